@@ -39,3 +39,6 @@ channel_keywords = {f"{mod}_channel" for mod in modifiers} | {"channel"}
 unit_test_exec_name = "unit"
 unit_test_resource_dir = "resource/ut"
 unit_test_subdir = "utest"
+
+# FUT MQTT collector specific variables
+mqtt_collector_api_port = 65003
@@ -4,7 +4,15 @@ from pathlib import Path
 import pytest
 
 from config.defaults import unit_test_exec_name, unit_test_resource_dir, unit_test_subdir
-from framework.lib.fut_lib import determine_required_devices, find_filename_in_dir, output_to_json, print_allure
+from framework.lib.fut_lib import (
+    compare_process_fingerprints,
+    determine_required_devices,
+    find_filename_in_dir,
+    output_to_json,
+    print_allure,
+)
+from framework.lib.fut_radio_ordering import RadioTransitionCostModel, reorder_items
+from framework.lib.fut_regulatory import get_regulatory_index
 from framework.tools import fut_setup
 from lib_testbed.generic.util.logger import log
 
@@ -14,6 +22,7 @@ pytest.expected_shell_result = 0
 pytest.tracked_managers = ["dm"]
 pytest_plugins = [
     "framework.lib.fut_allure",
+    "framework.lib.fut_shard_plugin",
 ]
 if Path("internal/pytest_plugins").is_dir():
     pytest_plugins.extend(
@@ -39,6 +48,18 @@ def pytest_addoption(parser):
         default=False,
         help="Strict OpenSync restart detection? False (default): strict - exit session. True: not strict - fail test.",
     )
+    parser.addoption(
+        "--radio_aware_ordering",
+        action="store_true",
+        default=False,
+        help="Reorder the WM2 and NM2 test cases to minimize the channel changes and the DFS CAC waits.",
+    )
+    parser.addoption(
+        "--radio_aware_ordering_dry_run",
+        action="store_true",
+        default=False,
+        help="Only report the time the radio aware ordering of the test cases would save, without reordering them.",
+    )
 
 
 def pytest_sessionstart():
@@ -76,6 +97,17 @@ def pytest_collection_modifyitems(config, items):
     else:
         tests_to_run = items
 
+    if config.getoption("--radio_aware_ordering") or config.getoption("--radio_aware_ordering_dry_run"):
+        reg_domain = pytest.fut_configurator.fut_test_config_gen_cls.test_generators.regulatory_domain
+        cost_model = RadioTransitionCostModel(get_regulatory_index(), reg_domain)
+        reordered, original_cost, reordered_cost = reorder_items(tests_to_run, _get_item_config, cost_model)
+        log.info(
+            f"Radio aware ordering: estimated radio transition time {original_cost:.0f}s, "
+            f"reordered {reordered_cost:.0f}s, saved {original_cost - reordered_cost:.0f}s",
+        )
+        if not config.getoption("--radio_aware_ordering_dry_run"):
+            tests_to_run = reordered
+
     for item in tests_to_run:
         # Get a list of all parent nodes - used for determining device requirements
         class_mapping.append(item.cls.__name__)
@@ -140,17 +172,12 @@ def process_restart_detection(request):
     current_os_pids = pytest.gw.opensync_pid_retrieval(tracked_node_services=pytest.tracked_managers)
 
     session_baseline_os_pids = pytest.session_baseline_os_pids.copy()
-    baseline_os_proc = sorted(session_baseline_os_pids.keys())
-    current_os_proc = sorted(current_os_pids.keys())
-    missing_os_pids = {key: session_baseline_os_pids[key] for key in baseline_os_proc if key not in current_os_proc}
-    mismatching_os_pids = {
-        key: current_os_pids[key]
-        for key in current_os_proc
-        if key in baseline_os_proc and current_os_pids[key] != session_baseline_os_pids[key]
-    }
+    missing_os_pids, mismatching_os_pids, new_os_pids = compare_process_fingerprints(
+        session_baseline_os_pids,
+        current_os_pids,
+    )
 
     # This modifies pytest.session_baseline_os_pids and must be done last, but before failing or exiting pytest
-    new_os_pids = {key: current_os_pids[key] for key in current_os_proc if key not in baseline_os_proc}
     if new_os_pids:
         pytest.session_baseline_os_pids.update(new_os_pids)
         print_allure(f"Adding new OpenSync process PIDs to baseline: {new_os_pids}")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import logging
+import os
 
 from docker.server.data.var.www.gatekeeper.lib import gatekeeper_io
 from flask import Flask
@@ -18,8 +19,19 @@ CORS(app, expose_headers=["x-suggested-filename"])
 gatekeeper_log_file = "/tmp/fut_gatekeeper.log"
 gatekeeper_logger = logging.getLogger("GatekeeperLogger")
 gatekeeper_logger_fh = logging.FileHandler(gatekeeper_log_file, mode="w")
-gatekeeper_logger.setLevel(logging.DEBUG)
 gatekeeper_logger.addHandler(gatekeeper_logger_fh)
+# Production mode logs a single access line per request instead of the decoded requests and replies
+production_mode = os.getenv("FUT_GATEKEEPER_PRODUCTION", "False").lower() in ("true", "1", "yes")
+
+
+def set_production_mode(enabled):
+    global production_mode
+    production_mode = enabled
+    gatekeeper_logger.setLevel(logging.INFO if enabled else logging.DEBUG)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING if enabled else logging.INFO)
+
+
+set_production_mode(production_mode)
 
 
 @app.route("/gatekeeper", methods=["GET", "POST"])
@@ -33,8 +45,9 @@ def gatekeeper_api():
 
     if request.method == "POST":
         m = "This is POST call to gatekeeper"
-        gatekeeper_logger.info(m)
-        req = gatekeeper_io.Req(request, logger=gatekeeper_logger)
+        gatekeeper_logger.debug(m)
+        cache = gatekeeper_io.verdict_cache if production_mode else None
+        req = gatekeeper_io.Req(request, logger=gatekeeper_logger, cache=cache)
         response = req.deserialize()
         return response
 
@@ -48,4 +61,4 @@ def gatekeeper_test(path):
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=not production_mode, threaded=True)
@@ -0,0 +1,209 @@
+import ipaddress
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+
+logger = logging.getLogger(__file__)
+
+# Tables with host names, which support the suffix entries "*.example.com" and ".example.com"
+FQDN_TABLES = ["fqdn", "https_sni", "http_host"]
+# Tables with URLs, which support the prefix entries "http://example.com/path/*"
+URL_TABLES = ["http_url"]
+# Tables with IP addresses, which support the network entries "192.168.0.0/16"
+IP_TABLES = ["ipv4", "ipv6"]
+
+
+def _freeze(entry):
+    if isinstance(entry, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in entry.items()})
+    if isinstance(entry, list):
+        return tuple(_freeze(value) for value in entry)
+    return entry
+
+
+class GatekeeperTable:
+    """
+    Indexed table of the gatekeeper content DB.
+
+    Exact entries are always looked up first. The suffix, prefix and network
+    entries are only used if there is no exact entry for the attribute, in
+    which case the most specific matching entry is returned.
+    """
+
+    def __init__(self, name, entries):
+        self.name = name
+        self.exact = MappingProxyType({key: _freeze(entry) for key, entry in entries.items()})
+        self.fqdn_suffixes = {}
+        self.url_prefixes = {}
+        self.url_prefix_lengths = ()
+        # IP version -> ((prefix length, {network address: entry}), ...), longest prefixes first
+        self.ip_networks = {}
+
+        if name in FQDN_TABLES:
+            for key, entry in self.exact.items():
+                if key.startswith(("*.", ".")):
+                    self.fqdn_suffixes[key.lstrip("*.").rstrip(".").lower()] = entry
+        elif name in URL_TABLES:
+            for key, entry in self.exact.items():
+                if key.endswith("*"):
+                    self.url_prefixes[key[:-1]] = entry
+            self.url_prefix_lengths = tuple(sorted({len(prefix) for prefix in self.url_prefixes}, reverse=True))
+        elif name in IP_TABLES:
+            networks = {}
+            for key, entry in self.exact.items():
+                if "/" not in key:
+                    continue
+                try:
+                    network = ipaddress.ip_network(key, strict=False)
+                except ValueError:
+                    logger.warning(f"Invalid network {key} in the {name} table")
+                    continue
+                version_networks = networks.setdefault(network.version, {})
+                version_networks.setdefault(network.prefixlen, {})[int(network.network_address)] = entry
+            for version, version_networks in networks.items():
+                self.ip_networks[version] = tuple(
+                    (prefixlen, version_networks[prefixlen]) for prefixlen in sorted(version_networks, reverse=True)
+                )
+
+    def lookup_fqdn(self, fqdn):
+        labels = fqdn.rstrip(".").lower().split(".")
+        # Longest suffix first, the suffix entry also matches the domain itself
+        for index in range(len(labels)):
+            entry = self.fqdn_suffixes.get(".".join(labels[index:]))
+            if entry is not None:
+                return entry
+        return None
+
+    def lookup_url(self, url):
+        for prefix_length in self.url_prefix_lengths:
+            entry = self.url_prefixes.get(url[:prefix_length])
+            if entry is not None:
+                return entry
+        return None
+
+    def lookup_ip(self, address):
+        if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            try:
+                address = ipaddress.ip_address(address)
+            except ValueError:
+                return None
+        address_int = int(address)
+        for prefixlen, networks in self.ip_networks.get(address.version, ()):
+            mask = ((1 << address.max_prefixlen) - 1) ^ ((1 << (address.max_prefixlen - prefixlen)) - 1)
+            entry = networks.get(address_int & mask)
+            if entry is not None:
+                return entry
+        return None
+
+    def lookup(self, attribute):
+        """
+        Return the entry for the request attribute or None.
+
+        Args:
+            attribute: FQDN, URL or IP address as a string. IPv4 addresses
+                in the network byte order integer and IPv6 addresses in the
+                packed format are also accepted.
+        """
+        entry = self.exact.get(attribute) if isinstance(attribute, str) else None
+        if entry is not None:
+            return entry
+
+        if self.fqdn_suffixes and isinstance(attribute, str):
+            return self.lookup_fqdn(attribute)
+        if self.url_prefixes and isinstance(attribute, str):
+            return self.lookup_url(attribute)
+        if self.name in IP_TABLES:
+            if isinstance(attribute, int):
+                attribute = ipaddress.IPv4Address(attribute.to_bytes(4, byteorder="big"))
+            elif isinstance(attribute, bytes):
+                attribute = ipaddress.IPv6Address(attribute)
+            else:
+                return self.lookup_ip(attribute)
+            entry = self.exact.get(str(attribute))
+            return entry if entry is not None else self.lookup_ip(attribute)
+        return None
+
+
+class GatekeeperDbSnapshot:
+    """Immutable indexed snapshot of the gatekeeper content and category DBs."""
+
+    def __init__(self, content, category, version=None):
+        self.tables = MappingProxyType({name: GatekeeperTable(name, entries) for name, entries in content.items()})
+        self.category = MappingProxyType({key: _freeze(entry) for key, entry in category.items()})
+        self.version = version
+
+    def lookup(self, key, attribute):
+        table = self.tables.get(key)
+        if table is None:
+            return None
+        return table.lookup(attribute)
+
+    def lookup_category(self, attribute):
+        return self.category.get(attribute)
+
+
+class GatekeeperDb:
+    """
+    Gatekeeper content and category DBs, loaded once and reloaded when the files change.
+
+    The DB files are checked with stat() when the snapshot is requested. If
+    the modification time, the size or the inode of any file has changed,
+    a new snapshot is built and replaces the previous one, so a request
+    always uses one consistent snapshot. If the new files can not be parsed,
+    for example while they are being written, the previous snapshot is kept
+    until the files change again.
+    """
+
+    def __init__(self, lib_path, content_file="gatekeeper_content.json", category_file="gatekeeper_category.json"):
+        self.content_path = os.path.join(lib_path, content_file)
+        self.category_path = os.path.join(lib_path, category_file)
+        self.reload_count = 0
+        self._snapshot = None
+        self._failed_version = None
+        self._lock = threading.Lock()
+
+    def _get_version(self):
+        version = []
+        for path in [self.content_path, self.category_path]:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return tuple(version)
+
+    def _load(self, version):
+        with open(self.content_path, "r") as f:
+            content = json.load(f)
+        with open(self.category_path, "r") as f:
+            category = json.load(f)
+        return GatekeeperDbSnapshot(content, category, version)
+
+    def get_snapshot(self):
+        snapshot = self._snapshot
+        try:
+            version = self._get_version()
+        except OSError as e:
+            if snapshot is None:
+                raise
+            logger.error(f"Failed to check the gatekeeper DB files, using the loaded DB: {e}")
+            return snapshot
+        if snapshot is not None and version in (snapshot.version, self._failed_version):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and version in (snapshot.version, self._failed_version):
+                return snapshot
+            try:
+                new_snapshot = self._load(version)
+            except (OSError, ValueError) as e:
+                if snapshot is None:
+                    raise
+                # The same files are not parsed again until they change
+                self._failed_version = version
+                logger.error(f"Failed to reload the gatekeeper DB, using the loaded DB: {e}")
+                return snapshot
+            self._snapshot = new_snapshot
+            self.reload_count += 1
+            logger.info(f"Gatekeeper DB loaded from {self.content_path} and {self.category_path}")
+            return new_snapshot
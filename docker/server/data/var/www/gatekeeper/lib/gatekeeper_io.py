@@ -3,6 +3,8 @@ import ipaddress
 import json
 import logging
 import socket
+import threading
+import time
 from enum import Enum
 
 from flask import jsonify, make_response
@@ -10,9 +12,13 @@ from google.protobuf import json_format
 from google.protobuf import message as pb_message
 
 from . import gatekeeper_pb2
+from .gatekeeper_db import GatekeeperDb
 
 logger = logging.getLogger(__file__)
 
+# Content and category DBs shared by all requests, loaded on the first request
+gatekeeper_db = GatekeeperDb("/var/www/gatekeeper/lib")
+
 
 class ReqType(Enum):
     UNKNOWN = 0
@@ -63,21 +69,121 @@ class GatekeeperError(Exception):
     pass
 
 
+# Request attribute field of each request type, the request type key is used in the DB and the message field names
+ATTRIBUTE_FIELDS = {
+    "fqdn": "fqdn",
+    "http_url": "http_url",
+    "http_host": "http_host",
+    "https_sni": "https_sni",
+    "ipv4": "addr_ipv4",
+    "ipv6": "addr_ipv6",
+    "app": "app_name",
+}
+
+
+def encode_varint(value):
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+class CachedReply:
+    """
+    Serialized reply, which only needs the request ID to be inserted.
+
+    The request ID is the first field of the reply header, and the header is
+    the first field of every reply type, so the reply is serialized with
+    the request ID by concatenating the encoded fields, which produces the
+    same bytes as the serialization of the complete reply message.
+    """
+
+    def __init__(self, reply, key):
+        reply_field = getattr(reply, f"reply_{key}")
+        header = type(reply_field.header)()
+        header.CopyFrom(reply_field.header)
+        header.request_id = 0
+        body = type(reply_field)()
+        body.CopyFrom(reply_field)
+        body.ClearField("header")
+        field_number = reply.DESCRIPTOR.fields_by_name[f"reply_{key}"].number
+        self.action = gatekeeper_pb2.GatekeeperAction.Name(reply_field.header.action)
+        self.reply_tag = encode_varint(field_number << 3 | 2)
+        self.header_rest = header.SerializeToString()
+        self.body_rest = body.SerializeToString()
+
+    def serialize(self, request_id):
+        header = self.header_rest
+        if request_id:
+            header = b"\x08" + encode_varint(request_id) + header
+        reply_field = b"\x0a" + encode_varint(len(header)) + header + self.body_rest
+        return self.reply_tag + encode_varint(len(reply_field)) + reply_field
+
+
+class VerdictCache:
+    """
+    Cache of the serialized replies, keyed by the request type, the attribute and the policy rule.
+
+    The cache is bound to a DB snapshot and is emptied when the DB is reloaded.
+    The cache is only used in the production mode, so every request is fully
+    processed and logged in the debug mode.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.snapshot = None
+        self.replies = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, snapshot, cache_key):
+        if snapshot is not self.snapshot:
+            with self._lock:
+                if snapshot is not self.snapshot:
+                    self.snapshot = snapshot
+                    self.replies = {}
+        cached_reply = self.replies.get(cache_key)
+        if cached_reply is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached_reply
+
+    def put(self, snapshot, cache_key, cached_reply):
+        if snapshot is not self.snapshot:
+            return
+        if len(self.replies) >= self.max_entries:
+            self.replies = {}
+        self.replies[cache_key] = cached_reply
+
+
+verdict_cache = VerdictCache()
+
+
 # Request handler
 # Deserialize a request
 # Presents the request in human readabler form:
 #  represent byte arrays to their meaning (mac address, ip addresses
 class Req:
-    def __init__(self, client_req, logger=logger):
+    def __init__(self, client_req, logger=logger, db=None, cache=None):
         self.logger = logger
         self.req = client_req
+        self.db = db
+        self.cache = cache
         self.response = None
         self.raw_response = None
+        # Request and reply conversions for the debug logs are skipped unless debug logging is enabled
+        self.debug = self.logger.isEnabledFor(logging.DEBUG)
 
     # deserialize the received request
     def deserialize(self):
+        start_time = time.perf_counter()
         message = gatekeeper_pb2.GatekeeperReq()
-        self.logger.debug(f"Headers:\n{self.req.headers}")
+        if self.debug:
+            self.logger.debug(f"Headers:\n{self.req.headers}")
 
         try:
             message.ParseFromString(self.req.get_data())
@@ -89,37 +195,56 @@ class Req:
             self.raw_response = jsonify(bar)
             return response
 
-        the_data = json_format.MessageToDict(message, preserving_proto_field_name=True)
-        present_data(the_data)
-        json_data = json.dumps(the_data, indent=4, sort_keys=True)
-        self.raw_response = json_data
-        self.logger.debug(f"deserialized data:\n{json_data}")
-        self.response = Response(message, self.logger)
-        self.logger.debug(f"Request type: {self.response.rtype}")
-        response = make_response(self.response.serialize())
+        if self.debug:
+            the_data = json_format.MessageToDict(message, preserving_proto_field_name=True)
+            present_data(the_data)
+            json_data = json.dumps(the_data, indent=4, sort_keys=True)
+            self.raw_response = json_data
+            self.logger.debug(f"deserialized data:\n{json_data}")
+        self.response = Response(message, self.logger, db=self.db)
+        if self.debug:
+            self.logger.debug(f"Request type: {self.response.rtype}")
+
+        cache_key = self.response.cache_key()
+        cached_reply = self.cache.get(self.response.db, cache_key) if self.cache and cache_key else None
+        cache_hit = cached_reply is not None
+        if cache_hit:
+            if self.debug:
+                self.logger.debug("Reply served from the verdict cache")
+            serialized_reply = cached_reply.serialize(self.response.request_header.request_id)
+            action = cached_reply.action
+        else:
+            serialized_reply = self.response.serialize()
+            action = self.response.action_name()
+            if self.cache and cache_key:
+                self.cache.put(self.response.db, cache_key, CachedReply(self.response.response, self.response.key))
+
+        response = make_response(serialized_reply)
         response.headers["Content-Type"] = "application/octet-stream"
+        if cache_key:
+            rtype, attribute, _ = cache_key
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.logger.info(
+                f"{rtype.name} {self.response.format_attribute(attribute)} {action} "
+                f"id={self.response.request_header.request_id} cached={cache_hit} {duration_ms:.2f}ms",
+            )
         return response
 
 
 class Response:
-    def __init__(self, client_req, logger=logger):
+    def __init__(self, client_req, logger=logger, db=None):
         self.logger = logger
         self.req = client_req
         self.rtype = None
         self.key = None
         self.attribute = None
+        self.entry = {}
+        self.request_header = None
+        self.debug = self.logger.isEnabledFor(logging.DEBUG)
         self.req_type()
         self.response = None
-        self.db = None
-        self.category_db = None
-        self.lib_path = "/var/www/gatekeeper/lib"
-        with open(f"{self.lib_path}/gatekeeper_content.json", "r") as f:
-            content = f.read()
-            self.db = json.loads(content)
-
-        with open(f"{self.lib_path}/gatekeeper_category.json", "r") as f:
-            content = f.read()
-            self.category_db = json.loads(content)
+        # The snapshot is taken once, so the whole request uses the same DB content
+        self.db = (db or gatekeeper_db).get_snapshot()
 
     def req_type(self):
         if self.req.HasField("req_fqdn"):
@@ -152,13 +277,25 @@ class Response:
 
         return ReqType.UNKNOWN
 
+    def cache_key(self):
+        """Return the key of the verdict cache for the request, or None if the request type is not supported."""
+        if self.rtype is None:
+            return None
+        request = getattr(self.req, f"req_{self.key}")
+        self.request_header = request.header
+        return self.rtype, getattr(request, ATTRIBUTE_FIELDS[self.key]), request.header.policy_rule
+
+    def action_name(self):
+        reply_header = getattr(self.response, f"reply_{self.key}").header
+        return gatekeeper_pb2.GatekeeperAction.Name(reply_header.action)
+
     def fill_fqdn_reply_body(self, request_header, reply_redirect, action):
         # if the action is set to redirect populate redirect IP address
         if action != gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_REDIRECT:
             return
 
         try:
-            ipv4_addr = self.db[self.key][self.attribute]["redirect_v4"]
+            ipv4_addr = self.entry["redirect_v4"]
             reply_redirect.redirect_ipv4 = socket.htonl(
                 int(ipaddress.ip_address(ipv4_addr)),
             )
@@ -166,41 +303,46 @@ class Response:
             reply_redirect.redirect_ipv4 = 0
 
         try:
-            ipv6_addr = self.db[self.key][self.attribute]["redirect_v6"]
+            ipv6_addr = self.entry["redirect_v6"]
             reply_redirect.redirect_ipv6 = ipaddress.IPv6Address(ipv6_addr).packed
         except KeyError:
             reply_redirect.redirect_ipv6 = bytes()
 
         try:
-            cname = self.db[self.key][self.attribute]["redirect_cname"]
+            cname = self.entry["redirect_cname"]
             reply_redirect.redirect_cname = cname
         except KeyError:
             reply_redirect.redirect_cname = ""
 
-    @property
-    def formatted_attribute(self):
+    def format_attribute(self, attribute):
         if self.rtype == ReqType.IPv4:
             ipstr = socket.inet_ntop(
                 socket.AF_INET,
-                self.attribute.to_bytes(4, byteorder="big"),
+                attribute.to_bytes(4, byteorder="big"),
             )
             return ipstr
 
-        return self.attribute
+        return attribute
+
+    @property
+    def formatted_attribute(self):
+        return self.format_attribute(self.attribute)
 
     def update_category(self, reply_header):
-        self.logger.debug(f"attribute: {self.formatted_attribute}")
-        if self.formatted_attribute not in self.category_db:
+        if self.debug:
+            self.logger.debug(f"attribute: {self.formatted_attribute}")
+        category = self.db.lookup_category(self.formatted_attribute)
+        if category is None:
             return
 
-        if "category_id" in self.category_db[self.formatted_attribute]:
-            reply_header.category_id = self.category_db[self.formatted_attribute]["category_id"]
+        if "category_id" in category:
+            reply_header.category_id = category["category_id"]
 
-        if "confidence_level" in self.category_db[self.formatted_attribute]:
-            reply_header.confidence_level = self.category_db[self.formatted_attribute]["confidence_level"]
+        if "confidence_level" in category:
+            reply_header.confidence_level = category["confidence_level"]
 
-        if "policy" in self.category_db[self.formatted_attribute]:
-            reply_header.policy = self.category_db[self.formatted_attribute]["policy"]
+        if "policy" in category:
+            reply_header.policy = category["policy"]
 
     def access_db(self, request_header, reply_header):
         action_map = {
@@ -218,13 +360,16 @@ class Response:
         self.update_category(reply_header)
 
         attr = self.formatted_attribute
+        self.entry = self.db.lookup(self.key, attr) or {}
         try:
-            db_action = self.db[self.key][attr]["action"]
+            db_action = self.entry["action"]
         except KeyError:
-            self.logger.debug(f"No db action found for {self.key} attribute {attr} type {self.rtype}, accepting")
+            if self.debug:
+                self.logger.debug(f"No db action found for {self.key} attribute {attr} type {self.rtype}, accepting")
             db_action = "allow"
 
-        self.logger.debug(f"db action for {self.key} attribute {attr} type {self.rtype}: {db_action}")
+        if self.debug:
+            self.logger.debug(f"db action for {self.key} attribute {attr} type {self.rtype}: {db_action}")
         # Raise our own error if the action is unkown
         try:
             reply_header.action = action_map[db_action]
@@ -233,12 +378,16 @@ class Response:
             raise GatekeeperError
 
         try:
-            db_flow_marker = self.db[self.key][attr]["flow_marker"]
+            db_flow_marker = self.entry["flow_marker"]
         except KeyError:
-            self.logger.debug(f"No db flow marker found for {self.key} attribute {attr} type {self.rtype}, accepting")
+            if self.debug:
+                self.logger.debug(
+                    f"No db flow marker found for {self.key} attribute {attr} type {self.rtype}, accepting",
+                )
             db_flow_marker = 0
 
-        self.logger.debug(f"db flow marker for {self.key} attribute {attr} type {self.rtype}: {db_flow_marker}")
+        if self.debug:
+            self.logger.debug(f"db flow marker for {self.key} attribute {attr} type {self.rtype}: {db_flow_marker}")
         reply_header.flow_marker = db_flow_marker
 
     def fill_header(self):
@@ -248,7 +397,8 @@ class Response:
             reply_redirect = reply_fqdn.redirect
             request_header = self.req.req_fqdn.header
             self.attribute = self.req.req_fqdn.fqdn
-            self.logger.debug(f"fqdn: {self.attribute}")
+            if self.debug:
+                self.logger.debug(f"fqdn: {self.attribute}")
             self.access_db(request_header, reply_header)
             self.fill_fqdn_reply_body(
                 request_header,
@@ -301,10 +451,11 @@ class Response:
     def serialize(self):
         self.response = gatekeeper_pb2.GatekeeperReply()
         self.fill_header()
-        the_data = json_format.MessageToDict(
-            self.response,
-            preserving_proto_field_name=True,
-        )
-        present_data(the_data)
-        self.logger.debug(f"Reply data:\n{json.dumps(the_data, indent=4, sort_keys=True)}")
+        if self.debug:
+            the_data = json_format.MessageToDict(
+                self.response,
+                preserving_proto_field_name=True,
+            )
+            present_data(the_data)
+            self.logger.debug(f"Reply data:\n{json.dumps(the_data, indent=4, sort_keys=True)}")
         return self.response.SerializeToString()
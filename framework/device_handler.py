@@ -1,18 +1,31 @@
-import threading
+import json
+import os
+import tempfile
 import time
 import traceback
 from pathlib import Path
 from typing import Any, Callable, Literal
 
 from framework.fut_configurator import FutConfigurator
-from framework.lib.fut_lib import allure_script_execution_post_processing
+from framework.lib.fut_device_snapshot import DEVICE_SNAPSHOT_CACHE_DIR, DeviceSnapshot
+from framework.lib.fut_file_sync import (
+    create_sync_archive,
+    get_changed_files,
+    get_device_manifest_command,
+    get_full_transfer_duration,
+    get_local_manifest,
+    get_local_size,
+    parse_device_manifest,
+    set_full_transfer_duration,
+)
+from framework.lib.fut_lib import allure_attach_to_report, allure_script_execution_post_processing
+from framework.lib.fut_reconnect import can_probe_port, load_reconnection_policy, ReconnectionEngine
+from framework.lib.fut_resident_shell import RESIDENT_SHELL_SCRIPT, ResidentShell, ResidentShellError
+from framework.lib.fut_ssh_pool import SshConnectionPool, SshPoolError
 from lib_testbed.generic.client.client import Client
-from lib_testbed.generic.pod.pod import Pod
 from lib_testbed.generic.util.logger import log
 from lib_testbed.generic.util.ssh.sshexception import SshException
 
-lock = threading.Lock()
-
 
 class DeviceHandler:
     def __init__(self, name):
@@ -30,11 +43,11 @@ class DeviceHandler:
         self.log_tail_process = None
         self.log_tail_file = None
         self.log_tail_file_name = None
+        self.file_transfer_stats = []
         self.device_api = self._get_device_api()
         self.rcn_active = False
-        self.rcn_attempt = 0
-        self.ssh_rcn_max_attempts = 4
-        self.rcn_sleep_time = 30
+        self.reconnection_policy = load_reconnection_policy()
+        self.reconnection_events: list[dict] = []
 
         if not self.device_type == "client":
             self.capabilities = self.device_api.capabilities
@@ -52,6 +65,12 @@ class DeviceHandler:
             self.device_config = self._extract_client_config()
 
         self.version = self._version()
+        self.device_snapshot = self._get_device_snapshot()
+        self.ssh_pool = self._get_ssh_pool()
+        self.resident_shell = self._get_resident_shell()
+        # Checked while the device is reachable, the reconnection only relies on the port probe if it works
+        self.ssh_port_probe = bool(self.hostname) and can_probe_port(self.hostname, self._get_ssh_port())
+        log.debug(f"SSH port probe of {self.name} {'enabled' if self.ssh_port_probe else 'disabled'}")
 
     def _extract_device_osrt_config(self) -> dict[str, Any]:
         """
@@ -147,23 +166,142 @@ class DeviceHandler:
             (obj): Device API 'pod' or 'client' object.
         """
         if self.device_type == "client":
-            device_obj = Client()
-        else:
-            device_obj = Pod()
+            return Client().resolve_obj(**{"config": self.testbed_cfg, "nickname": self.name})
+
+        # Node pod API is shared with the test configuration generator
+        return self.fut_configurator.get_pod_api(self.name)
+
+    def _get_device_snapshot(self) -> DeviceSnapshot:
+        """
+        Return the snapshot of the device properties for the current firmware version.
+
+        The snapshot is persisted if the FUT_DEVICE_SNAPSHOT_CACHE
+        environment variable is set. The snapshot recorded on a different
+        firmware version is discarded, as the device version was already
+        queried on handler initialization.
+
+        Returns:
+            (DeviceSnapshot): Device snapshot.
+        """
+        cache_dir = DEVICE_SNAPSHOT_CACHE_DIR if self.fut_configurator.device_snapshot_enabled else None
+        return DeviceSnapshot(
+            serial=self.device_osrt_config.get("id"),
+            model=self.model,
+            version=self.version,
+            cache_dir=cache_dir,
+        )
+
+    def get_ssh_command(self, remote_command: str, ssh_options: list[str] | None = None) -> list[str]:
+        """
+        Return the local command which executes the command on the device over a dedicated SSH session.
+
+        Args:
+            remote_command (str): Command executed on the device. No command is added if empty.
+            ssh_options (list | None): Additional SSH options. Defaults to None.
+
+        Returns:
+            (list): Local SSH command.
+        """
+        host = self.device_osrt_config.get("host", {})
+        username = host.get("user", self.username)
+        password = host.get("pass", self.password)
+        ssh_cmd = [
+            "ssh",
+            "-T",
+            "-o",
+            "StrictHostKeyChecking=no",
+            "-o",
+            "UserKnownHostsFile=/dev/null",
+            "-o",
+            "LogLevel=ERROR",
+            "-o",
+            "ServerAliveInterval=10",
+            *(ssh_options or []),
+            f"{username}@{self.hostname}",
+        ]
+        if remote_command:
+            ssh_cmd.append(remote_command)
+        if password:
+            ssh_cmd = ["sshpass", "-p", password] + ssh_cmd
+        return ssh_cmd
+
+    def get_resident_shell_command(self) -> list[str]:
+        """
+        Return the local command which starts the resident shell on the device.
+
+        The resident shell is reached over a dedicated SSH session, which
+        stays open for the lifetime of the resident shell.
+
+        Returns:
+            (list): Command used to start the resident shell.
+        """
+        return self.get_ssh_command(f"sh {self.fut_dir}/{RESIDENT_SHELL_SCRIPT}")
+
+    def _get_resident_shell(self) -> ResidentShell | None:
+        """
+        Return the resident shell handler, if enabled.
+
+        The resident shell is enabled by setting the FUT_RESIDENT_SHELL
+        environment variable and is only used for node devices.
 
-        device_api = device_obj.resolve_obj(**{"config": self.testbed_cfg, "nickname": self.name})
+        Returns:
+            (ResidentShell | None): Resident shell handler or None if disabled.
+        """
+        if not self.fut_configurator.resident_shell_enabled or self.device_type != "node":
+            return None
+        log.debug(f"Resident shell enabled on {self.name}")
+        return ResidentShell(name=self.name, spawn_cmd=self.get_resident_shell_command())
+
+    def _get_ssh_pool(self) -> SshConnectionPool | None:
+        """
+        Return the SSH connection pool, if enabled.
 
-        if hasattr(device_api, "override_version_specific_ifnames"):
-            device_api.override_version_specific_ifnames()
+        The SSH connection pool is enabled by setting the FUT_SSH_POOL
+        environment variable.
+
+        Returns:
+            (SshConnectionPool | None): SSH connection pool or None if disabled.
+        """
+        if not self.fut_configurator.ssh_pool_enabled:
+            return None
+        log.debug(f"SSH connection pool enabled on {self.name}")
+        return SshConnectionPool(name=self.name, ssh_command=self.get_ssh_command)
 
-        return device_api
+    def run_raw(self, cmd: str, **kwargs) -> list:
+        """
+        Run the raw command on the device.
+
+        The command is executed on a channel of the SSH connection pool, if
+        enabled, and over a new SSH session of the device API otherwise or
+        if the SSH connection pool is not usable.
+
+        Args:
+            cmd (str): Command to be executed.
+
+        Keyword Args:
+            timeout (int): Command timeout in seconds.
+            as_sudo (bool): Execute the command with superuser privileges.
+            skip_logging (bool): If set to True, the command is not logged.
+
+        Returns:
+            (list): Exit code (int), standard output (str) and standard error (str) of the executed command.
+        """
+        if self.ssh_pool and not self.ssh_pool.disabled:
+            try:
+                if not kwargs.get("skip_logging"):
+                    log.debug(f"[{self.name}] SSH pool: {cmd}")
+                pool_cmd = f"sudo {cmd}" if kwargs.get("as_sudo") else cmd
+                return self.ssh_pool.run(pool_cmd, timeout=kwargs.get("timeout") or self.test_script_timeout * 2)
+            except SshPoolError as exception:
+                log.warning(f"SSH connection pool execution failed on {self.name}: {exception}")
+        return self.device_api.run_raw(cmd, **kwargs)
 
     def clear_folder(self, folder_path: str) -> Literal[True]:
         """Remove contents of the target folder on the remote device."""
         if not Path(folder_path).is_absolute():
             folder_path = f"{self.fut_dir}/{folder_path}/"
         cmd = f"[ -d {folder_path} ] && rm -rf {folder_path} || echo '{folder_path} does not exist, nothing to remove.'"
-        ret = self.device_api.run_raw(cmd, skip_exception=True)
+        ret = self.run_raw(cmd, skip_exception=True)
         if ret[0] != 0:
             log.warning(f"Failed to empty {folder_path} on {self.name}.")
         return True
@@ -333,20 +471,26 @@ class DeviceHandler:
         """
         Create file containing shell environment variables.
 
-        Name of the file is hardcoded to 'fut_set_env.sh'.
+        Name of the file is hardcoded to 'fut_set_env.sh'. The file is
+        created in a directory dedicated to the device, so handlers of
+        different devices can create it concurrently. The file is written
+        to a temporary file first and then renamed. The file is readable by
+        everyone, like a file created with the default umask.
 
         Returns:
             (str): Path to shell environment variable file.
         """
-        shell_fut_env_path = f"{self.fut_base_dir}/fut_set_env.sh"
-        shell_fut_env_file = open(shell_fut_env_path, "w")
-
-        for key, value in self._get_shell_cfg().items():
-            ini_line = f'{key}="{value}"\n'
-            shell_fut_env_file.write(ini_line)
+        shell_fut_env_dir = Path(self.fut_base_dir).joinpath(".fut_cache", "fut_set_env", self.name)
+        shell_fut_env_dir.mkdir(parents=True, exist_ok=True)
+        shell_fut_env_path = shell_fut_env_dir.joinpath("fut_set_env.sh").as_posix()
+        with tempfile.NamedTemporaryFile("w", dir=shell_fut_env_dir, suffix=".tmp", delete=False) as shell_fut_env_file:
+            for key, value in self._get_shell_cfg().items():
+                ini_line = f'{key}="{value}"\n'
+                shell_fut_env_file.write(ini_line)
 
-        shell_fut_env_file.write('echo "${FUT_TOPDIR}/fut_set_env.sh sourced"\n')
-        shell_fut_env_file.close()
+            shell_fut_env_file.write('echo "${FUT_TOPDIR}/fut_set_env.sh sourced"\n')
+        os.chmod(shell_fut_env_file.name, 0o644)
+        os.replace(shell_fut_env_file.name, shell_fut_env_path)
 
         return shell_fut_env_path
 
@@ -366,24 +510,170 @@ class DeviceHandler:
 
         return version
 
+    def _put_folders(self, folders: list[str], device_env_file: str | None, as_sudo: bool) -> int:
+        """
+        Transfer all files in the folders to the device.
+
+        Args:
+            folders (list): Folders, relative to the FUT base directory.
+            device_env_file (str | None): Path to the shell environment file, if it is transferred.
+            as_sudo (bool): Transfer the files with superuser privileges.
+
+        Returns:
+            (int): Number of transferred bytes.
+        """
+        bytes_sent = get_local_size(self.fut_base_dir, folders)
+        if device_env_file:
+            bytes_sent += os.path.getsize(device_env_file)
+        self.fut_configurator.transfer_scheduler.reserve_bandwidth(bytes_sent)
+        try:
+            for folder in folders:
+                self.device_api.put_dir(
+                    directory=f"{self.fut_base_dir}/{folder}/",
+                    location=f"{self.fut_dir}/{folder}/",
+                    as_sudo=as_sudo,
+                )
+        except Exception as exception:
+            raise RuntimeError(traceback.format_exc()) from exception
+
+        if device_env_file:
+            self.device_api.put_file(file_name=device_env_file, location=self.fut_dir)
+
+        return bytes_sent
+
+    def _sync_folders(self, folders: list[str], device_env_file: str | None, as_sudo: bool) -> dict | None:
+        """
+        Transfer only the files which are missing or changed on the device.
+
+        The MD5 digests of the local files are compared with the manifest
+        of the files on the device, retrieved with a single command. The
+        changed files are transferred as a single compressed archive and
+        extracted on the device. If all files are up to date, the
+        synchronization costs a single command execution.
+
+        Args:
+            folders (list): Folders, relative to the FUT base directory.
+            device_env_file (str | None): Path to the shell environment file, if it is transferred.
+            as_sudo (bool): Extract the files with superuser privileges.
+
+        Returns:
+            (dict | None): File transfer statistics or None if the synchronization failed.
+        """
+        start_time = time.monotonic()
+        paths = folders + ([Path(device_env_file).name] if device_env_file else [])
+        local_manifest = get_local_manifest(self.fut_base_dir, folders)
+        if device_env_file:
+            local_manifest |= get_local_manifest(Path(device_env_file).parent.as_posix(), [Path(device_env_file).name])
+        manifest_cmd = get_device_manifest_command(self.fut_dir, paths)
+        manifest_ec, manifest_std_out, manifest_std_err = self.run_raw(manifest_cmd, skip_logging=True)
+        if manifest_ec != 0:
+            log.warning(f"Failed to retrieve the FUT file manifest from {self.name}: {manifest_std_err}")
+            return None
+        if manifest_std_err:
+            log.debug(f"FUT file manifest errors on {self.name}: {manifest_std_err}")
+
+        changed_files = get_changed_files(local_manifest, parse_device_manifest(manifest_std_out))
+        bytes_sent = 0
+        if changed_files:
+            archive_fd, archive_path = tempfile.mkstemp(prefix=f"fut_sync_{self.name}_", suffix=".tar.gz")
+            os.close(archive_fd)
+            remote_archive_path = f"/tmp/{Path(archive_path).name}"
+            try:
+                bytes_sent = create_sync_archive(archive_path, local_manifest, changed_files)
+                self.fut_configurator.transfer_scheduler.reserve_bandwidth(bytes_sent)
+                self.device_api.put_file(file_name=archive_path, location="/tmp")
+            except Exception as exception:
+                log.warning(f"Failed to transfer the FUT file archive to {self.name}: {exception}")
+                return None
+            finally:
+                os.remove(archive_path)
+            extract_cmd = (
+                f"sh -c 'mkdir -p {self.fut_dir} && tar -xzf {remote_archive_path} -C {self.fut_dir}; "
+                f"extract_ec=$?; rm -f {remote_archive_path}; exit $extract_ec'"
+            )
+            extract_ec, _, extract_std_err = self.run_raw(extract_cmd, as_sudo=as_sudo)
+            if extract_ec != 0:
+                log.warning(f"Failed to extract the FUT file archive on {self.name}: {extract_std_err}")
+                return None
+
+        duration = time.monotonic() - start_time
+        transfer_key = f"{self.model}:{','.join(folders)}"
+        if len(changed_files) == len(local_manifest):
+            set_full_transfer_duration(self.fut_base_dir, transfer_key, duration)
+        full_transfer_duration = get_full_transfer_duration(self.fut_base_dir, transfer_key)
+        bytes_total = sum(file_size for _, _, file_size in local_manifest.values())
+        return {
+            "device": self.name,
+            "folders": folders,
+            "files_total": len(local_manifest),
+            "files_sent": len(changed_files),
+            "bytes_total": bytes_total,
+            "bytes_sent": bytes_sent,
+            "bytes_saved": max(bytes_total - bytes_sent, 0),
+            "duration": round(duration, 3),
+            "seconds_saved": (
+                round(max(full_transfer_duration - duration, 0), 3) if full_transfer_duration is not None else None
+            ),
+        }
+
     def file_transfer(self, folders: list[str], **kwargs) -> None:
+        """
+        Transfer the FUT folders and the shell environment file to the device.
+
+        Only the changed files are transferred, unless 'full_transfer' is
+        set or the synchronization fails, in which case all files in the
+        folders are transferred.
+
+        Args:
+            folders (list): Folders, relative to the FUT base directory.
+
+        Keyword Args:
+            as_sudo (bool): Transfer the files with superuser privileges. Defaults to True.
+            skip_env_file (bool): Do not transfer the shell environment file. Defaults to False.
+            full_transfer (bool): Transfer all files in the folders. Defaults to False.
+        """
         as_sudo = kwargs.get("as_sudo", True)
         skip_env_file = kwargs.get("skip_env_file", False)
+        full_transfer = kwargs.get("full_transfer", False)
+        transfer_scheduler = self.fut_configurator.transfer_scheduler
         log.info(f"Transferring the {folders} folders to {self.name}")
-        with lock:
-            try:
-                for folder in folders:
-                    self.device_api.put_dir(
-                        directory=f"{self.fut_base_dir}/{folder}/",
-                        location=f"{self.fut_dir}/{folder}/",
-                        as_sudo=as_sudo,
-                    )
-            except Exception as exception:
-                raise RuntimeError(traceback.format_exc()) from exception
+        device_env_file = self.create_fut_set_env() if not skip_env_file else None
+        with transfer_scheduler.slot(self.name):
+            start_time = time.monotonic()
+            transfer_stats = None if full_transfer else self._sync_folders(folders, device_env_file, as_sudo)
+            if transfer_stats is None:
+                bytes_sent = self._put_folders(folders, device_env_file, as_sudo)
+                transfer_stats = {
+                    "device": self.name,
+                    "folders": folders,
+                    "bytes_total": bytes_sent,
+                    "bytes_sent": bytes_sent,
+                    "duration": round(time.monotonic() - start_time, 3),
+                }
+        device_transfer_stats = transfer_scheduler.record(
+            self.name,
+            transfer_stats["bytes_sent"],
+            transfer_stats["duration"],
+        )
+        transfer_stats["throughput"] = device_transfer_stats["throughput"]
+
+        self.file_transfer_stats.append(transfer_stats)
+        if "files_sent" in transfer_stats:
+            log.info(
+                f"Transferred {transfer_stats['files_sent']}/{transfer_stats['files_total']} files "
+                f"({transfer_stats['bytes_sent']} of {transfer_stats['bytes_total']} bytes) to {self.name} "
+                f"in {transfer_stats['duration']}s, saved {transfer_stats['bytes_saved']} bytes "
+                f"and {transfer_stats['seconds_saved']}s",
+            )
+        log.info(f"{self.name} file transfer throughput: {device_transfer_stats['throughput']} B/s")
+        allure_attach_to_report(
+            name=f"{self.name} file transfer",
+            body=json.dumps(transfer_stats, indent=4),
+        )
 
-            if not skip_env_file:
-                device_env_file = self.create_fut_set_env()
-                self.device_api.put_file(file_name=device_env_file, location=self.fut_dir)
+        if self.resident_shell and transfer_stats.get("files_sent", True):
+            # Restart the resident shell on next use, so it loads the transferred files
+            self.resident_shell.close()
 
     def check_fut_file_transfer(self) -> None | Literal[True]:
         """
@@ -392,7 +682,7 @@ class DeviceHandler:
         Returns:
             (bool): True if files were transferred.
         """
-        fut_file_check = self.device_api.run_raw(f"ls -la {self.fut_dir}/shell/lib")
+        fut_file_check = self.run_raw(f"ls -la {self.fut_dir}/shell/lib")
 
         if fut_file_check[0] != 0:
             log.info(f"{self.fut_dir} missing on {self.name.upper()}")
@@ -416,7 +706,7 @@ class DeviceHandler:
             (bool): True if SSH connection to the device is lost, False otherwise.
         """
         try:
-            res = self.device_api.run_raw("ls /", timeout=5)[0]
+            res = self.run_raw("ls /", timeout=5)[0]
             log.debug(f"Exit code of the SSH connection check: {res}")
             # Each exit_code != 0 is treated as SSH disconnection.
             return res != 0
@@ -425,13 +715,26 @@ class DeviceHandler:
             # Each exception is treated as SSH disconnection.
             return True
 
+    def _get_ssh_port(self) -> int:
+        """
+        Return the SSH port of the device.
+
+        Returns:
+            (int): SSH port from the testbed configuration, 22 by default.
+        """
+        return self.device_osrt_config.get("host", {}).get("port", 22)
+
     def _start_rcn_procedure(self) -> None | Literal[True]:
         """
         Start reconnection procedure to the device.
 
-        Method tries to reconnect 'ssh_rcn_max_attempts' number of
-        times. Between each unsuccessful attempt pauses and retries if
-        not already tried 'ssh_rcn_max_attempts' times.
+        The SSH port of the device is probed with exponential backoff, as
+        defined by the 'reconnection_policy', and the reconnection is
+        confirmed with a single command once the port is open. If the port
+        could not be probed from the framework host while the device was
+        reachable, the recovery is confirmed periodically with the command
+        alone. The time to recover is attached
+        to the report.
 
         Raises:
             ConnectionError: If device could not reconnect.
@@ -442,26 +745,80 @@ class DeviceHandler:
         log.warning("Lost SSH connection")
         log.debug("Starting SSH reconnection procedure")
         self.rcn_active = True
-
-        while self.rcn_active:
-            if self.rcn_attempt > self.ssh_rcn_max_attempts:
-                self.rcn_attempt = 0
-                self.rcn_active = False
-                raise ConnectionError("Lost connection to device.")
-            log.debug(f"Waiting {self.rcn_sleep_time}s before next reconnection attempt.")
-            time.sleep(self.rcn_sleep_time)
-            if self._check_mgmt_ssh_connection_down():
-                log.warning(f"Could not establish SSH connection - attempt {self.rcn_attempt}.")
-                self.rcn_attempt += 1
-            else:
-                log.debug(f"SSH connection re-established - attempt {self.rcn_attempt}.")
-                log.info("SSH connection re-established.")
-                self.rcn_attempt = 0
-                self.rcn_active = False
-                break
+        # Channels of the lost connection are not usable, they are established again on the next command
+        if self.resident_shell:
+            self.resident_shell.close()
+        if self.ssh_pool:
+            self.ssh_pool.close()
+
+        reconnection_engine = ReconnectionEngine(
+            name=self.name,
+            host=self.hostname,
+            confirm=lambda: not self._check_mgmt_ssh_connection_down(),
+            port=self._get_ssh_port(),
+            probe_port=self.ssh_port_probe,
+            **self.reconnection_policy,
+        )
+        try:
+            reconnection_event = reconnection_engine.wait_for_recovery()
+        finally:
+            self.rcn_active = False
+        self.reconnection_events.append(reconnection_event)
+        allure_attach_to_report(name=f"{self.name}_reconnection", body=json.dumps(reconnection_event, indent=4))
+
+        if not reconnection_event["recovered"]:
+            raise ConnectionError(
+                f"Lost connection to device, not recovered in {reconnection_event['time_to_recover']}s.",
+            )
+        log.info(f"SSH connection re-established in {reconnection_event['time_to_recover']}s.")
+        # Master connection failures while the device was unreachable do not count towards disabling the pool
+        if self.ssh_pool:
+            self.ssh_pool.reset()
 
         return True
 
+    def _run_command(
+        self,
+        cmd: str,
+        timeout: int,
+        skip_logging: bool = False,
+        script: str | None = None,
+        script_args: str = "",
+        **kwargs,
+    ) -> list:
+        """
+        Run the command on the device.
+
+        If the resident shell is enabled and the script is provided, the
+        script is executed in the resident shell. The command is executed
+        over a new SSH session if the resident shell is not usable. If the
+        resident shell fails after it has received the script, the failure
+        is reported as an SSH failure with exit code 255, so that the
+        reconnection procedure handles it instead of executing the script
+        twice.
+
+        Args:
+            cmd (str): Complete command to be executed.
+            timeout (int): Command timeout in seconds.
+            skip_logging (bool): If set to True, the logging procedure will be skipped.
+            script (str | None): Absolute path to the script, if the command
+                can be executed in the resident shell. Defaults to None.
+            script_args (str): Script arguments. Defaults to empty string.
+
+        Returns:
+            (list): Exit code (int), standard output (str) and standard error (str) of the executed command.
+        """
+        if script and self.resident_shell and not self.resident_shell.disabled:
+            try:
+                if not skip_logging:
+                    log.debug(f"[{self.name}] resident shell: {cmd}")
+                return list(self.resident_shell.run(script, script_args, timeout=timeout))
+            except ResidentShellError as exception:
+                log.warning(f"Resident shell execution failed on {self.name}: {exception}")
+                if exception.command_sent:
+                    return [255, "", str(exception)]
+        return self.run_raw(cmd, timeout=timeout, skip_logging=skip_logging, **kwargs)
+
     @allure_script_execution_post_processing
     def execute(self, path: str, args: str = "", as_sudo: bool = False, **kwargs) -> tuple[int, str, str]:
         """
@@ -490,6 +847,11 @@ class DeviceHandler:
         if isinstance(args, list):
             args = " ".join(args)
 
+        # Background and superuser executions are not supported by the resident shell
+        resident_script = None
+        if not background_execution and not as_sudo and kwargs.get("suffix", ".sh") == ".sh":
+            resident_script = self.get_remote_test_command(test_path=path, **kwargs).strip()
+
         if background_execution:
             args += " &"
 
@@ -499,8 +861,14 @@ class DeviceHandler:
             cmd = f"sudo {cmd}"
 
         timeout = self.test_script_timeout * 2 if "timeout" not in kwargs else kwargs["timeout"]
+        run_kwargs = {
+            "timeout": timeout,
+            "skip_logging": skip_logging,
+            "script": resident_script,
+            "script_args": args,
+        }
 
-        cmd_res = self.device_api.run_raw(cmd, timeout=timeout, skip_logging=skip_logging, **kwargs)
+        cmd_res = self._run_command(cmd, **run_kwargs, **kwargs)
         if cmd_res[0] == 255 and skip_rcn is False:
             if self._check_mgmt_ssh_connection_down():
                 log.info(
@@ -508,11 +876,11 @@ class DeviceHandler:
                 )
                 self._start_rcn_procedure()
                 self.check_fut_file_transfer()
-                cmd_res = self.device_api.run_raw(cmd, timeout=timeout, skip_logging=skip_logging, **kwargs)
+                cmd_res = self._run_command(cmd, **run_kwargs, **kwargs)
         elif cmd_res[0] == 127 or "command not found" in cmd_res[2] or "No such file or directory" in cmd_res[2]:
             log.info(f"Checking FUT files: {cmd_res[2]}")
             self.check_fut_file_transfer()
-            cmd_res = self.device_api.run_raw(cmd, timeout=timeout, skip_logging=skip_logging, **kwargs)
+            cmd_res = self._run_command(cmd, **run_kwargs, **kwargs)
 
         cmd_ec = cmd_res[0]
         cmd_std_out = "" if not cmd_res[1] else cmd_res[1]
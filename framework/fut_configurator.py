@@ -1,12 +1,15 @@
 import json
 import os
 import subprocess
+import threading
 from pathlib import Path
 
 import yaml
 
-from framework.generators.fut_gen import FutTestConfigGenClass
-from framework.lib.fut_lib import load_reg_rule, map_dict_key_path
+from framework.generators.fut_gen import FutTestConfigGenClass, TEST_CONFIG_CACHE_DIR
+from framework.lib.fut_lib import map_dict_key_path
+from framework.lib.fut_regulatory import get_regulatory_index
+from framework.lib.fut_transfer_scheduler import TransferScheduler
 from lib_testbed.generic.pod.pod import Pod
 from lib_testbed.generic.util.config import load_tb_config
 from lib_testbed.generic.util.logger import log
@@ -33,16 +36,30 @@ class FutConfigurator(metaclass=Singleton):
             if os.getenv("FUT_CONFIG_FROM_JSON", "False").lower() in (False, None, "false", "none", "")
             else os.getenv("FUT_CONFIG_FROM_JSON")
         )
+        self.log_stream_enabled = os.getenv("FUT_LOG_STREAM", "False").lower() in ("true", "1", "yes")
+        self.device_snapshot_enabled = os.getenv("FUT_DEVICE_SNAPSHOT_CACHE", "False").lower() in ("true", "1", "yes")
+        self.resident_shell_enabled = os.getenv("FUT_RESIDENT_SHELL", "False").lower() in ("true", "1", "yes")
+        self.ssh_pool_enabled = os.getenv("FUT_SSH_POOL", "False").lower() in ("true", "1", "yes")
+        self.test_config_cache_enabled = os.getenv("FUT_TEST_CONFIG_CACHE", "False").lower() in ("true", "1", "yes")
+        self.vif_config_reuse_enabled = os.getenv("FUT_VIF_CONFIG_REUSE", "False").lower() in ("true", "1", "yes")
+        self.transfer_scheduler = TransferScheduler(
+            max_concurrency=int(os.getenv("FUT_TRANSFER_CONCURRENCY") or 4),
+            max_bandwidth=int(os.getenv("FUT_TRANSFER_BANDWIDTH") or 0),
+        )
         self.fut_version_map = self._load_fut_version_map()
         self.fut_release_version = self._get_release_version()
         self.fut_test_hostname = "fut.opensync.io"
         self.curl_port_rate_limit = 8000
-        self.regulatory_rule = load_reg_rule()
+        self.regulatory_index = get_regulatory_index()
+        self.regulatory_rule = self.regulatory_index.rule
         self.regulatory_shell_file = self._create_regulatory_shell_file()
         self.testbed_name = os.getenv("OPENSYNC_TESTBED", self.get_testbed_name())
         self.testbed_cfg = load_tb_config(location_file=f"{self.testbed_name}.yaml", skip_deployment=True)
         self.base_ssid = f"FUT_ssid_{self.testbed_cfg['user_name']}"
         self.base_psk = f"FUT_psk_{self.testbed_cfg['user_name']}"
+        self.pod_apis: dict = {}
+        self._pod_api_lock = threading.Lock()
+        self._pod_api_locks: dict[str, threading.Lock] = {}
         self.fut_test_config_gen_cls = self._get_fut_test_config_generator()
         self.wireless_manager_names = ["wm", "owm"]
 
@@ -114,18 +131,36 @@ class FutConfigurator(metaclass=Singleton):
 
         return reg_map_shell_path
 
-    def _get_fut_test_config_generator(self) -> FutTestConfigGenClass:
-        device_obj = Pod()
-        gw_obj = device_obj.resolve_obj(**{"config": self.testbed_cfg, "nickname": "gw"})
-        leaf_obj = device_obj.resolve_obj(**{"config": self.testbed_cfg, "nickname": "l1"})
+    def get_pod_api(self, nickname: str) -> object:
+        """
+        Return the pod API of the node, resolved once per session.
+
+        The pod API objects are shared by the test configuration generator
+        and the node handlers, so the version specific interface names are
+        only resolved once for each node.
 
-        for obj in [gw_obj, leaf_obj]:
-            if hasattr(obj, "override_version_specific_ifnames"):
-                obj.override_version_specific_ifnames()
+        Args:
+            nickname (str): Node name, e.g. 'gw' or 'l1'.
 
+        Returns:
+            (obj): Pod API object.
+        """
+        # The remote resolution is serialized per node only, so different nodes are resolved concurrently
+        with self._pod_api_lock:
+            nickname_lock = self._pod_api_locks.setdefault(nickname, threading.Lock())
+        with nickname_lock:
+            if nickname not in self.pod_apis:
+                pod_api = Pod().resolve_obj(**{"config": self.testbed_cfg, "nickname": nickname})
+                if hasattr(pod_api, "override_version_specific_ifnames"):
+                    pod_api.override_version_specific_ifnames()
+                self.pod_apis[nickname] = pod_api
+            return self.pod_apis[nickname]
+
+    def _get_fut_test_config_generator(self) -> FutTestConfigGenClass:
         fut_test_config_generator = FutTestConfigGenClass(
-            gw=gw_obj,
-            leaf=leaf_obj,
+            gw=self.get_pod_api("gw"),
+            leaf=self.get_pod_api("l1"),
+            cache_dir=TEST_CONFIG_CACHE_DIR if self.test_config_cache_enabled else None,
         )
 
         return fut_test_config_generator
@@ -1,16 +1,21 @@
 import importlib.util
 import sys
 from itertools import product
+from operator import itemgetter
 from pathlib import Path
+from typing import Callable
 
 from config.defaults import all_pytest_flags, channel_keywords, radio_band_keywords, radio_band_list
-from framework.lib.fut_lib import load_reg_rule, validate_channel_ht_mode_band
+from framework.lib.fut_regulatory import channels_to_mask, get_regulatory_index
 from lib_testbed.generic.pod.generic.pod_api import PodApi
 from lib_testbed.generic.util.logger import log
 
 fut_base_dir = Path(__file__).absolute().parents[2].as_posix()
 sys.path.append(fut_base_dir)
 
+# Order in which the radio parameter filters are evaluated
+wifi_params_filters = ("bands", "bandwidths", "regulatory", "unii_4")
+
 generator_modules = []
 generator_dir = "framework/generators"
 generator_mod = generator_dir.replace("/", ".")
@@ -33,7 +38,8 @@ class DefaultGenClass:
         self.gw = gw
         self.leaf = leaf
         self.regulatory_domain = self.gw.capabilities.get_regulatory_domain()
-        self.regulatory_rule = load_reg_rule()
+        self.regulatory_index = get_regulatory_index()
+        self.regulatory_rule = self.regulatory_index.rule
         attributes_to_add = []
         for gen_key in dir(self):
             if not gen_key.startswith("__") and not gen_key.endswith("__"):
@@ -82,15 +88,50 @@ class DefaultGenClass:
         channel_supported = channel in channels
         if not channel_supported:
             log.debug(f"Radio band {band} is not compatible with device")
-        channel_ht_mode_band_regulatory_compliant = validate_channel_ht_mode_band(
+        channel_ht_mode_band_regulatory_compliant = self.regulatory_index.is_compliant(
             channel,
-            radio_band=band,
-            ht_mode=ht_mode,
-            reg_domain=self.regulatory_domain,
-            regulatory_rule=self.regulatory_rule,
+            ht_mode,
+            band,
+            self.regulatory_domain,
         )
         return channel_supported and channel_ht_mode_band_regulatory_compliant
 
+    def _get_regulatory_compliance(self, rows: dict[str, set]) -> dict[tuple, bool]:
+        """
+        Verify the device support and the regulatory compliance of the distinct radio parameter rows.
+
+        The rows of each device are verified with a single call to the regulatory index, with the channels supported
+        by the device as the additional constraint, which gives the same result as _check_band_channel_compatible().
+
+        Args:
+            rows (dict): Sets of (channel, ht_mode, radio_band) tuples, keyed by the device name.
+
+        Returns:
+            (dict): True for the compatible rows, False otherwise, keyed by the (device, channel, ht_mode, radio_band)
+                tuple.
+        """
+        compliance = {}
+        for device, device_rows in rows.items():
+            device_rows = list(device_rows)
+            supported_channel_masks = {}
+            for radio_band in {row[2] for row in device_rows}:
+                try:
+                    channels = self.__getattribute__(device).capabilities.get_supported_radio_channels(
+                        freq_band=radio_band,
+                    )
+                except AttributeError:
+                    channels = None
+                supported_channel_masks[radio_band] = channels_to_mask(
+                    channel for channel in channels or [] if isinstance(channel, int) and channel >= 0
+                )
+            compliant_rows = self.regulatory_index.compliant_rows(
+                device_rows,
+                self.regulatory_domain,
+                allowed_masks=supported_channel_masks,
+            )
+            compliance.update({(device, *row): compliant for row, compliant in zip(device_rows, compliant_rows)})
+        return compliance
+
     def get_if_name_type_from_if_role(self, if_role: str, radio_band: str | None = None) -> list[tuple[str]]:
         """
         Return the interface type and name from the interface role and optionally the radio band for VIFs.
@@ -275,138 +316,168 @@ class DefaultGenClass:
             inputs["inputs"][idx].insert(encryption_index, encryption)
         return inputs
 
-    def _filter_device_incompatible_bands(self, inputs: dict) -> dict:
-        """Filter out inputs where radio_band is set and not supported by the device."""
+    @staticmethod
+    def _memoized_check(cache: dict, check: Callable, *args, **kwargs) -> bool:
+        """Return the result of the check, evaluating it only once for each distinct set of arguments."""
+        key = (check.__name__, args, tuple(kwargs.items()))
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = check(*args, **kwargs)
+            return result
+        except TypeError:
+            # Unhashable arguments are not memoized
+            return check(*args, **kwargs)
+
+    def _filter_wifi_params(self, inputs: dict, filters: tuple[str, ...] = wifi_params_filters) -> dict:
+        """
+        Filter out inputs with radio parameters not supported by the device or by the regulatory domain.
+
+        All selected filters are evaluated in a single pass over the inputs. Column indexes are resolved once per test
+        case and the results of the device and regulatory checks are memoized, because the number of distinct radio
+        parameter combinations is small compared to the number of inputs.
+
+        Filters:
+            bands: radio_band is not supported by the device.
+            bandwidths: ht_mode is not supported by the device.
+            regulatory: channel, ht_mode and radio_band are not supported by the device or the regulatory domain.
+            unii_4: UNII-4 channel combinations, for devices that do not support them.
+
+        Args:
+            inputs (dict): Test case inputs.
+            filters (tuple): Names of the filters to apply. Defaults to all filters.
+
+        Returns:
+            inputs (dict): Test case inputs without the incompatible inputs.
+        """
+        if "unii_4" in filters and self._check_unii_4_capable():
+            filters = tuple(name for name in filters if name != "unii_4")
         if "args_mapping" not in inputs:
             return inputs
-        if set(radio_band_keywords).isdisjoint(inputs["args_mapping"]):
+        args_mapping = inputs["args_mapping"]
+        if set(radio_band_keywords).isdisjoint(args_mapping):
             return inputs
+        if set(channel_keywords).isdisjoint(args_mapping):
+            filters = tuple(name for name in filters if name not in ("regulatory", "unii_4"))
+        if not filters:
+            return inputs
+
+        # Resolve column indexes once: (radio band index, channel key, channel index, device)
+        ht_mode_index = args_mapping.index("ht_mode") if "ht_mode" in args_mapping else None
+        columns = []
+        for radio_band_key in set(radio_band_keywords).intersection(args_mapping):
+            channel_key = f"{radio_band_key.removesuffix('radio_band')}channel"
+            channel_index = args_mapping.index(channel_key) if channel_key in args_mapping else None
+            device = "leaf" if radio_band_key.removesuffix("_radio_band") in ["leaf", "l1", "l2"] else "gw"
+            columns.append((args_mapping.index(radio_band_key), channel_key, channel_index, device))
+
+        check_cache = {}
+        # The regulatory compliance of all distinct radio parameter rows is verified in one batch per device
+        regulatory_compliance = {}
+        if "regulatory" in filters:
+            regulatory_rows: dict[str, set] = {}
+            for single_input in inputs["inputs"]:
+                ht_mode = "HT20" if ht_mode_index is None else single_input[ht_mode_index]
+                for radio_band_index, _, channel_index, device in columns:
+                    if channel_index is None:
+                        continue
+                    row = (single_input[channel_index], ht_mode, single_input[radio_band_index])
+                    if None in row:
+                        continue
+                    try:
+                        regulatory_rows.setdefault(device, set()).add(row)
+                    except TypeError:
+                        # Unhashable parameters are verified individually
+                        continue
+            regulatory_compliance = self._get_regulatory_compliance(regulatory_rows)
+
+        def is_compatible(single_input: list) -> bool:
+            ht_mode = "HT20" if ht_mode_index is None else single_input[ht_mode_index]
+            for name in filters:
+                for radio_band_index, channel_key, channel_index, device in columns:
+                    radio_band = single_input[radio_band_index]
+                    if name == "bands":
+                        if radio_band is not None and not self._memoized_check(
+                            check_cache,
+                            self._check_band_compatible,
+                            radio_band,
+                            device,
+                        ):
+                            return False
+                        continue
+                    if name == "bandwidths":
+                        if None in [radio_band, ht_mode]:
+                            continue
+                        if not self._memoized_check(
+                            check_cache,
+                            self._check_ht_mode_band_support,
+                            radio_band=radio_band,
+                            ht_mode=ht_mode,
+                        ):
+                            return False
+                        continue
+                    if channel_index is None:
+                        raise ValueError(f"'{channel_key}' is not in list")
+                    channel = single_input[channel_index]
+                    if None in [radio_band, channel, ht_mode]:
+                        continue
+                    if name == "regulatory":
+                        try:
+                            compliant = regulatory_compliance[(device, channel, ht_mode, radio_band)]
+                        except (KeyError, TypeError):
+                            compliant = self._check_band_channel_compatible(
+                                radio_band,
+                                channel,
+                                device,
+                                ht_mode=ht_mode,
+                            )
+                        if not compliant:
+                            return False
+                    elif name == "unii_4":
+                        if radio_band in ["5g", "5gu"] and (
+                            channel in [169, 173, 177, 181]
+                            or (channel == 165 and ht_mode != "HT20")
+                            or (channel in [149, 153, 157, 161] and ht_mode == "HT160")
+                        ):
+                            return False
+            return True
+
+        # Inputs often differ only in parameters not relevant to the filters, so the result is memoized per input
+        radio_params_indexes = [index for column in columns for index in (column[0], column[2]) if index is not None]
+        if ht_mode_index is not None:
+            radio_params_indexes.append(ht_mode_index)
+        get_radio_params = itemgetter(*radio_params_indexes)
+        input_cache = {}
         tmp_inputs = []
-        radio_band_keys = set(radio_band_keywords).intersection(inputs["args_mapping"])
         for single_input in inputs["inputs"]:
-            compatibility_condition = True
-            for radio_band_key in radio_band_keys:
-                radio_band_index = inputs["args_mapping"].index(radio_band_key)
-                radio_band = single_input[radio_band_index]
-                device = "leaf" if radio_band_key.removesuffix("_radio_band") in ["leaf", "l1", "l2"] else "gw"
-                band_compatible = self._check_band_compatible(radio_band, device)
-                if radio_band is not None and not band_compatible:
-                    compatibility_condition = False
-                    continue
-            if compatibility_condition:
+            try:
+                radio_params = get_radio_params(single_input)
+                compatible = input_cache.get(radio_params)
+                if compatible is None:
+                    compatible = input_cache[radio_params] = is_compatible(single_input)
+            except TypeError:
+                # Unhashable parameters are not memoized
+                compatible = is_compatible(single_input)
+            if compatible:
                 tmp_inputs.append(single_input)
         inputs["inputs"] = tmp_inputs
         return inputs
 
+    def _filter_device_incompatible_bands(self, inputs: dict) -> dict:
+        """Filter out inputs where radio_band is set and not supported by the device."""
+        return self._filter_wifi_params(inputs, filters=("bands",))
+
     def _filter_device_incompatible_bandwidths(self, inputs: dict) -> dict:
         """Filter out inputs where ht_mode is not supported by the device."""
-        if "args_mapping" not in inputs:
-            return inputs
-        if set(radio_band_keywords).isdisjoint(inputs["args_mapping"]):
-            return inputs
-        tmp_inputs = []
-        radio_band_keys = set(radio_band_keywords).intersection(inputs["args_mapping"])
-        for single_input in inputs["inputs"]:
-            compatibility_condition = True
-            for radio_band_key in radio_band_keys:
-                radio_band_index = inputs["args_mapping"].index(radio_band_key)
-                radio_band = single_input[radio_band_index]
-                ht_mode = "HT20"
-                if "ht_mode" in inputs["args_mapping"]:
-                    ht_mode_index = inputs["args_mapping"].index("ht_mode")
-                    ht_mode = single_input[ht_mode_index]
-                ht_mode_supported = self._check_ht_mode_band_support(radio_band=radio_band, ht_mode=ht_mode)
-                if None in [radio_band, ht_mode]:
-                    """if any of the provided parameters is None, skip this check"""
-                    pass
-                elif not ht_mode_supported:
-                    compatibility_condition = False
-                    continue
-            if compatibility_condition:
-                tmp_inputs.append(single_input)
-        inputs["inputs"] = tmp_inputs
-        return inputs
+        return self._filter_wifi_params(inputs, filters=("bandwidths",))
 
     def _filter_regulatory_incompatible_wifi_params(self, inputs: dict) -> dict:
         """Filter out inputs where ht_mode is not supported by the device."""
-        if "args_mapping" not in inputs:
-            return inputs
-        if set(radio_band_keywords).isdisjoint(inputs["args_mapping"]):
-            return inputs
-        if set(channel_keywords).isdisjoint(inputs["args_mapping"]):
-            return inputs
-        tmp_inputs = []
-        radio_band_keys = set(radio_band_keywords).intersection(inputs["args_mapping"])
-        for single_input in inputs["inputs"]:
-            compatibility_condition = True
-            for radio_band_key in radio_band_keys:
-                radio_band_index = inputs["args_mapping"].index(radio_band_key)
-                radio_band = single_input[radio_band_index]
-                channel_prefix = radio_band_key.removesuffix("radio_band")
-                channel_key = f"{channel_prefix}channel"
-                channel_index = inputs["args_mapping"].index(channel_key)
-                channel = single_input[channel_index]
-                device = "leaf" if radio_band_key.removesuffix("_radio_band") in ["leaf", "l1", "l2"] else "gw"
-                ht_mode = "HT20"
-                if "ht_mode" in inputs["args_mapping"]:
-                    ht_mode_index = inputs["args_mapping"].index("ht_mode")
-                    ht_mode = single_input[ht_mode_index]
-                channel_ht_mode_band_regulatory_compliant = self._check_band_channel_compatible(
-                    radio_band,
-                    channel,
-                    device,
-                    ht_mode=ht_mode,
-                )
-                if None in [radio_band, channel, ht_mode]:
-                    """if any of the provided parameters is None, skip this check"""
-                    pass
-                elif not channel_ht_mode_band_regulatory_compliant:
-                    compatibility_condition = False
-                    continue
-            if compatibility_condition:
-                tmp_inputs.append(single_input)
-        inputs["inputs"] = tmp_inputs
-        return inputs
+        return self._filter_wifi_params(inputs, filters=("regulatory",))
 
     def _remove_unii_4(self, inputs: dict) -> dict:
         """Remove combinations for UNII-4 channels for devices that do not support them."""
-        if self._check_unii_4_capable():
-            return inputs
-        if "args_mapping" not in inputs:
-            return inputs
-        if set(radio_band_keywords).isdisjoint(inputs["args_mapping"]):
-            return inputs
-        if set(channel_keywords).isdisjoint(inputs["args_mapping"]):
-            return inputs
-        tmp_inputs = []
-        radio_band_keys = set(radio_band_keywords).intersection(inputs["args_mapping"])
-        for single_input in inputs["inputs"]:
-            compatibility_condition = True
-            for radio_band_key in radio_band_keys:
-                radio_band_index = inputs["args_mapping"].index(radio_band_key)
-                radio_band = single_input[radio_band_index]
-                channel_prefix = radio_band_key.removesuffix("radio_band")
-                channel_key = f"{channel_prefix}channel"
-                channel_index = inputs["args_mapping"].index(channel_key)
-                channel = single_input[channel_index]
-                ht_mode = "HT20"
-                if "ht_mode" in inputs["args_mapping"]:
-                    ht_mode_index = inputs["args_mapping"].index("ht_mode")
-                    ht_mode = single_input[ht_mode_index]
-                if None in [radio_band, channel, ht_mode]:
-                    """if any of the provided parameters is None, skip this check"""
-                    pass
-                elif radio_band in ["5g", "5gu"] and (
-                    channel in [169, 173, 177, 181]
-                    or (channel == 165 and ht_mode != "HT20")
-                    or (channel in [149, 153, 157, 161] and ht_mode == "HT160")
-                ):
-                    compatibility_condition = False
-                    continue
-            if compatibility_condition:
-                tmp_inputs.append(single_input)
-        inputs["inputs"] = tmp_inputs
-        return inputs
+        return self._filter_wifi_params(inputs, filters=("unii_4",))
 
     def _ignore_test_cases(self, inputs: dict) -> dict:
         """Ignore test cases when the inputs contain the 'ignore' key."""
@@ -494,10 +565,7 @@ class DefaultGenClass:
             inputs = self._inputs_int_or_str_to_list(inputs)
             inputs = self._expand_permutations(inputs)
             inputs = self._implicit_insert_encryption(inputs)
-            inputs = self._filter_device_incompatible_bands(inputs)
-            inputs = self._filter_device_incompatible_bandwidths(inputs)
-            inputs = self._filter_regulatory_incompatible_wifi_params(inputs)
-            inputs = self._remove_unii_4(inputs)
+            inputs = self._filter_wifi_params(inputs)
             inputs = self._ignore_test_cases(inputs)
             inputs = self._do_args_mapping(inputs)
             configs = self._unpack_default_values(inputs)
@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 
+import hashlib
 import importlib.util
+import json
+import os
+import pickle
 import sys
+import tempfile
 from pathlib import Path
 
 from mergedeep import merge, Strategy
@@ -14,14 +19,28 @@ from lib_testbed.generic.util.logger import log
 fut_base_dir = Path(__file__).absolute().parents[2].as_posix()
 sys.path.append(fut_base_dir)
 
+TEST_CONFIG_CACHE_DIR = f"{fut_base_dir}/.fut_cache/test_config"
+# Paths relative to the FUT base directory, which affect the generated test configuration
+TEST_CONFIG_CACHE_SOURCES = [
+    "config/test_case",
+    "internal/config/test_case",
+    "config/rules/regulatory.yaml",
+    "config/defaults.py",
+    "framework/generators",
+    "framework/lib/fut_lib.py",
+    "framework/lib/fut_regulatory.py",
+]
+TEST_CONFIG_CACHE_MAX_ENTRIES = 10
+
 
 class FutTestConfigGenClass:
-    def __init__(self, gw: "PodApi", leaf: "PodApi", modules=None, test_list=None):
+    def __init__(self, gw: "PodApi", leaf: "PodApi", modules=None, test_list=None, cache_dir=None):
         self.fut_base_dir = fut_base_dir
         self.gw = gw
         self.leaf = leaf
         self.modules = modules
         self.test_list = test_list
+        self.cache_dir = cache_dir
         self.test_generators = DefaultGenClass(
             gw=self.gw,
             leaf=self.leaf,
@@ -133,6 +152,90 @@ class FutTestConfigGenClass:
                 combined_configs[test_name] = test_gen(all_inputs.get(test_name))
         return combined_configs
 
+    def get_cache_key(self) -> str | None:
+        """
+        Return the key of the generated test configuration in the cache.
+
+        The key is the hash of the content of all test case input files,
+        the regulatory rules, the generator sources, the gw and leaf
+        device capabilities and the module and test filters.
+
+        Returns:
+            (str | None): Cache key or None if the device capabilities are not available.
+        """
+        key_hash = hashlib.sha256()
+        for device in [self.gw, self.leaf]:
+            device_capabilities = getattr(device.capabilities, "device_capabilities", None)
+            if device_capabilities is None:
+                return None
+            key_hash.update(str(device.model).encode())
+            key_hash.update(json.dumps(device_capabilities, sort_keys=True, default=str).encode())
+        key_hash.update(json.dumps([self.modules, self.test_list], sort_keys=True).encode())
+        for source in TEST_CONFIG_CACHE_SOURCES:
+            source_path = Path(self.fut_base_dir).joinpath(source)
+            source_files = sorted(source_path.rglob("*")) if source_path.is_dir() else [source_path]
+            for source_file in source_files:
+                if not source_file.is_file() or source_file.suffix not in (".py", ".yaml"):
+                    continue
+                key_hash.update(source_file.relative_to(self.fut_base_dir).as_posix().encode())
+                key_hash.update(hashlib.sha256(source_file.read_bytes()).digest())
+        return key_hash.hexdigest()
+
+    def _load_cached_configs(self, cache_key: str) -> dict | None:
+        """
+        Load the generated test configuration from the cache.
+
+        Args:
+            cache_key (str): Cache key of the test configuration.
+
+        Returns:
+            (dict | None): Test configuration or None if it is not cached.
+        """
+        cache_file = Path(self.cache_dir).joinpath(f"{cache_key}.pickle")
+        try:
+            with open(cache_file, "rb") as cache_fd:
+                cached_configs = pickle.load(cache_fd)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError) as exception:
+            log.warning(f"Failed to load cached test configuration {cache_file}: {exception}")
+            return None
+        log.debug(f"Loaded cached test configuration: {cache_file}")
+        return cached_configs
+
+    def _store_cached_configs(self, cache_key: str, configs: dict) -> None:
+        """
+        Store the generated test configuration into the cache.
+
+        The file is written atomically, so concurrent sessions never read
+        a partially written file. Only the most recent cache entries are
+        kept.
+
+        Args:
+            cache_key (str): Cache key of the test configuration.
+            configs (dict): Generated test configuration.
+        """
+        cache_dir = Path(self.cache_dir)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("wb", dir=cache_dir, suffix=".tmp", delete=False) as tmp_fd:
+                pickle.dump(configs, tmp_fd)
+            os.replace(tmp_fd.name, cache_dir.joinpath(f"{cache_key}.pickle"))
+            cache_files = sorted(cache_dir.glob("*.pickle"), key=lambda cache_file: cache_file.stat().st_mtime)
+            for stale_file in cache_files[:-TEST_CONFIG_CACHE_MAX_ENTRIES]:
+                stale_file.unlink(missing_ok=True)
+        except (OSError, pickle.PicklingError) as exception:
+            log.warning(f"Failed to store test configuration in cache {cache_dir}: {exception}")
+            return
+        log.debug(f"Stored test configuration in cache: {cache_dir}/{cache_key}.pickle")
+
+    def clear_cache(self) -> None:
+        """Remove all cached test configurations, other files in the cache directory are kept."""
+        if self.cache_dir and Path(self.cache_dir).is_dir():
+            log.info(f"Removing test configuration cache entries: {self.cache_dir}")
+            for cache_file in Path(self.cache_dir).glob("*.pickle"):
+                cache_file.unlink(missing_ok=True)
+
     def get_all_inputs(self):
         if self.all_inputs is None:
             self.all_inputs = self._load_all_inputs()
@@ -140,7 +243,13 @@ class FutTestConfigGenClass:
 
     def get_test_configs(self):
         if self.combined_configs is None:
-            self.combined_configs = self._generate_config_from_inputs()
+            cache_key = self.get_cache_key() if self.cache_dir else None
+            if cache_key:
+                self.combined_configs = self._load_cached_configs(cache_key)
+            if self.combined_configs is None:
+                self.combined_configs = self._generate_config_from_inputs()
+                if cache_key:
+                    self._store_cached_configs(cache_key, self.combined_configs)
         return self.combined_configs
 
 
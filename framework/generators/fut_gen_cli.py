@@ -6,7 +6,7 @@ import os
 import sys
 from pathlib import Path
 
-from fut_gen import FutTestConfigGenClass
+from fut_gen import FutTestConfigGenClass, TEST_CONFIG_CACHE_DIR
 
 from lib_testbed.generic.pod.pod import Pod
 from lib_testbed.generic.util.config import load_tb_config
@@ -24,6 +24,7 @@ def parse_arguments():
 
     Example of usage:
     python3 fut_gen.py -j test.config.json
+    python3 fut_gen.py --warm-cache
     """
     parser = argparse.ArgumentParser(
         description=tool_description,
@@ -63,7 +64,28 @@ def parse_arguments():
         nargs="+",
         help="Output test configuration for given test name(s)",
     )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Store the generated test configuration in the test configuration cache,\n"
+        "used by the test sessions when FUT_TEST_CONFIG_CACHE is enabled.\n"
+        "Not supported with the --modules and --test options, as the test sessions read the full configuration",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove all entries from the test configuration cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        required=False,
+        default=TEST_CONFIG_CACHE_DIR,
+        type=str,
+        help=f"Test configuration cache directory (default: {TEST_CONFIG_CACHE_DIR})",
+    )
     input_args = parser.parse_args()
+    if input_args.warm_cache and (input_args.modules or input_args.test):
+        parser.error("--warm-cache can not be combined with --modules or --test")
     return input_args
 
 
@@ -95,8 +117,17 @@ if __name__ == "__main__":
         leaf=leaf_obj,
         modules=opts.modules,
         test_list=opts.test,
+        cache_dir=opts.cache_dir if opts.warm_cache or opts.clear_cache else None,
     )
+    if opts.clear_cache:
+        test_config_obj.clear_cache()
+        if not opts.warm_cache:
+            sys.exit(0)
     gen_test_cfg = test_config_obj.get_test_configs()
+    if opts.warm_cache:
+        print(f"Test configuration cache key: {test_config_obj.get_cache_key()}")
+        if not opts.json:
+            sys.exit(0)
     out_filename = f"{gw_obj.model}_{leaf_obj.model}" if not opts.json else opts.json
     modules_str = f"_{'_'.join(opts.modules)}" if opts.modules else ""
     write_json_to_file(json_data=gen_test_cfg, filename=f"{out_filename}{modules_str}_gen.json")
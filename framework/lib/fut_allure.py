@@ -2,6 +2,9 @@ import glob
 import json
 import os
 import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Callable
 
@@ -11,6 +14,9 @@ from lib_testbed.generic.pytest_plugins.allure_environment import get_osrt_snaps
 from lib_testbed.generic.util.allure_util import AllureUtil
 from lib_testbed.generic.util.logger import log
 
+# Encoder of the parameter values, independent of the order of the dictionary keys
+_canonical_json_encoder = json.JSONEncoder(sort_keys=True, default=str)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def allure_environment(request, setup):
@@ -58,29 +64,180 @@ def allure_environment(request, setup):
                 AllureUtil(cfg).add_environment("osrt_snapshot", snapshot)
 
 
+def _link_or_copy(src_path: str, dst_path: str) -> None:
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+
 def _create_backup_dir(src_path: str) -> None:
+    """
+    Create a backup of the results directory next to it.
+
+    Files are hardlinked instead of copied, falling back to a copy if the
+    file system does not support hardlinks. Result files are only ever
+    removed from the original directory, never modified in place, so the
+    backup keeps the original content.
+
+    Args:
+        src_path (str): Path of the directory to back up.
+    """
     try:
         dst_path = Path(src_path).parent.joinpath(f"{Path(src_path).name}_bak")
-        shutil.copytree(src_path, dst_path)
-        print(f"Directory '{src_path}' successfully copied to '{dst_path}'.")
+        shutil.copytree(src_path, dst_path, copy_function=_link_or_copy)
+        print(f"Directory '{src_path}' successfully backed up to '{dst_path}'.")
     except shutil.Error as exception:
         raise exception(f"Error copying directory: {exception}")
 
 
-def search_files(directory: str, search_strings: list[str]) -> list[str]:
-    matching_files = []
-    # Iterate over files in the target directory
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if not file.endswith("-result.json"):
+def merge_result_dirs(source_directories: list[str], destination_directory: str) -> None:
+    """
+    Merge the results directories of several test runs into a single results directory.
+
+    Result, container and attachment files have unique names, so they are
+    hardlinked or copied as they are. The values of the environment
+    properties which differ between the runs are joined with a comma.
+
+    Args:
+        source_directories (list): Paths of the results directories.
+        destination_directory (str): Path of the merged results directory.
+    """
+    os.makedirs(destination_directory, exist_ok=True)
+    environment: dict[str, list[str]] = {}
+    for source_directory in source_directories:
+        if not os.path.isdir(source_directory):
+            log.warning(f"Results directory {source_directory} does not exist")
+            continue
+        for file_name in sorted(os.listdir(source_directory)):
+            src_path = os.path.join(source_directory, file_name)
+            if not os.path.isfile(src_path):
+                continue
+            if file_name == "environment.properties":
+                with open(src_path) as environment_file:
+                    for line in environment_file.read().splitlines():
+                        key, separator, value = line.partition("=")
+                        if separator and value not in environment.setdefault(key, []):
+                            environment[key].append(value)
                 continue
-            file_path = os.path.join(root, file)
-            if any(search_string in open(file_path).read() for search_string in search_strings):
-                matching_files.append(file_path)
-    return matching_files
+            dst_path = os.path.join(destination_directory, file_name)
+            if not os.path.exists(dst_path):
+                _link_or_copy(src_path, dst_path)
+    if environment:
+        with open(os.path.join(destination_directory, "environment.properties"), "w") as environment_file:
+            environment_file.writelines(f"{key}={','.join(values)}\n" for key, values in environment.items())
+
+
+def _parse_result_file(file_path: str) -> tuple[str, str | None, dict | None]:
+    try:
+        with open(file_path, "r") as res_file:
+            result = json.load(res_file)
+    except (OSError, ValueError):
+        return file_path, None, None
+    if not isinstance(result, dict):
+        return file_path, None, None
+    try:
+        data = data_from_results(result)
+    except (AssertionError, IndexError, TypeError):
+        data = None
+    return file_path, result.get("name"), data
+
 
+class ResultStore:
+    """
+    Index of the pytest result files in the results directory.
+
+    Each '*-result.json' file in the directory tree is parsed exactly once.
+    Large directories are parsed in parallel worker processes. The index
+    maps the test name to the result files of the test, and holds the data
+    extracted from the top level result files by the data_from_results
+    function.
 
-def create_processed_results(source_directory: str, removed_entries: list, create_backup: bool = True) -> None:
+    Args:
+        source_directory (str): Path of the results directory.
+        max_workers (int | None): Maximum number of worker processes.
+            Defaults to None, which means the number of processors.
+    """
+
+    # Smaller directories are parsed in the current process, as starting the worker processes takes longer
+    parallel_min_files = 500
+
+    def __init__(self, source_directory: str, max_workers: int | None = None):
+        self.source_directory = source_directory
+        self.max_workers = max_workers
+        self.name_index: dict[str, list[str]] = {}
+        self.results_data: dict[str, dict] = {}
+        self._load()
+
+    def _get_result_files(self) -> list[str]:
+        result_files = []
+        for root, _, files in os.walk(self.source_directory):
+            result_files.extend(os.path.join(root, file) for file in files if file.endswith("-result.json"))
+        return sorted(result_files)
+
+    def _load(self) -> None:
+        result_files = self._get_result_files()
+        if len(result_files) < self.parallel_min_files:
+            parsed_files = map(_parse_result_file, result_files)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                parsed_files = list(executor.map(_parse_result_file, result_files, chunksize=64))
+        top_level_directory = os.path.normpath(self.source_directory)
+        for file_path, name, data in parsed_files:
+            if name is not None:
+                self.name_index.setdefault(name, []).append(file_path)
+            is_top_level = os.path.dirname(file_path) == top_level_directory
+            if data is not None and is_top_level and fnmatch(os.path.basename(file_path), "[0-9a-f-]*-result.json"):
+                self.results_data[file_path] = data
+
+    def get_results_data(self) -> list[dict]:
+        """
+        Return the data extracted from the top level result files.
+
+        Returns:
+            (list): A list containing the filtered data
+        """
+        return list(self.results_data.values())
+
+    def get_files(self, test_names: list[str]) -> list[str]:
+        """
+        Return the result files of the provided tests.
+
+        Args:
+            test_names (list): Names of the tests.
+
+        Returns:
+            (list): Paths of the result files.
+        """
+        return [
+            file_path for test_name in dict.fromkeys(test_names) for file_path in self.name_index.get(test_name, [])
+        ]
+
+    def remove_files(self, file_paths: list[str]) -> None:
+        """
+        Remove the result files from the results directory and from the index.
+
+        Args:
+            file_paths (list): Paths of the result files.
+        """
+        removed_file_paths = set(file_paths)
+        for file_path in removed_file_paths:
+            Path(file_path).unlink(missing_ok=True)
+            self.results_data.pop(file_path, None)
+        for test_name, test_file_paths in list(self.name_index.items()):
+            remaining_file_paths = [file_path for file_path in test_file_paths if file_path not in removed_file_paths]
+            if remaining_file_paths:
+                self.name_index[test_name] = remaining_file_paths
+            else:
+                del self.name_index[test_name]
+
+
+def create_processed_results(
+    source_directory: str,
+    removed_entries: list,
+    create_backup: bool = True,
+    result_store: ResultStore | None = None,
+) -> None:
     """
     Process the test results directory based on the provided entries to be removed.
 
@@ -88,17 +245,18 @@ def create_processed_results(source_directory: str, removed_entries: list, creat
         source_directory (str): Path of the source directory containing the results to be processed
         removed_entries (list): A list of tests from the current run that should be removed based on the status from the reference run
         create_backup (bool): Create a backup of the original results before modifying them
+        result_store (ResultStore | None): Index of the source directory, if already loaded
     """
     if create_backup:
         _create_backup_dir(source_directory)
 
+    if result_store is None:
+        result_store = ResultStore(source_directory)
     test_names = [test.get("name") for test in removed_entries]
-    matching_files = search_files(source_directory, test_names)
+    matching_files = result_store.get_files(test_names)
     try:
         assert len(matching_files) == len(removed_entries)
-        for file in matching_files:
-            if Path(file).is_file():
-                Path(file).unlink(missing_ok=False)
+        result_store.remove_files(matching_files)
     except AssertionError:
         print(
             f"Number of entries to be removed ({len(removed_entries)}): {removed_entries} is not the same as the number of files containing these entries ({len(matching_files)}): {matching_files}.",
@@ -153,7 +311,7 @@ def read_data_from_report(source_directory: str) -> list:
 
 
 def read_data_from_results(source_directory: str) -> list:
-    res_data = read_json_data_from_files(source_directory, "[0-9a-f-]*-result.json", None, data_from_results)
+    res_data = ResultStore(source_directory).get_results_data()
     return res_data
 
 
@@ -194,10 +352,32 @@ def read_json_data_from_files(
     return res_data
 
 
+def get_alignment_key(test: dict) -> tuple[str, str]:
+    """
+    Return the key used to align the test between the test runs.
+
+    The key is the test name without the parametrization suffix and the
+    canonical form of the parameter values, which does not depend on the
+    order of the dictionary keys.
+
+    Args:
+        test (dict): Filtered data of a single test.
+
+    Returns:
+        (tuple): Base test name and canonical parameter values.
+    """
+    return test["name"].split("[")[0], _canonical_json_encoder.encode(test.get("parameterValues"))
+
+
 def results_alignment(current_data: list, reference_data: list) -> tuple[list, list, list]:
     """
     Align the current data to the reference data in terms of name and parameter values.
 
+    The reference tests are indexed by the alignment key, so the alignment
+    takes linear time. Tests with duplicate keys are matched in the order
+    of the sorted test names: each current test is matched to the first
+    reference test with the same key, which was not yet matched.
+
     Args:
         current_data (list): A list containing the filtered data from the current test run
         reference_data (list): A list containing the filtered data from the reference test run
@@ -210,35 +390,31 @@ def results_alignment(current_data: list, reference_data: list) -> tuple[list, l
     sorted_current_data = sorted(current_data, key=lambda test: test["name"])
     sorted_reference_data = sorted(reference_data, key=lambda test: test["name"])
 
+    reference_index = {}
+    for ref_idx, ref_test in enumerate(sorted_reference_data):
+        reference_index.setdefault(get_alignment_key(ref_test), deque()).append(ref_idx)
+
     common_entries = []
     current_data_specific_entries = []
-    # shallow copy is enough, since items should not be changed, only popped
-    reference_data_specific_entries = sorted_reference_data[:]
+    matched_reference_indices = set()
     for test_case in sorted_current_data:
-        test_name = test_case["name"].split("[")[0]
-        parameterValues = test_case.get("parameterValues")
-        name_ref = None
-        status_ref = None
-        for ref_idx, ref_test in enumerate(reference_data_specific_entries):
-            if not all(
-                [ref_test["name"].split("[")[0] == test_name, ref_test.get("parameterValues") == parameterValues],
-            ):
-                continue
-            name_ref = ref_test.get("name")
-            status_ref = ref_test.get("status")
-            if len(reference_data_specific_entries) > 0:
-                reference_data_specific_entries.pop(ref_idx)
-            break
-        item_out = {
-            **test_case,
-            "name_ref": name_ref,
-            "status_ref": status_ref,
-        }
+        ref_indices = reference_index.get(get_alignment_key(test_case))
+        if not ref_indices:
+            current_data_specific_entries.append(test_case)
+            continue
+        ref_idx = ref_indices.popleft()
+        matched_reference_indices.add(ref_idx)
+        ref_test = sorted_reference_data[ref_idx]
+        name_ref = ref_test.get("name")
+        status_ref = ref_test.get("status")
         if name_ref is None or status_ref is None:
             current_data_specific_entries.append(test_case)
         else:
-            common_entries.append(item_out)
+            common_entries.append({**test_case, "name_ref": name_ref, "status_ref": status_ref})
 
+    reference_data_specific_entries = [
+        ref_test for ref_idx, ref_test in enumerate(sorted_reference_data) if ref_idx not in matched_reference_indices
+    ]
     return current_data_specific_entries, reference_data_specific_entries, common_entries
 
 
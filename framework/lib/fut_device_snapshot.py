@@ -0,0 +1,118 @@
+"""
+FUT device snapshot.
+
+This module contains the persisted snapshot of the device properties,
+which can not change without flashing new firmware on the device, for
+example the kconfig file and the wireless manager name. Device settings,
+such as the regulatory domain, are not part of the snapshot. The
+snapshot is keyed by the device serial number and is only valid for the
+firmware version it was recorded on, so the device handler validates it
+with the single version query it performs anyway, and skips the
+remaining queries for the properties in the snapshot.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from lib_testbed.generic.util.logger import log
+
+DEVICE_SNAPSHOT_CACHE_DIR = Path(__file__).absolute().parents[2].joinpath(".fut_cache", "device_snapshot").as_posix()
+# Snapshots with a different format version are discarded
+DEVICE_SNAPSHOT_FORMAT = 1
+
+
+class DeviceSnapshot:
+    """
+    Snapshot of the device properties which are constant for the firmware version.
+
+    Without the cache directory or the device serial number, the snapshot
+    is neither loaded nor stored, so each property is queried once per
+    device handler, as before.
+
+    Args:
+        serial (str | None): Device serial number.
+        model (str): Device model.
+        version (str): Firmware version reported by the device.
+        cache_dir (str | None): Directory of the persisted snapshots. Defaults to None, which disables persistence.
+    """
+
+    def __init__(self, serial: str | None, model: str, version: str, cache_dir: str | None = None):
+        self.serial = serial
+        self.model = model
+        self.version = version
+        self.snapshot_file = None
+        if cache_dir and serial:
+            safe_serial = "".join(char if char.isalnum() or char in "-_." else "_" for char in str(serial))
+            self.snapshot_file = Path(cache_dir).joinpath(f"{safe_serial}.json")
+        self._lock = threading.Lock()
+        self.properties: dict[str, Any] = self._load()
+
+    def _identity(self) -> dict:
+        return {"format": DEVICE_SNAPSHOT_FORMAT, "serial": self.serial, "model": self.model, "version": self.version}
+
+    def _load(self) -> dict:
+        if self.snapshot_file is None:
+            return {}
+        try:
+            with open(self.snapshot_file) as snapshot_fd:
+                snapshot = json.load(snapshot_fd)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exception:
+            log.warning(f"Failed to load device snapshot {self.snapshot_file}: {exception}")
+            return {}
+        if not isinstance(snapshot, dict) or snapshot.get("identity") != self._identity():
+            log.info(f"Device snapshot of {self.serial} was recorded on a different firmware, discarding")
+            return {}
+        log.debug(f"Loaded device snapshot {self.snapshot_file}")
+        return snapshot.get("properties", {})
+
+    def _store(self) -> None:
+        if self.snapshot_file is None:
+            return
+        try:
+            snapshot_dir = self.snapshot_file.parent
+            snapshot_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=snapshot_dir, suffix=".tmp", delete=False) as tmp_fd:
+                json.dump({"identity": self._identity(), "properties": self.properties}, tmp_fd, indent=4)
+            os.replace(tmp_fd.name, self.snapshot_file)
+        except (OSError, TypeError) as exception:
+            log.warning(f"Failed to store device snapshot {self.snapshot_file}: {exception}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return the property from the snapshot.
+
+        Args:
+            key (str): Property name.
+            default (Any): Value returned if the property is not in the snapshot.
+
+        Returns:
+            (Any): Property value.
+        """
+        return self.properties.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Add the property to the snapshot and persist the snapshot.
+
+        Args:
+            key (str): Property name.
+            value (Any): JSON serializable property value.
+        """
+        with self._lock:
+            if self.properties.get(key) == value:
+                return
+            self.properties[key] = value
+            self._store()
+
+    def clear(self) -> None:
+        """Remove all properties from the snapshot, e.g. after the device was reconfigured."""
+        with self._lock:
+            self.properties = {}
+            if self.snapshot_file is not None:
+                self.snapshot_file.unlink(missing_ok=True)
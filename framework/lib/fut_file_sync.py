@@ -0,0 +1,200 @@
+"""
+FUT file synchronization helpers.
+
+This module contains helper functions used to transfer only the
+changed FUT files to the device. The content digests of the local
+files are compared to the manifest of files present on the device,
+and the files that differ are packed into a single compressed archive.
+"""
+
+import hashlib
+import json
+import os
+import tarfile
+import threading
+from pathlib import Path
+
+from lib_testbed.generic.util.logger import log
+
+# Directories which are never transferred to the device
+SYNC_EXCLUDED_DIRS = {"__pycache__", ".pytest_cache", ".git"}
+# Durations of the transfers of all files, relative to the FUT base directory
+TRANSFER_DURATIONS_FILE = ".fut_cache/file_transfer_durations.json"
+
+_durations_lock = threading.Lock()
+
+
+def _walk_files(path: Path):
+    if path.is_file():
+        yield path.as_posix()
+        return
+    for dir_path, dir_names, file_names in os.walk(path, followlinks=True):
+        dir_names[:] = sorted(dir_name for dir_name in dir_names if dir_name not in SYNC_EXCLUDED_DIRS)
+        for file_name in sorted(file_names):
+            file_path = os.path.join(dir_path, file_name)
+            if not file_name.endswith(".pyc") and os.path.isfile(file_path):
+                yield file_path
+
+
+def get_local_manifest(base_dir: str, paths: list[str]) -> dict[str, tuple[str, str, int]]:
+    """
+    Return the manifest of the local files in the provided folders.
+
+    Args:
+        base_dir (str): Directory to which the paths are relative.
+        paths (list): Folders and files, relative to the base directory.
+
+    Returns:
+        (dict): Relative file path mapped to a tuple of MD5 digest, absolute path and size of the file.
+    """
+    manifest = {}
+    for path in paths:
+        for file_path in _walk_files(Path(base_dir).joinpath(path)):
+            with open(file_path, "rb") as file_fd:
+                file_content = file_fd.read()
+            relative_path = os.path.relpath(file_path, base_dir)
+            manifest[relative_path] = (hashlib.md5(file_content).hexdigest(), file_path, len(file_content))
+    return manifest
+
+
+def get_local_size(base_dir: str, paths: list[str]) -> int:
+    """
+    Return the total size of the local files in the provided folders.
+
+    Args:
+        base_dir (str): Directory to which the paths are relative.
+        paths (list): Folders and files, relative to the base directory.
+
+    Returns:
+        (int): Size of the files in bytes.
+    """
+    return sum(os.path.getsize(file_path) for path in paths for file_path in _walk_files(Path(base_dir).joinpath(path)))
+
+
+def get_device_manifest_command(fut_dir: str, paths: list[str]) -> str:
+    """
+    Return the command which lists the MD5 digests of the FUT files on the device.
+
+    The command always succeeds. Missing directories and files are not
+    listed, so they are considered changed. File names are passed to md5sum
+    unsplit, and errors are reported on the standard error.
+
+    Args:
+        fut_dir (str): FUT directory on the device.
+        paths (list): Folders and files, relative to the FUT directory.
+
+    Returns:
+        (str): Command printing one 'digest  path' line for each file.
+    """
+    quoted_paths = " ".join(f"'{path}'" for path in paths)
+    return f"cd {fut_dir} 2> /dev/null && find {quoted_paths} -type f -exec md5sum {{}} +; true"
+
+
+def parse_device_manifest(manifest_output: str) -> dict[str, str]:
+    """
+    Parse the output of the device manifest command.
+
+    Args:
+        manifest_output (str): Output of the device manifest command.
+
+    Returns:
+        (dict): Relative file path mapped to the MD5 digest of the file.
+    """
+    manifest = {}
+    for line in manifest_output.splitlines():
+        digest, _, file_path = line.partition("  ")
+        if len(digest) != 32 or not file_path:
+            continue
+        manifest[file_path.removeprefix("./")] = digest
+    return manifest
+
+
+def get_changed_files(local_manifest: dict[str, tuple[str, str, int]], device_manifest: dict[str, str]) -> list[str]:
+    """
+    Return the files which are missing on the device or differ from the local files.
+
+    Args:
+        local_manifest (dict): Manifest of the local files.
+        device_manifest (dict): Manifest of the files on the device.
+
+    Returns:
+        (list): Relative paths of the changed files.
+    """
+    return [
+        relative_path
+        for relative_path, (digest, _, _) in local_manifest.items()
+        if device_manifest.get(relative_path) != digest
+    ]
+
+
+def create_sync_archive(archive_path: str, local_manifest: dict[str, tuple[str, str, int]], files: list[str]) -> int:
+    """
+    Pack the files into a compressed archive.
+
+    Files are stored as owned by root, regardless of the local owner.
+
+    Args:
+        archive_path (str): Path to the created archive.
+        local_manifest (dict): Manifest of the local files.
+        files (list): Relative paths of the files to pack.
+
+    Returns:
+        (int): Size of the archive in bytes.
+    """
+
+    def reset_owner(tar_info: tarfile.TarInfo) -> tarfile.TarInfo:
+        tar_info.uid = tar_info.gid = 0
+        tar_info.uname = tar_info.gname = ""
+        return tar_info
+
+    with tarfile.open(archive_path, "w:gz", dereference=True, compresslevel=6) as archive:
+        for relative_path in files:
+            archive.add(local_manifest[relative_path][1], arcname=relative_path, recursive=False, filter=reset_owner)
+    return os.path.getsize(archive_path)
+
+
+def _load_transfer_durations(durations_path: Path) -> dict[str, float]:
+    try:
+        with open(durations_path) as durations_fd:
+            return json.load(durations_fd)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_full_transfer_duration(base_dir: str, key: str) -> float | None:
+    """
+    Return the duration of the last transfer of all files for the provided key.
+
+    Args:
+        base_dir (str): FUT base directory.
+        key (str): Key identifying the device model and the transferred folders.
+
+    Returns:
+        (float | None): Duration in seconds or None if unknown.
+    """
+    with _durations_lock:
+        return _load_transfer_durations(Path(base_dir).joinpath(TRANSFER_DURATIONS_FILE)).get(key)
+
+
+def set_full_transfer_duration(base_dir: str, key: str, duration: float) -> None:
+    """
+    Store the duration of the transfer of all files for the provided key.
+
+    The durations are used as the reference for the time saved by
+    transferring only the changed files.
+
+    Args:
+        base_dir (str): FUT base directory.
+        key (str): Key identifying the device model and the transferred folders.
+        duration (float): Duration in seconds.
+    """
+    durations_path = Path(base_dir).joinpath(TRANSFER_DURATIONS_FILE)
+    with _durations_lock:
+        durations = _load_transfer_durations(durations_path)
+        durations[key] = round(duration, 3)
+        try:
+            durations_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(durations_path, "w") as durations_fd:
+                json.dump(durations, durations_fd, indent=4, sort_keys=True)
+        except OSError as exception:
+            log.warning(f"Failed to store file transfer durations to {durations_path}: {exception}")
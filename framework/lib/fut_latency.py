@@ -0,0 +1,81 @@
+"""
+FUT latency statistics.
+
+This module contains the latency measurement and statistics shared by
+the load test and benchmark tools. Percentiles use the nearest-rank
+definition, so each reported value is one of the measured latencies. The
+module depends only on the standard library, so the tools which run
+outside of the FUT framework, e.g. in the server container, can use it.
+"""
+
+import time
+from statistics import mean
+from typing import Any, Callable, Collection
+
+DEFAULT_STATISTICS = ("mean", "p50", "p95", "p99")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of the values.
+
+    Args:
+        values (list): Measured values.
+        fraction (float): Percentile as a fraction, e.g. 0.99 for the 99th percentile.
+
+    Returns:
+        (float): Percentile value, 0.0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def format_latencies(latencies: list[float], statistics: tuple[str, ...] = DEFAULT_STATISTICS) -> str:
+    """
+    Format the latency statistics in milliseconds.
+
+    Args:
+        latencies (list): Measured latencies in seconds.
+        statistics (tuple): Names of the reported statistics: 'min', 'mean', 'max', or a percentile such as
+            'p95'. Defaults to the mean, median, 95th and 99th percentile.
+
+    Returns:
+        (str): Formatted statistics, e.g. 'mean   1.250 ms, p50   1.100 ms'.
+    """
+    if not latencies:
+        return "no samples"
+    functions = {"min": min, "mean": mean, "max": max}
+    formatted = []
+    for statistic in statistics:
+        if statistic in functions:
+            value = functions[statistic](latencies)
+        else:
+            value = percentile(latencies, int(statistic.removeprefix("p")) / 100)
+        formatted.append(f"{statistic} {value * 1000:7.3f} ms")
+    return ", ".join(formatted)
+
+
+def measure(function: Callable[[], Any], iterations: int, expected_results: Collection = (0, 1)) -> list[float]:
+    """
+    Call the function repeatedly and measure the latency of each call.
+
+    An unexpected result is reported, but the call is still measured.
+
+    Args:
+        function (Callable): Measured function, e.g. a command execution which returns the exit code.
+        iterations (int): Number of calls.
+        expected_results (Collection): Expected return values of the function. Defaults to the exit codes 0 and 1.
+
+    Returns:
+        (list): Latencies in seconds.
+    """
+    latencies = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        result = function()
+        latencies.append(time.perf_counter() - start_time)
+        if result not in expected_results:
+            print(f"Unexpected result: {result}")
+    return latencies
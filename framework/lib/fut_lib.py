@@ -5,9 +5,14 @@ This module contains functions that are necessary throughout the entire
 FUT test suite but belong to no particular class.
 """
 
+import functools
 import hashlib
 import json
 import subprocess
+import threading
+import time
+import traceback
+from concurrent.futures import as_completed, ThreadPoolExecutor
 from os import PathLike
 from pathlib import Path
 from typing import Any, Callable, Literal
@@ -16,9 +21,9 @@ import allure  # type: ignore
 import yaml
 
 from config.defaults import all_bandwidth_list, radio_band_list
+from framework.lib.fut_regulatory import get_regulatory_index, load_regulatory_rule, RegulatoryIndex
 from lib_testbed.generic.util.logger import log
 
-
 type fileDescriptorOrPathstr = int | str | bytes | PathLike[str] | PathLike[bytes]
 
 
@@ -36,10 +41,100 @@ def allure_attach_to_report(name: str | None, body: Any):
         log.warning(f"Failed to create the Allure report attachment: {exception}")
 
 
+def multi_device_concurrent_script_execution(
+    devices: list,
+    script: str,
+    args: str = "",
+    policy: Literal["collect_all", "fail_fast"] = "collect_all",
+    max_workers: int | None = None,
+    **kwargs,
+) -> dict[str, dict]:
+    """
+    Execute a script on all specified devices concurrently.
+
+    The script is executed on each device in a separate thread. With the
+    'collect_all' policy, the script is executed on all devices. With the
+    'fail_fast' policy, executions that did not start yet are cancelled
+    after the first failure, while the running executions are completed.
+    The 'fail_fast' policy only skips executions if 'max_workers' is lower
+    than the number of devices, otherwise all executions start at once.
+
+    Allure steps are created after all executions are complete, one for
+    each device, in the order of the provided devices.
+
+    Args:
+        devices (list): List of NodeHandler or DeviceHandler objects.
+        script (str):  Path to script.
+        args (str): Optional script arguments. Defaults to empty string.
+        policy (str): Failure policy, 'collect_all' or 'fail_fast'. Defaults to 'collect_all'.
+        max_workers (int | None): Maximum number of concurrent executions. Defaults to the number of devices.
+
+    Keyword Args:
+        as_sudo (bool): Execute script with superuser privileges.
+        suffix (str): Suffix of the script.
+        folder (str): Name of the folder where the script is located.
+
+    Returns:
+        (dict): Device name mapped to a dictionary with the exit code ('ec'), standard output ('std_out'), standard
+            error ('std_err') and duration in seconds ('duration') of the execution. The exit code is None if the
+            execution raised an exception or was cancelled.
+    """
+    if policy not in ("collect_all", "fail_fast"):
+        raise ValueError(f"Invalid policy: {policy}, should be 'collect_all' or 'fail_fast'.")
+    if not devices:
+        return {}
+
+    failed = threading.Event()
+    cancelled = {"ec": None, "std_out": "", "std_err": "Cancelled after a failure on another device", "duration": 0}
+
+    def execute_on_device(device) -> dict:
+        # Executions picked up by a worker before the pending ones were cancelled
+        if policy == "fail_fast" and failed.is_set():
+            return cancelled
+        # Execute without the Allure step, as steps are not tracked across threads
+        execute = getattr(device.execute, "__wrapped__", None)
+        start_time = time.monotonic()
+        try:
+            if execute:
+                ec, std_out, std_err = execute(device, script, args, **kwargs)
+            else:
+                ec, std_out, std_err = device.execute(script, args, **kwargs)
+        except Exception:
+            ec, std_out, std_err = None, "", traceback.format_exc()
+        if ec != 0:
+            failed.set()
+        return {"ec": ec, "std_out": std_out, "std_err": std_err, "duration": round(time.monotonic() - start_time, 3)}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(devices)) as executor:
+        futures = {executor.submit(execute_on_device, device): device for device in devices}
+        for future in as_completed(futures):
+            if policy == "fail_fast" and not future.cancelled() and future.result()["ec"] != 0:
+                for pending_future in futures:
+                    pending_future.cancel()
+        device_results = {
+            device.name: cancelled if future.cancelled() else future.result() for future, device in futures.items()
+        }
+    results = {device.name: device_results[device.name] for device in devices}
+
+    script_name = script.split("/")[-1]
+    for device in devices:
+        result = results[device.name]
+        with step(f"{device.name.upper()} {script_name} (ec: {result['ec']}, {result['duration']}s)"):
+            if result["std_out"] or result["std_err"]:
+                allure_attach_to_report(
+                    name=f"{device.name} {script_name} output",
+                    body=f"{result['std_out']}\n{result['std_err']}".strip(),
+                )
+    return results
+
+
 def multi_device_script_execution(devices: list, script: str, args: str = "", **kwargs) -> None:
     """
     Execute a script on all specified devices.
 
+    The script is executed on all devices concurrently, and the failures
+    of all devices are reported.
+
     Args:
         devices (list): List of NodeHandler or DeviceHandler objects.
         script (str):  Path to script.
@@ -49,14 +144,14 @@ def multi_device_script_execution(devices: list, script: str, args: str = "", **
         as_sudo (bool): Execute script with superuser privileges.
         suffix (str): Suffix of the script.
         folder (str): Name of the folder where the script is located.
+
+    Raises:
+        RuntimeError: If the script execution failed on any of the devices.
     """
-    try:
-        for device in devices:
-            assert device.execute(script, args, **kwargs)[0] == 0
-    except AssertionError as assertion:
-        raise RuntimeError(
-            f"Unable to execute script on all specified devices {device}, assertion on {device}: {assertion}",
-        )
+    results = multi_device_concurrent_script_execution(devices, script, args, **kwargs)
+    failures = {name: result["std_err"] for name, result in results.items() if result["ec"] != 0}
+    if failures:
+        raise RuntimeError(f"Unable to execute script on all specified devices {list(results)}, failures: {failures}")
 
 
 def allure_script_execution_post_processing(function: Callable) -> Callable:
@@ -67,6 +162,7 @@ def allure_script_execution_post_processing(function: Callable) -> Callable:
     output to be split into steps when creating the Allure report.
     """
 
+    @functools.wraps(function)
     def wrapper(*args, **kwargs):
         step_name = args[1].split("/")[-1]
         with allure.step(f"{step_name}:"):
@@ -180,6 +276,42 @@ def check_if_dicts_match(dict1: dict, dict2: dict) -> list | Literal[True]:
     return True
 
 
+def parse_process_fingerprints(fingerprint_output: str) -> dict:
+    """
+    Parse the output of the get_process_fingerprint script.
+
+    Args:
+        fingerprint_output (str): Lines formatted as <process_path>:<pid>:<start_time>.
+
+    Returns:
+        (dict): Process paths and their fingerprints, formatted as "<pid>:<start_time>".
+    """
+    fingerprints = {}
+    for line in fingerprint_output.split():
+        process_path, _, fingerprint = line.partition(":")
+        fingerprints[process_path] = fingerprint
+    return fingerprints
+
+
+def compare_process_fingerprints(baseline: dict, current: dict) -> tuple[dict, dict, dict]:
+    """
+    Compare the current process fingerprints with the baseline.
+
+    Args:
+        baseline (dict): Baseline process fingerprints.
+        current (dict): Current process fingerprints.
+
+    Returns:
+        (tuple): Baseline processes which are currently missing, current processes
+            with a fingerprint different from the baseline and current processes
+            which are not in the baseline.
+    """
+    missing = {key: baseline[key] for key in sorted(baseline) if key not in current}
+    mismatching = {key: current[key] for key in sorted(current) if key in baseline and current[key] != baseline[key]}
+    new = {key: current[key] for key in sorted(current) if key not in baseline}
+    return missing, mismatching, new
+
+
 def execute_locally(path: str, args: str = "", suffix=".sh", **kwargs) -> tuple[int, str, str]:
     """
     Execute the specified script locally with optional arguments.
@@ -297,24 +429,19 @@ def map_dict_key_path(dictionary: dict, key_mem: str = "") -> list[Any]:
 def load_reg_rule() -> dict:
     """Load regulatory rules from regulatory.yaml file.
 
+    Use get_regulatory_index() to access the rules loaded once per process.
+
     Returns:
         (dict): regulatory rules dictionary
     """
-    full_path = f'{str(Path(__file__).absolute()).split("framework")[0]}/config/rules/regulatory.yaml'
-    try:
-        with open(full_path) as reg_rule_file:
-            return yaml.safe_load(reg_rule_file)
-    except yaml.YAMLError as exception:
-        raise RuntimeError(f"Failed to load regulatory rules from YAML file {full_path}: {exception}") from exception
-    except PermissionError as exception:
-        raise RuntimeError(f"Failed to open file file {full_path}: {exception}") from exception
+    return load_regulatory_rule()
 
 
 def validate_channel_ht_mode_band(
     channel: int,
     ht_mode: str = "HT20",
     radio_band: str = "",
-    regulatory_rule: dict | None = None,
+    regulatory_rule: dict | RegulatoryIndex | None = None,
     reg_domain: str = "US",
     raise_broken: bool = False,
 ) -> bool:
@@ -324,33 +451,31 @@ def validate_channel_ht_mode_band(
         channel (int): WiFi channel
         ht_mode (str): channel bandwidth
         radio_band (str): WiFi band.
+        regulatory_rule (dict | RegulatoryIndex | None): regulatory rules dictionary or index. Defaults to the
+            regulatory index shared within the process.
         reg_domain (str): regulatory domain. Supported "US" (default), "EU", "GB".
 
     Returns:
         bool: True if the combination of band, channel, ht_mode, reg_domain is supported by the device, False otherwise.
     """
-    if not regulatory_rule:
-        log.warning("Regulatory rules not found, loading")
-        regulatory_rule = load_reg_rule()
-    try:
-        assert ht_mode in all_bandwidth_list
-        assert radio_band in radio_band_list
-        if channel not in regulatory_rule[reg_domain.upper()]["band"][radio_band.lower()][ht_mode.upper()]:
-            msg = f"Invalid combination of parameters: channel:{channel}, ht_mode:{ht_mode.upper()}, band:{radio_band.lower()}, regulatory domain: {reg_domain.upper()}"
-            log.debug(msg)
-            if raise_broken:
-                raise RuntimeError(msg)
-        else:
-            return True
-    except AssertionError:
+    if ht_mode not in all_bandwidth_list or radio_band not in radio_band_list:
         log.error(f"Invalid radio_band: {radio_band} and ht_mode:{ht_mode}")
-    except RuntimeError as e:
-        log.error(e)
-    except KeyError:
-        log.debug(
-            f"Parameters unsupported by device. channel:{channel}, ht_mode:{ht_mode}, band:{radio_band}, regulatory domain: {reg_domain}",
-        )
-    return False
+        return False
+    if isinstance(regulatory_rule, dict):
+        try:
+            compliant = channel in regulatory_rule[reg_domain.upper()]["band"][radio_band.lower()][ht_mode.upper()]
+        except KeyError:
+            compliant = False
+    else:
+        regulatory_index = regulatory_rule if regulatory_rule is not None else get_regulatory_index()
+        compliant = regulatory_index.is_compliant(channel, ht_mode, radio_band, reg_domain)
+    if not compliant:
+        msg = f"Invalid combination of parameters: channel:{channel}, ht_mode:{ht_mode.upper()}, band:{radio_band.lower()}, regulatory domain: {reg_domain.upper()}"
+        if raise_broken:
+            log.error(msg)
+        else:
+            log.debug(msg)
+    return compliant
 
 
 def get_str_hash(input_string: str, hash_length: int = 32) -> str:
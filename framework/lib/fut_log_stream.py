@@ -0,0 +1,202 @@
+"""
+FUT device log stream.
+
+This module contains the client of a persistent system log stream, which
+is started once per device and kept open for the whole test session.
+Received log lines are stored in a bounded local ring buffer, so that
+the log window of any command execution can be sliced from the buffer
+by the markers recorded before and after the execution, without any
+additional commands executed on the device.
+"""
+
+import atexit
+import subprocess
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from lib_testbed.generic.util.logger import log
+
+
+class LogStreamError(Exception):
+    """Raised when the log stream is not usable."""
+
+
+class LogStream:
+    """
+    Persistent system log stream of the device.
+
+    The stream process is started lazily on the first marker. If the
+    process exits, for example after the device reboot, it is restarted
+    on the next marker. After 'max_restarts' consecutive failures to
+    start the stream, the log stream is disabled and the caller is
+    expected to fall back to regular log collection.
+
+    Args:
+        name (str): Name of the device, used for logging.
+        spawn_cmd (list): Local command which prints the system log of the
+            device to its standard output as it grows.
+        max_lines (int): Maximum number of log lines kept in the ring
+            buffer. Defaults to 50000.
+        settle_time (float): Time in seconds without new log lines, after
+            which the stream is considered caught up. Defaults to 0.3.
+        max_settle_time (float): Maximum time in seconds to wait for the
+            stream to catch up. Defaults to 2.
+        max_restarts (int): Number of consecutive failures tolerated before
+            the log stream is disabled. Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        spawn_cmd: list[str],
+        max_lines: int = 50000,
+        settle_time: float = 0.3,
+        max_settle_time: float = 2,
+        max_restarts: int = 5,
+    ):
+        self.name = name
+        self.spawn_cmd = spawn_cmd
+        self.settle_time = settle_time
+        self.max_settle_time = max_settle_time
+        self.max_restarts = max_restarts
+        self.restart_count = 0
+        self.disabled = False
+        self.process: subprocess.Popen | None = None
+        self._lines: deque[tuple[float, str]] = deque(maxlen=max_lines)
+        self._line_count = 0
+        self._last_line_time = 0.0
+        self._start_line_count = 0
+        self._condition = threading.Condition()
+        self._reader: threading.Thread | None = None
+
+    def is_alive(self) -> bool:
+        """Return True if the log stream process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the log stream and wait until the initial log dump is received.
+
+        Raises:
+            LogStreamError: If the log stream process could not be started.
+        """
+        log.debug(f"Starting log stream on {self.name}: {' '.join(self.spawn_cmd)}")
+        try:
+            self.process = subprocess.Popen(
+                self.spawn_cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exception:
+            self.process = None
+            raise LogStreamError(f"Failed to start log stream on {self.name}: {exception}") from exception
+        self._start_line_count = self._line_count
+        self._reader = threading.Thread(
+            target=self._read_lines,
+            args=(self.process,),
+            name=f"log_stream_{self.name}",
+            daemon=True,
+        )
+        self._reader.start()
+        atexit.register(self.close)
+        # Lines already present in the system log are printed first and do not belong to any execution window
+        self.wait_settled()
+        if not self.is_alive():
+            raise LogStreamError(f"Log stream on {self.name} exited with code {self.process.returncode}.")
+
+    def close(self) -> None:
+        """Stop the log stream process. Received log lines are kept."""
+        atexit.unregister(self.close)
+        if self.process is None:
+            return
+        try:
+            self.process.terminate()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        finally:
+            self.process = None
+
+    def _read_lines(self, process: subprocess.Popen) -> None:
+        for raw_line in iter(process.stdout.readline, b""):
+            with self._condition:
+                self._lines.append((time.time(), raw_line.decode("utf-8", errors="replace").rstrip("\n")))
+                self._line_count += 1
+                self._last_line_time = time.monotonic()
+                self._condition.notify_all()
+        process.stdout.close()
+
+    def wait_settled(self) -> None:
+        """Wait until no new log lines are received for the settle time, or at most the maximum settle time."""
+        start_time = time.monotonic()
+        deadline = start_time + self.max_settle_time
+        with self._condition:
+            while self.is_alive():
+                settled_at = max(self._last_line_time, start_time) + self.settle_time
+                remaining = min(settled_at, deadline) - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+    def mark(self) -> int:
+        """
+        Return the marker of the current position in the log stream.
+
+        Starts the log stream if it is not running.
+
+        Raises:
+            LogStreamError: If the log stream is disabled or could not be started.
+
+        Returns:
+            (int): Number of log lines received so far.
+        """
+        if self.disabled:
+            raise LogStreamError(f"Log stream on {self.name} is disabled.")
+        if not self.is_alive():
+            if self.process is not None:
+                log.debug(f"Log stream on {self.name} exited, restarting.")
+                self.close()
+                # Stream which exited without any output counts as failed
+                self.restart_count = self.restart_count + 1 if self._line_count == self._start_line_count else 0
+            if self.restart_count >= self.max_restarts:
+                log.warning(f"Log stream on {self.name} failed {self.restart_count} times, disabling it.")
+                self.disabled = True
+                raise LogStreamError(f"Log stream on {self.name} is disabled.")
+            try:
+                self.start()
+            except LogStreamError:
+                self.close()
+                self.restart_count += 1
+                raise
+        with self._condition:
+            return self._line_count
+
+    def get_lines(self, start_mark: int, end_mark: int | None = None, settle: bool = True) -> list[str]:
+        """
+        Return the log lines received between the markers, prefixed with the local receive time.
+
+        Args:
+            start_mark (int): Marker recorded at the start of the window.
+            end_mark (int | None): Marker recorded at the end of the window.
+                Defaults to None, which means all lines received so far.
+            settle (bool): Wait for the stream to catch up before slicing
+                the lines up to the end of the stream. Defaults to True.
+
+        Returns:
+            (list): Log lines of the window.
+        """
+        if end_mark is None and settle:
+            self.wait_settled()
+        with self._condition:
+            end_mark = self._line_count if end_mark is None else min(end_mark, self._line_count)
+            first_mark = self._line_count - len(self._lines)
+            window = islice(self._lines, max(start_mark - first_mark, 0), max(end_mark - first_mark, 0))
+            lines = [
+                f"{time.strftime('%H:%M:%S', time.localtime(receive_time))} {line}" for receive_time, line in window
+            ]
+        if start_mark < first_mark:
+            lines.insert(0, f"[{first_mark - start_mark} log lines dropped from the log stream buffer]")
+        return lines
@@ -0,0 +1,186 @@
+"""
+FUT batched OVSDB reads.
+
+This module contains the batch of OVSDB select operations. The queued
+selects are sent to the device as a single OVSDB transaction and executed
+by one ovsdb-client invocation, instead of one remote ovsh execution per
+table lookup. The OVSDB values in the results are converted to Python
+values: sets to lists, maps to dictionaries and UUIDs to strings.
+"""
+
+import json
+from typing import Any, Callable
+
+OVSDB_DATABASE = "Open_vSwitch"
+OVSDB_BATCH_SCRIPT = "tools/device/ovsdb_batch_select"
+# Operators of the where conditions and the matching OVSDB condition functions
+WHERE_OPERATORS = {"==": "==", "!=": "!=", "<=": "<=", ">=": ">=", "<": "<", ">": ">", ":inc:": "includes"}
+
+
+def parse_where_condition(condition: str) -> list:
+    """
+    Convert the where condition string into the OVSDB condition.
+
+    The values are converted to booleans or numbers if possible, as the
+    OVSDB comparison is type strict, otherwise they are kept as strings.
+
+    Args:
+        condition (str): Condition in the "<column><operator><value>" format, e.g. "if_name==home-ap-24".
+
+    Raises:
+        ValueError: The condition does not contain a supported operator.
+
+    Returns:
+        (list): OVSDB condition, e.g. ["if_name", "==", "home-ap-24"].
+    """
+    # The first operator in the condition separates the column from the value
+    positions = [(condition.find(operator), -len(operator), operator) for operator in WHERE_OPERATORS]
+    matches = [position for position in positions if position[0] > 0]
+    if not matches:
+        raise ValueError(f"Invalid where condition: {condition}, supported operators: {list(WHERE_OPERATORS)}")
+    _, _, operator = min(matches)
+    column, _, value = condition.partition(operator)
+    try:
+        parsed_value = json.loads(value)
+    except json.JSONDecodeError:
+        parsed_value = value
+    if not isinstance(parsed_value, bool | int | float | list):
+        parsed_value = value
+    return [column.strip(), WHERE_OPERATORS[operator], parsed_value]
+
+
+def ovsdb_value_to_python(value: Any) -> Any:
+    """
+    Convert the OVSDB JSON value into the Python value.
+
+    Args:
+        value (Any): OVSDB value, e.g. ["set", [1, 6]] or ["map", [["key", "value"]]].
+
+    Returns:
+        (Any): List for sets, dictionary for maps, string for UUIDs and the atom itself otherwise.
+    """
+    if isinstance(value, list) and len(value) == 2 and value[0] in ("set", "map", "uuid", "named-uuid"):
+        value_type, content = value
+        if value_type == "set":
+            return [ovsdb_value_to_python(item) for item in content]
+        if value_type == "map":
+            return {ovsdb_value_to_python(key): ovsdb_value_to_python(item) for key, item in content}
+        return content
+    return value
+
+
+class OvsdbBatch:
+    """
+    Batch of OVSDB select operations executed in a single transaction.
+
+    The select operations are queued with the select() method, which
+    returns the position of the result, and all of them are executed
+    together by the execute() method.
+
+    Args:
+        execute (Callable): Function which executes a device script and returns the exit code, the standard
+            output and the standard error, e.g. the execute method of the device handler.
+        database (str): OVSDB database name. Defaults to OVSDB_DATABASE.
+    """
+
+    def __init__(self, execute: Callable, database: str = OVSDB_DATABASE):
+        self._execute = execute
+        self.database = database
+        self.operations: list[dict] = []
+
+    def __len__(self) -> int:
+        """Return the number of queued select operations."""
+        return len(self.operations)
+
+    def select(self, table: str, columns: list[str] | None = None, where: str | list[str] | None = None) -> int:
+        """
+        Queue a select operation.
+
+        Args:
+            table (str): OVSDB table name.
+            columns (list | None): Columns to select. Defaults to None, which selects all columns.
+            where (str | list | None): Condition or list of conditions in the "<column><operator><value>" format.
+                Defaults to None, which selects all rows.
+
+        Returns:
+            (int): Position of the select result in the list returned by the execute() method.
+        """
+        conditions = [where] if isinstance(where, str) else where or []
+        operation = {"op": "select", "table": table, "where": [parse_where_condition(item) for item in conditions]}
+        if columns is not None:
+            operation["columns"] = list(columns)
+        self.operations.append(operation)
+        return len(self.operations) - 1
+
+    def transaction(self) -> str:
+        """
+        Return the OVSDB transaction with all queued select operations.
+
+        Returns:
+            (str): OVSDB transaction in JSON format.
+        """
+        return json.dumps([self.database, *self.operations], separators=(",", ":"))
+
+    def execute(self, skip_exception: bool = False) -> list[list[dict] | None]:
+        """
+        Execute all queued select operations with a single remote invocation.
+
+        Args:
+            skip_exception (bool): Return None for the failed selects instead of raising an exception. Defaults to
+                False.
+
+        Raises:
+            RuntimeError: The transaction or any of the select operations failed.
+
+        Returns:
+            (list): Rows of each select operation in the order the operations were queued. Each row is a dictionary
+                of the selected columns.
+        """
+        if not self.operations:
+            return []
+        transaction = self.transaction().replace("'", "'\\''")
+        exit_code, std_out, std_err = self._execute(OVSDB_BATCH_SCRIPT, f"'{transaction}'")
+        if exit_code != 0:
+            if skip_exception:
+                return [None] * len(self.operations)
+            raise RuntimeError(f"OVSDB transaction failed with exit code {exit_code}: {std_err}")
+        return self.parse_results(std_out, skip_exception=skip_exception)
+
+    def parse_results(self, output: str, skip_exception: bool = False) -> list[list[dict] | None]:
+        """
+        Parse the output of the OVSDB transaction.
+
+        The operations following a failed operation are not executed by the
+        OVSDB server, so they are considered failed as well.
+
+        Args:
+            output (str): Standard output of the transaction.
+            skip_exception (bool): Return None for the failed selects instead of raising an exception. Defaults to
+                False.
+
+        Raises:
+            RuntimeError: The output can not be parsed or any of the select operations failed.
+
+        Returns:
+            (list): Rows of each select operation in the order the operations were queued.
+        """
+        lines = [line for line in output.strip().splitlines() if line.strip()]
+        try:
+            results = json.loads(lines[-1])
+        except (IndexError, json.JSONDecodeError) as exception:
+            if skip_exception:
+                return [None] * len(self.operations)
+            raise RuntimeError(f"Failed to parse the OVSDB transaction result: {output}") from exception
+
+        parsed_results = []
+        for index, operation in enumerate(self.operations):
+            result = results[index] if isinstance(results, list) and index < len(results) else None
+            if not isinstance(result, dict) or "rows" not in result:
+                if not skip_exception:
+                    raise RuntimeError(f"OVSDB select from the {operation['table']} table failed: {result}")
+                parsed_results.append(None)
+                continue
+            parsed_results.append(
+                [{column: ovsdb_value_to_python(value) for column, value in row.items()} for row in result["rows"]],
+            )
+        return parsed_results
@@ -0,0 +1,215 @@
+"""
+FUT radio state aware test case ordering.
+
+This module contains the reordering of the parametrized test cases which
+configure the radio of the gateway. Each test case sets the channel,
+ht_mode and radio band of a radio. Changing the channel of a radio takes
+time, and moving a radio to a DFS channel additionally requires the
+channel availability check (CAC), which takes 60 seconds on standard and
+600 seconds on weather radar DFS channels. The test cases of each test
+function are reordered with a greedy nearest neighbour search over the
+distinct radio states, driven by the transition cost model, so test cases
+with the same radio state run back to back and DFS channels are visited
+in one block.
+"""
+
+from typing import Callable
+
+from framework.lib.fut_regulatory import RegulatoryIndex
+
+# Test suites of which the test cases are reordered
+RADIO_ORDERED_SUITES = ("TestWm2", "TestNm2")
+# Estimated durations in seconds of the radio state transitions
+VIF_RESET_DURATION = 10.0
+CHANNEL_CHANGE_DURATION = 15.0
+CAC_DURATIONS = {"standard": 60.0, "weather": 600.0}
+
+
+class RadioTransitionCostModel:
+    """
+    Estimates the duration of the radio state transitions between the test cases.
+
+    The radio state of a test case is the tuple (radio_band, channel,
+    ht_mode). The state of each radio is tracked separately, as the
+    radios keep their channels when a test case configures another radio.
+    The VIF reset is performed when the channel or the radio band differs
+    from the previous test case, the same as the WM2 test cases do.
+
+    Args:
+        regulatory_index (RegulatoryIndex): Regulatory index with the DFS channels.
+        reg_domain (str): Regulatory domain of the device.
+    """
+
+    def __init__(self, regulatory_index: RegulatoryIndex, reg_domain: str):
+        self.regulatory_index = regulatory_index
+        self.reg_domain = reg_domain
+        self._cac_durations: dict[tuple, float] = {}
+
+    def cac_duration(self, radio_state: tuple) -> float:
+        """
+        Return the duration of the channel availability check of the radio state.
+
+        Args:
+            radio_state (tuple): Radio band, channel and ht_mode.
+
+        Returns:
+            (float): CAC duration in seconds, 0 for the non-DFS channels.
+        """
+        if radio_state not in self._cac_durations:
+            radio_band, channel, ht_mode = radio_state
+            dfs_type = self.regulatory_index.get_dfs_type(channel, ht_mode or "HT20", radio_band, self.reg_domain)
+            self._cac_durations[radio_state] = CAC_DURATIONS.get(dfs_type, 0.0)
+        return self._cac_durations[radio_state]
+
+    def transition_cost(self, radio_states: dict, last_state: tuple | None, radio_state: tuple) -> float:
+        """
+        Return the estimated duration of the transition to the radio state.
+
+        Args:
+            radio_states (dict): Current (channel, ht_mode) of each radio band.
+            last_state (tuple | None): Radio state of the previous test case.
+            radio_state (tuple): Radio state of the next test case.
+
+        Returns:
+            (float): Estimated duration in seconds.
+        """
+        radio_band, channel, ht_mode = radio_state
+        cost = 0.0
+        if last_state is None or last_state[:2] != radio_state[:2]:
+            cost += VIF_RESET_DURATION
+        if radio_states.get(radio_band) != (channel, ht_mode):
+            cost += CHANNEL_CHANGE_DURATION + self.cac_duration(radio_state)
+        return cost
+
+    def sequence_cost(self, radio_state_sequence: list[tuple]) -> float:
+        """
+        Return the estimated duration of all transitions of the sequence of radio states.
+
+        Args:
+            radio_state_sequence (list): Radio states in the execution order.
+
+        Returns:
+            (float): Estimated duration in seconds.
+        """
+        radio_states: dict = {}
+        last_state = None
+        cost = 0.0
+        for radio_state in radio_state_sequence:
+            cost += self.transition_cost(radio_states, last_state, radio_state)
+            radio_states[radio_state[0]] = radio_state[1:]
+            last_state = radio_state
+        return cost
+
+
+def get_radio_state(test_case_config: dict) -> tuple | None:
+    """
+    Return the radio state configured by the test case.
+
+    Args:
+        test_case_config (dict): Test case configuration.
+
+    Returns:
+        (tuple | None): Radio band, channel and ht_mode, or None if the test case does not configure a radio channel.
+    """
+    if not isinstance(test_case_config, dict):
+        return None
+    radio_band, channel = test_case_config.get("radio_band"), test_case_config.get("channel")
+    if not isinstance(radio_band, str) or not isinstance(channel, int):
+        return None
+    return radio_band, channel, test_case_config.get("ht_mode")
+
+
+def order_radio_states(
+    radio_states: list[tuple],
+    cost_model: RadioTransitionCostModel,
+    initial_states: dict | None = None,
+    initial_last_state: tuple | None = None,
+) -> list[tuple]:
+    """
+    Order the distinct radio states with the greedy nearest neighbour search.
+
+    The next state is always the one with the cheapest transition from the
+    current state. Ties are resolved by the band, the non-DFS channels
+    first, then by the channel and the ht_mode, so the states of one band
+    are visited together and the DFS channels in one block.
+
+    Args:
+        radio_states (list): Distinct radio states.
+        cost_model (RadioTransitionCostModel): Transition cost model.
+        initial_states (dict | None): Radio channels before the first state. Defaults to None.
+        initial_last_state (tuple | None): Radio state before the first state. Defaults to None.
+
+    Returns:
+        (list): Radio states in the visiting order.
+    """
+
+    def sort_key(radio_state: tuple) -> tuple:
+        radio_band, channel, ht_mode = radio_state
+        return radio_band, cost_model.cac_duration(radio_state), channel, str(ht_mode)
+
+    remaining = sorted(set(radio_states), key=sort_key)
+    current_states = dict(initial_states or {})
+    last_state = initial_last_state
+    ordered = []
+    while remaining:
+        next_state = min(remaining, key=lambda state: cost_model.transition_cost(current_states, last_state, state))
+        remaining.remove(next_state)
+        ordered.append(next_state)
+        current_states[next_state[0]] = next_state[1:]
+        last_state = next_state
+    return ordered
+
+
+def reorder_items(
+    items: list,
+    get_config: Callable,
+    cost_model: RadioTransitionCostModel,
+    suites: tuple = RADIO_ORDERED_SUITES,
+) -> tuple[list, float, float]:
+    """
+    Reorder the test cases of each test function to minimize the radio state transitions.
+
+    Only the test cases of the selected suites are reordered, and only
+    within their test function, so the order of the test functions is
+    kept. The test functions with a test case that does not configure a
+    radio channel are not reordered. Test cases with the same radio state
+    keep their relative order.
+
+    Args:
+        items (list): Collected pytest items.
+        get_config (Callable): Function which returns the test case configuration of the item.
+        cost_model (RadioTransitionCostModel): Transition cost model.
+        suites (tuple): Names of the test suites to reorder. Defaults to RADIO_ORDERED_SUITES.
+
+    Returns:
+        (tuple): Reordered items, estimated transition duration of the original and of the new order in seconds.
+    """
+    # Consecutive items of the same test function
+    groups: list[tuple] = []
+    for item in items:
+        function_name = getattr(item, "originalname", item.name)
+        group_key = (getattr(item.cls, "__name__", None), function_name)
+        if groups and groups[-1][0] == group_key:
+            groups[-1][1].append(item)
+        else:
+            groups.append((group_key, [item]))
+
+    reordered = []
+    original_sequence, reordered_sequence = [], []
+    radio_channels: dict = {}
+    last_state = None
+    for (suite, _), group_items in groups:
+        states = [get_radio_state(get_config(item)) for item in group_items]
+        if suite not in suites or None in states:
+            reordered.extend(group_items)
+            continue
+        original_sequence.extend(states)
+        items_by_state: dict[tuple, list] = {}
+        for item, state in zip(group_items, states):
+            items_by_state.setdefault(state, []).append(item)
+        for state in order_radio_states(states, cost_model, radio_channels, last_state):
+            reordered.extend(items_by_state[state])
+            reordered_sequence.extend([state] * len(items_by_state[state]))
+            radio_channels[state[0]] = state[1:]
+            last_state = state
+    return reordered, cost_model.sequence_cost(original_sequence), cost_model.sequence_cost(reordered_sequence)
@@ -0,0 +1,228 @@
+"""
+FUT reconnection engine.
+
+This module contains the reconnection procedure used after the SSH
+connection to a device is lost, e.g. during a reboot or a link loss. The
+SSH port of the device is probed at short jittered intervals, which grow
+exponentially up to a limit, until the deadline expires. Once the port
+accepts connections, the recovery is confirmed with a single command. The
+time to recover is measured for each reconnection event.
+
+The port is probed directly from the framework host, which is not always
+possible, e.g. the device name only resolves on the server or the device
+is reachable only through the SSH gateway of the testbed. Whether the port
+can be probed is therefore checked once while the device is reachable, see
+'can_probe_port'. If it can not, or the device name does not resolve, the
+recovery is confirmed periodically with the command alone.
+
+The reconnection policies are defined per test suite in the
+'config/rules/reconnection_policy.yaml' file.
+"""
+
+import random
+import socket
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+import yaml
+
+from lib_testbed.generic.util.logger import log
+
+RECONNECTION_POLICY_FILE = "config/rules/reconnection_policy.yaml"
+
+
+def load_reconnection_policy(test_suite_name: str | None = None) -> dict:
+    """
+    Load the reconnection policy of the test suite.
+
+    The test suite entry overrides the values of the default policy. The
+    policy file in the 'internal' directory extends the generic one.
+
+    Args:
+        test_suite_name (str | None): Name of the test suite, e.g. 'cm2'. Defaults to None, which returns the default
+            policy.
+
+    Returns:
+        (dict): Keyword arguments of the ReconnectionEngine class.
+    """
+    policies: dict = {}
+    for parent_dir in [".", "internal"]:
+        policy_file = Path(parent_dir).joinpath(RECONNECTION_POLICY_FILE)
+        if policy_file.is_file():
+            with open(policy_file) as policy_fd:
+                for name, policy in (yaml.safe_load(policy_fd) or {}).items():
+                    policies.setdefault(name, {}).update(policy or {})
+    return {**policies.get("default", {}), **policies.get(test_suite_name, {})}
+
+
+def is_port_open(host: str, port: int, timeout: float) -> bool:
+    """
+    Check if the TCP port of the host accepts connections.
+
+    Args:
+        host (str): Hostname or IP address.
+        port (int): TCP port.
+        timeout (float): Connection timeout in seconds.
+
+    Raises:
+        socket.gaierror: If the hostname could not be resolved.
+
+    Returns:
+        (bool): True if the connection was accepted, False otherwise.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except socket.gaierror:
+        raise
+    except OSError:
+        return False
+
+
+def can_probe_port(host: str, port: int, timeout: float = 2) -> bool:
+    """
+    Check if the port of the reachable device can be probed from the framework host.
+
+    The check is done while the device is reachable, so a closed port means
+    the device is reachable only through a gateway, not that it is down.
+
+    Args:
+        host (str): Hostname or IP address.
+        port (int): TCP port.
+        timeout (float): Connection timeout in seconds. Defaults to 2.
+
+    Returns:
+        (bool): True if the port accepts connections.
+    """
+    try:
+        return is_port_open(host, port, timeout)
+    except socket.gaierror:
+        return False
+
+
+class ReconnectionEngine:
+    """
+    Probe-driven reconnection to a single device.
+
+    The port is probed until it accepts connections, after which the
+    'confirm' function is called once. If the confirmation fails, e.g.
+    the SSH server is started but the device is not yet usable, probing
+    continues until the deadline.
+
+    If the port can not be probed from the framework host, as set with
+    'probe_port', or the host can not be resolved, the 'confirm' function
+    is called at each interval instead.
+
+    Args:
+        name (str): Name of the device, used for logging.
+        host (str): Hostname or IP address of the device.
+        confirm (Callable): Function which returns True if the device is usable, e.g. executes a command over SSH.
+        port (int): Probed TCP port. Defaults to 22.
+        initial_interval (float): Time in seconds between the first probes. Defaults to 0.5.
+        max_interval (float): Upper limit in seconds of the time between the probes. Defaults to 8.
+        backoff_factor (float): Factor by which the time between the probes increases after each failed probe.
+            Defaults to 2.
+        jitter (float): Random variation of the time between the probes, as a fraction of the interval. Defaults
+            to 0.2.
+        probe_timeout (float): Timeout in seconds of a single probe. Defaults to 2.
+        deadline (float): Time in seconds after which the device is considered lost. Defaults to 150.
+        probe_port (bool): Probe the port before the confirmation. If False, the recovery is confirmed at each
+            interval without probing. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        confirm: Callable[[], bool],
+        port: int = 22,
+        initial_interval: float = 0.5,
+        max_interval: float = 8,
+        backoff_factor: float = 2,
+        jitter: float = 0.2,
+        probe_timeout: float = 2,
+        deadline: float = 150,
+        probe_port: bool = True,
+    ):
+        self.name = name
+        self.host = host
+        self.confirm = confirm
+        self.port = port
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.probe_timeout = probe_timeout
+        self.deadline = deadline
+        self.probe_port = probe_port
+
+    def intervals(self) -> Iterator[float]:
+        """
+        Yield the jittered times between the consecutive probes.
+
+        Yields:
+            (float): Time in seconds until the next probe.
+        """
+        interval = self.initial_interval
+        while True:
+            yield interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            interval = min(interval * self.backoff_factor, self.max_interval)
+
+    def probe(self) -> bool:
+        """
+        Probe the port of the device.
+
+        Raises:
+            socket.gaierror: If the hostname of the device could not be resolved.
+
+        Returns:
+            (bool): True if the port accepts connections, False otherwise.
+        """
+        return is_port_open(self.host, self.port, self.probe_timeout)
+
+    def wait_for_recovery(self) -> dict:
+        """
+        Wait until the device is usable again or the deadline expires.
+
+        Returns:
+            (dict): Reconnection event metrics: device name, recovery status, time to recover in seconds, number of
+                probes and confirmations, and whether probing was replaced by the confirmations alone.
+        """
+        log.debug(f"Probing {self.host}:{self.port} of {self.name} for up to {self.deadline}s")
+        start_time = time.monotonic()
+        end_time = start_time + self.deadline
+        probes, confirmations, recovered, probe_fallback = 0, 0, False, not self.probe_port
+        for interval in self.intervals():
+            port_open = False
+            if not probe_fallback:
+                probes += 1
+                try:
+                    port_open = self.probe()
+                except socket.gaierror as exception:
+                    log.debug(
+                        f"Unable to resolve {self.host} of {self.name}, confirming the recovery instead: {exception}"
+                    )
+                    probe_fallback = True
+            if port_open or probe_fallback:
+                confirmations += 1
+                if self.confirm():
+                    recovered = True
+                    break
+                if port_open:
+                    log.debug(f"Port {self.port} of {self.name} is open, but the device is not usable yet.")
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+
+        event = {
+            "device": self.name,
+            "recovered": recovered,
+            "time_to_recover": round(time.monotonic() - start_time, 3),
+            "probes": probes,
+            "confirmations": confirmations,
+            "probe_fallback": probe_fallback,
+        }
+        log.debug(f"Reconnection event of {self.name}: {event}")
+        return event
@@ -0,0 +1,237 @@
+"""
+FUT regulatory index.
+
+This module contains the regulatory rules compiled into an immutable
+index. The allowed channels of each (regulatory domain, radio band,
+ht_mode) combination are stored as a bitset, so validating a channel is a
+dictionary lookup and a bit test, instead of a scan of the channel list.
+The rules are loaded and compiled once per process and the index is
+shared by the FUT configurator, the test case generators and the node
+handlers.
+"""
+
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterable
+
+import yaml
+
+REGULATORY_RULE_FILE = Path(__file__).absolute().parents[2].joinpath("config", "rules", "regulatory.yaml").as_posix()
+
+
+def load_regulatory_rule(rule_file: str = REGULATORY_RULE_FILE) -> dict:
+    """
+    Load regulatory rules from the regulatory.yaml file.
+
+    Args:
+        rule_file (str): Path to the regulatory rules file.
+
+    Raises:
+        RuntimeError: File can not be read or parsed.
+
+    Returns:
+        (dict): Regulatory rules dictionary.
+    """
+    try:
+        with open(rule_file) as reg_rule_file:
+            return yaml.safe_load(reg_rule_file)
+    except yaml.YAMLError as exception:
+        raise RuntimeError(f"Failed to load regulatory rules from YAML file {rule_file}: {exception}") from exception
+    except PermissionError as exception:
+        raise RuntimeError(f"Failed to open file file {rule_file}: {exception}") from exception
+
+
+def channels_to_mask(channels: Iterable[int]) -> int:
+    """
+    Return the bitset of the channels.
+
+    Args:
+        channels (Iterable): Channel numbers.
+
+    Returns:
+        (int): Bitset with the bit of each channel set.
+    """
+    mask = 0
+    for channel in channels:
+        mask |= 1 << channel
+    return mask
+
+
+class RegulatoryIndex:
+    """
+    Immutable index of the channels allowed by the regulatory rules.
+
+    The "band" and "dfs" sections of each regulatory domain are indexed.
+    The regulatory domain, the radio band and the ht_mode are
+    case-insensitive.
+
+    Args:
+        regulatory_rule (dict): Regulatory rules dictionary.
+    """
+
+    __slots__ = ("rule", "_masks", "_dfs_masks")
+
+    def __init__(self, regulatory_rule: dict):
+        masks, dfs_masks = {}, {}
+        for reg_domain, domain_rule in regulatory_rule.items():
+            if not isinstance(domain_rule, dict) or not isinstance(domain_rule.get("band"), dict):
+                continue
+            for radio_band, band_rule in domain_rule["band"].items():
+                for ht_mode, channels in band_rule.items():
+                    masks[(reg_domain.upper(), radio_band.lower(), ht_mode.upper())] = channels_to_mask(channels)
+            for dfs_type, dfs_rule in (domain_rule.get("dfs") or {}).items():
+                for radio_band, band_rule in dfs_rule.items():
+                    for ht_mode, channels in band_rule.items():
+                        key = (dfs_type.lower(), reg_domain.upper(), radio_band.lower(), ht_mode.upper())
+                        dfs_masks[key] = channels_to_mask(channels)
+        object.__setattr__(self, "rule", regulatory_rule)
+        object.__setattr__(self, "_masks", MappingProxyType(masks))
+        object.__setattr__(self, "_dfs_masks", MappingProxyType(dfs_masks))
+
+    def __setattr__(self, name, value):
+        """Reject attribute changes, the index is shared between threads."""
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __contains__(self, key: tuple) -> bool:
+        """Return True if the (reg_domain, radio_band, ht_mode) combination is in the rules."""
+        reg_domain, radio_band, ht_mode = key
+        return (reg_domain.upper(), radio_band.lower(), ht_mode.upper()) in self._masks
+
+    def channel_mask(self, reg_domain: str, radio_band: str, ht_mode: str) -> int:
+        """
+        Return the bitset of the channels allowed for the combination.
+
+        Args:
+            reg_domain (str): Regulatory domain.
+            radio_band (str): Radio band.
+            ht_mode (str): Channel bandwidth.
+
+        Returns:
+            (int): Bitset of the allowed channels, 0 if the combination is not in the rules.
+        """
+        return self._masks.get((reg_domain.upper(), radio_band.lower(), ht_mode.upper()), 0)
+
+    def channels(self, reg_domain: str, radio_band: str, ht_mode: str) -> list[int]:
+        """
+        Return the channels allowed for the combination.
+
+        Args:
+            reg_domain (str): Regulatory domain.
+            radio_band (str): Radio band.
+            ht_mode (str): Channel bandwidth.
+
+        Returns:
+            (list): Allowed channels in ascending order.
+        """
+        mask = self.channel_mask(reg_domain, radio_band, ht_mode)
+        return [channel for channel in range(mask.bit_length()) if mask >> channel & 1]
+
+    def is_compliant(self, channel: int, ht_mode: str, radio_band: str, reg_domain: str) -> bool:
+        """
+        Verify if the channel, ht_mode and radio_band are allowed in the regulatory domain.
+
+        Args:
+            channel (int): Wi-Fi channel.
+            ht_mode (str): Channel bandwidth.
+            radio_band (str): Radio band.
+            reg_domain (str): Regulatory domain.
+
+        Returns:
+            (bool): True if the combination is allowed, False otherwise.
+        """
+        if not isinstance(channel, int) or channel < 0:
+            return False
+        return bool(self.channel_mask(reg_domain, radio_band, ht_mode) >> channel & 1)
+
+    def get_dfs_type(self, channel: int, ht_mode: str, radio_band: str, reg_domain: str) -> str | None:
+        """
+        Return the DFS type of the channel, which determines the duration of the channel availability check.
+
+        Args:
+            channel (int): Wi-Fi channel.
+            ht_mode (str): Channel bandwidth.
+            radio_band (str): Radio band.
+            reg_domain (str): Regulatory domain.
+
+        Returns:
+            (str | None): "weather" or "standard" for DFS channels, None for the other channels.
+        """
+        if not isinstance(channel, int) or channel < 0:
+            return None
+        for dfs_type in ("weather", "standard"):
+            key = (dfs_type, reg_domain.upper(), radio_band.lower(), ht_mode.upper())
+            if self._dfs_masks.get(key, 0) >> channel & 1:
+                return dfs_type
+        return None
+
+    def compliant_rows(
+        self,
+        rows: Iterable[tuple[int, str, str]],
+        reg_domain: str,
+        allowed_masks: dict | None = None,
+    ) -> list[bool]:
+        """
+        Verify the regulatory compliance of many (channel, ht_mode, radio_band) rows at once.
+
+        The bitset of each distinct (radio_band, ht_mode) pair is looked up
+        once per call, so the cost per row is a single bit test.
+
+        Args:
+            rows (Iterable): Tuples of channel, ht_mode and radio_band.
+            reg_domain (str): Regulatory domain.
+            allowed_masks (dict | None): Optional bitsets of the channels allowed by other
+                constraints, e.g. the device capabilities, keyed by radio_band. Bands
+                missing in the dictionary allow no channels. Defaults to None.
+
+        Returns:
+            (list): True for each compliant row, False otherwise.
+        """
+        band_masks: dict = {}
+        result = []
+        for channel, ht_mode, radio_band in rows:
+            mask = band_masks.get((radio_band, ht_mode))
+            if mask is None:
+                try:
+                    mask = self.channel_mask(reg_domain, radio_band, ht_mode)
+                except AttributeError:
+                    mask = 0
+                if allowed_masks is not None:
+                    mask &= allowed_masks.get(radio_band, 0)
+                band_masks[(radio_band, ht_mode)] = mask
+            result.append(isinstance(channel, int) and channel >= 0 and bool(mask >> channel & 1))
+        return result
+
+    def filter_rows(self, rows: Iterable[tuple[int, str, str]], reg_domain: str) -> list[tuple[int, str, str]]:
+        """
+        Return the regulatory compliant (channel, ht_mode, radio_band) rows.
+
+        Args:
+            rows (Iterable): Tuples of channel, ht_mode and radio_band.
+            reg_domain (str): Regulatory domain.
+
+        Returns:
+            (list): Compliant rows, in the input order.
+        """
+        rows = list(rows)
+        return [row for row, compliant in zip(rows, self.compliant_rows(rows, reg_domain)) if compliant]
+
+
+_regulatory_index: RegulatoryIndex | None = None
+_regulatory_index_lock = threading.Lock()
+
+
+def get_regulatory_index() -> RegulatoryIndex:
+    """
+    Return the regulatory index shared within the process.
+
+    The regulatory rules are loaded and compiled on the first call.
+
+    Returns:
+        (RegulatoryIndex): Shared regulatory index.
+    """
+    global _regulatory_index
+    with _regulatory_index_lock:
+        if _regulatory_index is None:
+            _regulatory_index = RegulatoryIndex(load_regulatory_rule())
+        return _regulatory_index
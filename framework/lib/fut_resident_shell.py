@@ -0,0 +1,231 @@
+"""
+FUT resident shell client.
+
+This module contains the client side of a long-lived shell, which is
+started once per device with the FUT shell environment already loaded.
+FUT scripts are then executed through framed requests on the same
+channel, without sourcing the shell libraries and establishing a new
+SSH session on every call.
+
+The device side of the protocol is implemented in the
+'shell/tools/device/resident_shell.sh' script.
+"""
+
+import os
+import select
+import subprocess
+import threading
+import time
+from itertools import count
+
+from lib_testbed.generic.util.logger import log
+
+RESIDENT_SHELL_SCRIPT = "shell/tools/device/resident_shell.sh"
+READY_MARKER = "FUT_RSH_READY"
+REQUEST_MARKER = "FUT_RSH_CMD"
+RESULT_MARKER = "FUT_RSH_RESULT"
+
+
+class ResidentShellError(Exception):
+    """
+    Raised when the resident shell channel is not usable.
+
+    Attributes:
+        command_sent (bool): True if the request already reached the resident
+            shell, in which case the command must not be executed again blindly.
+    """
+
+    command_sent: bool = False
+
+
+class ResidentShell:
+    """
+    Long-lived shell on the device, used to execute FUT scripts.
+
+    The shell process is started lazily on the first execution. If the
+    process dies or the channel becomes unusable, it is closed and
+    restarted on the next execution. After 'max_restarts' unexpected
+    failures the resident shell is disabled and the caller is expected
+    to fall back to regular command execution.
+
+    Args:
+        name (str): Name of the device, used for logging.
+        spawn_cmd (list): Local command which starts the resident shell on
+            the device and connects to its standard input and output.
+        start_timeout (int): Time in seconds to wait for the resident shell
+            to report it is ready. Defaults to 30.
+        max_restarts (int): Number of unexpected failures tolerated before the
+            resident shell is disabled. Defaults to 3.
+        response_grace (int): Time in seconds allowed on top of the command
+            timeout for the response to arrive. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        spawn_cmd: list[str],
+        start_timeout: int = 30,
+        max_restarts: int = 3,
+        response_grace: int = 10,
+    ):
+        self.name = name
+        self.spawn_cmd = spawn_cmd
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self.response_grace = response_grace
+        self.restart_count = 0
+        self.disabled = False
+        self.process: subprocess.Popen | None = None
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._request_id = count(1)
+
+    def is_alive(self) -> bool:
+        """Return True if the resident shell process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the resident shell and wait until it reports it is ready.
+
+        Raises:
+            ResidentShellError: If the resident shell does not become ready.
+        """
+        log.debug(f"Starting resident shell on {self.name}: {' '.join(self.spawn_cmd)}")
+        self._buffer.clear()
+        try:
+            self.process = subprocess.Popen(
+                self.spawn_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except OSError as exception:
+            self.close(crashed=True)
+            raise ResidentShellError(f"Failed to start resident shell on {self.name}: {exception}") from exception
+
+        deadline = time.monotonic() + self.start_timeout
+        try:
+            # Any banner printed by the remote login shell is skipped
+            while not self._read_line(deadline).startswith(READY_MARKER):
+                pass
+        except ResidentShellError as exception:
+            self.close(crashed=True)
+            raise ResidentShellError(f"Resident shell on {self.name} is not ready: {exception}") from exception
+        log.debug(f"Resident shell on {self.name} is ready.")
+
+    def close(self, crashed: bool = False) -> None:
+        """
+        Stop the resident shell process.
+
+        Args:
+            crashed (bool): The resident shell is closed due to an unexpected
+                failure, which counts towards the restart limit.
+        """
+        if crashed:
+            self.restart_count += 1
+            if self.restart_count > self.max_restarts and not self.disabled:
+                log.warning(f"Resident shell on {self.name} failed {self.restart_count} times, disabling it.")
+                self.disabled = True
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.terminate()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        finally:
+            self.process = None
+            self._buffer.clear()
+
+    def _ensure_started(self) -> None:
+        if self.disabled:
+            raise ResidentShellError(f"Resident shell on {self.name} is disabled.")
+        if self.is_alive():
+            return
+        if self.process is not None:
+            log.warning(f"Resident shell on {self.name} exited unexpectedly, restarting.")
+            self.close(crashed=True)
+            if self.disabled:
+                raise ResidentShellError(f"Resident shell on {self.name} is disabled.")
+        self.start()
+
+    def _fill_buffer(self, deadline: float) -> None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ResidentShellError("Timed out waiting for the resident shell response.")
+        file_descriptor = self.process.stdout.fileno()
+        readable, _, _ = select.select([file_descriptor], [], [], remaining)
+        if not readable:
+            raise ResidentShellError("Timed out waiting for the resident shell response.")
+        chunk = os.read(file_descriptor, 65536)
+        if not chunk:
+            raise ResidentShellError("Resident shell channel closed.")
+        self._buffer.extend(chunk)
+
+    def _read_line(self, deadline: float) -> str:
+        while (newline_index := self._buffer.find(b"\n")) < 0:
+            self._fill_buffer(deadline)
+        line = bytes(self._buffer[:newline_index])
+        del self._buffer[: newline_index + 1]
+        return line.decode("utf-8", errors="replace")
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        while len(self._buffer) < size:
+            self._fill_buffer(deadline)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def run(self, script: str, args: str = "", timeout: int = 360) -> tuple[int, str, str]:
+        """
+        Execute the FUT script in the resident shell.
+
+        Args:
+            script (str): Absolute path to the script on the device.
+            args (str): Script arguments, interpreted by the device shell.
+                Defaults to empty string.
+            timeout (int): Script timeout in seconds. Defaults to 360.
+
+        Raises:
+            ResidentShellError: If the script could not be executed in the
+                resident shell.
+
+        Returns:
+            (tuple): Exit code (int), standard output (str) and standard error (str) of the executed script.
+        """
+        if "\n" in script or "\n" in args:
+            raise ResidentShellError("Multi-line commands are not supported by the resident shell.")
+
+        with self._lock:
+            self._ensure_started()
+            request_id = next(self._request_id)
+            request = f"{REQUEST_MARKER} {request_id} {int(timeout)}\n{script}\n{args.strip()}\n"
+            try:
+                self.process.stdin.write(request.encode("utf-8"))
+                self.process.stdin.flush()
+            except OSError as exception:
+                self.close(crashed=True)
+                raise ResidentShellError(f"Failed to send request to resident shell: {exception}") from exception
+
+            deadline = time.monotonic() + timeout + self.response_grace
+            try:
+                header = self._read_line(deadline).split()
+                if len(header) != 5 or header[0] != RESULT_MARKER or header[1] != str(request_id):
+                    raise ResidentShellError(f"Unexpected resident shell response: {header}")
+                exit_code, stdout_size, stderr_size = (int(field) for field in header[2:])
+                std_out = self._read_exact(stdout_size, deadline)
+                std_err = self._read_exact(stderr_size, deadline)
+            except (ResidentShellError, ValueError) as exception:
+                self.close(crashed=True)
+                error = ResidentShellError(str(exception))
+                error.command_sent = True
+                raise error from exception
+
+        return (
+            exit_code,
+            std_out.decode("utf-8", errors="replace").strip(),
+            std_err.decode("utf-8", errors="replace").strip(),
+        )
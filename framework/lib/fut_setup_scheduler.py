@@ -0,0 +1,212 @@
+"""
+FUT setup scheduler.
+
+This module contains the scheduler which executes the session setup as a
+dependency graph of named steps. Each step is started as soon as all of
+its dependencies are complete, so independent steps, for example the
+server container setup and the node handler initialization, run in
+parallel. The start time and the duration of each step are recorded, so
+the setup time can be broken down by step.
+"""
+
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from lib_testbed.generic.util.logger import log
+
+
+class SetupStep:
+    """
+    Named setup step.
+
+    Args:
+        name (str): Unique name of the step.
+        function (Callable): Function executed by the step.
+        args (tuple): Arguments of the function.
+        depends_on (tuple): Names of the steps which must be complete before the step is started.
+    """
+
+    def __init__(self, name: str, function: Callable, args: tuple = (), depends_on: tuple = ()):
+        self.name = name
+        self.function = function
+        self.args = args
+        self.depends_on = tuple(depends_on)
+        self.status = "pending"
+        self.start_time: float | None = None
+        self.end_time: float | None = None
+        self.error: str | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+class SetupScheduler:
+    """
+    Scheduler which executes the setup steps with maximal parallelism allowed by their dependencies.
+
+    After a step fails, no further steps are started, the running steps
+    are completed and the steps which were not started are skipped.
+
+    Args:
+        max_workers (int | None): Maximum number of concurrently executed steps. Defaults to the number of steps.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self.steps: dict[str, SetupStep] = {}
+        self.start_time: float | None = None
+        self.end_time: float | None = None
+
+    def add_step(self, name: str, function: Callable, *args: Any, depends_on: tuple | list = ()) -> SetupStep:
+        """
+        Add the setup step.
+
+        Args:
+            name (str): Unique name of the step.
+            function (Callable): Function executed by the step.
+            *args: Arguments of the function.
+            depends_on (tuple | list): Names of the steps which must be complete before the step is started.
+
+        Raises:
+            ValueError: Step with the same name already exists.
+
+        Returns:
+            (SetupStep): Added step.
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate setup step: {name}")
+        self.steps[name] = SetupStep(name, function, args, depends_on)
+        return self.steps[name]
+
+    def _validate(self) -> None:
+        for setup_step in self.steps.values():
+            for dependency in setup_step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Setup step {setup_step.name} depends on an unknown step: {dependency}")
+        # Depth-first search for the dependency cycles
+        visited, in_progress = set(), set()
+
+        def visit(name: str, path: list[str]) -> None:
+            if name in in_progress:
+                cycle = path[path.index(name) :] + [name]
+                raise ValueError(f"Setup step dependency cycle: {' -> '.join(cycle)}")
+            if name in visited:
+                return
+            in_progress.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency, path + [name])
+            in_progress.remove(name)
+            visited.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    def _execute_step(self, setup_step: SetupStep) -> None:
+        setup_step.start_time = time.monotonic()
+        setup_step.status = "running"
+        log.debug(f"Setup step {setup_step.name} started")
+        try:
+            setup_step.function(*setup_step.args)
+        except Exception:
+            setup_step.error = traceback.format_exc()
+            setup_step.status = "failed"
+            raise
+        finally:
+            setup_step.end_time = time.monotonic()
+        setup_step.status = "passed"
+        log.debug(f"Setup step {setup_step.name} completed in {setup_step.duration:.2f}s")
+
+    def run(self) -> None:
+        """
+        Execute all setup steps.
+
+        Raises:
+            ValueError: Dependencies of the steps are not valid.
+            RuntimeError: Setup step failed.
+        """
+        self._validate()
+        self.start_time = time.monotonic()
+        pending = dict(self.steps)
+        completed: set[str] = set()
+        failed: list[SetupStep] = []
+        running: dict = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers or max(len(self.steps), 1)) as executor:
+            while pending or running:
+                if not failed:
+                    ready = [
+                        setup_step
+                        for setup_step in pending.values()
+                        if all(dependency in completed for dependency in setup_step.depends_on)
+                    ]
+                    for setup_step in ready:
+                        del pending[setup_step.name]
+                        running[executor.submit(self._execute_step, setup_step)] = setup_step
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    setup_step = running.pop(future)
+                    if future.exception() is None:
+                        completed.add(setup_step.name)
+                    else:
+                        failed.append(setup_step)
+        for setup_step in pending.values():
+            setup_step.status = "skipped"
+        self.end_time = time.monotonic()
+        if failed:
+            failed_names = ", ".join(setup_step.name for setup_step in failed)
+            raise RuntimeError(f"Setup step(s) failed: {failed_names}\n{failed[0].error}")
+
+    def critical_path(self) -> list[str]:
+        """
+        Return the chain of dependent steps which determined the end of the setup.
+
+        Starting at the step which ended last, the path follows the
+        dependency which ended last, as that is the dependency the step
+        waited for.
+
+        Returns:
+            (list): Names of the steps, in the execution order.
+        """
+        executed = [setup_step for setup_step in self.steps.values() if setup_step.end_time is not None]
+        if not executed:
+            return []
+        path = [max(executed, key=lambda setup_step: setup_step.end_time)]
+        while True:
+            dependencies = [self.steps[name] for name in path[-1].depends_on if self.steps[name].end_time is not None]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=lambda setup_step: setup_step.end_time))
+        return [setup_step.name for setup_step in reversed(path)]
+
+    def timing_report(self) -> dict:
+        """
+        Return the timing breakdown of the setup.
+
+        Returns:
+            (dict): Total duration, critical path and the status, dependencies, start offset from the
+                setup start and duration of each step, in seconds.
+        """
+        steps = {}
+        for setup_step in self.steps.values():
+            started = setup_step.start_time is not None and self.start_time is not None
+            steps[setup_step.name] = {
+                "status": setup_step.status,
+                "depends_on": list(setup_step.depends_on),
+                "start": round(setup_step.start_time - self.start_time, 3) if started else None,
+                "duration": round(setup_step.duration, 3) if setup_step.duration is not None else None,
+            }
+        total_duration = None
+        if self.start_time is not None and self.end_time is not None:
+            total_duration = round(self.end_time - self.start_time, 3)
+        return {
+            "total_duration": total_duration,
+            "serial_duration": round(sum(step["duration"] or 0 for step in steps.values()), 3),
+            "critical_path": self.critical_path(),
+            "steps": steps,
+        }
@@ -0,0 +1,90 @@
+"""
+FUT shard plugin.
+
+This pytest plugin selects the test cases of a shard and records the
+durations of the executed test cases, used to balance the shards of the
+following runs. The shards are created and executed by the
+framework/tools/fut_shard_runner.py tool.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from framework.lib.fut_sharding import get_suite_name
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run_shard",
+        type=str,
+        action="store",
+        default=None,
+        help="Path to the JSON file with the node IDs of the test cases to run, created by fut_shard_runner.py.",
+    )
+    parser.addoption(
+        "--shard_durations",
+        type=str,
+        action="store",
+        default=None,
+        help="Path to the JSON file to which the durations of the executed test cases are written.",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Executed before the FUT collection hook, which determines the required devices from the remaining items
+    shard_file = config.getoption("run_shard")
+    if not shard_file:
+        return
+    with open(shard_file) as shard_fd:
+        shard_node_ids = set(json.load(shard_fd))
+    selected = [item for item in items if item.nodeid in shard_node_ids]
+    deselected = [item for item in items if item.nodeid not in shard_node_ids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+class ShardDurationRecorder:
+    """
+    Records the durations of the executed test cases.
+
+    The setup of the first test case of each test suite includes the
+    setup of the suite scoped fixtures, so it is recorded as the suite
+    setup duration instead of the test case duration.
+
+    Args:
+        durations_file (str): Path to the JSON file to which the durations are written.
+    """
+
+    def __init__(self, durations_file: str):
+        self.durations_file = durations_file
+        self.phase_durations: dict[str, dict] = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.phase_durations.setdefault(report.nodeid, {})[report.when] = report.duration
+
+    def get_durations(self) -> dict:
+        cases, suites = {}, {}
+        for node_id, phase_durations in self.phase_durations.items():
+            setup_duration = phase_durations.get("setup", 0.0)
+            suite = get_suite_name(node_id)
+            if suite not in suites:
+                suites[suite] = round(setup_duration, 3)
+                setup_duration = 0.0
+            call_duration = phase_durations.get("call", 0.0) + phase_durations.get("teardown", 0.0)
+            cases[node_id] = round(setup_duration + call_duration, 3)
+        return {"cases": cases, "suites": suites}
+
+    def pytest_sessionfinish(self):
+        Path(self.durations_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.durations_file, "w") as durations_fd:
+            json.dump(self.get_durations(), durations_fd, indent=4)
+
+
+def pytest_configure(config):
+    durations_file = config.getoption("shard_durations")
+    if durations_file:
+        config.pluginmanager.register(ShardDurationRecorder(durations_file), "fut_shard_duration_recorder")
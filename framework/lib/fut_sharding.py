@@ -0,0 +1,359 @@
+"""
+FUT test run sharding.
+
+This module contains the functions which split a single FUT test run
+between several identical testbeds. The parametrized test cases are
+collected once, split into shards balanced by the durations recorded in
+the previous runs, and each shard is executed by a separate pytest
+process against its own testbed, selected with the OPENSYNC_TESTBED
+environment variable. The Allure results of the shards are merged into a
+single results directory, so one report is generated for the whole run.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lib_testbed.generic.util.logger import log
+
+FUT_BASE_DIR = Path(__file__).absolute().parents[2].as_posix()
+SHARD_HISTORY_FILE = Path(FUT_BASE_DIR).joinpath(".fut_cache", "shard_durations.json").as_posix()
+# Estimated duration in seconds of test cases and suite setups without any recorded duration
+DEFAULT_CASE_DURATION = 30.0
+DEFAULT_SUITE_SETUP_DURATION = 60.0
+
+
+def get_suite_name(node_id: str) -> str:
+    """
+    Return the test suite (class) name of the test case.
+
+    Args:
+        node_id (str): Pytest node ID, e.g. "test/DM_test.py::TestDm::test_dm_verify_awlan_node_params[cfg0]".
+
+    Returns:
+        (str): Test suite name, or the module path if the test case is not in a class.
+    """
+    parts = node_id.split("::")
+    return parts[1] if len(parts) > 2 else parts[0]
+
+
+def get_test_name(node_id: str) -> str:
+    """
+    Return the node ID of the test case without the parameter ID.
+
+    Args:
+        node_id (str): Pytest node ID.
+
+    Returns:
+        (str): Node ID of the test function.
+    """
+    return node_id.split("[", 1)[0]
+
+
+def load_duration_history(history_file: str | None = None) -> dict:
+    """
+    Load the test case and suite setup durations recorded in the previous runs.
+
+    Args:
+        history_file (str | None): Path to the history file. Defaults to SHARD_HISTORY_FILE.
+
+    Returns:
+        (dict): Dictionary with the "cases" and "suites" durations in seconds.
+    """
+    history_file = history_file or SHARD_HISTORY_FILE
+    try:
+        with open(history_file) as history_fd:
+            history = json.load(history_fd)
+    except FileNotFoundError:
+        history = {}
+    except (OSError, ValueError) as exception:
+        log.warning(f"Failed to load shard duration history {history_file}: {exception}")
+        history = {}
+    return {"cases": history.get("cases", {}), "suites": history.get("suites", {})}
+
+
+def update_duration_history(durations_files: list[str], history_file: str | None = None) -> dict:
+    """
+    Merge the durations recorded by the shards into the history file.
+
+    Args:
+        durations_files (list): Paths to the durations files written by the shards.
+        history_file (str | None): Path to the history file. Defaults to SHARD_HISTORY_FILE.
+
+    Returns:
+        (dict): Updated history.
+    """
+    history_file = history_file or SHARD_HISTORY_FILE
+    history = load_duration_history(history_file)
+    for durations_file in durations_files:
+        try:
+            with open(durations_file) as durations_fd:
+                durations = json.load(durations_fd)
+        except (OSError, ValueError) as exception:
+            log.warning(f"Failed to load shard durations {durations_file}: {exception}")
+            continue
+        history["cases"].update(durations.get("cases", {}))
+        history["suites"].update(durations.get("suites", {}))
+    history_dir = Path(history_file).parent
+    history_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=history_dir, suffix=".tmp", delete=False) as tmp_fd:
+        json.dump(history, tmp_fd, indent=4, sort_keys=True)
+    os.replace(tmp_fd.name, history_file)
+    return history
+
+
+def estimate_durations(node_ids: list[str], history: dict) -> dict[str, float]:
+    """
+    Estimate the duration of each test case.
+
+    Test cases without a recorded duration are estimated by the median of
+    the recorded durations of the same test function, then of the same
+    test suite, then of all test cases.
+
+    Args:
+        node_ids (list): Pytest node IDs.
+        history (dict): Recorded durations, as returned by load_duration_history.
+
+    Returns:
+        (dict): Estimated duration of each test case in seconds.
+    """
+    recorded = history.get("cases", {})
+    by_test, by_suite = {}, {}
+    for node_id, duration in recorded.items():
+        by_test.setdefault(get_test_name(node_id), []).append(duration)
+        by_suite.setdefault(get_suite_name(node_id), []).append(duration)
+    overall = statistics.median(recorded.values()) if recorded else DEFAULT_CASE_DURATION
+    estimates = {}
+    for node_id in node_ids:
+        if node_id in recorded:
+            estimates[node_id] = recorded[node_id]
+        elif get_test_name(node_id) in by_test:
+            estimates[node_id] = statistics.median(by_test[get_test_name(node_id)])
+        elif get_suite_name(node_id) in by_suite:
+            estimates[node_id] = statistics.median(by_suite[get_suite_name(node_id)])
+        else:
+            estimates[node_id] = overall
+    return estimates
+
+
+def split_into_shards(node_ids: list[str], num_shards: int, history: dict | None = None) -> list[list[str]]:
+    """
+    Split the test cases into shards with balanced estimated durations.
+
+    The test cases are assigned longest first, each to the shard on which
+    it would finish earliest. A shard executing the first test case of a
+    test suite also pays the setup of the suite, so the test cases of a
+    suite are only spread across the shards when it shortens the run.
+    Within each shard the test cases keep the collection order, as the
+    test suites expect.
+
+    Args:
+        node_ids (list): Pytest node IDs, in the collection order.
+        num_shards (int): Number of shards.
+        history (dict | None): Recorded durations, as returned by load_duration_history. Defaults to None.
+
+    Raises:
+        ValueError: Number of shards is not positive.
+
+    Returns:
+        (list): Node IDs of each shard.
+    """
+    if num_shards < 1:
+        raise ValueError(f"Number of shards must be positive: {num_shards}")
+    history = history or {"cases": {}, "suites": {}}
+    estimates = estimate_durations(node_ids, history)
+    suite_setup = history.get("suites", {})
+    loads = [0.0] * num_shards
+    shard_suites: list[set] = [set() for _ in range(num_shards)]
+    assignment = {}
+    for node_id in sorted(node_ids, key=lambda node_id: estimates[node_id], reverse=True):
+        suite = get_suite_name(node_id)
+        setup_duration = suite_setup.get(suite, DEFAULT_SUITE_SETUP_DURATION)
+        finish_times = [
+            loads[shard] + estimates[node_id] + (0 if suite in shard_suites[shard] else setup_duration)
+            for shard in range(num_shards)
+        ]
+        shard = min(range(num_shards), key=lambda shard: (finish_times[shard], shard))
+        loads[shard] = finish_times[shard]
+        shard_suites[shard].add(suite)
+        assignment[node_id] = shard
+    shards: list[list[str]] = [[] for _ in range(num_shards)]
+    for node_id in node_ids:
+        shards[assignment[node_id]].append(node_id)
+    return shards
+
+
+def estimate_shard_duration(shard: list[str], history: dict) -> float:
+    """
+    Estimate the duration of the shard, including the setup of each test suite.
+
+    Args:
+        shard (list): Node IDs of the shard.
+        history (dict): Recorded durations, as returned by load_duration_history.
+
+    Returns:
+        (float): Estimated duration in seconds.
+    """
+    suites = {get_suite_name(node_id) for node_id in shard}
+    suite_setup = history.get("suites", {})
+    setup_duration = sum(suite_setup.get(suite, DEFAULT_SUITE_SETUP_DURATION) for suite in suites)
+    return setup_duration + sum(estimate_durations(shard, history).values())
+
+
+def collect_node_ids(pytest_args: list[str], testbed: str, pytest_command: list[str] | None = None) -> list[str]:
+    """
+    Collect the test cases of the run.
+
+    The collection generates the test configuration with the device
+    capabilities of the testbed, so the identical testbeds yield the same
+    parametrized test cases.
+
+    Args:
+        pytest_args (list): Pytest arguments selecting the test cases.
+        testbed (str): Name of the testbed used for the collection.
+        pytest_command (list | None): Command which runs pytest. Defaults to the current Python interpreter.
+
+    Raises:
+        RuntimeError: Collection failed.
+
+    Returns:
+        (list): Pytest node IDs, in the collection order.
+    """
+    pytest_command = pytest_command or [sys.executable, "-m", "pytest"]
+    cmd = [*pytest_command, "--collect-only", "-q", *pytest_args]
+    result = subprocess.run(
+        cmd,
+        cwd=FUT_BASE_DIR,
+        env={**os.environ, "OPENSYNC_TESTBED": testbed},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to collect test cases: {' '.join(cmd)}\n{result.stdout}\n{result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line and not line.startswith(" ")]
+
+
+class ShardResult:
+    """
+    Result of the shard execution.
+
+    Args:
+        index (int): Index of the shard.
+        testbed (str): Name of the testbed which executed the shard.
+        shard_dir (str): Directory with the shard files and results.
+        node_ids (list): Node IDs of the shard.
+    """
+
+    def __init__(self, index: int, testbed: str, shard_dir: str, node_ids: list[str]):
+        self.index = index
+        self.testbed = testbed
+        self.shard_dir = shard_dir
+        self.node_ids = node_ids
+        self.exit_code: int | None = None
+        self.duration: float | None = None
+
+    @property
+    def shard_file(self) -> str:
+        return Path(self.shard_dir).joinpath("shard.json").as_posix()
+
+    @property
+    def results_dir(self) -> str:
+        return Path(self.shard_dir).joinpath("allure-results").as_posix()
+
+    @property
+    def durations_file(self) -> str:
+        return Path(self.shard_dir).joinpath("durations.json").as_posix()
+
+    @property
+    def log_file(self) -> str:
+        return Path(self.shard_dir).joinpath("pytest.log").as_posix()
+
+
+def run_shard(
+    shard_result: ShardResult,
+    pytest_args: list[str],
+    pytest_command: list[str] | None = None,
+) -> ShardResult:
+    """
+    Execute the shard against its testbed.
+
+    Args:
+        shard_result (ShardResult): Shard to execute.
+        pytest_args (list): Additional pytest arguments.
+        pytest_command (list | None): Command which runs pytest. Defaults to the current Python interpreter.
+
+    Returns:
+        (ShardResult): Shard with the exit code and the duration of the execution.
+    """
+    pytest_command = pytest_command or [sys.executable, "-m", "pytest"]
+    Path(shard_result.shard_dir).mkdir(parents=True, exist_ok=True)
+    with open(shard_result.shard_file, "w") as shard_fd:
+        json.dump(shard_result.node_ids, shard_fd, indent=4)
+    cmd = [
+        *pytest_command,
+        *pytest_args,
+        f"--run_shard={shard_result.shard_file}",
+        f"--shard_durations={shard_result.durations_file}",
+        f"--alluredir={shard_result.results_dir}",
+    ]
+    log.info(f"Shard {shard_result.index}: {len(shard_result.node_ids)} test cases on {shard_result.testbed}")
+    start_time = time.monotonic()
+    with open(shard_result.log_file, "w") as log_fd:
+        shard_result.exit_code = subprocess.run(
+            cmd,
+            cwd=FUT_BASE_DIR,
+            env={**os.environ, "OPENSYNC_TESTBED": shard_result.testbed},
+            stdout=log_fd,
+            stderr=subprocess.STDOUT,
+        ).returncode
+    shard_result.duration = time.monotonic() - start_time
+    log.info(f"Shard {shard_result.index} on {shard_result.testbed} exited with {shard_result.exit_code}")
+    return shard_result
+
+
+def run_shards(
+    shards: list[list[str]],
+    testbeds: list[str],
+    output_dir: str,
+    pytest_args: list[str],
+    pytest_command: list[str] | None = None,
+) -> list[ShardResult]:
+    """
+    Execute the shards in parallel, each against its own testbed.
+
+    Empty shards are not executed.
+
+    Args:
+        shards (list): Node IDs of each shard.
+        testbeds (list): Testbed names, one for each shard.
+        output_dir (str): Directory of the shard files and results.
+        pytest_args (list): Additional pytest arguments.
+        pytest_command (list | None): Command which runs pytest. Defaults to the current Python interpreter.
+
+    Raises:
+        ValueError: Number of testbeds does not match the number of shards.
+
+    Returns:
+        (list): Results of the executed shards.
+    """
+    if len(shards) != len(testbeds):
+        raise ValueError(f"Number of shards {len(shards)} does not match the number of testbeds {len(testbeds)}")
+    shard_results = [
+        ShardResult(index, testbed, Path(output_dir).joinpath(f"shard_{index}").as_posix(), node_ids)
+        for index, (testbed, node_ids) in enumerate(zip(testbeds, shards))
+        if node_ids
+    ]
+    if not shard_results:
+        return []
+    with ThreadPoolExecutor(max_workers=len(shard_results)) as executor:
+        futures = [
+            executor.submit(run_shard, shard_result, pytest_args, pytest_command) for shard_result in shard_results
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,261 @@
+"""
+FUT SSH connection pool.
+
+This module contains the per-device pool of multiplexed SSH channels. A
+single OpenSSH master connection (ControlMaster) is established per
+device and kept alive with SSH keepalives. Each remote command is
+executed on a new channel of the master connection, so the TCP
+connection, the key exchange and the authentication are paid once per
+device instead of on every command. The number of concurrently open
+channels is bounded, and the master connection is health checked and
+re-established when it is lost.
+"""
+
+import atexit
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from framework.lib.fut_latency import percentile
+from lib_testbed.generic.util.logger import log
+
+
+class SshPoolError(Exception):
+    """Raised when the SSH connection pool is not usable, the caller is expected to fall back to a new SSH session."""
+
+
+class SshConnectionPool:
+    """
+    Pool of multiplexed SSH channels to a single device.
+
+    The master connection is started lazily on the first command. Before a
+    command is executed, the master connection is health checked if the
+    last check is older than 'health_check_interval', or if the previous
+    command failed with the SSH error exit code 255. A lost master
+    connection is re-established, and after 'max_restarts' consecutive
+    failures the pool is disabled and the caller is expected to fall back
+    to regular command execution.
+
+    Args:
+        name (str): Name of the device, used for logging.
+        ssh_command (Callable): Function which returns the local SSH command for the remote command and the
+            additional SSH options, e.g. the get_ssh_command method of the device handler.
+        max_channels (int): Maximum number of concurrently open channels. Defaults to 8.
+        keepalive_interval (int): Interval in seconds of the SSH keepalive messages. Defaults to 10.
+        keepalive_count_max (int): Number of unanswered keepalive messages after which the master connection is
+            considered lost. Defaults to 3.
+        health_check_interval (int): Interval in seconds of the master connection health checks. Defaults to 30.
+        connect_timeout (int): Timeout in seconds of the master connection setup. Defaults to 15.
+        idle_timeout (int): Time in seconds after which an unused master connection is closed. Defaults to 600.
+        max_restarts (int): Number of consecutive master connection failures tolerated before the pool is
+            disabled. Defaults to 3.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ssh_command: Callable[[str, list[str]], list[str]],
+        max_channels: int = 8,
+        keepalive_interval: int = 10,
+        keepalive_count_max: int = 3,
+        health_check_interval: int = 30,
+        connect_timeout: int = 15,
+        idle_timeout: int = 600,
+        max_restarts: int = 3,
+    ):
+        self.name = name
+        self.ssh_command = ssh_command
+        self.max_channels = max_channels
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count_max = keepalive_count_max
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self.max_restarts = max_restarts
+        self.restart_count = 0
+        self.disabled = False
+        self.master_started = False
+        self.control_dir: str | None = None
+        self.control_path: str | None = None
+        self.latencies: deque = deque(maxlen=1000)
+        self._channels = threading.BoundedSemaphore(max_channels)
+        self._lock = threading.RLock()
+        self._last_health_check = 0.0
+        atexit.register(self.close)
+
+    def _control_options(self) -> list[str]:
+        return ["-o", f"ControlPath={self.control_path}"]
+
+    def _control_command(self, operation: str) -> list[str]:
+        return self.ssh_command("", ["-O", operation, *self._control_options()])
+
+    def _run_local(self, command: list[str], timeout: float) -> int:
+        try:
+            return subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout,
+                check=False,
+            ).returncode
+        except (OSError, subprocess.TimeoutExpired) as exception:
+            log.debug(f"SSH control command on {self.name} failed: {exception}")
+            return 255
+
+    def start(self) -> None:
+        """
+        Establish the master connection.
+
+        Raises:
+            SshPoolError: If the master connection could not be established.
+        """
+        with self._lock:
+            self.control_dir = tempfile.mkdtemp(prefix="fut-ssh-")
+            self.control_path = f"{self.control_dir}/{self.name}"
+            master_options = [
+                "-N",
+                "-o",
+                "ControlMaster=yes",
+                *self._control_options(),
+                "-o",
+                f"ControlPersist={self.idle_timeout}",
+                "-o",
+                f"ConnectTimeout={self.connect_timeout}",
+                "-o",
+                f"ServerAliveInterval={self.keepalive_interval}",
+                "-o",
+                f"ServerAliveCountMax={self.keepalive_count_max}",
+            ]
+            log.debug(f"Starting SSH master connection to {self.name}")
+            # The master connection moves to the background once it is established
+            self._run_local(self.ssh_command("", master_options), timeout=self.connect_timeout + 5)
+            if not self.check():
+                self.close(crashed=True)
+                raise SshPoolError(f"SSH master connection to {self.name} could not be established.")
+            self.master_started = True
+            self.restart_count = 0
+            self._last_health_check = time.monotonic()
+            log.debug(f"SSH master connection to {self.name} is established.")
+
+    def check(self) -> bool:
+        """
+        Check the master connection.
+
+        Returns:
+            (bool): True if the master connection is alive, False otherwise.
+        """
+        return self.control_path is not None and self._run_local(self._control_command("check"), 5) == 0
+
+    def _ensure_master(self) -> None:
+        with self._lock:
+            if self.disabled:
+                raise SshPoolError(f"SSH connection pool of {self.name} is disabled.")
+            if self.master_started:
+                if time.monotonic() - self._last_health_check < self.health_check_interval:
+                    return
+                if self.check():
+                    self._last_health_check = time.monotonic()
+                    return
+                log.warning(f"SSH master connection to {self.name} was lost, re-establishing it.")
+                self.close(crashed=True)
+                if self.disabled:
+                    raise SshPoolError(f"SSH connection pool of {self.name} is disabled.")
+            self.start()
+
+    def run(self, command: str, timeout: float | None = None) -> list:
+        """
+        Execute the command on a channel of the master connection.
+
+        The call blocks while all channels are in use.
+
+        Args:
+            command (str): Command executed on the device.
+            timeout (float | None): Command timeout in seconds. Defaults to None.
+
+        Raises:
+            SshPoolError: If the master connection is not usable.
+
+        Returns:
+            (list): Exit code (int), standard output (str) and standard error (str) of the executed command. The
+                exit code is 124 if the command timed out.
+        """
+        with self._channels:
+            self._ensure_master()
+            channel_command = self.ssh_command(command, ["-o", "ControlMaster=no", *self._control_options()])
+            start_time = time.perf_counter()
+            try:
+                result = subprocess.run(
+                    channel_command,
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    timeout=timeout,
+                    check=False,
+                )
+            except subprocess.TimeoutExpired as exception:
+                std_out = (exception.stdout or b"").decode("utf-8", errors="replace").strip()
+                return [124, std_out, f"Command timed out after {timeout}s: {command}"]
+            except OSError as exception:
+                raise SshPoolError(f"Failed to open SSH channel to {self.name}: {exception}") from exception
+            finally:
+                self.latencies.append(time.perf_counter() - start_time)
+
+        if result.returncode == 255:
+            # SSH failure, the master connection is checked before the next command
+            self._last_health_check = 0.0
+        return [
+            result.returncode,
+            result.stdout.decode("utf-8", errors="replace").strip(),
+            result.stderr.decode("utf-8", errors="replace").strip(),
+        ]
+
+    def latency_percentiles(self) -> dict:
+        """
+        Return the command latency statistics of the recent commands.
+
+        Returns:
+            (dict): Number of samples, p50 and p99 latency in seconds.
+        """
+        latencies = list(self.latencies)
+        return {"samples": len(latencies), "p50": percentile(latencies, 0.5), "p99": percentile(latencies, 0.99)}
+
+    def close(self, crashed: bool = False) -> None:
+        """
+        Close the master connection.
+
+        The master connection is established again on the next command.
+
+        Args:
+            crashed (bool): The master connection failed unexpectedly, which counts towards 'max_restarts'.
+                Defaults to False.
+        """
+        with self._lock:
+            if self.control_path is not None:
+                if self.master_started:
+                    self._run_local(self._control_command("exit"), 5)
+                shutil.rmtree(self.control_dir, ignore_errors=True)
+            self.master_started = False
+            self.control_dir = None
+            self.control_path = None
+            if crashed:
+                self.restart_count += 1
+                if self.restart_count > self.max_restarts and not self.disabled:
+                    log.warning(f"SSH connection pool of {self.name} failed {self.restart_count} times, disabling it.")
+                    self.disabled = True
+
+    def reset(self) -> None:
+        """
+        Close the master connection and clear the failure count.
+
+        Used after the device has recovered from a connection loss, e.g. a
+        reboot, so the master connection failures during the outage do not
+        leave the pool disabled.
+        """
+        with self._lock:
+            self.close()
+            self.restart_count = 0
+            self.disabled = False
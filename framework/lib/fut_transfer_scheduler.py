@@ -0,0 +1,106 @@
+"""
+FUT file transfer scheduler.
+
+This module contains the scheduler which bounds the file transfers to
+the testbed devices. Transfers to different devices run in parallel, up
+to the configured concurrency, while transfers to the same device are
+serialized. The optional bandwidth cap paces the start of transfers, so
+that the combined rate of all transfers does not exceed it.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from lib_testbed.generic.util.logger import log
+
+
+class TransferScheduler:
+    """
+    Bounded parallel scheduler for file transfers.
+
+    Args:
+        max_concurrency (int): Maximum number of concurrent transfers. Defaults to 4.
+        max_bandwidth (int | None): Maximum combined transfer rate in bytes
+            per second. Defaults to None, which means unlimited.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_bandwidth: int | None = None):
+        if max_concurrency < 1:
+            raise ValueError(f"Transfer concurrency must be a positive integer, not {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.max_bandwidth = max_bandwidth if max_bandwidth and max_bandwidth > 0 else None
+        self.transfer_stats: dict[str, dict] = {}
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._device_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._bandwidth_available_at = 0.0
+
+    def _get_device_lock(self, device_name: str) -> threading.Lock:
+        with self._lock:
+            return self._device_locks.setdefault(device_name, threading.Lock())
+
+    @contextmanager
+    def slot(self, device_name: str):
+        """
+        Context manager which holds a transfer slot for the device.
+
+        Waits until no other transfer to the same device is in progress
+        and the number of concurrent transfers is below the limit.
+
+        Args:
+            device_name (str): Name of the device.
+        """
+        with self._get_device_lock(device_name):
+            wait_start_time = time.monotonic()
+            with self._slots:
+                wait_duration = time.monotonic() - wait_start_time
+                if wait_duration > 1:
+                    log.debug(f"Transfer to {device_name} waited {wait_duration:.1f}s for a transfer slot")
+                yield
+
+    def reserve_bandwidth(self, num_bytes: int) -> float:
+        """
+        Wait until the transfer of the provided number of bytes fits into the bandwidth cap.
+
+        Each reservation occupies the shared bandwidth for the time needed
+        to transfer its bytes at the maximum rate. Reservations are served
+        in order of arrival.
+
+        Args:
+            num_bytes (int): Number of bytes about to be transferred.
+
+        Returns:
+            (float): Time in seconds spent waiting.
+        """
+        if not self.max_bandwidth or num_bytes <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start_time = max(now, self._bandwidth_available_at)
+            self._bandwidth_available_at = start_time + num_bytes / self.max_bandwidth
+        wait_duration = start_time - now
+        if wait_duration > 0:
+            time.sleep(wait_duration)
+        return wait_duration
+
+    def record(self, device_name: str, num_bytes: int, duration: float) -> dict:
+        """
+        Record a completed transfer and return the accumulated statistics of the device.
+
+        Args:
+            device_name (str): Name of the device.
+            num_bytes (int): Number of transferred bytes.
+            duration (float): Duration of the transfer in seconds.
+
+        Returns:
+            (dict): Transferred bytes, duration and throughput in bytes per second of the device.
+        """
+        with self._lock:
+            device_stats = self.transfer_stats.setdefault(device_name, {"bytes": 0, "duration": 0.0})
+            device_stats["bytes"] += num_bytes
+            device_stats["duration"] = round(device_stats["duration"] + duration, 3)
+            device_stats["throughput"] = (
+                round(device_stats["bytes"] / device_stats["duration"]) if device_stats["duration"] else None
+            )
+            return dict(device_stats)
@@ -1,4 +1,5 @@
 import time
+from copy import deepcopy
 from os import PathLike
 from pathlib import Path
 from random import randrange
@@ -9,7 +10,10 @@ from mergedeep import merge, Strategy
 
 from config.defaults import radio_band_list
 from framework.device_handler import DeviceHandler
-from framework.lib.fut_lib import get_str_hash, step
+from framework.lib.fut_lib import allure_attach_to_report, get_str_hash, parse_process_fingerprints, step
+from framework.lib.fut_log_stream import LogStream, LogStreamError
+from framework.lib.fut_ovsdb_batch import OvsdbBatch
+from framework.lib.fut_reconnect import load_reconnection_policy
 from lib_testbed.generic.util.logger import log
 
 
@@ -23,6 +27,9 @@ class NodeHandler(DeviceHandler):
         self.opensync_root_dir = self.capabilities.get_opensync_rootdir()
         self.ovsdb = self.device_api.lib.ovsdb
         self.interfaces: dict = {}
+        # Last successfully applied VIF configuration arguments, keyed by the VIF interface name
+        self.applied_interface_args: dict = {}
+        self.log_stream = self._get_log_stream()
 
     def configure_device_mode(self, device_mode: str) -> Literal[True]:
         """
@@ -84,6 +91,7 @@ class NodeHandler(DeviceHandler):
         Raises:
             AssertionError: If the command to reset the VIF fails.
         """
+        self.applied_interface_args.clear()
         assert self.execute("tools/device/vif_reset")[0] == self.expected_shell_result
 
     def create_and_configure_backhaul(
@@ -592,6 +600,20 @@ class NodeHandler(DeviceHandler):
             (tuple): Exit code (int), standard output (str) and standard error (str) of the executed command.
         """
         attach_on_pass = kwargs.get("attach_on_pass", False)
+        if self.log_stream and not self.log_stream.disabled:
+            try:
+                log_stream_start_mark = self.log_stream.mark()
+            except LogStreamError as exception:
+                log.warning(f"Log stream is not available, tailing the log file on the device instead: {exception}")
+            else:
+                cmd_res = self.execute(path, args, as_sudo=as_sudo, **kwargs)
+                if cmd_res[0] != 0 or attach_on_pass:
+                    log_lines = self.log_stream.get_lines(log_stream_start_mark)
+                    allure_attach_to_report(
+                        name=f'{self.name}_{time.strftime("%Y%m%d-%H%M%S")}.log',
+                        body="\n".join(log_lines),
+                    )
+                return cmd_res
         try:
             self._start_log_tail()
             cmd_res = self.execute(path, args, as_sudo=as_sudo, **kwargs)
@@ -603,6 +625,27 @@ class NodeHandler(DeviceHandler):
             self._remove_log_tail_file_remotely()
         return cmd_res
 
+    def _get_log_stream(self) -> LogStream | None:
+        """
+        Return the persistent log stream handler, if enabled.
+
+        The log stream is enabled by setting the FUT_LOG_STREAM environment
+        variable. It is used by execute_with_logging instead of tailing the
+        system log into a file on the device for each execution.
+
+        Returns:
+            (LogStream | None): Log stream handler or None if disabled.
+        """
+        if not self.fut_configurator.log_stream_enabled:
+            return None
+        try:
+            log_tail_command = self._get_log_tail_command()
+        except RuntimeError as exception:
+            log.warning(f"Log stream on {self.name} is disabled: {exception}")
+            return None
+        log.debug(f"Log stream enabled on {self.name}")
+        return LogStream(name=self.name, spawn_cmd=self.get_ssh_command(log_tail_command))
+
     def _get_log_tail_command(self) -> str:
         """
         Get the command for tailing the system log on the device. Stores this information as an object attribute.
@@ -668,7 +711,7 @@ class NodeHandler(DeviceHandler):
         log_tail_file_name = self._get_log_tail_file_name()
         log_tail_remove_cmd = f"[ -e {log_tail_file_name} ] && rm {log_tail_file_name}"
         try:
-            cmd_res = self.device_api.run_raw(log_tail_remove_cmd, timeout=5)
+            cmd_res = self.run_raw(log_tail_remove_cmd, timeout=5)
             if cmd_res[0] != 0:
                 log.warning(f"Encountered issue while removing log file remotely: {cmd_res[2]}")
         finally:
@@ -688,7 +731,7 @@ class NodeHandler(DeviceHandler):
         log_tail_timeout = 70 if self.test_script_timeout <= 70 else self.test_script_timeout
         log_tail_start_cmd = f"timeout {log_tail_timeout} {log_tail_command} > {log_tail_file_name} &"
         log.debug(f"Log tail start command: '{log_tail_start_cmd}'")
-        cmd_res = self.device_api.run_raw(log_tail_start_cmd, timeout=5)
+        cmd_res = self.run_raw(log_tail_start_cmd, timeout=5)
         if cmd_res[0] != 0:
             log.warning(f"Encountered issue while starting log tailing process: {cmd_res[2]}")
 
@@ -698,7 +741,7 @@ class NodeHandler(DeviceHandler):
 
         If the log tailing processes are not stopped correctly, it will only log a warning.
         """
-        cmd_res = self.device_api.run_raw(f"pkill {self._get_log_tail_command().split()[0]}", timeout=5)
+        cmd_res = self.run_raw(f"pkill {self._get_log_tail_command().split()[0]}", timeout=5)
         if cmd_res[0] != 0:
             log.warning(f"Encountered issue while stopping log tailing process: {cmd_res[2]}")
 
@@ -706,6 +749,8 @@ class NodeHandler(DeviceHandler):
         """
         Perform the necessary device setup for FUT test case execution.
 
+        The reconnection policy of the test suite is applied to the device.
+
         Args:
             test_suite_name (str): Name of the test suite to be executed.
             setup_args (str): Additional setup arguments to be passed to
@@ -714,6 +759,7 @@ class NodeHandler(DeviceHandler):
         Returns:
             (bool): True if setup is successful.
         """
+        self.reconnection_policy = load_reconnection_policy(test_suite_name)
         with step(f"{self.name.upper()} setup"):
             with step(f"{test_suite_name.upper()} setup"):
                 assert self.execute(f"tests/{test_suite_name}/{test_suite_name}_setup", setup_args)[0] == 0
@@ -745,16 +791,74 @@ class NodeHandler(DeviceHandler):
         """
         if hasattr(self, "bridge_type"):
             return self.bridge_type
+        if self.device_snapshot.get("bridge_type"):
+            self.bridge_type = self.device_snapshot.get("bridge_type")
+            return self.bridge_type
         ovs_version = self.ovsdb.get(
             table="AWLAN_Node",
             select="ovs_version",
             skip_exception=True,
         )
+        return self._set_bridge_type(ovs_version)
+
+    def _set_bridge_type(self, ovs_version: str | None) -> str:
+        """
+        Store the networking bridge type determined from the AWLAN_Node 'ovs_version' field value.
+
+        Args:
+            ovs_version (str | None): The 'ovs_version' field value, None if it is not available.
+
+        Returns:
+            bridge_type (str): The networking bridge type: 'native_bridge' or 'ovs_bridge'.
+        """
         # The device is using Native bridge if the 'ovs_version' is not available
-        self.bridge_type = "native_bridge" if "N/A" in ovs_version else "ovs_bridge"
+        self.bridge_type = "native_bridge" if not ovs_version or "N/A" in str(ovs_version) else "ovs_bridge"
         log.info(f"Bridge type on {self.name} is {self.bridge_type}.")
+        self.device_snapshot.set("bridge_type", self.bridge_type)
         return self.bridge_type
 
+    def ovsdb_batch(self) -> OvsdbBatch:
+        """
+        Create a batch of OVSDB select operations, which are executed on the device in a single transaction.
+
+        Example:
+            batch = gw.ovsdb_batch()
+            radio_index = batch.select("Wifi_Radio_State", ["channel"], "if_name==wifi1")
+            vif_index = batch.select("Wifi_VIF_State", ["ssid", "enabled"], "if_name==home-ap-50")
+            results = batch.execute()
+            channel = results[radio_index][0]["channel"]
+
+        Returns:
+            (OvsdbBatch): Empty batch of select operations.
+        """
+        return OvsdbBatch(self.execute)
+
+    def load_startup_ovsdb_state(self) -> None:
+        """
+        Retrieve the OVSDB values used during the session setup with a single transaction.
+
+        The bridge type and the services in the Node_Services table are
+        stored in the node handler, so the get_bridge_type() and the
+        get_node_services_and_status() methods do not access the device.
+        Values that are already known are not queried.
+        """
+        batch = self.ovsdb_batch()
+        awlan_node_index = None
+        if not hasattr(self, "bridge_type") and not self.device_snapshot.get("bridge_type"):
+            # All columns are selected, as the select of a missing column would fail the transaction
+            awlan_node_index = batch.select("AWLAN_Node")
+        node_services_index = None if hasattr(self, "node_services") else batch.select("Node_Services")
+        if not len(batch):
+            return
+        results = batch.execute(skip_exception=True)
+        if awlan_node_index is not None and results[awlan_node_index] is not None:
+            awlan_node = results[awlan_node_index][0] if results[awlan_node_index] else {}
+            self._set_bridge_type(awlan_node.get("ovs_version"))
+        if node_services_index is not None and results[node_services_index] is not None:
+            self.node_services = {
+                row["service"]: {"status": row["status"]} for row in results[node_services_index] if "service" in row
+            }
+
     def get_opensync_version(self) -> str:
         """
         Check the device AWLAN_Node table for the OPENSYNC field value.
@@ -847,12 +951,16 @@ class NodeHandler(DeviceHandler):
         """
         if hasattr(self, "wireless_manager_name"):
             return self.wireless_manager_name
+        if self.device_snapshot.get("wireless_manager_name"):
+            self.wireless_manager_name = self.device_snapshot.get("wireless_manager_name")
+            return self.wireless_manager_name
         wireless_manager_name = self.execute("tools/device/get_wireless_manager_name")
         if wireless_manager_name[0] == self.expected_shell_result:
             self.wireless_manager_name = wireless_manager_name[1].split("\n")[-1]
             log.info(f"Wireless manager name on {self.name} is {self.wireless_manager_name}.")
         else:
             raise RuntimeError(f"Unable to get wireless manager name on {self.name} device: {wireless_manager_name[2]}")
+        self.device_snapshot.set("wireless_manager_name", self.wireless_manager_name)
         return self.wireless_manager_name
 
     def get_wpa3_support(self) -> str:
@@ -869,11 +977,15 @@ class NodeHandler(DeviceHandler):
         """
         if hasattr(self, "wpa3_supported"):
             return self.wpa3_supported
+        if self.device_snapshot.get("wpa3_supported") is not None:
+            self.wpa3_supported = self.device_snapshot.get("wpa3_supported")
+            return self.wpa3_supported
         script = "tools/device/check_wpa3_compatibility"
         result = self.execute(script, skip_logging=True)
         self._add_to_logs(result, script)
         self.wpa3_supported = result[0] == self.expected_shell_result
         log.info(f"WPA3 is {'' if self.wpa3_supported else 'not'} supported on the device.")
+        self.device_snapshot.set("wpa3_supported", self.wpa3_supported)
         return self.wpa3_supported
 
     def get_kconfig(self) -> list:
@@ -885,6 +997,9 @@ class NodeHandler(DeviceHandler):
         """
         if hasattr(self, "kconfig"):
             return self.kconfig
+        if self.device_snapshot.get("kconfig"):
+            self.kconfig = self.device_snapshot.get("kconfig")
+            return self.kconfig
         kconfig_local_path = self.device_api.get_file(
             Path(self.opensync_root_dir).joinpath("etc", "kconfig"),
             self.fut_base_dir,
@@ -893,6 +1008,7 @@ class NodeHandler(DeviceHandler):
         with open(kconfig_local_path) as kconfig:
             kconfig_content = kconfig.readlines()
         self.kconfig = [line.strip() for line in kconfig_content if "#" not in line]
+        self.device_snapshot.set("kconfig", self.kconfig)
         return self.kconfig
 
     def get_kconfig_managers(self) -> list:
@@ -954,13 +1070,18 @@ class NodeHandler(DeviceHandler):
 
     def opensync_pid_retrieval(self, tracked_node_services: list = None) -> dict:
         """
-        Retrieve PIDs of OpenSync related processes on the device.
+        Retrieve PIDs and start times of OpenSync related processes on the device.
 
         The function checks the Node_Services OVSDB table and retrieves
-        their respective PIDs. By default, the method retrieves the PIDs
-        of all the OpenSync related processes on the device. This can be
-        overridden by specifying the processes you wish to track with the
-        tracked_node_services argument.
+        the PIDs and the start times of the enabled services. By default,
+        the method retrieves the fingerprints of all the OpenSync related
+        processes on the device. This can be overridden by specifying the
+        processes you wish to track with the tracked_node_services argument.
+
+        The OVSDB query and the process lookup are performed by a single
+        script execution, which does not source the shell libraries. The
+        OVSDB table is not queried at all if only DM is tracked, as DM is
+        not present in the Node_Services table.
 
         Args:
             tracked_node_services (list): list of node services you wish
@@ -968,28 +1089,14 @@ class NodeHandler(DeviceHandler):
 
         Returns:
             os_proc_pids (dict): Dictionary containing OpenSync related
-                processes and their respective PIDs
+                processes and their respective PIDs and start times,
+                formatted as "<pid>:<start_time>"
 
         """
         log.debug("Executing OpenSync PID retrieval")
-        enabled_node_services = self.ovsdb.get(
-            table="Node_Services",
-            select="service",
-            where="status==enabled",
-        ).split()
-        # Manually append DM since it is not present in the Node_Services table
-        enabled_node_services.append("dm")
-        if tracked_node_services:
-            # Keep track of only those services that are present both in enabled_node_services_stdout and
-            # tracked_node_services
-            enabled_node_services = list(set(enabled_node_services) & set(tracked_node_services))
-        enabled_node_services_list = [
-            f"{self.opensync_root_dir}/bin/{node_service}" for node_service in enabled_node_services
-        ]
-        node_services_pid_args = self.get_command_arguments(*sorted(enabled_node_services_list))
-        os_proc_names_and_pids = self.execute("tools/device/get_process_id", node_services_pid_args)[1].split()
-        os_proc_dict = {proc.split(":")[0]: proc.split(":")[1] for proc in os_proc_names_and_pids}
-        return os_proc_dict
+        node_services_args = self.get_command_arguments(*sorted(set(tracked_node_services or [])))
+        fingerprint_output = self.execute("tools/device/get_process_fingerprint", node_services_args)[1]
+        return parse_process_fingerprints(fingerprint_output)
 
     def create_interface_object(
         self,
@@ -1123,6 +1230,10 @@ class NodeHandler(DeviceHandler):
                 Configure virtual interface arguments for an STA.
         """
 
+        # Scalar state columns compared to the previously applied configuration
+        RADIO_STATE_COLUMNS = ("channel", "ht_mode")
+        VIF_STATE_COLUMNS = ("ap_bridge", "bridge", "enabled", "mode", "ssid", "ssid_broadcast", "vif_radio_idx")
+
         def __init__(
             self,
             node: "NodeHandler",
@@ -1484,7 +1595,7 @@ class NodeHandler(DeviceHandler):
 
             return combined_args
 
-        def _prepare_and_sanitize_combined_args(self) -> str:
+        def _prepare_and_sanitize_combined_args(self, combined_args: dict | None = None) -> str:
             """
             Prepare the combined arguments for usage in shell scripts.
 
@@ -1493,6 +1604,9 @@ class NodeHandler(DeviceHandler):
             `python_value_to_ovsdb_value` method of the `ovsdb` object. It retrieves the command arguments by calling
             the `get_command_arguments` method of the `node` object, passing in the combined arguments list.
 
+            Args:
+                combined_args (dict | None): Arguments to prepare. Defaults to the `combined_args` attribute.
+
             Returns:
                 str: Sanitized combined arguments.
 
@@ -1505,8 +1619,10 @@ class NodeHandler(DeviceHandler):
                 output:
                     str: "-arg_name_1 arg_value_1 -arg_name_2 arg_value_2"
             """
+            if combined_args is None:
+                combined_args = self.combined_args
             combined_args_list = [
-                f"-{k} {self.node.ovsdb.python_value_to_ovsdb_value(v)}" for k, v in self.combined_args.items()
+                f"-{k} {self.node.ovsdb.python_value_to_ovsdb_value(v)}" for k, v in combined_args.items()
             ]
             sanitized_combined_args = self.node.get_command_arguments(combined_args_list)
 
@@ -1519,6 +1635,7 @@ class NodeHandler(DeviceHandler):
             Raises:
                 AssertionError: If the command to reset the VIF fails.
             """
+            self.node.applied_interface_args.pop(self.if_name, None)
             assert self.node.execute("tools/device/vif_reset", self.if_name)[0] == self.node.expected_shell_result
 
         def _configure_ap_interface(self, vif_reset: bool = False, perform_network_config: bool = True) -> int:
@@ -1567,14 +1684,127 @@ class NodeHandler(DeviceHandler):
 
             return res[0]
 
-        def configure_interface(self, vif_reset: bool = False, perform_network_config: bool = True) -> int:
+        def _update_ap_interface(self, changed_args: dict, applied_args: dict, perform_network_config: bool) -> int:
+            """
+            Push only the changed arguments of the AP VIF interface to the device.
+
+            The radio and VIF interface names and the channel are always provided, as the 'configure_ap_interface'
+            shell script requires them. The channel availability check is performed only if the channel or the ht_mode
+            changed, and the network configuration only if any of the network arguments changed.
+
+            Args:
+                changed_args (dict): Arguments that differ from the previously applied configuration.
+                applied_args (dict): All arguments of the configuration.
+                perform_network_config (bool): Perform network configuration.
+
+            Returns:
+                res (int): Exit code.
+            """
+            update_args = {key: applied_args[key] for key in ("radio_if_name", "vif_if_name", "channel")}
+            if changed_args.keys() & {"channel", "ht_mode"} and "perform_cac" in applied_args:
+                update_args["perform_cac"] = applied_args["perform_cac"]
+            update_args.update(changed_args)
+
+            network_keys = self.network_args.keys() - self.radio_args.keys() - self.vif_args.keys()
+            update_network = perform_network_config and bool(changed_args.keys() & network_keys)
+            if update_network:
+                update_args["network_if_name"] = applied_args["network_if_name"]
+            update_args["perform_network_config"] = update_network
+
+            log.info(f"Updating {', '.join(sorted(changed_args))} of the {self.if_name} interface.")
+            res = self.node.execute_with_logging(
+                "tools/device/configure_ap_interface",
+                self._prepare_and_sanitize_combined_args(update_args),
+            )
+
+            return res[0]
+
+        def _get_applied_args(self, perform_network_config: bool) -> dict:
+            """
+            Return the arguments which the configuration applies to the device.
+
+            Args:
+                perform_network_config (bool): Perform network configuration. Only applicable when the VIF is an AP.
+
+            Returns:
+                dict: Copy of the combined arguments, without the network arguments if the network configuration is
+                    not performed.
+            """
+            applied_args = deepcopy(self.combined_args)
+            applied_args.pop("perform_network_config", None)
+            if self.interface_mode == "ap" and not perform_network_config:
+                for key in self.network_args.keys() - self.radio_args.keys() - self.vif_args.keys():
+                    applied_args.pop(key, None)
+            return applied_args
+
+        def _is_device_state_matching(self, applied_args: dict) -> bool:
+            """
+            Verify the radio and VIF state on the device still match the previously applied arguments.
+
+            Only the scalar columns of the Wifi_Radio_State and Wifi_VIF_State tables are compared. STA interfaces
+            must also be associated to a parent.
+
+            Args:
+                applied_args (dict): Previously applied arguments.
+
+            Returns:
+                bool: True if the device state matches the arguments, False otherwise.
+            """
+            state_checks = [("Wifi_VIF_State", self.if_name, self.VIF_STATE_COLUMNS)]
+            if "radio_if_name" in applied_args:
+                state_checks.append(("Wifi_Radio_State", applied_args["radio_if_name"], self.RADIO_STATE_COLUMNS))
+
+            # Both state tables are read with a single transaction
+            batch = self.node.ovsdb_batch()
+            selected_columns = []
+            for table, if_name, state_columns in state_checks:
+                select = [column for column in state_columns if isinstance(applied_args.get(column), str | int)]
+                if table == "Wifi_VIF_State" and self.interface_mode == "sta":
+                    select.append("parent")
+                batch.select(table, select, f"if_name=={if_name}")
+                selected_columns.append(select)
+            try:
+                results = batch.execute()
+            except RuntimeError as exception:
+                log.debug(f"Failed to retrieve the state of the {self.if_name} interface: {exception}")
+                return False
+
+            for (table, if_name, _), select, rows in zip(state_checks, selected_columns, results):
+                if len(rows) != 1:
+                    return False
+                state = rows[0]
+                if "parent" in select and not state.get("parent"):
+                    return False
+                for column in select:
+                    if column != "parent" and str(state.get(column)).lower() != str(applied_args[column]).lower():
+                        log.debug(f"{table}::{column} of the {if_name} interface does not match the configuration.")
+                        return False
+            return True
+
+        def configure_interface(
+            self,
+            vif_reset: bool = False,
+            perform_network_config: bool = True,
+            force: bool = False,
+        ) -> int:
             """
             Configure the VIF interface on the device.
 
+            If the reuse of the configuration is enabled with the FUT_VIF_CONFIG_REUSE environment variable, the node
+            handler remembers the arguments of the last successful configuration of each interface. If the radio and VIF
+            state on the device still match them, only the changed arguments are pushed to the device, and the
+            configuration is skipped if nothing changed. The full configuration is applied on the first call, after a
+            VIF reset, if the device state does not match or if forced. STA interfaces are always fully reconfigured
+            when any of the arguments changed, as the association has to be re-established. Only the channel, the
+            ht_mode and the scalar VIF state columns are compared to the device state, so test cases which change the
+            other columns, e.g. the security or the network settings, directly on the device need to force the next
+            configuration. Without the reuse, the full configuration is always applied.
+
             Args:
                 vif_reset (bool): Reset the VIF interfaces. Default is False.
                 perform_network_config (bool): Perform network configuration. Only applicable when the VIF is an AP.
                     Default is True.
+                force (bool): Apply the full configuration, even if it is already applied. Default is False.
 
             Returns:
                 res (int): Exit code.
@@ -1582,11 +1812,48 @@ class NodeHandler(DeviceHandler):
             Raises:
                 ValueError: The interface role does not end with either "ap" or "sta".
             """
-            if self.interface_mode == "ap":
-                res = self._configure_ap_interface(vif_reset, perform_network_config)
-            elif self.interface_mode == "sta":
-                res = self._configure_sta_interface(vif_reset)
-            else:
+            if self.interface_mode not in ("ap", "sta"):
                 raise ValueError(f"Unsupported interface_mode {self.interface_mode}, supported: 'ap', 'sta'.")
 
+            if vif_reset:
+                self.vif_reset()
+
+            applied_args = self._get_applied_args(perform_network_config)
+            reuse_enabled = self.node.fut_configurator.vif_config_reuse_enabled and not force
+            previous_args = self.node.applied_interface_args.get(self.if_name) if reuse_enabled else None
+            if previous_args is not None and not self._is_device_state_matching(previous_args):
+                log.info(f"Device state of the {self.if_name} interface changed, applying the full configuration.")
+                previous_args = None
+
+            if previous_args is None:
+                changed_args = applied_args
+            else:
+                changed_args = {
+                    key: value
+                    for key, value in applied_args.items()
+                    if key not in previous_args or previous_args[key] != value
+                }
+
+            if previous_args is not None and not changed_args:
+                log.info(f"Configuration of the {self.if_name} interface is already applied, reusing it.")
+                allure_attach_to_report(
+                    name="configuration_reused",
+                    body=f"Configuration of the {self.if_name} interface on {self.node.name} is already applied.",
+                )
+                return self.node.expected_shell_result
+
+            if previous_args is None or self.interface_mode == "sta":
+                previous_args = {}
+                if self.interface_mode == "ap":
+                    res = self._configure_ap_interface(perform_network_config=perform_network_config)
+                else:
+                    res = self._configure_sta_interface()
+            else:
+                res = self._update_ap_interface(changed_args, applied_args, perform_network_config)
+
+            if res == self.node.expected_shell_result:
+                self.node.applied_interface_args[self.if_name] = {**previous_args, **applied_args}
+            else:
+                self.node.applied_interface_args.pop(self.if_name, None)
+
             return res
@@ -6,9 +6,11 @@ from pathlib import Path
 from queue import Queue
 from threading import Thread
 from typing import Callable, Literal
+from urllib.parse import urlencode
 
 import pytest
 
+from config.defaults import mqtt_collector_api_port
 from framework.device_handler import DeviceHandler
 from framework.lib.fut_lib import (
     allure_attach_to_report,
@@ -31,6 +33,8 @@ class ServerHandler(DeviceHandler):
         self.mqtt_hostname = "fut.opensync.io"
         self.mqtt_messages_file = "mqtt_messages.json"
         self.mqtt_port = 65002
+        self.mqtt_ca_cert = "/etc/mosquitto/certs/fut/ca.pem"
+        self.mqtt_collector_port = mqtt_collector_api_port
         self.opensync_root = os.getenv("OPENSYNC_ROOT", "/home/plume/fut-base")
         self.docker_root = f"{self.opensync_root}/docker"
         self.docker_run_cmd = f"{self.docker_root}/dock-run"
@@ -42,7 +46,7 @@ class ServerHandler(DeviceHandler):
 
     def get_docker_container_id(self):
         active_containers_cmd = 'docker container list --filter=ancestor=fut-server --format "{{.ID}}"'
-        container = self.device_api.run_raw(active_containers_cmd)[1]
+        container = self.run_raw(active_containers_cmd)[1]
         return container
 
     def _switch_tool(self):
@@ -70,7 +74,7 @@ class ServerHandler(DeviceHandler):
             else:
                 hostname = device
             mgmt_ip_cmd = f"getent hosts {hostname} | cut -d' ' -f1"
-            mgmt_ip = self.device_api.run_raw(mgmt_ip_cmd)[1]
+            mgmt_ip = self.run_raw(mgmt_ip_cmd)[1]
             mgmt_ip_dict.update({device: mgmt_ip})
 
         return mgmt_ip_dict
@@ -88,7 +92,7 @@ class ServerHandler(DeviceHandler):
         """
         log.debug("Restarting FUT Cloud simulation.")
 
-        if self.device_api.run_raw(f"{self.cloud_script_path} -r")[0] != 0:
+        if self.run_raw(f"{self.cloud_script_path} -r")[0] != 0:
             log.warning("Could not restart FUT cloud simulation.")
             return False
 
@@ -109,7 +113,7 @@ class ServerHandler(DeviceHandler):
         """
         log.debug("Starting FUT Cloud simulation")
 
-        if self.device_api.run_raw(self.cloud_script_path)[0] != 0:
+        if self.run_raw(self.cloud_script_path)[0] != 0:
             log.warning("Could not start FUT cloud simulation.")
             return False
 
@@ -130,7 +134,7 @@ class ServerHandler(DeviceHandler):
         """
         log.debug("Stopping FUT Cloud simulation")
 
-        if self.device_api.run_raw(f"{self.cloud_script_path} -s")[0] != 0:
+        if self.run_raw(f"{self.cloud_script_path} -s")[0] != 0:
             log.warning("Could not stop FUT cloud simulation.")
             return False
 
@@ -209,7 +213,7 @@ class ServerHandler(DeviceHandler):
             cmd = f"sudo {cmd}"
 
         log.info(f"Executing: {cmd}")
-        cmd_ec, cmd_std_out, cmd_std_err = self.device_api.run_raw(cmd, as_sudo=as_sudo, **kwargs)
+        cmd_ec, cmd_std_out, cmd_std_err = self.run_raw(cmd, as_sudo=as_sudo, **kwargs)
 
         allure_attach_to_report(name="log_client_host", body=cmd_std_out)
 
@@ -234,7 +238,7 @@ class ServerHandler(DeviceHandler):
 
         log.debug(f"Executing: {cmd}")
 
-        cmd_res = self.device_api.run_raw(cmd, timeout=timeout)
+        cmd_res = self.run_raw(cmd, timeout=timeout)
 
         cmd_ec = cmd_res[0]
         cmd_std_out = "" if not cmd_res[1] else cmd_res[1]
@@ -261,6 +265,115 @@ class ServerHandler(DeviceHandler):
         cmd_ec, cmd_std_out, cmd_std_err = self._run_raw(path, args, as_sudo, **kwargs)
         return cmd_ec, cmd_std_out, cmd_std_err
 
+    def _mqtt_collector_request(self, path: str, timeout: float = 10, **params) -> dict | None:
+        """
+        Send the request to the MQTT collector API in the FUT server container.
+
+        Args:
+            path (str): API path, for example 'status' or 'messages'.
+            timeout (float): Maximum time in seconds the collector waits for
+                the subscription or the messages. Defaults to 10.
+        Keyword Args:
+            Query parameters of the request. Parameters with the value None
+            are omitted.
+
+        Returns:
+            (dict | None): Decoded API response, or None if the collector is not reachable.
+        """
+        query = urlencode({key: value for key, value in {**params, "timeout": timeout}.items() if value is not None})
+        url = f"http://127.0.0.1:{self.mqtt_collector_port}/{path}?{query}"
+        cmd = f"curl --silent --max-time {int(timeout) + 5} '{url}'"
+        ec, std_out, _ = self.run_raw(cmd, timeout=int(timeout) + 10, skip_logging=True)
+        if ec != 0 or not std_out:
+            return None
+        try:
+            return json.loads(std_out)
+        except ValueError:
+            log.warning(f"Invalid response from the MQTT collector: {std_out}")
+            return None
+
+    def start_mqtt_collector(self, timeout: float = 10) -> bool:
+        """
+        Start the persistent MQTT collector in the FUT server container.
+
+        The collector is started only once and is reused by all test cases.
+
+        Args:
+            timeout (float): Time in seconds to wait for the collector API.
+                Defaults to 10.
+
+        Returns:
+            (bool): True if the collector is running.
+        """
+        if self._mqtt_collector_request("status") is not None:
+            return True
+        log.info("Starting FUT MQTT collector.")
+        collector_args = self.get_command_arguments(
+            f"--hostname {self.mqtt_hostname}",
+            f"--port {self.mqtt_port}",
+            f"--ca_cert '{self.mqtt_ca_cert}'",
+            f"--api_port {self.mqtt_collector_port}",
+        )
+        start_cmd = (
+            f"docker exec --detach {pytest.server_docker} "
+            f"python3 {self.fut_dir}/framework/tools/fut_mqtt_collector.py {collector_args}"
+        )
+        if self.run_raw(start_cmd)[0] != 0:
+            log.warning("Failed to start FUT MQTT collector.")
+            return False
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._mqtt_collector_request("status") is not None:
+                return True
+            time.sleep(0.2)
+        log.warning("FUT MQTT collector API is not reachable.")
+        return False
+
+    def _mqtt_collect_messages(
+        self,
+        topic: str,
+        trigger: Callable,
+        max_message_count: int,
+        node_filter: str,
+        mqtt_timeout: int,
+    ) -> list[dict] | None:
+        """
+        Collect the MQTT messages received after the trigger using the persistent MQTT collector.
+
+        The topic subscription is confirmed by the broker before the
+        trigger is started, and the messages are returned as soon as the
+        requested number of messages is received.
+
+        Args:
+            topic (str): MQTT topic.
+            trigger (function): The trigger function.
+            max_message_count (int): Number of messages to collect.
+            node_filter (str): Filter received messages based on node ID.
+            mqtt_timeout (int): Maximum time in seconds to wait for the messages.
+
+        Returns:
+            (list | None): Collected messages, or None if the collector is not
+                available, in which case the trigger was not started.
+        """
+        if not self.start_mqtt_collector():
+            return None
+        subscription = self._mqtt_collector_request("subscribe", topic=topic)
+        if not subscription or not subscription.get("subscribed"):
+            log.warning(f"FUT MQTT collector failed to subscribe to the topic: {topic}")
+            return None
+        trigger()
+        response = self._mqtt_collector_request(
+            "messages",
+            timeout=mqtt_timeout,
+            topic=topic,
+            node_id=node_filter or None,
+            since=subscription["time"],
+            count=max_message_count,
+        )
+        if response is None:
+            raise RuntimeError("Failed to collect MQTT messages.")
+        return [entry["message"] for entry in response["messages"]]
+
     def _mqtt_start_listener(self, queue: Queue, mqtt_args: str, mqtt_timeout: int) -> None:
         """
         Start the FUT MQTT tool with the provided arguments.
@@ -279,52 +392,38 @@ class ServerHandler(DeviceHandler):
         log.info(f"Response from FUT MQTT tool: {res}")
         queue.put(res)
 
-    def mqtt_trigger_and_validate_message(
+    def _mqtt_collect_messages_with_tool(
         self,
         topic: str,
         trigger: Callable,
-        expected_data: dict,
-        comparison_method: str = "exact_match",
-        max_message_count: int = 1,
-        node_filter: str = "",
-    ) -> Literal[True]:
+        max_message_count: int,
+        node_filter: str,
+        mqtt_timeout: int,
+    ) -> list[dict]:
         """
-        Start the FUT MQTT tool.
-
-        Starts the tool configures the MQTT connection and subscribes to
-        a topic. This method also starts a trigger function once the
-        MQTT connection has been configured and validates the received
-        data against a dictionary containing the expected data using the
-        specified comparison method.
+        Collect the MQTT messages received after the trigger using the FUT MQTT tool.
 
         Args:
             topic (str): MQTT topic.
             trigger (function): The trigger function.
-            expected_data (dict): Dictionary containing the expected data.
-            comparison_method (str): Comparison method. Supported options:
-                exact_match or in_range.
-            max_message_count (int): Number of messages to collect before
-                terminating connection
-            node_filter (str) : Filter received messages based on node ID
+            max_message_count (int): Number of messages to collect.
+            node_filter (str): Filter received messages based on node ID.
+            mqtt_timeout (int): Maximum time in seconds to wait for the messages.
 
         Raises:
             RuntimeError: If no MQTT messages were collected.
-            RuntimeError: If an issue was encountered during the data
-                comparison.
 
         Returns:
-            (bool): True if the MQTT connection, message gathering and data
-                comparison were performed correctly.
+            (list): Collected messages.
         """
         main_queue: Queue = Queue()
-        mqtt_timeout = 300
         messages_remote_path = f"{self.fut_dir}/{self.mqtt_messages_file}"
         messages_local_path = f"{self.fut_base_dir}/{self.mqtt_messages_file}"
         server_mqtt_args_base = [
             f"--hostname {self.mqtt_hostname}",
             f"--port {self.mqtt_port}",
             f"--topic {topic}",
-            "--ca_cert '/etc/mosquitto/certs/fut/ca.pem'",
+            f"--ca_cert '{self.mqtt_ca_cert}'",
             f"--max_message_count {max_message_count}",
             f"--timeout {mqtt_timeout}",
             "--collect_messages",
@@ -359,11 +458,63 @@ class ServerHandler(DeviceHandler):
         ):
             raise RuntimeError("Failed to collect MQTT messages.")
 
+        self.device_api.get_file(messages_remote_path, self.fut_base_dir, create_dir=False)
+        with open(messages_local_path, "r") as mqtt_file:
+            return json.load(mqtt_file)
+
+    def mqtt_trigger_and_validate_message(
+        self,
+        topic: str,
+        trigger: Callable,
+        expected_data: dict,
+        comparison_method: str = "exact_match",
+        max_message_count: int = 1,
+        node_filter: str = "",
+    ) -> Literal[True]:
+        """
+        Collect the MQTT messages caused by the trigger and validate them.
+
+        The messages are collected by the persistent MQTT collector in the
+        FUT server container, which subscribes to the topic before the
+        trigger function is started. If the collector is not available, the
+        FUT MQTT tool is started for this call instead. The received data is
+        validated against a dictionary containing the expected data using
+        the specified comparison method.
+
+        Args:
+            topic (str): MQTT topic.
+            trigger (function): The trigger function.
+            expected_data (dict): Dictionary containing the expected data.
+            comparison_method (str): Comparison method. Supported options:
+                exact_match or in_range.
+            max_message_count (int): Number of messages to collect before
+                terminating connection
+            node_filter (str) : Filter received messages based on node ID
+
+        Raises:
+            RuntimeError: If no MQTT messages were collected.
+            RuntimeError: If an issue was encountered during the data
+                comparison.
+
+        Returns:
+            (bool): True if the MQTT connection, message gathering and data
+                comparison were performed correctly.
+        """
+        mqtt_timeout = 300
+        mqtt_messages = self._mqtt_collect_messages(topic, trigger, max_message_count, node_filter, mqtt_timeout)
+        if mqtt_messages is None:
+            log.warning("FUT MQTT collector is not available, falling back to the FUT MQTT tool.")
+            mqtt_messages = self._mqtt_collect_messages_with_tool(
+                topic,
+                trigger,
+                max_message_count,
+                node_filter,
+                mqtt_timeout,
+            )
+        if not mqtt_messages:
+            raise RuntimeError("Failed to collect MQTT messages.")
+
         with step("Data extraction"):
-            # Access collected MQTT messages
-            self.device_api.get_file(messages_remote_path, self.fut_base_dir, create_dir=False)
-            with open(messages_local_path, "r") as mqtt_file:
-                mqtt_messages = json.load(mqtt_file)
             # Extract required data from MQTT messages
             extracted_data = extract_mqtt_data_as_dict(mqtt_messages, expected_data.keys(), simplify=True)
             print_allure(f"The following data was extracted: \n{output_to_json(extracted_data, convert_only=True)}")
@@ -405,7 +556,7 @@ class ServerHandler(DeviceHandler):
         if not Path(folder_path).is_absolute():
             folder_path = f"{self.fut_dir}/{folder_path}/"
         cmd = f"[ -d {folder_path} ] && sudo rm -rf {folder_path}"
-        ret = self.device_api.run_raw(cmd)
+        ret = self.run_raw(cmd)
         if ret[0] != 0:
             log.warning(f"Failed to empty {folder_path} on {self.name}.")
         return True
@@ -1,111 +1,322 @@
 #!/usr/bin/env python3
 
-# Open unprivileged port and echo incoming traffic back to sender
+# Open unprivileged port and exchange OVSDB JSON-RPC echo messages with the connected devices
 import argparse
-import os
-import socket
-from time import sleep, strftime
+import asyncio
+import json
+import logging
+import logging.handlers
+import re
+import signal
 
 # Backlog specifies number of unaccepted connections that the system will allow before refusing new connections.
-BACKLOG = 1
-SOCKET_BUF = 1024
+BACKLOG = 128
+SOCKET_BUF = 65536
+# Messages are never expected to be this large, the connection is closed if a message exceeds this size
+MAX_MESSAGE_SIZE = 1024 * 1024
 CLOUD_RESPONSES = {
-    "echo": '{"params":[],"id":"echo","method":"echo"}',
+    "echo": {"params": [], "id": "echo", "method": "echo"},
 }
-SOCKET_LISTEN_SLEEP = 1
-
-
-parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
-parser.add_argument(
-    "--host",
-    required=False,
-    default="0.0.0.0",
-    type=str,
-    help="Hostname/IP to bind\n",
-)
-parser.add_argument(
-    "--port",
-    required=False,
-    default="65001",
-    type=int,
-    help="Port to bind\n",
-)
-parser.add_argument(
-    "--verbose",
-    "-v",
-    action="store_true",
-    help="Enable logging\n",
-)
-args = parser.parse_args()
-verbose = args.verbose
-
-
-def log(msg=""):
-    if verbose:
-        time = strftime("%d/%m/%Y %H:%M:%S")
-        line = f"{time} - {msg}"
-        os.system(f'echo "{line}" >> /tmp/cloud_listener.log')
-
-
-class DeviceSocket:
-    def __init__(self, sock=None):
-        if sock is None:
-            # If no socket specified, create new INET domain, STREAM type socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock = sock
-
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock.bind((args.host, args.port))
-        self.sock.listen(BACKLOG)
-        self.connection = None
-
-    def close(self):
-        self.sock.close()
-        return True
-
-    def connect(self, host, port):
-        self.sock.connect((host, port))
-
-    def open(self):
-        connection, address = self.sock.accept()
-        log(f"Connected by {address}")
-        self.__setattr__("connection", connection)
-
-    def receive(self):
-        chunks = []
-        bytes_recd = 0
-        while bytes_recd == 0:
-            chunk = self.connection.recv(min(SOCKET_BUF - bytes_recd, 2048))
-            if chunk == b"":
-                raise RuntimeError("socket connection broken")
-            chunks.append(chunk)
-            bytes_recd = bytes_recd + len(chunk)
-        receive_msg = b"".join(chunks)
-        log(f"Received:\n{receive_msg}")
-        return receive_msg
-
-    def send(self, msg):
-        log(f"Sending:\n{msg}")
-        sent = self.connection.send(msg.encode("ascii"))
-        if sent == 0:
-            raise RuntimeError("Socket connection broken")
-        return True
-
-    def send_type(self, msg_type=None):
-        return self.send(CLOUD_RESPONSES[msg_type])
-
-
-device_socket = DeviceSocket()
-device_socket.open()
-
-while 1:
+# Interval of the echo requests sent by the cloud to each connected device
+ECHO_INTERVAL = 5
+LOG_FILE = "/tmp/cloud_listener.log"
+# Buffered log records are written to the log file at least this often
+LOG_FLUSH_INTERVAL = 1
+LOG_BUFFER_CAPACITY = 1000
+
+log = logging.getLogger("cloud_listener")
+
+
+class JsonRpcFramingError(Exception):
+    pass
+
+
+class JsonRpcFramer:
+    """
+    Split the received byte stream into JSON-RPC messages.
+
+    OVSDB sends the JSON-RPC messages as a stream of concatenated JSON
+    objects, without any delimiter or length prefix. The framer tracks the
+    nesting depth of the objects and arrays, ignoring the brackets inside
+    the strings, so a message is complete when the depth of its top-level
+    object returns to zero. The scan state is kept between the received
+    chunks, so each byte is scanned only once, regardless of how the
+    messages are split between the chunks.
+    """
+
+    _TOKENS = re.compile(rb'[{}\[\]"\\]')
+    _STRING_TOKENS = re.compile(rb'["\\]')
+    _WHITESPACE = b" \t\r\n"
+
+    def __init__(self, max_message_size=MAX_MESSAGE_SIZE):
+        self.max_message_size = max_message_size
+        self.buffer = bytearray()
+        self.scan_position = 0
+        self.depth = 0
+        self.in_string = False
+
+    def feed(self, data):
+        """
+        Add the received data and return the completed messages.
+
+        Args:
+            data (bytes): Received data.
+
+        Raises:
+            JsonRpcFramingError: The stream is not a sequence of JSON objects or a message is too large.
+
+        Returns:
+            (list): Decoded messages.
+        """
+        self.buffer += data
+        messages = []
+        position = self.scan_position
+        while True:
+            if self.depth == 0:
+                # Skip the whitespace between the messages
+                while position < len(self.buffer) and self.buffer[position] in self._WHITESPACE:
+                    position += 1
+                del self.buffer[:position]
+                position = 0
+                if not self.buffer:
+                    break
+                if self.buffer[0] != ord("{"):
+                    raise JsonRpcFramingError(f"Unexpected data outside of a JSON object: {bytes(self.buffer[:32])}")
+
+            pattern = self._STRING_TOKENS if self.in_string else self._TOKENS
+            match = pattern.search(self.buffer, position)
+            if match is None:
+                # The position is past the end of the buffer if the escaped character was not received yet
+                position = max(position, len(self.buffer))
+                break
+            token = match.group()
+            position = match.end()
+            if token == b"\\":
+                # Skip the escaped character, which may be a quote
+                position += 1
+            elif token == b'"':
+                self.in_string = not self.in_string
+            elif token in (b"{", b"["):
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        messages.append(json.loads(self.buffer[:position]))
+                    except ValueError as e:
+                        raise JsonRpcFramingError(f"Invalid JSON message: {e}") from e
+                    del self.buffer[:position]
+                    position = 0
+
+        self.scan_position = position
+        if len(self.buffer) > self.max_message_size:
+            raise JsonRpcFramingError(f"Message exceeds {self.max_message_size} bytes")
+        return messages
+
+
+def encode_message(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+
+class DeviceConnection:
+    """JSON-RPC session with a single connected device."""
+
+    def __init__(self, listener, reader, writer):
+        self.listener = listener
+        self.reader = reader
+        self.writer = writer
+        self.address = writer.get_extra_info("peername")
+        self.framer = JsonRpcFramer()
+        self.echo_replies = 0
+
+    def send(self, message):
+        data = encode_message(message)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Sending to {self.address}:\n{data}")
+        self.writer.write(data)
+
+    def handle_message(self, message):
+        method = message.get("method")
+        if method is None:
+            # Reply to the echo request of the cloud
+            if message.get("id") == CLOUD_RESPONSES["echo"]["id"]:
+                self.echo_replies += 1
+            return
+        if method == "echo":
+            self.send({"id": message.get("id"), "result": message.get("params", []), "error": None})
+            self.listener.echo_count += 1
+        elif message.get("id") is not None:
+            self.send({"id": message["id"], "result": None, "error": "unknown method"})
+
+    async def send_echo_requests(self):
+        try:
+            while True:
+                await asyncio.sleep(self.listener.echo_interval)
+                self.send(CLOUD_RESPONSES["echo"])
+                await self.writer.drain()
+        except ConnectionError:
+            # The connection coroutine handles the broken connection
+            pass
+
+    async def run(self):
+        log.info(f"Connected by {self.address}")
+        echo_task = None
+        if self.listener.echo_interval:
+            echo_task = asyncio.ensure_future(self.send_echo_requests())
+        try:
+            while True:
+                data = await self.reader.read(SOCKET_BUF)
+                if not data:
+                    break
+                messages = self.framer.feed(data)
+                for message in messages:
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug(f"Received from {self.address}:\n{message}")
+                    self.handle_message(message)
+                if messages:
+                    await self.writer.drain()
+        except JsonRpcFramingError as e:
+            log.error(f"Closing connection of {self.address} - {e}")
+        except ConnectionError as e:
+            log.info(f"Connection of {self.address} broken - {e}")
+        finally:
+            if echo_task is not None:
+                echo_task.cancel()
+            self.writer.close()
+            log.info(f"Disconnected {self.address}")
+
+
+class CloudListener:
+    """
+    Cloud listener serving any number of concurrently connected devices.
+
+    Each connection is handled by its own coroutine, which replies to the
+    echo requests of the device as soon as they are received, and sends
+    the echo requests of the cloud every echo interval.
+    """
+
+    def __init__(self, host="0.0.0.0", port=65001, echo_interval=ECHO_INTERVAL):
+        self.host = host
+        self.port = port
+        self.echo_interval = echo_interval
+        self.server = None
+        self.connections = set()
+        self.connection_count = 0
+        self.echo_count = 0
+
+    async def _handle_connection(self, reader, writer):
+        connection = DeviceConnection(self, reader, writer)
+        self.connections.add(connection)
+        self.connection_count += 1
+        try:
+            await connection.run()
+        finally:
+            self.connections.discard(connection)
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self._handle_connection,
+            self.host,
+            self.port,
+            backlog=BACKLOG,
+            reuse_address=True,
+        )
+        # Port 0 binds a random free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        log.info(f"Listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for connection in list(self.connections):
+            connection.writer.close()
+
+
+def configure_logging(verbose, log_file=LOG_FILE):
+    """
+    Configure the buffered file logger.
+
+    The log records are kept in memory and written to the log file in
+    batches, when the buffer is full, on errors and periodically, so the
+    message exchange is never blocked by writing each line to the file.
+
+    Args:
+        verbose (bool): Log the connections and the exchanged messages.
+        log_file (str): Path of the log file.
+
+    Returns:
+        (logging.Handler): Buffering handler, flushed by the caller.
+    """
+    file_handler = logging.FileHandler(log_file, mode="a")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s", datefmt="%d/%m/%Y %H:%M:%S"))
+    handler = logging.handlers.MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG if verbose else logging.ERROR)
+    log.propagate = False
+    return handler
+
+
+async def flush_logs(handler):
+    while True:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        handler.flush()
+
+
+async def serve(host, port, echo_interval, log_handler):
+    listener = CloudListener(host, port, echo_interval)
+    await listener.start()
+    flush_task = asyncio.ensure_future(flush_logs(log_handler))
+    stop_event = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
     try:
-        data = device_socket.receive()
-        if data:
-            device_socket.send_type("echo")
-            device_socket.receive()
-            log(f"Sleep {SOCKET_LISTEN_SLEEP} seconds")
-            sleep(SOCKET_LISTEN_SLEEP)
-    except RuntimeError as exception:
-        log(f"RuntimeError - {exception}")
-        device_socket.open()
+        await stop_event.wait()
+    finally:
+        log.info("Stopping cloud listener")
+        flush_task.cancel()
+        await listener.stop()
+        log_handler.flush()
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "--host",
+        required=False,
+        default="0.0.0.0",
+        type=str,
+        help="Hostname/IP to bind\n",
+    )
+    parser.add_argument(
+        "--port",
+        required=False,
+        default="65001",
+        type=int,
+        help="Port to bind\n",
+    )
+    parser.add_argument(
+        "--echo-interval",
+        required=False,
+        default=ECHO_INTERVAL,
+        type=float,
+        help="Interval of the echo requests sent to each device in seconds, 0 disables the requests\n",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable logging\n",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    log_handler = configure_logging(args.verbose)
+    asyncio.run(serve(args.host, args.port, args.echo_interval, log_handler))
+
+
+if __name__ == "__main__":
+    main()
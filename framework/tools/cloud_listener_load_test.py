@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""CLI tool to simulate many devices exchanging JSON-RPC echo messages with the cloud listener."""
+
+import argparse
+import asyncio
+import signal
+import sys
+import time
+
+from framework.lib.fut_latency import format_latencies
+from framework.tools.cloud_listener import CloudListener, encode_message, JsonRpcFramer
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Simulate devices connected to the cloud listener and measure the echo latency",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        required=False,
+        default=None,
+        help="Hostname/IP of the running cloud listener. If not set, the listener is started in this process.",
+    )
+    parser.add_argument(
+        "--port",
+        "-p",
+        type=int,
+        required=False,
+        default=65001,
+        help="Port of the running cloud listener",
+    )
+    parser.add_argument(
+        "--devices",
+        "-d",
+        type=int,
+        required=False,
+        default=100,
+        help="Number of simulated devices, each with its own connection",
+    )
+    parser.add_argument(
+        "--messages",
+        "-m",
+        type=int,
+        required=False,
+        default=50,
+        help="Number of echo requests sent by each device",
+    )
+    input_args = parser.parse_args()
+    return input_args
+
+
+def signal_handler(sig, frame) -> None:
+    """Handle the signal.
+
+    Args:
+        sig (_type_): Not used
+        frame (_type_): Not used
+    """
+    sys.exit(0)
+
+
+async def simulate_device(host: str, port: int, device_index: int, num_messages: int) -> dict:
+    """
+    Connect to the cloud listener and send the echo requests one after another.
+
+    The echo requests of the cloud are answered, as OVSDB on the device would.
+
+    Args:
+        host (str): Hostname/IP of the cloud listener.
+        port (int): Port of the cloud listener.
+        device_index (int): Index of the device, used in the request IDs.
+        num_messages (int): Number of echo requests.
+
+    Returns:
+        (dict): Echo latencies in seconds and the number of cloud echo requests received.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    framer = JsonRpcFramer()
+    latencies = []
+    cloud_echo_requests = 0
+    try:
+        for message_index in range(num_messages):
+            request_id = f"device-{device_index}-{message_index}"
+            start_time = time.perf_counter()
+            writer.write(encode_message({"id": request_id, "method": "echo", "params": [device_index]}))
+            await writer.drain()
+            replied = False
+            while not replied:
+                data = await reader.read(65536)
+                if not data:
+                    raise ConnectionError(f"Connection of device {device_index} closed by the cloud listener")
+                for message in framer.feed(data):
+                    if message.get("method") == "echo":
+                        cloud_echo_requests += 1
+                        writer.write(encode_message({"id": message["id"], "result": [], "error": None}))
+                    elif message.get("id") == request_id:
+                        if message.get("result") != [device_index]:
+                            raise ValueError(f"Unexpected echo reply: {message}")
+                        replied = True
+            latencies.append(time.perf_counter() - start_time)
+    finally:
+        writer.close()
+    return {"latencies": latencies, "cloud_echo_requests": cloud_echo_requests}
+
+
+async def run_load(host: str, port: int, num_devices: int, num_messages: int) -> dict:
+    """
+    Simulate the devices concurrently.
+
+    Args:
+        host (str): Hostname/IP of the cloud listener.
+        port (int): Port of the cloud listener.
+        num_devices (int): Number of simulated devices.
+        num_messages (int): Number of echo requests sent by each device.
+
+    Returns:
+        (dict): Latencies of all echo requests, the duration and the number of cloud echo requests.
+    """
+    start_time = time.perf_counter()
+    results = await asyncio.gather(
+        *[simulate_device(host, port, device_index, num_messages) for device_index in range(num_devices)],
+    )
+    return {
+        "latencies": [latency for result in results for latency in result["latencies"]],
+        "duration": time.perf_counter() - start_time,
+        "cloud_echo_requests": sum(result["cloud_echo_requests"] for result in results),
+    }
+
+
+async def run_local_load(num_devices: int, num_messages: int, echo_interval: float = 1) -> dict:
+    """Start the cloud listener in this process on a random port and simulate the devices."""
+    listener = CloudListener("127.0.0.1", 0, echo_interval)
+    await listener.start()
+    try:
+        return await run_load("127.0.0.1", listener.port, num_devices, num_messages)
+    finally:
+        await listener.stop()
+
+
+def main(host: str, port: int, num_devices: int, num_messages: int) -> None:
+    if host:
+        result = asyncio.run(run_load(host, port, num_devices, num_messages))
+    else:
+        result = asyncio.run(run_local_load(num_devices, num_messages))
+
+    latencies = result["latencies"]
+    print(f"{num_devices} devices, {len(latencies)} echo requests in {result['duration']:.2f}s")
+    print(f"    Throughput: {len(latencies) / result['duration']:.0f} echo/s")
+    print(f"    Latency:    {format_latencies(latencies, ('mean', 'p50', 'p95', 'p99', 'max'))}")
+    print(f"    Cloud echo requests answered: {result['cloud_echo_requests']}")
+
+
+if __name__ == "__main__":
+    # Accept Ctrl+C as a signal interrupt
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Parse input arguments
+    input_args = parse_arguments()
+    main(input_args.host, input_args.port, input_args.devices, input_args.messages)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+
+"""
+Persistent MQTT collector service.
+
+The collector runs inside the FUT server container for the whole test
+session. It keeps a single MQTT connection to the broker, stays subscribed
+to the requested topics, and buffers the decoded messages in memory. The
+buffered messages are served through a small HTTP API on the loopback
+interface, with filters by topic, node ID and time window:
+
+    /status                     Connection state and buffer statistics.
+    /subscribe?topic=           Subscribe to the topic and wait for the
+                                broker acknowledgement.
+    /messages?topic=&node_id=&since=&until=&count=&timeout=
+                                Return the matching messages, waiting up
+                                to the timeout for 'count' messages.
+
+All times are seconds since the epoch, measured by the collector clock.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import paho.mqtt.client as mqtt
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import DecodeError
+
+from config.defaults import mqtt_collector_api_port
+from lib_testbed.generic.mqtt.opensync_stats_pb2 import Report as StatsReportSchema
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Start the persistent MQTT collector service",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--hostname",
+        type=str,
+        required=True,
+        help="MQTT server hostname",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        required=True,
+        help="Port to connect to",
+    )
+    parser.add_argument(
+        "--ca_cert",
+        type=str,
+        required=True,
+        help="Path to CA certificate file",
+    )
+    parser.add_argument(
+        "--topic",
+        type=str,
+        required=False,
+        action="append",
+        default=[],
+        help="Topic to subscribe to at startup, can be repeated",
+    )
+    parser.add_argument(
+        "--api_port",
+        type=int,
+        required=False,
+        default=mqtt_collector_api_port,
+        help="Port of the local HTTP API",
+    )
+    parser.add_argument(
+        "--max_messages",
+        type=int,
+        required=False,
+        default=20000,
+        help="Maximum number of messages kept in the buffer",
+    )
+    input_args = parser.parse_args()
+    return input_args
+
+
+def decode_message(payload: bytes) -> dict | None:
+    """
+    Decode the MQTT message payload.
+
+    JSON payloads are returned as they are, other payloads are decoded as
+    the OpenSync statistics report, optionally compressed with zlib.
+
+    Args:
+        payload (bytes): Raw MQTT message payload.
+
+    Returns:
+        (dict | None): Decoded message, or None if the payload could not be decoded.
+    """
+    try:
+        message = json.loads(payload)
+        if isinstance(message, dict):
+            return message
+    except ValueError:
+        pass
+    try:
+        payload = zlib.decompress(payload)
+    except zlib.error:
+        pass
+    report = StatsReportSchema()
+    try:
+        report.ParseFromString(payload)
+    except DecodeError:
+        return None
+    return MessageToDict(report)
+
+
+class MqttMessageBuffer:
+    """
+    Bounded buffer of the received MQTT messages.
+
+    Messages are stored in the order of arrival together with the receive
+    time, the topic and the node ID. Queries wait on a condition variable,
+    so that the waiting caller is woken up as soon as a matching message
+    is received.
+
+    Args:
+        max_messages (int): Maximum number of messages kept in the buffer.
+            Defaults to 20000.
+    """
+
+    def __init__(self, max_messages: int = 20000):
+        self._messages: deque[dict] = deque(maxlen=max_messages)
+        self._condition = threading.Condition()
+        self.message_count = 0
+
+    def add(self, topic: str, message: dict, receive_time: float | None = None) -> None:
+        """
+        Add the message to the buffer and wake up the waiting queries.
+
+        Args:
+            topic (str): Topic on which the message was received.
+            message (dict): Decoded message.
+            receive_time (float | None): Receive time of the message.
+                Defaults to None, which means the current time.
+        """
+        entry = {
+            "time": time.time() if receive_time is None else receive_time,
+            "topic": topic,
+            "node_id": message.get("nodeID") or message.get("nodeId"),
+            "message": message,
+        }
+        with self._condition:
+            self._messages.append(entry)
+            self.message_count += 1
+            self._condition.notify_all()
+
+    def _match(
+        self,
+        topic: str | None,
+        node_id: str | None,
+        since: float | None,
+        until: float | None,
+    ) -> list[dict]:
+        matching_entries = []
+        for entry in self._messages:
+            if since is not None and entry["time"] < since:
+                continue
+            if until is not None and entry["time"] > until:
+                continue
+            if topic and not mqtt.topic_matches_sub(topic, entry["topic"]):
+                continue
+            if node_id and entry["node_id"] != node_id:
+                continue
+            matching_entries.append(entry)
+        return matching_entries
+
+    def query(
+        self,
+        topic: str | None = None,
+        node_id: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        count: int = 0,
+        timeout: float = 0,
+    ) -> list[dict]:
+        """
+        Return the buffered messages matching the filters.
+
+        Args:
+            topic (str | None): Topic filter, MQTT wildcards are supported.
+            node_id (str | None): Node ID of the message.
+            since (float | None): Only messages received at or after this time.
+            until (float | None): Only messages received at or before this time.
+            count (int): Number of messages to wait for. If non-zero, at most
+                'count' oldest matching messages are returned. Defaults to 0,
+                which means all matching messages are returned immediately.
+            timeout (float): Maximum time in seconds to wait for the messages.
+                Defaults to 0.
+
+        Returns:
+            (list): Matching buffer entries, with the keys 'time', 'topic',
+                'node_id' and 'message'.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                matching_entries = self._match(topic, node_id, since, until)
+                remaining = deadline - time.monotonic()
+                if count <= 0 or len(matching_entries) >= count or remaining <= 0:
+                    break
+                if until is not None and time.time() > until:
+                    break
+                self._condition.wait(remaining)
+        return matching_entries[:count] if count > 0 else matching_entries
+
+    def __len__(self) -> int:
+        """Return the number of buffered messages."""
+        with self._condition:
+            return len(self._messages)
+
+
+class MqttCollector:
+    """
+    MQTT client which keeps the subscriptions across reconnections.
+
+    The broker is restarted by the test cases, so the client reconnects
+    in the background and subscribes to all requested topics again.
+
+    Args:
+        hostname (str): MQTT server hostname.
+        port (int): MQTT server port.
+        ca_cert (str): Path to CA certificate file.
+        buffer (MqttMessageBuffer): Buffer of the received messages.
+    """
+
+    def __init__(self, hostname: str, port: int, ca_cert: str, buffer: MqttMessageBuffer):
+        self.hostname = hostname
+        self.port = port
+        self.buffer = buffer
+        self.connected = False
+        self.decode_failures = 0
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, threading.Event] = {}
+        self._pending_subscriptions: dict[int, str] = {}
+        self.client = mqtt.Client(client_id=f"fut_mqtt_collector_{os.getpid()}", clean_session=True)
+        self.client.tls_set(ca_certs=ca_cert)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=2)
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_subscribe = self._on_subscribe
+        self.client.on_message = self._on_message
+
+    def start(self) -> None:
+        """Connect to the broker in the background. The connection is retried until it succeeds."""
+        self.client.connect_async(self.hostname, self.port, keepalive=30)
+        self.client.loop_start()
+
+    def stop(self) -> None:
+        """Disconnect from the broker."""
+        self.client.disconnect()
+        self.client.loop_stop()
+
+    def _subscribe(self, topic: str) -> None:
+        result, mid = self.client.subscribe(topic)
+        if result == mqtt.MQTT_ERR_SUCCESS:
+            self._pending_subscriptions[mid] = topic
+
+    def _on_connect(self, client, userdata, flags, rc) -> None:
+        if rc != 0:
+            return
+        with self._lock:
+            self.connected = True
+            # The session is not persistent, so every reconnection requires new subscriptions
+            for topic in self._subscriptions:
+                self._subscribe(topic)
+
+    def _on_disconnect(self, client, userdata, rc) -> None:
+        with self._lock:
+            self.connected = False
+            self._pending_subscriptions.clear()
+            for subscribed in self._subscriptions.values():
+                subscribed.clear()
+
+    def _on_subscribe(self, client, userdata, mid, granted_qos) -> None:
+        with self._lock:
+            topic = self._pending_subscriptions.pop(mid, None)
+            if topic is not None:
+                self._subscriptions[topic].set()
+
+    def _on_message(self, client, userdata, msg) -> None:
+        message = decode_message(msg.payload)
+        if message is None:
+            self.decode_failures += 1
+            return
+        self.buffer.add(msg.topic, message)
+
+    def subscribe(self, topic: str, timeout: float = 10) -> bool:
+        """
+        Subscribe to the topic and wait for the broker acknowledgement.
+
+        Args:
+            topic (str): Topic to subscribe to.
+            timeout (float): Maximum time in seconds to wait for the
+                connection and the acknowledgement. Defaults to 10.
+
+        Returns:
+            (bool): True if the subscription is active.
+        """
+        with self._lock:
+            if topic not in self._subscriptions:
+                self._subscriptions[topic] = threading.Event()
+                if self.connected:
+                    self._subscribe(topic)
+            subscribed = self._subscriptions[topic]
+        return subscribed.wait(timeout)
+
+    def get_status(self) -> dict:
+        """Return the connection state and the buffer statistics."""
+        with self._lock:
+            topics = {topic: subscribed.is_set() for topic, subscribed in self._subscriptions.items()}
+        return {
+            "connected": self.connected,
+            "topics": topics,
+            "buffered_messages": len(self.buffer),
+            "received_messages": self.buffer.message_count,
+            "decode_failures": self.decode_failures,
+            "time": time.time(),
+        }
+
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of the collector HTTP API."""
+
+    collector: MqttCollector
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/status":
+                self._send_json(200, self.collector.get_status())
+            elif url.path == "/subscribe":
+                if not params.get("topic"):
+                    self._send_json(400, {"error": "Missing topic"})
+                    return
+                subscribed = self.collector.subscribe(params["topic"], timeout=float(params.get("timeout", 10)))
+                self._send_json(200 if subscribed else 503, {"subscribed": subscribed, "time": time.time()})
+            elif url.path == "/messages":
+                entries = self.collector.buffer.query(
+                    topic=params.get("topic"),
+                    node_id=params.get("node_id"),
+                    since=float(params["since"]) if "since" in params else None,
+                    until=float(params["until"]) if "until" in params else None,
+                    count=int(params.get("count", 0)),
+                    timeout=float(params.get("timeout", 0)),
+                )
+                self._send_json(200, {"messages": entries, "time": time.time()})
+            else:
+                self._send_json(404, {"error": f"Unknown path: {url.path}"})
+        except ValueError as exception:
+            self._send_json(400, {"error": str(exception)})
+
+    def log_message(self, format, *args) -> None:
+        # Queries are frequent, only errors are logged
+        pass
+
+
+def create_api_server(collector: MqttCollector, api_port: int, hostname: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Create the HTTP API server of the collector.
+
+    Args:
+        collector (MqttCollector): Collector served by the API.
+        api_port (int): Port of the API, 0 selects a free port.
+        hostname (str): Address of the API. Defaults to the loopback address.
+
+    Returns:
+        (ThreadingHTTPServer): API server, which is not serving requests yet.
+    """
+    request_handler = type("BoundCollectorRequestHandler", (CollectorRequestHandler,), {"collector": collector})
+    api_server = ThreadingHTTPServer((hostname, api_port), request_handler)
+    api_server.daemon_threads = True
+    return api_server
+
+
+def signal_handler(sig, frame) -> None:
+    """Handle the signal.
+
+    Args:
+        sig (_type_): Not used
+        frame (_type_): Not used
+    """
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    input_args = parse_arguments()
+    mqtt_collector = MqttCollector(
+        input_args.hostname,
+        input_args.port,
+        input_args.ca_cert,
+        MqttMessageBuffer(max_messages=input_args.max_messages),
+    )
+    for start_topic in input_args.topic:
+        mqtt_collector.subscribe(start_topic, timeout=0)
+    mqtt_collector.start()
+    collector_api_server = create_api_server(mqtt_collector, input_args.api_port)
+    try:
+        collector_api_server.serve_forever()
+    finally:
+        mqtt_collector.stop()
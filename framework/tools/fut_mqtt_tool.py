@@ -87,6 +87,167 @@ def parse_arguments():
     return input_args
 
 
+def simplify_mqtt_data(value_list: list) -> Any:
+    """Simplify the values extracted for a single key in a single pass over the values.
+
+    If the first string, boolean or numeric value is a string or a boolean and
+    all values are equal, the first value is returned. Otherwise, if any value
+    is numeric, the average value is returned. Otherwise, the list of values is
+    returned unchanged.
+
+    Args:
+        value_list (list): Values extracted for a single key
+    """
+    first_value = value_list[0] if value_list else None
+    first_scalar_is_number = None
+    all_equal = True
+    has_number = False
+    # Sum of the integer values, None if any value is not an integer
+    int_total: int | None = 0
+    for value in value_list:
+        if all_equal and not value == first_value:
+            all_equal = False
+        if type(value) is int:
+            is_number = True
+            if int_total is not None:
+                int_total += value
+        else:
+            int_total = None
+            if isinstance(value, (str, bool)):
+                is_number = False
+            elif isinstance(value, (int, float)):
+                is_number = True
+            else:
+                continue
+        if first_scalar_is_number is None:
+            first_scalar_is_number = is_number
+        has_number = has_number or is_number
+    if first_scalar_is_number is False and all_equal:
+        return first_value
+    if not has_number:
+        return value_list
+    if int_total is None:
+        # Float and mixed values keep the exact behavior and the errors of the statistics module
+        return round(mean(value_list), 4)
+    count = len(value_list)
+    quotient, remainder = divmod(int_total, count)
+    return round(quotient if remainder == 0 else int_total / count, 4)
+
+
+class _SearchState:
+    """
+    Keys searched for in a subtree of the message, with the transitions to the states of the child subtrees.
+
+    A search is a tuple of the key index, the key path and the position of
+    the currently searched element of the path. Transitions are compiled on
+    the first use for each combination of keys found in a dictionary, and
+    reused for all following dictionaries with the same found keys.
+    """
+
+    __slots__ = ("searches", "keys", "transitions")
+
+    def __init__(self, searches: tuple):
+        self.searches = searches
+        self.keys = tuple(dict.fromkeys(path[position] for _, path, position in searches))
+        self.transitions: dict = {}
+
+    def compile_transition(self, found_keys: tuple) -> tuple:
+        """
+        Compile the transition for the dictionary which contains the found keys.
+
+        Args:
+            found_keys (tuple): Searched keys contained in the dictionary.
+
+        Returns:
+            (tuple): List of (index, key) of the extracted values, the state of
+                the other values of the dictionary or None if no search is
+                pending, and the dictionary of states of the values, which
+                continue the key paths.
+        """
+        extracted_keys, pending, continuations = [], [], {}
+        for search in self.searches:
+            index, path, position = search
+            key = path[position]
+            if key not in found_keys:
+                pending.append(search)
+            elif position + 1 == len(path):
+                extracted_keys.append((index, key))
+            else:
+                continuations.setdefault(key, []).append((index, path, position + 1))
+        pending_state = _SearchState(tuple(pending)) if pending else None
+        continuation_states = {
+            key: _SearchState(tuple(pending) + tuple(key_continuations))
+            for key, key_continuations in continuations.items()
+        }
+        transition = (extracted_keys, pending_state, continuation_states)
+        self.transitions[found_keys] = transition
+        return transition
+
+
+class MqttDataExtractor:
+    """
+    Extract multiple keys from the collected MQTT messages in a single pass.
+
+    The keys are compiled once and the message tree is traversed once for
+    all of them. A key is found in a dictionary which contains it, in which
+    case neither its value nor the other values of the dictionary are
+    searched further for the same key. Tuple keys are paths, each element
+    of the path is searched for within the values found for the previous
+    element. The extractor can be reused for multiple messages.
+
+    Args:
+        data_keys (list): Define the list of keys for which the values are extracted
+    """
+
+    def __init__(self, data_keys: list[int | str | tuple]):
+        self.data_keys = list(data_keys)
+        self._root_state = _SearchState(
+            tuple(
+                (index, data_key if isinstance(data_key, tuple) and data_key else (data_key,), 0)
+                for index, data_key in enumerate(self.data_keys)
+            ),
+        )
+
+    def extract(self, data: dict | list) -> list[list]:
+        """
+        Extract the values of all keys from the data.
+
+        Args:
+            data (dict): Data in a dictionary or list format.
+
+        Returns:
+            (list): Lists of the extracted values, in the order of the keys.
+        """
+        value_lists: list[list] = [[] for _ in self.data_keys]
+        # Depth-first traversal, which visits the nodes in the document order
+        stack = [(data, self._root_state)]
+        pop, push, extend = stack.pop, stack.append, stack.extend
+        while stack:
+            node, state = pop()
+            node_type = type(node)
+            if node_type is list or node_type is not dict and isinstance(node, list):
+                extend([(item, state) for item in reversed(node) if isinstance(item, (dict, list))])
+                continue
+            if node_type is not dict and not isinstance(node, dict):
+                continue
+            found_keys = tuple([key for key in state.keys if key in node])
+            if not found_keys:
+                extend([(value, state) for value in reversed(node.values()) if isinstance(value, (dict, list))])
+                continue
+            transition = state.transitions.get(found_keys) or state.compile_transition(found_keys)
+            extracted_keys, pending_state, continuation_states = transition
+            for index, key in extracted_keys:
+                value_lists[index].append(node[key])
+            if continuation_states:
+                for key, value in reversed(node.items()):
+                    child_state = continuation_states.get(key, pending_state)
+                    if child_state is not None and isinstance(value, (dict, list)):
+                        push((value, child_state))
+            elif pending_state is not None:
+                extend([(value, pending_state) for value in reversed(node.values()) if isinstance(value, (dict, list))])
+        return value_lists
+
+
 def extract_mqtt_data(
     data: dict | list,
     value_list: list,
@@ -103,31 +264,9 @@ def extract_mqtt_data(
                          if element is a list of type str or bool only the first element
                          is returned if all elements are equal
     """
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if data_key in data.keys():
-                value_list.append(data[data_key])
-                break
-            if isinstance(value, (dict, list)):
-                if key == data_key:
-                    value_list.append(value)
-                else:
-                    extract_mqtt_data(value, value_list, data_key)
-            elif key == data_key:
-                value_list.append(value)
-    elif isinstance(data, list):
-        for item in data:
-            extract_mqtt_data(item, value_list, data_key)
-    if simplify:
-        for element in value_list:
-            if isinstance(element, (str, bool)):
-                if all(element == value_list[0] for element in value_list):
-                    value_list = value_list[0]
-                    break
-            elif isinstance(element, (int, float)):
-                value_list = round(mean(value_list), 4)
-                break
-    return value_list
+    (extracted_values,) = MqttDataExtractor([data_key]).extract(data)
+    value_list.extend(extracted_values)
+    return simplify_mqtt_data(value_list) if simplify else value_list
 
 
 def extract_mqtt_data_as_dict(
@@ -142,13 +281,15 @@ def extract_mqtt_data_as_dict(
         data_keys (list): Define the list of keys for which the values are extracted
         simplify (bool): Simplify the extracted data
     """
-    extracted_data = []
-    for data_key in data_keys:
-        value_list: list = []
-        extracted_data.append(extract_mqtt_data(data, value_list, data_key, simplify))
+    extractor = MqttDataExtractor(data_keys)
+    extracted_data = extractor.extract(data)
+    for data_key, value_list in zip(extractor.data_keys, extracted_data):
         if not value_list:
             raise KeyError(f"Failed to extract data from the MQTT messages for the following key: {data_key}")
-    extracted_data_dict = dict(zip(data_keys, extracted_data))
+    extracted_data_dict = {
+        data_key: simplify_mqtt_data(value_list) if simplify else value_list
+        for data_key, value_list in zip(extractor.data_keys, extracted_data)
+    }
     return extracted_data_dict
 
 
@@ -16,9 +16,11 @@ import pytest
 from framework.device_handler import DeviceHandler
 from framework.fut_configurator import FutConfigurator
 from framework.lib.fut_lib import (
-    flatten_list,
+    allure_attach_to_report,
+    output_to_json,
     step,
 )
+from framework.lib.fut_setup_scheduler import SetupScheduler
 from framework.node_handler import NodeHandler
 from framework.server_handler import ServerHandler
 from lib_testbed.generic.util.logger import log
@@ -28,6 +30,10 @@ lock = threading.Lock()
 
 ALL_CLIENTS_TUPLE = ("w1", "w2", "e1", "e2")
 ALL_NODES_TUPLE = ("gw", "l1", "l2")
+# Clients without the device setup, only their handlers are created
+NO_SETUP_CLIENTS_TUPLE = ("e1", "e2")
+FUT_BASE_DIR = Path(__file__).absolute().parents[2].as_posix()
+SETUP_TIMING_FILE = Path(FUT_BASE_DIR).joinpath(".fut_cache", "setup_timing.json").as_posix()
 
 
 def parse_arguments():
@@ -86,27 +92,53 @@ def setup_server_handler() -> None:
         raise RuntimeError(traceback.format_exc()) from exception
 
 
+def setup_node_handler(node: str) -> None:
+    log.debug(f"Setting up {node} handler")
+    try:
+        if hasattr(pytest, node):
+            log.info(f"Found existing {node} handler")
+            return
+        with step(f"{node.upper()} handler initialization"):
+            setattr(pytest, node, NodeHandler(name=node))
+    except Exception as exception:
+        raise RuntimeError(traceback.format_exc()) from exception
+
+
 def setup_node_handlers(nodes: tuple = ALL_NODES_TUPLE) -> None:
     log.info("Setting up node handlers")
+    for node in nodes:
+        setup_node_handler(node)
+
+
+def setup_client_handler(client: str) -> None:
+    log.debug(f"Setting up {client} handler")
     try:
-        for node in nodes:
-            log.debug(f"Setting up {node} handler")
-            if hasattr(pytest, node):
-                log.info(f"Found existing {node} handler")
-                continue
-            with step(f"{node.upper()} handler initialization"):
-                setattr(pytest, node, NodeHandler(name=node))
+        with step(f"{client.upper()} handler initialization"):
+            setattr(pytest, client, DeviceHandler(name=client))
     except Exception as exception:
         raise RuntimeError(traceback.format_exc()) from exception
 
 
 def setup_client_handlers(clients: tuple = ALL_CLIENTS_TUPLE) -> None:
     log.info("Setting up client handlers")
+    for client in clients:
+        setup_client_handler(client)
+
+
+def check_ssh_availability(nodes: tuple = ALL_NODES_TUPLE) -> None:
+    log.info(f"Performing SSH availability check for the following devices: {nodes}")
     try:
-        for client in clients:
-            log.debug(f"Setting up {client} handler")
-            with step(f"{client.upper()} handler initialization"):
-                setattr(pytest, client, DeviceHandler(name=client))
+        with step("SSH availability check"):
+            stream = subprocess.Popen(
+                [f"{FUT_BASE_DIR}/framework/tools/wait_for_host_ssh.py", ",".join(nodes)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            stdout_bytes, _ = stream.communicate()
+            stdout = stdout_bytes.decode("utf-8").strip()
+            exit_code = stream.returncode
+            log.info(stdout)
+            assert exit_code == 0
     except Exception as exception:
         raise RuntimeError(traceback.format_exc()) from exception
 
@@ -138,11 +170,11 @@ def setup_node_device(node, *args) -> None:
 
             # TMP mount executable
             fut_dir = node_handler.fut_dir
-            mount_point_ec, mount_point_std_out, mount_point_std_err = node_handler.device_api.run_raw(
+            mount_point_ec, mount_point_std_out, mount_point_std_err = node_handler.run_raw(
                 f"test -e {fut_dir} || mkdir -p {fut_dir} && df -TP {fut_dir} | tail -1 | awk -F' ' '{{print $NF}}'",
             )
             assert mount_point_ec == 0
-            assert node_handler.device_api.run_raw(f"mount | (! grep -E 'on {mount_point_std_out} .*noexec')")[0] == 0
+            assert node_handler.run_raw(f"mount | (! grep -E 'on {mount_point_std_out} .*noexec')")[0] == 0
 
             # Transfer FUT files
             node_handler.file_transfer(folders=["shell"])
@@ -161,6 +193,9 @@ def setup_node_device(node, *args) -> None:
                 # Prevent node from rebooting
                 assert node_handler.execute("tools/device/device_init", skip_logging=True)[0] == 0
 
+            # Retrieve the bridge type and the Node_Services table with a single OVSDB transaction
+            node_handler.load_startup_ovsdb_state()
+
             kconfig_managers = node_handler.get_kconfig_managers()
             log.debug(f"Managers in kconfig file: {kconfig_managers}")
             services_and_statuses = node_handler.get_node_services_and_status()
@@ -179,56 +214,75 @@ def setup_client_device(client, *args) -> None:
         raise RuntimeError(traceback.format_exc()) from exception
 
 
-def pre_test_device_setup(node_devices: tuple = ALL_NODES_TUPLE, client_devices: tuple = ALL_CLIENTS_TUPLE) -> None:
-    try:
-        threads: list = []
-        setup_device_map: list = []
-        log.info(f"Performing setup for the following devices: {node_devices + client_devices}")
-
-        setup_fut_configurator()
-        setup_server_handler()
-        setup_server_device()
-
-        log.info(f"Performing SSH availability check for the following devices: {node_devices}")
+def create_setup_scheduler(node_devices: tuple = ALL_NODES_TUPLE, client_devices: tuple = ALL_CLIENTS_TUPLE):
+    """
+    Create the dependency graph of the session setup steps.
 
-        server = pytest.server
+    The server container setup, the node SSH availability check and the
+    client handler initialization only depend on the FUT configurator, so
+    they run in parallel. Each node handler is initialized as soon as the
+    nodes are reachable over SSH, and each device setup starts as soon as
+    its own handler is initialized.
 
-        with step("SSH availability check"):
-            ssh_check_nodes = ",".join(node_devices)
-            stream = subprocess.Popen(
-                [f"{server.fut_base_dir}/framework/tools/wait_for_host_ssh.py", ssh_check_nodes],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            stdout_bytes, _ = stream.communicate()
-            stdout = stdout_bytes.decode("utf-8").strip()
-            exit_code = stream.returncode
-            log.info(stdout)
-            assert exit_code == 0
+    Args:
+        node_devices (tuple): Names of the nodes.
+        client_devices (tuple): Names of the clients.
 
-        if node_devices:
-            setup_node_handlers(node_devices)
-            setup_device_map.extend(zip([setup_node_device] * len(node_devices), node_devices))
+    Returns:
+        (SetupScheduler): Scheduler with the setup steps.
+    """
+    scheduler = SetupScheduler()
+    scheduler.add_step("fut_configurator", setup_fut_configurator)
+    scheduler.add_step("server_handler", setup_server_handler, depends_on=["fut_configurator"])
+    scheduler.add_step("server_device", setup_server_device, depends_on=["server_handler"])
+    if node_devices:
+        scheduler.add_step("ssh_check", check_ssh_availability, tuple(node_devices), depends_on=["fut_configurator"])
+    for node in node_devices:
+        scheduler.add_step(f"{node}_handler", setup_node_handler, node, depends_on=["ssh_check"])
+        scheduler.add_step(f"{node}_device", setup_node_device, node, depends_on=[f"{node}_handler"])
+    for client in client_devices:
+        scheduler.add_step(f"{client}_handler", setup_client_handler, client, depends_on=["fut_configurator"])
+        if client not in NO_SETUP_CLIENTS_TUPLE:
+            scheduler.add_step(f"{client}_device", setup_client_device, client, depends_on=[f"{client}_handler"])
+    return scheduler
+
+
+def report_setup_timing(scheduler: SetupScheduler, timing_file: str | None = None) -> dict:
+    """
+    Log the setup timing breakdown, attach it to the Allure report and write it to the JSON file.
 
-        if client_devices:
-            setup_client_handlers(client_devices)
-            setup_device_map.extend(
-                zip([setup_client_device] * (len(client_devices)), set(client_devices) - {"e1", "e2"}),
-            )
+    Args:
+        scheduler (SetupScheduler): Executed scheduler.
+        timing_file (str | None): Path of the JSON file. Defaults to SETUP_TIMING_FILE.
 
-        log.info("Setting up node devices")
-        for target, target_args in setup_device_map:
-            log.debug(f"Setting up {target_args} device")
-            flattened_args = flatten_list([target_args])
-            thread = threading.Thread(target=target, args=flattened_args)
-            threads.append(thread)
-            thread.start()
+    Returns:
+        (dict): Timing breakdown.
+    """
+    timing_report = scheduler.timing_report()
+    log.info(
+        f"Setup completed in {timing_report['total_duration']}s, serial duration of the steps "
+        f"{timing_report['serial_duration']}s, critical path: {' -> '.join(timing_report['critical_path'])}",
+    )
+    timing_file = timing_file or SETUP_TIMING_FILE
+    timing_json = output_to_json(timing_report, sort_keys=False, convert_only=True)
+    allure_attach_to_report(name="setup_timing", body=timing_json)
+    try:
+        Path(timing_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(timing_file).write_text(timing_json)
+    except OSError as exception:
+        log.warning(f"Failed to write the setup timing to {timing_file}: {exception}")
+    return timing_report
 
-        for thread in threads:
-            thread.join()
 
+def pre_test_device_setup(node_devices: tuple = ALL_NODES_TUPLE, client_devices: tuple = ALL_CLIENTS_TUPLE) -> None:
+    log.info(f"Performing setup for the following devices: {tuple(node_devices) + tuple(client_devices)}")
+    scheduler = create_setup_scheduler(tuple(node_devices), tuple(client_devices))
+    try:
+        scheduler.run()
     except Exception as exception:
         raise RuntimeError(traceback.format_exc()) from exception
+    finally:
+        report_setup_timing(scheduler)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""CLI tool to split a single FUT test run between several identical testbeds."""
+
+import argparse
+import shlex
+import signal
+import sys
+from pathlib import Path
+
+from framework.lib.fut_allure import merge_result_dirs
+from framework.lib.fut_sharding import (
+    collect_node_ids,
+    estimate_shard_duration,
+    load_duration_history,
+    run_shards,
+    SHARD_HISTORY_FILE,
+    split_into_shards,
+    update_duration_history,
+)
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Split a FUT test run into shards balanced by duration and execute them on several testbeds. "
+        "All unrecognized arguments are passed to pytest.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--testbeds",
+        "-t",
+        type=str,
+        required=True,
+        help="Comma-separated names of the identical testbeds, one shard is executed on each",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        required=False,
+        default="shard-results",
+        help="Directory of the shard logs and results, the merged results are in the 'allure-results' subdirectory",
+    )
+    parser.add_argument(
+        "--history",
+        type=str,
+        required=False,
+        default=SHARD_HISTORY_FILE,
+        help="File with the test case durations recorded in the previous runs",
+    )
+    parser.add_argument(
+        "--plan-only",
+        action="store_true",
+        required=False,
+        help="Only print the shards with their estimated durations, without executing them",
+    )
+    parser.add_argument(
+        "--pytest-command",
+        type=str,
+        required=False,
+        default=None,
+        help="Command which runs pytest, e.g. a fake testbed runner. Defaults to the current Python interpreter",
+    )
+    input_args, pytest_args = parser.parse_known_args()
+    return input_args, pytest_args
+
+
+def signal_handler(sig, frame):
+    print("\nShard runner interrupted")
+    sys.exit(1)
+
+
+def main(
+    testbeds: list[str],
+    output_dir: str,
+    pytest_args: list[str],
+    history_file: str = SHARD_HISTORY_FILE,
+    plan_only: bool = False,
+    pytest_command: list[str] | None = None,
+) -> int:
+    node_ids = collect_node_ids(pytest_args, testbeds[0], pytest_command=pytest_command)
+    history = load_duration_history(history_file)
+    shards = split_into_shards(node_ids, len(testbeds), history)
+
+    print(f"{len(node_ids)} test cases in {len(testbeds)} shards:")
+    for index, (testbed, shard) in enumerate(zip(testbeds, shards)):
+        estimated_duration = estimate_shard_duration(shard, history)
+        print(f"    Shard {index} on {testbed}: {len(shard)} test cases, estimated {estimated_duration:.0f}s")
+    if plan_only or not node_ids:
+        return 0
+
+    shard_results = run_shards(shards, testbeds, output_dir, pytest_args, pytest_command=pytest_command)
+    merged_results_dir = Path(output_dir).joinpath("allure-results").as_posix()
+    merge_result_dirs([shard_result.results_dir for shard_result in shard_results], merged_results_dir)
+    update_duration_history([shard_result.durations_file for shard_result in shard_results], history_file)
+
+    for shard_result in shard_results:
+        print(
+            f"    Shard {shard_result.index} on {shard_result.testbed}: exit code {shard_result.exit_code}, "
+            f"{shard_result.duration:.0f}s, log {shard_result.log_file}",
+        )
+    print(f"Merged results: {merged_results_dir}")
+    return max(shard_result.exit_code for shard_result in shard_results)
+
+
+if __name__ == "__main__":
+    # Accept Ctrl+C as a signal interrupt
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Parse input arguments
+    input_args, pytest_args = parse_arguments()
+    sys.exit(
+        main(
+            testbeds=[testbed for testbed in input_args.testbeds.split(",") if testbed],
+            output_dir=input_args.output_dir,
+            pytest_args=pytest_args,
+            history_file=input_args.history,
+            plan_only=input_args.plan_only,
+            pytest_command=shlex.split(input_args.pytest_command) if input_args.pytest_command else None,
+        ),
+    )
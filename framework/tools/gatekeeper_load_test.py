@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+"""CLI tool to measure the request latency of the gatekeeper simulator in the debug and the production mode."""
+
+import argparse
+import random
+import signal
+import sys
+import time
+from pathlib import Path
+from statistics import median
+
+from docker.server.data.var.www.gatekeeper.lib import gatekeeper_pb2
+from docker.server.data.var.www.gatekeeper.lib.gatekeeper_db import GatekeeperDb
+
+from framework.lib.fut_latency import format_latencies
+
+DEFAULT_FQDNS = [
+    "www.wikipedia.org",
+    "www.dailymirror.co.uk",
+    "www.googlefoo.com",
+    "www.playboy.com",
+    "www.unknown.org",
+]
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure the gatekeeper simulator request latency",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--requests",
+        "-r",
+        type=int,
+        required=False,
+        default=2000,
+        help="Number of requests sent in each mode",
+    )
+    parser.add_argument(
+        "--url",
+        "-u",
+        type=str,
+        required=False,
+        default=None,
+        help="URL of the running gatekeeper simulator, e.g. https://fut.opensync.io:5000/gatekeeper. "
+        "If not set, the debug and the production mode are compared on the simulator created in this process.",
+    )
+    parser.add_argument(
+        "--fqdn",
+        "-f",
+        type=str,
+        action="append",
+        required=False,
+        help="FQDN used in the requests. Can be repeated.",
+    )
+    parser.add_argument(
+        "--lib-path",
+        "-l",
+        type=str,
+        required=False,
+        default=Path(gatekeeper_pb2.__file__).parent.as_posix(),
+        help="Directory with the DB files of the simulator created in this process",
+    )
+    parser.add_argument(
+        "--seed",
+        "-s",
+        type=int,
+        required=False,
+        default=0,
+        help="Seed of the random request order",
+    )
+    input_args = parser.parse_args()
+    return input_args
+
+
+def signal_handler(sig, frame) -> None:
+    """Handle the signal.
+
+    Args:
+        sig (_type_): Not used
+        frame (_type_): Not used
+    """
+    sys.exit(0)
+
+
+def create_requests(fqdns: list[str], num_requests: int, seed: int) -> list[bytes]:
+    """
+    Create the serialized FQDN verdict requests.
+
+    Args:
+        fqdns (list): FQDNs, chosen randomly for each request.
+        num_requests (int): Number of requests.
+        seed (int): Seed of the random choice.
+
+    Returns:
+        (list): Serialized requests, each with a unique request ID.
+    """
+    rand = random.Random(seed)
+    requests = []
+    for request_id in range(1, num_requests + 1):
+        request = gatekeeper_pb2.GatekeeperReq()
+        request.req_fqdn.header.request_id = request_id
+        request.req_fqdn.header.policy_rule = "fut"
+        request.req_fqdn.fqdn = rand.choice(fqdns)
+        requests.append(request.SerializeToString())
+    return requests
+
+
+def measure(post, requests: list[bytes]) -> list[float]:
+    """
+    Send the requests one by one and measure the latency of each request.
+
+    Args:
+        post (callable): Sends the serialized request and returns the HTTP status code.
+        requests (list): Serialized requests.
+
+    Returns:
+        (list): Latencies in seconds.
+    """
+    latencies = []
+    for request in requests:
+        start_time = time.perf_counter()
+        status_code = post(request)
+        latencies.append(time.perf_counter() - start_time)
+        if status_code != 200:
+            print(f"Unexpected status code: {status_code}")
+    return latencies
+
+
+def measure_in_process(requests: list[bytes], lib_path: str) -> dict:
+    """
+    Measure the request latency of the simulator created in this process, in the debug and the production mode.
+
+    Args:
+        requests (list): Serialized requests.
+        lib_path (str): Directory with the DB files.
+
+    Returns:
+        (dict): Latencies in seconds for each mode.
+    """
+    from docker.server.data.var.www.gatekeeper import gatekeeper
+    from docker.server.data.var.www.gatekeeper.lib import gatekeeper_io
+
+    gatekeeper_io.gatekeeper_db = GatekeeperDb(lib_path)
+    client = gatekeeper.app.test_client()
+
+    def post(request):
+        return client.post("/gatekeeper", data=request).status_code
+
+    latencies = {}
+    initial_production_mode = gatekeeper.production_mode
+    try:
+        for mode, production_mode in [("debug", False), ("production", True)]:
+            gatekeeper.set_production_mode(production_mode)
+            # The first request loads the DB, which is not part of the per-request latency
+            post(requests[0])
+            latencies[mode] = measure(post, requests)
+    finally:
+        gatekeeper.set_production_mode(initial_production_mode)
+    return latencies
+
+
+def measure_url(url: str, requests: list[bytes]) -> dict:
+    """
+    Measure the request latency of the running simulator, in the mode the simulator was started in.
+
+    Args:
+        url (str): Gatekeeper endpoint URL.
+        requests (list): Serialized requests.
+
+    Returns:
+        (dict): Latencies in seconds.
+    """
+    import requests as http_requests
+
+    session = http_requests.Session()
+    session.verify = False
+    headers = {"Content-Type": "application/octet-stream"}
+
+    def post(request):
+        return session.post(url, data=request, headers=headers).status_code
+
+    post(requests[0])
+    return {url: measure(post, requests)}
+
+
+def main(num_requests: int, url: str, fqdns: list[str], lib_path: str, seed: int) -> None:
+    requests = create_requests(fqdns, num_requests, seed)
+    latencies = measure_url(url, requests) if url else measure_in_process(requests, lib_path)
+
+    for name, mode_latencies in latencies.items():
+        print(f"{name}: {format_latencies(mode_latencies)}, {len(mode_latencies) / sum(mode_latencies):.0f} req/s")
+    if "debug" in latencies and "production" in latencies:
+        print(f"Speedup: {median(latencies['debug']) / median(latencies['production']):.1f}x")
+
+
+if __name__ == "__main__":
+    # Accept Ctrl+C as a signal interrupt
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Parse input arguments
+    input_args = parse_arguments()
+    main(input_args.requests, input_args.url, input_args.fqdn or DEFAULT_FQDNS, input_args.lib_path, input_args.seed)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""CLI tool to compare the FUT script execution latency with and without the resident shell."""
+
+import argparse
+import signal
+import sys
+from statistics import median
+
+import pytest
+
+from framework.fut_configurator import FutConfigurator
+from framework.lib.fut_latency import format_latencies, measure
+from framework.lib.fut_resident_shell import ResidentShell
+from framework.node_handler import NodeHandler
+
+DEFAULT_SCRIPTS = [
+    "tools/device/check_kconfig_option CONFIG_MANAGER_WM y",
+    "tools/device/get_wireless_manager_name",
+]
+STATISTICS = ("min", "mean", "p50", "p95")
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare FUT script execution latency over SSH and in the resident shell",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--node",
+        "-n",
+        type=str,
+        required=False,
+        default="gw",
+        choices=("gw", "l1", "l2"),
+        help="Node used for the measurement",
+    )
+    parser.add_argument(
+        "--iterations",
+        "-i",
+        type=int,
+        required=False,
+        default=20,
+        help="Number of executions of each script",
+    )
+    parser.add_argument(
+        "--script",
+        "-s",
+        type=str,
+        action="append",
+        required=False,
+        help="Script path relative to the shell directory, followed by arguments. Can be repeated.",
+    )
+    input_args = parser.parse_args()
+    return input_args
+
+
+def signal_handler(sig, frame) -> None:
+    """Handle the signal.
+
+    Args:
+        sig (_type_): Not used
+        frame (_type_): Not used
+    """
+    sys.exit(0)
+
+
+def main(node: str, iterations: int, scripts: list[str]) -> None:
+    pytest.fut_configurator = FutConfigurator()
+    node_handler = NodeHandler(name=node)
+    resident_shell = ResidentShell(name=node, spawn_cmd=node_handler.get_resident_shell_command())
+    # The first execution starts the resident shell, which is not part of the per-call latency
+    resident_shell.run(f"{node_handler.fut_dir}/shell/tools/device/get_wireless_manager_name.sh")
+
+    for script in scripts:
+        script_name, _, script_args = script.partition(" ")
+        script_path = f"{node_handler.fut_dir}/shell/{script_name}.sh"
+        ssh_cmd = f"{node_handler.get_remote_test_command(test_path=script_name)} {script_args}"
+
+        ssh_latencies = measure(
+            lambda ssh_cmd=ssh_cmd: node_handler.device_api.run_raw(ssh_cmd, skip_logging=True)[0],
+            iterations,
+        )
+        resident_latencies = measure(
+            lambda script_path=script_path, script_args=script_args: resident_shell.run(script_path, script_args)[0],
+            iterations,
+        )
+
+        print(f"{script}:")
+        print(f"    SSH:            {format_latencies(ssh_latencies, STATISTICS)}")
+        print(f"    Resident shell: {format_latencies(resident_latencies, STATISTICS)}")
+        print(f"    Speedup:        {median(ssh_latencies) / median(resident_latencies):.1f}x")
+
+    resident_shell.close()
+
+
+if __name__ == "__main__":
+    # Accept Ctrl+C as a signal interrupt
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Parse input arguments
+    input_args = parse_arguments()
+    main(input_args.node, input_args.iterations, input_args.script or DEFAULT_SCRIPTS)
@@ -10,6 +10,7 @@ from framework.lib.fut_allure import (
     read_data_from_report,
     read_data_from_results,
     results_alignment,
+    ResultStore,
     split_common_entries,
 )
 
@@ -64,7 +65,8 @@ if __name__ == "__main__":
 
     # Assert that current data are Pytest results
     assert not Path(input_args.current).joinpath("index.html").is_file()
-    extracted_current_data = read_data_from_results(source_directory=input_args.current)
+    current_result_store = ResultStore(source_directory=input_args.current)
+    extracted_current_data = current_result_store.get_results_data()
 
     # Detect if reference data are Pytest results or Allure report
     if Path(input_args.current).joinpath("index.html").is_file():
@@ -77,4 +79,4 @@ if __name__ == "__main__":
     common_entries = aligned_results[2]
     split_entries = split_common_entries(common_entries)
     removed_entries = split_entries[1]
-    create_processed_results(input_args.current, removed_entries, input_args.backup)
+    create_processed_results(input_args.current, removed_entries, input_args.backup, current_result_store)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""CLI tool to compare the raw command latency over new SSH sessions and over the SSH connection pool."""
+
+import argparse
+import signal
+import sys
+
+import pytest
+
+from framework.fut_configurator import FutConfigurator
+from framework.lib.fut_latency import format_latencies, measure, percentile
+from framework.lib.fut_ssh_pool import SshConnectionPool
+from framework.node_handler import NodeHandler
+
+DEFAULT_COMMANDS = [
+    "ls /",
+    "pgrep -o dm",
+]
+
+
+def parse_arguments():
+    """Standalone method to parse script input arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare raw command latency over new SSH sessions and over the SSH connection pool",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--node",
+        "-n",
+        type=str,
+        required=False,
+        default="gw",
+        choices=("gw", "l1", "l2"),
+        help="Node used for the measurement",
+    )
+    parser.add_argument(
+        "--iterations",
+        "-i",
+        type=int,
+        required=False,
+        default=50,
+        help="Number of executions of each command",
+    )
+    parser.add_argument(
+        "--command",
+        "-c",
+        type=str,
+        action="append",
+        required=False,
+        help="Raw command executed on the device. Can be repeated.",
+    )
+    input_args = parser.parse_args()
+    return input_args
+
+
+def signal_handler(sig, frame) -> None:
+    """Handle the signal.
+
+    Args:
+        sig (_type_): Not used
+        frame (_type_): Not used
+    """
+    sys.exit(0)
+
+
+def main(node: str, iterations: int, commands: list[str]) -> None:
+    pytest.fut_configurator = FutConfigurator()
+    node_handler = NodeHandler(name=node)
+    ssh_pool = SshConnectionPool(name=node, ssh_command=node_handler.get_ssh_command)
+    # The first execution establishes the master connection, which is not part of the per-command latency
+    ssh_pool.run("true")
+
+    for command in commands:
+        ssh_latencies = measure(
+            lambda command=command: node_handler.device_api.run_raw(command, skip_logging=True)[0],
+            iterations,
+        )
+        pool_latencies = measure(lambda command=command: ssh_pool.run(command)[0], iterations)
+
+        print(f"{command}:")
+        print(f"    SSH session: {format_latencies(ssh_latencies, ('p50', 'p99'))}")
+        print(f"    SSH pool:    {format_latencies(pool_latencies, ('p50', 'p99'))}")
+        print(f"    Speedup:     {percentile(ssh_latencies, 0.5) / percentile(pool_latencies, 0.5):.1f}x")
+
+    ssh_pool.close()
+
+
+if __name__ == "__main__":
+    # Accept Ctrl+C as a signal interrupt
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Parse input arguments
+    input_args = parse_arguments()
+    main(input_args.node, input_args.iterations, input_args.command or DEFAULT_COMMANDS)
@@ -0,0 +1,164 @@
+import time
+from copy import deepcopy
+
+import allure
+import pytest
+
+from config.defaults import all_bandwidth_list, all_channels, all_encryption_types, radio_band_list
+from framework.generators.DefaultGen import DefaultGenClass
+from framework.lib.fut_regulatory import RegulatoryIndex
+from lib_testbed.generic.util.logger import log
+
+gw_max_channel_width = {"24g": 40, "5g": 160, "6g": 320}
+leaf_max_channel_width = {"24g": 40, "5gl": 80, "5gu": 80}
+
+
+class BenchmarkCapabilities:
+    """Device capabilities with a fixed set of supported bands, used for a reproducible benchmark."""
+
+    def __init__(self, max_channel_width: dict):
+        self.max_channel_width = max_channel_width
+
+    def get_regulatory_domain(self):
+        return "US"
+
+    def get_phy_radio_ifname(self, freq_band):
+        return f"phy_{freq_band}" if freq_band in self.max_channel_width else None
+
+    def get_max_channel_width(self, freq_band):
+        return self.max_channel_width.get(freq_band)
+
+    def get_supported_radio_channels(self, freq_band):
+        return all_channels.get(freq_band, []) if freq_band in self.max_channel_width else []
+
+
+class BenchmarkDevice:
+    def __init__(self, max_channel_width: dict):
+        self.capabilities = BenchmarkCapabilities(max_channel_width)
+
+
+def legacy_filter_wifi_params(default_gen: DefaultGenClass, inputs: dict) -> dict:
+    """Apply the filters one after another with a full pass over the inputs each, as the reference implementation."""
+    radio_band_keys = {"radio_band", "leaf_radio_band"}
+    args_mapping = inputs["args_mapping"]
+
+    def ht_mode_of(single_input):
+        return single_input[args_mapping.index("ht_mode")] if "ht_mode" in args_mapping else "HT20"
+
+    def bands(single_input, key):
+        radio_band = single_input[args_mapping.index(key)]
+        device = "leaf" if key.removesuffix("_radio_band") in ["leaf", "l1", "l2"] else "gw"
+        return radio_band is None or default_gen._check_band_compatible(radio_band, device)
+
+    def bandwidths(single_input, key):
+        radio_band, ht_mode = single_input[args_mapping.index(key)], ht_mode_of(single_input)
+        supported = default_gen._check_ht_mode_band_support(radio_band=radio_band, ht_mode=ht_mode)
+        return None in [radio_band, ht_mode] or supported
+
+    def regulatory(single_input, key):
+        radio_band = single_input[args_mapping.index(key)]
+        channel = single_input[args_mapping.index(f"{key.removesuffix('radio_band')}channel")]
+        ht_mode = ht_mode_of(single_input)
+        device = "leaf" if key.removesuffix("_radio_band") in ["leaf", "l1", "l2"] else "gw"
+        compliant = default_gen._check_band_channel_compatible(radio_band, channel, device, ht_mode=ht_mode)
+        return None in [radio_band, channel, ht_mode] or compliant
+
+    def unii_4(single_input, key):
+        radio_band = single_input[args_mapping.index(key)]
+        channel = single_input[args_mapping.index(f"{key.removesuffix('radio_band')}channel")]
+        ht_mode = ht_mode_of(single_input)
+        return None in [radio_band, channel, ht_mode] or not (
+            radio_band in ["5g", "5gu"]
+            and (
+                channel in [169, 173, 177, 181]
+                or (channel == 165 and ht_mode != "HT20")
+                or (channel in [149, 153, 157, 161] and ht_mode == "HT160")
+            )
+        )
+
+    predicates = [bands, bandwidths, regulatory]
+    if not default_gen._check_unii_4_capable():
+        predicates.append(unii_4)
+    for predicate in predicates:
+        inputs["inputs"] = [
+            single_input
+            for single_input in inputs["inputs"]
+            if all(predicate(single_input, key) for key in radio_band_keys)
+        ]
+    return inputs
+
+
+@pytest.fixture(scope="module")
+def benchmark_gen():
+    default_gen = DefaultGenClass(
+        gw=BenchmarkDevice(gw_max_channel_width),
+        leaf=BenchmarkDevice(leaf_max_channel_width),
+    )
+    default_gen.unii_4_capable = False
+    return default_gen
+
+
+@pytest.fixture(scope="module")
+def benchmark_inputs():
+    """Synthetic WM2-like inputs: channel x ht_mode x band permutations for gw and leaf, roughly 50k inputs."""
+    channels = sorted(set(channel for band_channels in all_channels.values() for channel in band_channels))
+    leaf_channel_bands = [(channel, band) for band in ["24g", "5gl", "5gu"] for channel in all_channels[band][::4]]
+    inputs = {
+        "args_mapping": ["channel", "ht_mode", "radio_band", "leaf_channel", "leaf_radio_band", "encryption"],
+        "inputs": [
+            [channel, ht_mode, radio_band, leaf_channel, leaf_radio_band, encryption]
+            for channel in channels[::2]
+            for ht_mode in all_bandwidth_list
+            for radio_band in radio_band_list
+            for leaf_channel, leaf_radio_band in leaf_channel_bands
+            for encryption in all_encryption_types
+        ]
+        + [[None, None, None, None, None, None]],
+    }
+    return inputs
+
+
+@allure.title("Benchmark DefaultGenClass radio parameter filters")
+class TestDefaultGenFilterBenchmark:
+    @allure.title("Validate single pass filter output matches the sequential filters")
+    def test__filter_wifi_params_output(self, benchmark_gen, benchmark_inputs):
+        expected = legacy_filter_wifi_params(benchmark_gen, deepcopy(benchmark_inputs))["inputs"]
+        actual = benchmark_gen._filter_wifi_params(deepcopy(benchmark_inputs))["inputs"]
+        log.info(f"inputs:{len(benchmark_inputs['inputs'])}, remaining:{len(actual)}")
+        assert expected and actual == expected
+
+    @allure.title("Validate regulatory compliance is verified with one batch per device")
+    def test__filter_wifi_params_regulatory_batch(self, benchmark_gen, benchmark_inputs, monkeypatch):
+        batch_sizes = []
+        compliant_rows = RegulatoryIndex.compliant_rows
+
+        def counting_compliant_rows(regulatory_index, rows, *args, **kwargs):
+            batch_sizes.append(len(rows))
+            return compliant_rows(regulatory_index, rows, *args, **kwargs)
+
+        def check_single_row(*args, **kwargs):
+            raise AssertionError("Regulatory compliance must not be verified for a single row")
+
+        monkeypatch.setattr(RegulatoryIndex, "compliant_rows", counting_compliant_rows)
+        monkeypatch.setattr(benchmark_gen, "_check_band_channel_compatible", check_single_row)
+        benchmark_gen._filter_regulatory_incompatible_wifi_params(deepcopy(benchmark_inputs))
+        log.info(f"Regulatory compliance batch sizes: {batch_sizes}")
+        assert len(batch_sizes) == 2
+
+    @allure.title("Benchmark single pass filter against the sequential filters")
+    def test__filter_wifi_params_speedup(self, benchmark_gen, benchmark_inputs):
+        legacy_inputs, single_pass_inputs = deepcopy(benchmark_inputs), deepcopy(benchmark_inputs)
+
+        start_time = time.perf_counter()
+        legacy_result = legacy_filter_wifi_params(benchmark_gen, legacy_inputs)["inputs"]
+        legacy_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        single_pass_result = benchmark_gen._filter_wifi_params(single_pass_inputs)["inputs"]
+        single_pass_duration = time.perf_counter() - start_time
+
+        log.info(
+            f"inputs:{len(benchmark_inputs['inputs'])}, sequential:{legacy_duration:.3f}s, "
+            f"single pass:{single_pass_duration:.3f}s, speedup:{legacy_duration / single_pass_duration:.1f}x",
+        )
+        assert single_pass_result == legacy_result
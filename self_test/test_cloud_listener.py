@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+
+import allure
+import pytest
+
+from framework.lib.fut_latency import format_latencies
+from framework.tools.cloud_listener import (
+    CloudListener,
+    configure_logging,
+    encode_message,
+    JsonRpcFramer,
+    JsonRpcFramingError,
+    log as cloud_listener_log,
+)
+from framework.tools.cloud_listener_load_test import run_load, run_local_load
+from lib_testbed.generic.util.logger import log
+
+
+@pytest.fixture
+def listener_log(tmp_path):
+    log_file = tmp_path.joinpath("cloud_listener.log")
+    handler = configure_logging(verbose=True, log_file=log_file.as_posix())
+    yield handler, log_file
+    cloud_listener_log.removeHandler(handler)
+    handler.close()
+    cloud_listener_log.setLevel(logging.NOTSET)
+
+
+@allure.title("Validate JsonRpcFramer class")
+class TestJsonRpcFramer:
+    @allure.title("Validate messages are split correctly regardless of the chunk boundaries")
+    def test_chunk_boundaries(self):
+        messages = [
+            {"id": "echo", "method": "echo", "params": []},
+            {"id": 1, "result": [{"rows": [{"name": "br-home", "ssid": 'a}"b\\{['}]}], "error": None},
+            {"id": None, "method": "update", "params": ["mon", {"Wifi_VIF_Config": {}}]},
+        ]
+        stream = b" \n".join(encode_message(message) for message in messages) + b"\n"
+        for chunk_size in [1, 2, 3, 7, 64, len(stream)]:
+            framer = JsonRpcFramer()
+            received = []
+            for position in range(0, len(stream), chunk_size):
+                received.extend(framer.feed(stream[position : position + chunk_size]))
+            assert received == messages, chunk_size
+            assert not framer.buffer
+
+    @allure.title("Validate escaped quotes split between the chunks")
+    def test_escape_boundary(self):
+        message = {"id": 1, "method": "echo", "params": ['"}\\"']}
+        data = json.dumps(message).encode()
+        escape_position = data.index(b"\\")
+        framer = JsonRpcFramer()
+        assert framer.feed(data[: escape_position + 1]) == []
+        assert framer.feed(data[escape_position + 1 :]) == [message]
+
+    @allure.title("Validate invalid and oversized streams are rejected")
+    def test_framing_errors(self):
+        with pytest.raises(JsonRpcFramingError, match="outside of a JSON object"):
+            JsonRpcFramer().feed(b'"echo"')
+        with pytest.raises(JsonRpcFramingError, match="Invalid JSON"):
+            JsonRpcFramer().feed(b'{"id": 1,}')
+        with pytest.raises(JsonRpcFramingError, match="exceeds"):
+            JsonRpcFramer(max_message_size=100).feed(b'{"params": "' + b"x" * 200)
+
+
+@allure.title("Validate CloudListener class")
+class TestCloudListener:
+    @allure.title("Validate many devices are served concurrently without the per-message delay")
+    def test_concurrent_devices(self):
+        result = asyncio.run(run_local_load(num_devices=100, num_messages=20, echo_interval=0))
+        latencies = sorted(result["latencies"])
+        log.info(f"{len(latencies)} echo requests in {result['duration']:.2f}s: {format_latencies(latencies)}")
+        # Each simulated device validates the reply to its echo request before sending the next one
+        assert len(latencies) == 100 * 20
+        assert result["cloud_echo_requests"] == 0
+
+    @allure.title("Validate the replies of each device are sent in the order of its requests")
+    def test_reply_order(self):
+        num_devices, num_messages = 20, 5
+
+        async def exchange():
+            listener = CloudListener("127.0.0.1", 0, echo_interval=0)
+            await listener.start()
+            try:
+                connections = [await asyncio.open_connection("127.0.0.1", listener.port) for _ in range(num_devices)]
+                # All devices send their requests before any of the replies is read
+                for device_index, (_, writer) in enumerate(connections):
+                    for message_index in range(num_messages):
+                        request = {"id": f"{device_index}-{message_index}", "method": "echo", "params": [device_index]}
+                        writer.write(encode_message(request))
+                    await writer.drain()
+                replies = {}
+                for device_index, (reader, writer) in reversed(list(enumerate(connections))):
+                    framer = JsonRpcFramer()
+                    replies[device_index] = []
+                    while len(replies[device_index]) < num_messages:
+                        replies[device_index].extend(framer.feed(await reader.read(1024)))
+                    writer.close()
+                return replies, listener.echo_count
+            finally:
+                await listener.stop()
+
+        replies, echo_count = asyncio.run(exchange())
+        assert echo_count == num_devices * num_messages
+        for device_index, device_replies in replies.items():
+            assert device_replies == [
+                {"id": f"{device_index}-{message_index}", "result": [device_index], "error": None}
+                for message_index in range(num_messages)
+            ]
+
+    @allure.title("Validate echo requests are sent to the devices and other requests are rejected")
+    def test_cloud_echo_requests(self):
+        async def exchange():
+            listener = CloudListener("127.0.0.1", 0, echo_interval=0.05)
+            await listener.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", listener.port)
+                writer.write(encode_message({"id": 5, "method": "transact", "params": []}))
+                framer = JsonRpcFramer()
+                received = []
+                while len(received) < 3:
+                    received.extend(framer.feed(await reader.read(1024)))
+                writer.write(encode_message({"id": "echo", "result": [], "error": None}))
+                await writer.drain()
+                await asyncio.sleep(0.05)
+                echo_replies = [connection.echo_replies for connection in listener.connections]
+                writer.close()
+                load = await run_load("127.0.0.1", listener.port, num_devices=5, num_messages=10)
+                return received, echo_replies, load, listener.connection_count
+            finally:
+                await listener.stop()
+
+        received, echo_replies, load, connection_count = asyncio.run(exchange())
+        assert received[0] == {"id": 5, "result": None, "error": "unknown method"}
+        assert received[1:] == [{"params": [], "id": "echo", "method": "echo"}] * 2
+        assert echo_replies == [1]
+        assert len(load["latencies"]) == 5 * 10
+        assert connection_count == 6
+
+    @allure.title("Validate log records are buffered and written in batches")
+    def test_buffered_log(self, listener_log):
+        handler, log_file = listener_log
+        asyncio.run(run_local_load(num_devices=2, num_messages=3, echo_interval=0))
+        assert not log_file.exists() or "Received from" not in log_file.read_text()
+        handler.flush()
+        log_lines = log_file.read_text().splitlines()
+        assert sum("Connected by" in line for line in log_lines) == 2
+        assert sum("Received from" in line for line in log_lines) == 2 * 3
@@ -0,0 +1,117 @@
+import random
+import time
+
+import allure
+import pytest
+
+from framework.lib.fut_allure import results_alignment
+from lib_testbed.generic.util.logger import log
+
+test_names = [f"test_{suite}_{index}" for suite in ["wm2", "nm2", "onbrd", "cm2", "sm"] for index in range(50)]
+statuses = ["passed", "failed", "broken", "skipped"]
+
+
+def legacy_results_alignment(current_data: list, reference_data: list) -> tuple[list, list, list]:
+    """Align the results by scanning the reference tests for each current test, as the reference implementation."""
+    sorted_current_data = sorted(current_data, key=lambda test: test["name"])
+    reference_data_specific_entries = sorted(reference_data, key=lambda test: test["name"])
+    common_entries = []
+    current_data_specific_entries = []
+    for test_case in sorted_current_data:
+        test_name = test_case["name"].split("[")[0]
+        name_ref = None
+        status_ref = None
+        for ref_idx, ref_test in enumerate(reference_data_specific_entries):
+            if ref_test["name"].split("[")[0] != test_name:
+                continue
+            if ref_test.get("parameterValues") != test_case.get("parameterValues"):
+                continue
+            name_ref = ref_test.get("name")
+            status_ref = ref_test.get("status")
+            reference_data_specific_entries.pop(ref_idx)
+            break
+        if name_ref is None or status_ref is None:
+            current_data_specific_entries.append(test_case)
+        else:
+            common_entries.append({**test_case, "name_ref": name_ref, "status_ref": status_ref})
+    return current_data_specific_entries, reference_data_specific_entries, common_entries
+
+
+def generate_results(num_entries: int, seed: int) -> tuple[list, list]:
+    """
+    Generate synthetic current and reference results.
+
+    Reference results have the dictionary keys of the parameter values in
+    a different order, parametrization suffixes are shuffled, and part of
+    the tests is duplicated or present in only one of the test runs.
+    """
+    rand = random.Random(seed)
+    current_data, reference_data = [], []
+    for index in range(num_entries):
+        test_name = test_names[index // 2 % len(test_names)]
+        # Pairs of tests share the configuration index, which produces duplicate keys
+        parameter_values = {"config_index": index // 2, "channel": rand.choice([1, 6, 11, 36, 44]), "ht_mode": "HT20"}
+        reversed_parameter_values = dict(reversed(parameter_values.items()))
+        current_test = {"name": f"{test_name}[config_{index}]", "status": rand.choice(statuses)}
+        reference_test = {"name": f"{test_name}[config_{rand.randrange(num_entries)}]", "status": rand.choice(statuses)}
+        if index % 10 != 1:
+            current_data.append({**current_test, "parameterValues": [parameter_values]})
+        if index % 10 != 2:
+            reference_data.append({**reference_test, "parameterValues": [reversed_parameter_values]})
+    return current_data, reference_data
+
+
+@allure.title("Validate results_alignment function")
+class TestResultsAlignment:
+    @allure.title("Validate indexed alignment matches the reference implementation")
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_results_alignment_equivalence(self, seed):
+        current_data, reference_data = generate_results(3000, seed)
+        actual = results_alignment(current_data, reference_data)
+        expected = legacy_results_alignment(current_data, reference_data)
+        log.info(f"current:{len(actual[0])}, reference:{len(actual[1])}, common:{len(actual[2])}")
+        assert actual == expected
+        assert actual[0] and actual[1] and actual[2]
+
+    @allure.title("Validate duplicate keys are aligned in the order of the test names")
+    def test_results_alignment_duplicates(self):
+        parameter_values = [{"channel": 6, "ht_mode": "HT20"}]
+        current_data = [
+            {"name": "test_wm2[cfg2]", "status": "failed", "parameterValues": parameter_values},
+            {"name": "test_wm2[cfg1]", "status": "passed", "parameterValues": parameter_values},
+        ]
+        reference_data = [
+            {"name": "test_wm2[cfg9]", "status": "broken", "parameterValues": parameter_values},
+            {"name": "test_wm2[cfg3]", "status": "passed", "parameterValues": parameter_values},
+            {"name": "test_wm2[cfg4]", "status": "passed", "parameterValues": parameter_values},
+        ]
+        _, reference_specific, common = results_alignment(current_data, reference_data)
+        assert [(test["name"], test["name_ref"]) for test in common] == [
+            ("test_wm2[cfg1]", "test_wm2[cfg3]"),
+            ("test_wm2[cfg2]", "test_wm2[cfg4]"),
+        ]
+        assert [test["name"] for test in reference_specific] == ["test_wm2[cfg9]"]
+
+    @allure.title("Validate alignment of 50k result entries")
+    def test_results_alignment_benchmark(self):
+        current_data, reference_data = generate_results(50000, 0)
+        start_time = time.perf_counter()
+        current_specific, reference_specific, common = results_alignment(current_data, reference_data)
+        duration = time.perf_counter() - start_time
+        log.info(
+            f"50k entries:{duration:.3f}s, common:{len(common)}, current:{len(current_specific)}, "
+            f"reference:{len(reference_specific)}",
+        )
+        assert len(common) + len(current_specific) == len(current_data)
+        assert len(common) + len(reference_specific) == len(reference_data)
+
+        # The linear scan is quadratic, so it is only measured on a subset of the entries
+        current_data, reference_data = generate_results(5000, 0)
+        start_time = time.perf_counter()
+        actual = results_alignment(current_data, reference_data)
+        duration = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        expected = legacy_results_alignment(current_data, reference_data)
+        legacy_duration = time.perf_counter() - start_time
+        log.info(f"5k entries:{duration:.3f}s, legacy 5k entries:{legacy_duration:.3f}s")
+        assert actual == expected
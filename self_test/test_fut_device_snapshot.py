@@ -0,0 +1,167 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework import fut_configurator
+from framework.fut_configurator import FutConfigurator
+from framework.lib.fut_device_snapshot import DeviceSnapshot
+from framework.node_handler import NodeHandler
+from lib_testbed.generic.util.logger import log
+
+
+class FakePodApi:
+    """Pod API which records the remote queries."""
+
+    def __init__(self, region: str = "US"):
+        self.region = region
+        self.queries = []
+        self.ovsdb = SimpleNamespace(get=self.get_ovsdb)
+
+    def get_region(self):
+        self.queries.append("get_region")
+        return self.region
+
+    def get_file(self, remote_path, location, create_dir=False):
+        self.queries.append("get_file")
+        return self.kconfig_path
+
+    def get_ovsdb(self, table, select, **kwargs):
+        self.queries.append(f"ovsdb {table}")
+        return "N/A"
+
+
+def create_node_handler(tmp_path, snapshot: DeviceSnapshot, device_api: FakePodApi) -> NodeHandler:
+    device_api.kconfig_path = tmp_path.joinpath("kconfig").as_posix()
+    node_handler = NodeHandler.__new__(NodeHandler)
+    node_handler.name = "gw"
+    node_handler.fut_base_dir = tmp_path.as_posix()
+    node_handler.opensync_root_dir = "/usr/opensync"
+    node_handler.expected_shell_result = 0
+    node_handler.device_api = device_api
+    node_handler.ovsdb = device_api.ovsdb
+    node_handler.device_snapshot = snapshot
+
+    def fake_execute(path, args="", **kwargs):
+        device_api.queries.append(path)
+        if path == "tools/device/get_wireless_manager_name":
+            return [0, "owm", ""]
+        return [0, "", ""]
+
+    node_handler.execute = fake_execute
+    node_handler._add_to_logs = lambda result, script: None
+    return node_handler
+
+
+def query_all_properties(node_handler: NodeHandler) -> dict:
+    node_handler._get_region()
+    return {
+        "regulatory_domain": node_handler.regulatory_domain,
+        "kconfig_managers": node_handler.get_kconfig_managers(),
+        "wireless_manager_name": node_handler.get_wireless_manager_name(),
+        "wpa3_supported": node_handler.get_wpa3_support(),
+        "bridge_type": node_handler.get_bridge_type(),
+    }
+
+
+@allure.title("Validate DeviceSnapshot class")
+class TestDeviceSnapshot:
+    @allure.title("Validate snapshot is only reused for the same device and firmware version")
+    def test_snapshot_identity(self, tmp_path):
+        snapshot = DeviceSnapshot("1A2B3C", "PP203X", "6.4.0-1", cache_dir=tmp_path.as_posix())
+        snapshot.set("bridge_type", "ovs_bridge")
+        assert DeviceSnapshot("1A2B3C", "PP203X", "6.4.0-1", cache_dir=tmp_path.as_posix()).get("bridge_type")
+        assert DeviceSnapshot("1A2B3C", "PP203X", "6.4.0-2", cache_dir=tmp_path.as_posix()).properties == {}
+        assert DeviceSnapshot("4D5E6F", "PP203X", "6.4.0-1", cache_dir=tmp_path.as_posix()).properties == {}
+        assert DeviceSnapshot("1A2B3C", "PP203X", "6.4.0-1").properties == {}
+
+    @allure.title("Validate invalid and missing snapshots are ignored")
+    def test_invalid_snapshot(self, tmp_path):
+        tmp_path.joinpath("1A2B3C.json").write_text('{"identity": ')
+        snapshot = DeviceSnapshot("1A2B3C", "PP203X", "6.4.0-1", cache_dir=tmp_path.as_posix())
+        assert snapshot.properties == {}
+        snapshot.set("wpa3_supported", False)
+        assert json.loads(tmp_path.joinpath("1A2B3C.json").read_text())["properties"] == {"wpa3_supported": False}
+        snapshot.clear()
+        assert not tmp_path.joinpath("1A2B3C.json").exists()
+        # Without the serial number the snapshot is not persisted
+        DeviceSnapshot(None, "PP203X", "6.4.0-1", cache_dir=tmp_path.as_posix()).set("bridge_type", "ovs_bridge")
+        assert list(tmp_path.iterdir()) == []
+
+
+@allure.title("Validate NodeHandler with the device snapshot")
+class TestNodeHandlerSnapshot:
+    @allure.title("Validate properties are queried once per firmware version")
+    def test_node_handler_queries(self, tmp_path):
+        cache_dir = tmp_path.joinpath("cache").as_posix()
+        tmp_path.joinpath("kconfig").write_text("CONFIG_MANAGER_WM=y\n# comment\nCONFIG_MANAGER_NM=y\nCONFIG_FOO=n\n")
+
+        device_api = FakePodApi()
+        node_handler = create_node_handler(tmp_path, DeviceSnapshot("1A2B3C", "PP203X", "1", cache_dir), device_api)
+        properties = query_all_properties(node_handler)
+        log.info(f"Queried properties: {properties}, queries: {device_api.queries}")
+        assert properties == {
+            "regulatory_domain": "US",
+            "kconfig_managers": ["NM", "WM"],
+            "wireless_manager_name": "owm",
+            "wpa3_supported": True,
+            "bridge_type": "native_bridge",
+        }
+        assert len(device_api.queries) == 5
+
+        # New session on the same firmware is served from the snapshot, except for the regulatory domain setting
+        device_api = FakePodApi()
+        node_handler = create_node_handler(tmp_path, DeviceSnapshot("1A2B3C", "PP203X", "1", cache_dir), device_api)
+        assert query_all_properties(node_handler) == properties
+        assert device_api.queries == ["get_region"]
+
+        # Regulatory domain changed without new firmware is detected
+        device_api = FakePodApi(region="EU")
+        node_handler = create_node_handler(tmp_path, DeviceSnapshot("1A2B3C", "PP203X", "1", cache_dir), device_api)
+        assert query_all_properties(node_handler)["regulatory_domain"] == "EU"
+        assert device_api.queries == ["get_region"]
+
+        # New firmware is queried again
+        device_api = FakePodApi(region="EU")
+        node_handler = create_node_handler(tmp_path, DeviceSnapshot("1A2B3C", "PP203X", "2", cache_dir), device_api)
+        assert query_all_properties(node_handler)["regulatory_domain"] == "EU"
+        assert len(device_api.queries) == 5
+
+    @allure.title("Validate regulatory domain is not stored in the snapshot")
+    def test_unsupported_region(self, tmp_path):
+        snapshot = DeviceSnapshot("1A2B3C", "PP203X", "1", tmp_path.as_posix())
+        node_handler = create_node_handler(tmp_path, snapshot, FakePodApi(region="XX"))
+        with pytest.raises(RuntimeError, match="not supported"):
+            node_handler._get_region()
+        node_handler = create_node_handler(tmp_path, snapshot, FakePodApi(region="US"))
+        assert node_handler._get_region() == "US"
+        assert snapshot.properties == {}
+
+
+@allure.title("Validate FutConfigurator pod API sharing")
+class TestFutConfiguratorPodApi:
+    @allure.title("Validate pod API of each node is resolved once, and different nodes concurrently")
+    def test_get_pod_api(self, monkeypatch):
+        resolved = []
+        resolving = threading.Barrier(2, timeout=5)
+
+        class FakePod:
+            def resolve_obj(self, config, nickname):
+                resolved.append(nickname)
+                # Both nodes must be resolved at the same time to pass the barrier
+                resolving.wait()
+                return SimpleNamespace(nickname=nickname, override_version_specific_ifnames=lambda: None)
+
+        monkeypatch.setattr(fut_configurator, "Pod", FakePod)
+        configurator = FutConfigurator.__new__(FutConfigurator)
+        configurator.testbed_cfg = {}
+        configurator.pod_apis = {}
+        configurator._pod_api_lock = threading.Lock()
+        configurator._pod_api_locks = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pod_apis = list(executor.map(configurator.get_pod_api, ["gw", "l1", "gw", "l1"]))
+        assert pod_apis[0] is pod_apis[2] and pod_apis[1] is pod_apis[3]
+        assert sorted(resolved) == ["gw", "l1"]
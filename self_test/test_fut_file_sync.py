@@ -0,0 +1,70 @@
+import subprocess
+
+import allure
+import pytest
+
+from framework.lib.fut_file_sync import (
+    create_sync_archive,
+    get_changed_files,
+    get_device_manifest_command,
+    get_local_manifest,
+    parse_device_manifest,
+)
+from lib_testbed.generic.util.logger import log
+
+
+@pytest.fixture
+def sync_dirs(tmp_path):
+    local_dir = tmp_path.joinpath("local")
+    device_dir = tmp_path.joinpath("device")
+    local_dir.joinpath("shell/lib").mkdir(parents=True)
+    local_dir.joinpath("shell/__pycache__").mkdir()
+    local_dir.joinpath("shell/lib/unit_lib.sh").write_text("unit_lib\n")
+    local_dir.joinpath("shell/lib/nm2_lib.sh").write_text("nm2_lib\n")
+    local_dir.joinpath("shell/__pycache__/skipped.pyc").write_text("skipped\n")
+    local_dir.joinpath("fut_set_env.sh").write_text('FUT_TOPDIR="/tmp/fut-base"\n')
+    device_dir.mkdir()
+    return local_dir, device_dir
+
+
+def get_device_manifest(device_dir, paths):
+    manifest_cmd = get_device_manifest_command(device_dir.as_posix(), paths)
+    manifest_std_out = subprocess.run(manifest_cmd, shell=True, stdout=subprocess.PIPE, check=True).stdout
+    return parse_device_manifest(manifest_std_out.decode("utf-8"))
+
+
+@allure.title("Validate FUT file synchronization helpers")
+class TestFutFileSync:
+    @allure.title("Validate only changed files are synchronized")
+    def test_sync_changed_files(self, sync_dirs, tmp_path):
+        local_dir, device_dir = sync_dirs
+        paths = ["shell", "fut_set_env.sh"]
+        local_manifest = get_local_manifest(local_dir.as_posix(), paths)
+        assert sorted(local_manifest) == ["fut_set_env.sh", "shell/lib/nm2_lib.sh", "shell/lib/unit_lib.sh"]
+
+        changed_files = get_changed_files(local_manifest, get_device_manifest(device_dir, paths))
+        assert sorted(changed_files) == sorted(local_manifest)
+        archive_path = tmp_path.joinpath("sync.tar.gz").as_posix()
+        assert create_sync_archive(archive_path, local_manifest, changed_files) > 0
+        subprocess.run(["tar", "-xzf", archive_path, "-C", device_dir.as_posix()], check=True)
+        assert device_dir.joinpath("shell/lib/unit_lib.sh").read_text() == "unit_lib\n"
+        assert not get_changed_files(local_manifest, get_device_manifest(device_dir, paths))
+
+        local_dir.joinpath("shell/lib/nm2_lib.sh").write_text("nm2_lib changed\n")
+        local_manifest = get_local_manifest(local_dir.as_posix(), paths)
+        changed_files = get_changed_files(local_manifest, get_device_manifest(device_dir, paths))
+        log.info(f"changed_files:{changed_files}")
+        assert changed_files == ["shell/lib/nm2_lib.sh"]
+
+    @allure.title("Validate device manifest of a missing directory is empty")
+    def test_device_manifest_missing_dir(self, tmp_path):
+        assert get_device_manifest(tmp_path.joinpath("missing"), ["shell"]) == {}
+
+    @allure.title("Validate device manifest of files with whitespace in the name")
+    def test_device_manifest_whitespace(self, sync_dirs):
+        local_dir, _ = sync_dirs
+        local_dir.joinpath("shell/lib/wifi lib.sh").write_text("wifi_lib\n")
+        local_manifest = get_local_manifest(local_dir.as_posix(), ["shell"])
+        device_manifest = get_device_manifest(local_dir, ["shell"])
+        assert device_manifest["shell/lib/wifi lib.sh"] == local_manifest["shell/lib/wifi lib.sh"][0]
+        assert not get_changed_files(local_manifest, device_manifest)
@@ -130,3 +130,20 @@ class TestFutTestConfigGenClass:
         test_configs = test_config_gen.get_test_configs()
         log.info(f"test_configs:{test_configs}")
         assert isinstance(test_configs, dict) and test_configs
+
+    @allure.title("Validate get_test_configs() method with the test configuration cache")
+    def test_get_test_configs_cached(self, tmp_path):
+        configurator_gen = pytest.fut_configurator.fut_test_config_gen_cls
+        test_config_gen = FutTestConfigGenClass(configurator_gen.gw, configurator_gen.leaf, cache_dir=tmp_path)
+        cache_key = test_config_gen.get_cache_key()
+        log.info(f"cache_key:{cache_key}")
+        assert cache_key and cache_key == test_config_gen.get_cache_key()
+        expected = test_config_gen.get_test_configs()
+        assert tmp_path.joinpath(f"{cache_key}.pickle").is_file()
+        cached_config_gen = FutTestConfigGenClass(configurator_gen.gw, configurator_gen.leaf, cache_dir=tmp_path)
+        cached_config_gen._generate_config_from_inputs = None
+        assert cached_config_gen.get_test_configs() == expected
+        tmp_path.joinpath("unrelated.txt").write_text("kept")
+        cached_config_gen.clear_cache()
+        assert not list(tmp_path.glob("*.pickle"))
+        assert tmp_path.joinpath("unrelated.txt").read_text() == "kept"
@@ -0,0 +1,35 @@
+import allure
+import pytest
+
+from framework.lib.fut_latency import format_latencies, measure, percentile
+from lib_testbed.generic.util.logger import log
+
+
+@allure.title("Validate latency statistics")
+class TestLatency:
+    @allure.title("Validate nearest-rank percentiles")
+    @pytest.mark.parametrize(
+        "fraction, expected",
+        [(0.0, 1.0), (0.5, 50.0), (0.95, 95.0), (0.99, 99.0), (1.0, 100.0)],
+    )
+    def test_percentile(self, fraction, expected):
+        values = [float(value) for value in range(100, 0, -1)]
+        assert percentile(values, fraction) == expected
+        assert percentile([], fraction) == 0.0
+
+    @allure.title("Validate the formatted latency statistics")
+    def test_format_latencies(self):
+        latencies = [0.001 * value for value in range(1, 101)]
+        formatted = format_latencies(latencies)
+        log.info(f"Latency: {formatted}")
+        assert formatted == "mean  50.500 ms, p50  50.000 ms, p95  95.000 ms, p99  99.000 ms"
+        assert format_latencies(latencies, ("min", "max")) == "min   1.000 ms, max 100.000 ms"
+        assert format_latencies([]) == "no samples"
+
+    @allure.title("Validate every call is measured and unexpected results are reported")
+    def test_measure(self, capsys):
+        results = iter([0, 1, 255, 0])
+        latencies = measure(lambda: next(results), 4)
+        assert len(latencies) == 4 and all(latency >= 0 for latency in latencies)
+        assert capsys.readouterr().out == "Unexpected result: 255\n"
+        assert len(measure(lambda: 200, 3, expected_results={200})) == 3
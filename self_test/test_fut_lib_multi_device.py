@@ -0,0 +1,97 @@
+import contextlib
+import threading
+import time
+
+import allure
+import pytest
+
+from framework.lib import fut_lib
+from lib_testbed.generic.util.logger import log
+
+
+class FakeDevice:
+    """Device which executes scripts by sleeping for the configured duration."""
+
+    def __init__(self, name: str, duration: float, ec: int = 0, barrier: threading.Barrier | None = None):
+        self.name = name
+        self.duration = duration
+        self.ec = ec
+        self.barrier = barrier
+        self.executed = False
+
+    def execute(self, path: str, args: str = "", **kwargs):
+        self.executed = True
+        # The barrier is passed only if all devices execute the script at the same time
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        time.sleep(self.duration)
+        if self.ec is None:
+            raise RuntimeError(f"{self.name} execution failed")
+        return self.ec, f"{self.name} {path} {args}", "" if self.ec == 0 else f"{self.name} error"
+
+
+@pytest.fixture
+def step_titles(monkeypatch):
+    titles = []
+
+    def record_step(step_title):
+        titles.append(step_title)
+        return contextlib.nullcontext()
+
+    monkeypatch.setattr(fut_lib, "step", record_step)
+    monkeypatch.setattr(fut_lib, "allure_attach_to_report", lambda name, body: None)
+    return titles
+
+
+@allure.title("Validate multi_device_concurrent_script_execution function")
+class TestMultiDeviceScriptExecution:
+    @allure.title("Validate scripts are executed concurrently and results are collected")
+    def test_concurrent_execution(self, step_titles):
+        barrier = threading.Barrier(3)
+        devices = [
+            FakeDevice(name, duration, barrier=barrier) for name, duration in [("gw", 0.3), ("l1", 0), ("l2", 0.1)]
+        ]
+        results = fut_lib.multi_device_concurrent_script_execution(devices, "tools/device/vif_reset", "arg")
+        log.info(f"results:{results}")
+        assert list(results) == ["gw", "l1", "l2"]
+        assert all(result["ec"] == 0 for result in results.values())
+        assert results["l1"]["std_out"] == "l1 tools/device/vif_reset arg"
+        assert [title.split()[0] for title in step_titles] == ["GW", "L1", "L2"]
+
+    @allure.title("Validate collect_all policy executes the script on all devices")
+    def test_collect_all(self, step_titles):
+        devices = [FakeDevice("gw", 0, ec=1), FakeDevice("l1", 0, ec=None), FakeDevice("l2", 0)]
+        results = fut_lib.multi_device_concurrent_script_execution(devices, "script", max_workers=1)
+        assert [result["ec"] for result in results.values()] == [1, None, 0]
+        assert "l1 execution failed" in results["l1"]["std_err"]
+        assert all(device.executed for device in devices)
+
+    @allure.title("Validate fail_fast policy skips executions after the first failure")
+    def test_fail_fast(self, step_titles):
+        devices = [FakeDevice("gw", 0, ec=1), FakeDevice("l1", 0), FakeDevice("l2", 0)]
+        results = fut_lib.multi_device_concurrent_script_execution(devices, "script", policy="fail_fast", max_workers=1)
+        assert results["gw"]["ec"] == 1
+        assert results["l1"]["ec"] is None and results["l2"]["ec"] is None
+        assert not devices[1].executed and not devices[2].executed
+
+    @allure.title("Validate fail_fast policy cancels pending executions while running ones complete")
+    def test_fail_fast_cancel_pending(self, step_titles):
+        devices = [FakeDevice("gw", 0.1, ec=1), FakeDevice("l1", 0.2), FakeDevice("l2", 0), FakeDevice("l3", 0)]
+        results = fut_lib.multi_device_concurrent_script_execution(devices, "script", policy="fail_fast", max_workers=2)
+        assert list(results) == ["gw", "l1", "l2", "l3"]
+        assert results["gw"]["ec"] == 1 and results["l1"]["ec"] == 0
+        assert results["l2"]["ec"] is None and results["l3"]["ec"] is None
+        assert not devices[2].executed and not devices[3].executed
+
+    @allure.title("Validate multi_device_script_execution reports the failures of all devices")
+    def test_multi_device_script_execution_collect_all(self, step_titles):
+        devices = [FakeDevice("gw", 0, ec=1), FakeDevice("l1", 0, ec=2)]
+        with pytest.raises(RuntimeError, match="gw error.*l1 error"):
+            fut_lib.multi_device_script_execution(devices, "script")
+        assert all(device.executed for device in devices)
+
+    @allure.title("Validate multi_device_script_execution raises on failure")
+    def test_multi_device_script_execution_failure(self, step_titles):
+        devices = [FakeDevice("gw", 0), FakeDevice("l1", 0, ec=1)]
+        with pytest.raises(RuntimeError, match="l1 error"):
+            fut_lib.multi_device_script_execution(devices, "script")
@@ -0,0 +1,124 @@
+import time
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework import node_handler
+from framework.lib.fut_log_stream import LogStream, LogStreamError
+from framework.node_handler import NodeHandler
+from lib_testbed.generic.util.logger import log
+
+
+class FakeDeviceApi:
+    """Device API which records the commands executed on the device."""
+
+    def __init__(self):
+        self.commands = []
+
+    def run_raw(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return [0, "", ""]
+
+
+@pytest.fixture
+def syslog(tmp_path):
+    syslog_file = tmp_path.joinpath("messages")
+    syslog_file.write_text("".join(f"boot message {index}\n" for index in range(100)))
+
+    def write_lines(*lines):
+        with open(syslog_file, "a") as syslog_fd:
+            syslog_fd.write("".join(f"{line}\n" for line in lines))
+
+    return syslog_file, write_lines
+
+
+@pytest.fixture
+def log_stream(syslog):
+    syslog_file, _ = syslog
+    stream = LogStream(name="self_test", spawn_cmd=["tail", "-n", "+1", "-F", syslog_file.as_posix()], settle_time=0.2)
+    yield stream
+    stream.close()
+
+
+@allure.title("Validate LogStream class")
+class TestLogStream:
+    @allure.title("Validate log lines are sliced by execution markers")
+    def test_get_lines(self, syslog, log_stream):
+        _, write_lines = syslog
+        start_mark = log_stream.mark()
+        assert start_mark == 100
+        write_lines("first step start", "first step end")
+        first_lines = log_stream.get_lines(start_mark)
+        end_mark = log_stream.mark()
+        write_lines("second step")
+        second_lines = log_stream.get_lines(end_mark)
+        log.info(f"first_lines:{first_lines}, second_lines:{second_lines}")
+        assert [line.split(" ", 1)[1] for line in first_lines] == ["first step start", "first step end"]
+        assert [line.split(" ", 1)[1] for line in second_lines] == ["second step"]
+        assert log_stream.get_lines(start_mark, end_mark) == first_lines
+
+    @allure.title("Validate lines dropped from the ring buffer are reported")
+    def test_ring_buffer(self, syslog):
+        syslog_file, write_lines = syslog
+        log_stream = LogStream(name="self_test", spawn_cmd=["tail", "-F", syslog_file.as_posix()], max_lines=5)
+        try:
+            start_mark = log_stream.mark()
+            write_lines(*[f"line {index}" for index in range(8)])
+            lines = log_stream.get_lines(start_mark)
+        finally:
+            log_stream.close()
+        assert lines[0] == "[3 log lines dropped from the log stream buffer]"
+        assert lines[-1].endswith("line 7") and len(lines) == 6
+
+    @allure.title("Validate log stream is restarted after it exits")
+    def test_restart(self, syslog, log_stream):
+        _, write_lines = syslog
+        log_stream.mark()
+        log_stream.process.kill()
+        log_stream.process.wait()
+        start_mark = log_stream.mark()
+        write_lines("after restart")
+        assert log_stream.get_lines(start_mark)[-1].endswith("after restart")
+        assert log_stream.restart_count == 0
+
+    @allure.title("Validate log stream is disabled after repeated failures")
+    def test_disabled(self):
+        log_stream = LogStream(name="self_test", spawn_cmd=["false"], max_restarts=2)
+        for _ in range(2):
+            with pytest.raises(LogStreamError, match="exited"):
+                log_stream.mark()
+        with pytest.raises(LogStreamError, match="disabled"):
+            log_stream.mark()
+        assert log_stream.disabled
+
+
+@allure.title("Validate NodeHandler.execute_with_logging with the log stream")
+class TestExecuteWithLogStream:
+    @allure.title("Validate log window is attached without commands executed on the device")
+    def test_execute_with_logging(self, syslog, log_stream, monkeypatch):
+        _, write_lines = syslog
+        attachments = {}
+        monkeypatch.setattr(
+            node_handler, "allure_attach_to_report", lambda name, body: attachments.update({name: body})
+        )
+
+        def fake_execute(path, args="", as_sudo=False, **kwargs):
+            write_lines(f"{path} {args} executed")
+            time.sleep(0.05)
+            return [int(args), "", ""]
+
+        device_handler = NodeHandler.__new__(NodeHandler)
+        device_handler.name = "gw"
+        device_handler.fut_configurator = SimpleNamespace(log_stream_enabled=True)
+        device_handler.device_api = FakeDeviceApi()
+        device_handler.log_stream = log_stream
+        device_handler.execute = fake_execute
+
+        assert device_handler.execute_with_logging("tests/wm2/wm2_test", "0")[0] == 0
+        assert not attachments
+        assert device_handler.execute_with_logging("tests/wm2/wm2_test", "1")[0] == 1
+        log.info(f"attachments:{attachments}")
+        assert len(attachments) == 1
+        assert list(attachments.values())[0].endswith("tests/wm2/wm2_test 1 executed")
+        assert device_handler.device_api.commands == []
@@ -0,0 +1,181 @@
+import json
+import subprocess
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework.server_handler import ServerHandler
+from framework.tools.fut_mqtt_collector import create_api_server, decode_message, MqttCollector, MqttMessageBuffer
+from framework.tools.fut_mqtt_tool import extract_mqtt_data_as_dict
+from lib_testbed.generic.mqtt.opensync_stats_pb2 import Report as StatsReportSchema
+from lib_testbed.generic.util.logger import log
+
+
+class LocalDeviceApi:
+    """Device API which executes the commands on the local host."""
+
+    def __init__(self):
+        self.commands = []
+
+    def run_raw(self, cmd, timeout=30, **kwargs):
+        self.commands.append(cmd)
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout)
+        return [result.returncode, result.stdout, result.stderr]
+
+
+def create_report_payload(node_id: str, noise_floor: int, compress: bool = False) -> bytes:
+    """Create the serialized statistics report with a single device entry."""
+    report = StatsReportSchema(nodeID=node_id)
+    report.device.add(noise_floor=noise_floor)
+    payload = report.SerializeToString()
+    return zlib.compress(payload) if compress else payload
+
+
+@pytest.fixture
+def mqtt_collector(monkeypatch):
+    """Collector which is not connected to the broker, its MQTT callbacks are invoked directly."""
+    collector = MqttCollector("fut.opensync.io", 65002, None, MqttMessageBuffer(max_messages=100))
+    subscribed_topics = []
+
+    def fake_subscribe(topic):
+        subscribed_topics.append(topic)
+        return 0, len(subscribed_topics)
+
+    monkeypatch.setattr(collector.client, "subscribe", fake_subscribe)
+    collector.subscribed_topics = subscribed_topics
+    return collector
+
+
+@pytest.fixture
+def collector_api(mqtt_collector):
+    api_server = create_api_server(mqtt_collector, 0)
+    thread = threading.Thread(target=api_server.serve_forever, daemon=True)
+    thread.start()
+    yield mqtt_collector, api_server.server_address[1]
+    api_server.shutdown()
+    api_server.server_close()
+
+
+def receive_message(collector: MqttCollector, topic: str, payload: bytes) -> None:
+    collector._on_message(collector.client, None, SimpleNamespace(topic=topic, payload=payload))
+
+
+@allure.title("Validate MqttMessageBuffer class")
+class TestMqttMessageBuffer:
+    @allure.title("Validate messages are filtered by topic, node ID and time window")
+    def test_query_filters(self):
+        buffer = MqttMessageBuffer(max_messages=100)
+        buffer.add("sim/stats/1", {"nodeID": "n1", "value": 1}, receive_time=10)
+        buffer.add("sim/stats/2", {"nodeId": "n2", "value": 2}, receive_time=20)
+        buffer.add("sim/fsm/1", {"nodeID": "n1", "value": 3}, receive_time=30)
+
+        def values(**filters):
+            return [entry["message"]["value"] for entry in buffer.query(**filters)]
+
+        assert values() == [1, 2, 3]
+        assert values(topic="sim/stats/#") == [1, 2]
+        assert values(topic="sim/+/1") == [1, 3]
+        assert values(node_id="n2") == [2]
+        assert values(since=15) == [2, 3]
+        assert values(since=15, until=25) == [2]
+        assert values(count=2) == [1, 2]
+
+    @allure.title("Validate waiting query returns as soon as the message is received")
+    def test_query_wait(self):
+        buffer = MqttMessageBuffer()
+        since = time.time()
+        buffer.add("sim/stats", {"nodeID": "n1"}, receive_time=since - 1)
+        timer = threading.Timer(0.3, buffer.add, args=("sim/stats", {"nodeID": "n1", "value": 1}))
+        timer.start()
+        entries = buffer.query(topic="sim/stats", since=since, count=1, timeout=10)
+        log.info(f"entries:{entries}")
+        # The query waited for the message received after the start of the time window
+        assert [entry["message"]["value"] for entry in entries] == [1]
+        assert entries[0]["time"] >= since
+        assert buffer.query(topic="sim/stats", since=time.time(), count=1, timeout=0.1) == []
+
+
+@allure.title("Validate MqttCollector class")
+class TestMqttCollector:
+    @allure.title("Validate JSON, protobuf and compressed protobuf payloads are decoded")
+    def test_decode_message(self):
+        assert decode_message(json.dumps({"deviceMac": "AA:BB"}).encode()) == {"deviceMac": "AA:BB"}
+        expected = {"nodeID": "n1", "device": [{"noiseFloor": -90}]}
+        assert decode_message(create_report_payload("n1", -90)) == expected
+        assert decode_message(create_report_payload("n1", -90, compress=True)) == expected
+
+    @allure.title("Validate subscriptions are restored after the broker restart")
+    def test_resubscribe(self, mqtt_collector):
+        assert mqtt_collector.subscribe("sim/stats", timeout=0) is False
+        assert mqtt_collector.subscribed_topics == []
+        mqtt_collector._on_connect(mqtt_collector.client, None, {}, 0)
+        mqtt_collector._on_subscribe(mqtt_collector.client, None, 1, (0,))
+        assert mqtt_collector.subscribe("sim/stats", timeout=0) is True
+
+        mqtt_collector._on_disconnect(mqtt_collector.client, None, 1)
+        assert mqtt_collector.get_status()["topics"] == {"sim/stats": False}
+        mqtt_collector._on_connect(mqtt_collector.client, None, {}, 0)
+        mqtt_collector._on_subscribe(mqtt_collector.client, None, 2, (0,))
+        assert mqtt_collector.subscribed_topics == ["sim/stats", "sim/stats"]
+        assert mqtt_collector.get_status()["topics"] == {"sim/stats": True}
+
+
+@allure.title("Validate ServerHandler MQTT validation with the MQTT collector")
+class TestServerHandlerMqttCollector:
+    @allure.title("Validate messages are returned right after the arrival without the file round trip")
+    def test_mqtt_collect_messages(self, collector_api):
+        mqtt_collector, api_port = collector_api
+        mqtt_collector._on_connect(mqtt_collector.client, None, {}, 0)
+        server = ServerHandler.__new__(ServerHandler)
+        server.device_api = LocalDeviceApi()
+        server.ssh_pool = None
+        server.mqtt_collector_port = api_port
+        topic = "sim/stats/survey"
+        # Message received before the subscription is outside of the time window
+        receive_message(mqtt_collector, topic, create_report_payload("n1", -60))
+
+        def receive_messages():
+            # Messages of other topics and other nodes are received first
+            receive_message(mqtt_collector, "sim/stats/other", create_report_payload("n1", -70))
+            receive_message(mqtt_collector, topic, create_report_payload("n2", -80))
+            receive_message(mqtt_collector, topic, create_report_payload("n1", -90, compress=True))
+
+        def trigger():
+            threading.Timer(0.5, receive_messages).start()
+
+        # Subscription is acknowledged by the broker after a delay
+        threading.Timer(0.2, mqtt_collector._on_subscribe, args=(mqtt_collector.client, None, 1, (0,))).start()
+        messages = server._mqtt_collect_messages(topic, trigger, 1, "n1", 10)
+        log.info(f"messages:{messages}")
+        assert messages == [{"nodeID": "n1", "device": [{"noiseFloor": -90}]}]
+        assert extract_mqtt_data_as_dict(messages, ["noiseFloor"], simplify=True) == {"noiseFloor": -90}
+        assert not any("get_file" in command or "fut_mqtt_tool" in command for command in server.device_api.commands)
+
+    @allure.title("Validate collector is not used if its API is not reachable")
+    def test_mqtt_collector_unavailable(self, monkeypatch):
+        server = ServerHandler.__new__(ServerHandler)
+        server.device_api = LocalDeviceApi()
+        server.ssh_pool = None
+        server.mqtt_collector_port = 1
+        monkeypatch.setattr(server, "start_mqtt_collector", lambda: False)
+        triggered = []
+        assert server._mqtt_collect_messages("sim/stats", lambda: triggered.append(True), 1, "", 10) is None
+        assert triggered == []
+
+        # The FUT MQTT tool collects the messages instead
+        tool_calls = []
+
+        def collect_messages_with_tool(topic, trigger, max_message_count, node_filter, mqtt_timeout):
+            tool_calls.append(topic)
+            trigger()
+            return [{"nodeID": "n1", "device": [{"noiseFloor": -90}]}]
+
+        monkeypatch.setattr(server, "_mqtt_collect_messages_with_tool", collect_messages_with_tool)
+        assert server.mqtt_trigger_and_validate_message(
+            "sim/stats", lambda: triggered.append(True), {"noiseFloor": -90}
+        )
+        assert tool_calls == ["sim/stats"] and triggered == [True]
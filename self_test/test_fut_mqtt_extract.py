@@ -0,0 +1,181 @@
+import random
+import time
+from statistics import mean
+
+import allure
+import pytest
+
+from framework.tools.fut_mqtt_tool import (
+    extract_mqtt_data,
+    extract_mqtt_data_as_dict,
+    MqttDataExtractor,
+    simplify_mqtt_data,
+)
+from lib_testbed.generic.util.logger import log
+
+
+def legacy_extract_mqtt_data(data, value_list: list, data_key, simplify: bool = False):
+    """Extract the values by traversing the message tree once per key, as the reference implementation."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if data_key in data.keys():
+                value_list.append(data[data_key])
+                break
+            if isinstance(value, (dict, list)):
+                if key == data_key:
+                    value_list.append(value)
+                else:
+                    legacy_extract_mqtt_data(value, value_list, data_key)
+            elif key == data_key:
+                value_list.append(value)
+    elif isinstance(data, list):
+        for item in data:
+            legacy_extract_mqtt_data(item, value_list, data_key)
+    if simplify:
+        for element in value_list:
+            if isinstance(element, (str, bool)):
+                if all(element == value_list[0] for element in value_list):
+                    value_list = value_list[0]
+                    break
+            elif isinstance(element, (int, float)):
+                value_list = round(mean(value_list), 4)
+                break
+    return value_list
+
+
+def legacy_extract_mqtt_data_as_dict(data, data_keys: list, simplify: bool = False) -> dict:
+    extracted_data = []
+    for data_key in data_keys:
+        value_list: list = []
+        extracted_data.append(legacy_extract_mqtt_data(data, value_list, data_key, simplify))
+        if not value_list:
+            raise KeyError(f"Failed to extract data from the MQTT messages for the following key: {data_key}")
+    return dict(zip(data_keys, extracted_data))
+
+
+def generate_sm_reports(num_reports: int, seed: int) -> list[dict]:
+    """Generate decoded SM statistics reports with survey, neighbor and client samples of several radios."""
+    rand = random.Random(seed)
+    reports = []
+    for report_index in range(num_reports):
+        survey, neighbors, clients = [], [], []
+        for band in ["BAND2G", "BAND5GL", "BAND5GU"]:
+            survey.append(
+                {
+                    "band": band,
+                    "surveyType": "ON_CHANNEL",
+                    "surveyList": [
+                        {
+                            "channel": rand.choice([1, 6, 11, 36, 44, 149]),
+                            "durationMs": 100,
+                            "busy": rand.randrange(100),
+                            "busyTx": rand.randrange(100),
+                            "busyRx": rand.randrange(100),
+                            "noiseFloor": rand.randrange(-100, -80),
+                            "offsetMs": sample_index * 100,
+                        }
+                        for sample_index in range(20)
+                    ],
+                },
+            )
+            neighbors.append(
+                {
+                    "band": band,
+                    "scanType": "OFF_CHAN_SCAN",
+                    "bssList": [
+                        {"bssid": f"00:11:22:33:{bssid_index:02x}:00", "ssid": "fut", "rssi": rand.randrange(-90, -30)}
+                        for bssid_index in range(30)
+                    ],
+                },
+            )
+            clients.append(
+                {
+                    "band": band,
+                    "channel": 44,
+                    "clientList": [
+                        {
+                            "macAddress": f"aa:bb:cc:dd:ee:{client_index:02x}",
+                            "connected": True,
+                            "stats": {"rxBytes": rand.randrange(1 << 20), "rssi": rand.randrange(-80, -30)},
+                        }
+                        for client_index in range(10)
+                    ],
+                },
+            )
+        reports.append(
+            {
+                "nodeID": "fut-node",
+                "survey": survey,
+                "neighbors": neighbors,
+                "clients": clients,
+                "device": {"timestamp": report_index, "uptime": 1000 + report_index},
+            },
+        )
+    return reports
+
+
+def generate_random_tree(rand: random.Random, keys: list[str], depth: int = 0):
+    """Generate a random tree of dictionaries and lists, with the keys repeated at various depths."""
+    if depth > 4 or rand.random() < 0.2:
+        return rand.choice([1, 2.5, -3, "a", "b", True, False, None, [], {}])
+    if rand.random() < 0.3:
+        return [generate_random_tree(rand, keys, depth + 1) for _ in range(rand.randrange(4))]
+    return {rand.choice(keys): generate_random_tree(rand, keys, depth + 1) for _ in range(rand.randrange(4))}
+
+
+sm_keys = ["noiseFloor", "busy", "channel", "rssi", "surveyType", "connected", "nodeID", "survey"]
+
+
+@allure.title("Validate MqttDataExtractor class")
+class TestMqttDataExtractor:
+    @allure.title("Validate single pass extraction matches the reference implementation on random trees")
+    @pytest.mark.parametrize("seed", range(5))
+    def test_extract_equivalence(self, seed):
+        rand = random.Random(seed)
+        keys = ["a", "b", "c", "d"]
+        for _ in range(500):
+            data = generate_random_tree(rand, keys)
+            for simplify in [False, True]:
+                for data_key in keys:
+                    try:
+                        expected = legacy_extract_mqtt_data(data, [], data_key, simplify)
+                    except TypeError:
+                        with pytest.raises(TypeError):
+                            extract_mqtt_data(data, [], data_key, simplify)
+                        continue
+                    assert extract_mqtt_data(data, [], data_key, simplify) == expected
+
+    @allure.title("Validate extraction of all keys from the SM reports")
+    def test_extract_sm_reports(self):
+        reports = generate_sm_reports(5, 0)
+        for simplify in [False, True]:
+            expected = legacy_extract_mqtt_data_as_dict(reports, sm_keys, simplify=simplify)
+            assert extract_mqtt_data_as_dict(reports, sm_keys, simplify=simplify) == expected
+        extracted_data = extract_mqtt_data_as_dict(reports, ["surveyType", "connected", "nodeID"], simplify=True)
+        assert extracted_data == {"surveyType": "ON_CHANNEL", "connected": True, "nodeID": "fut-node"}
+        with pytest.raises(KeyError, match="missingKey"):
+            extract_mqtt_data_as_dict(reports, ["noiseFloor", "missingKey"])
+
+    @allure.title("Validate tuple keys are extracted as paths")
+    def test_extract_path_keys(self):
+        reports = generate_sm_reports(2, 0)
+        extracted_data = extract_mqtt_data_as_dict(reports, [("clients", "rssi"), ("survey", "band"), "rssi"])
+        # Client RSSI values are a subset of all RSSI values, which also include the neighbor RSSI values
+        assert len(extracted_data[("clients", "rssi")]) == 2 * 3 * 10
+        assert len(extracted_data["rssi"]) == 2 * 3 * (10 + 30)
+        assert extracted_data[("survey", "band")] == ["BAND2G", "BAND5GL", "BAND5GU"] * 2
+        assert simplify_mqtt_data(MqttDataExtractor([("device", "uptime")]).extract(reports)[0]) == 1000.5
+
+    @allure.title("Validate single pass extraction speedup on large SM reports")
+    def test_extract_benchmark(self):
+        reports = generate_sm_reports(200, 1)
+
+        start_time = time.perf_counter()
+        legacy_data = legacy_extract_mqtt_data_as_dict(reports, sm_keys, simplify=True)
+        legacy_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        extracted_data = extract_mqtt_data_as_dict(reports, sm_keys, simplify=True)
+        duration = time.perf_counter() - start_time
+        log.info(f"200 reports, {len(sm_keys)} keys, single pass:{duration:.3f}s, per key:{legacy_duration:.3f}s")
+        assert extracted_data == legacy_data
@@ -0,0 +1,137 @@
+import json
+import time
+
+import allure
+import pytest
+
+from framework.lib.fut_ovsdb_batch import ovsdb_value_to_python, parse_where_condition
+from framework.node_handler import NodeHandler
+from lib_testbed.generic.util.logger import log
+
+# Simulated duration of a single remote command execution
+ROUND_TRIP_DURATION = 0.02
+
+ovsdb_tables = {
+    "AWLAN_Node": [{"ovs_version": "2.17.0", "model": "FUT"}],
+    "Node_Services": [{"service": "wm", "status": "enabled"}, {"service": "nm", "status": "disabled"}],
+    "Wifi_VIF_State": [
+        {"if_name": "home-ap-50", "ssid": "fut_home_ap", "mac_list": ["set", []], "channel": 44},
+        {"if_name": "bhaul-ap-50", "ssid": "fut_bhaul_ap", "mac_list": ["set", ["aa:bb:cc:dd:ee:ff"]], "channel": 44},
+    ],
+}
+
+
+def ovsdb_select(table: str, columns: list | None, where: list) -> list:
+    rows = [row for row in ovsdb_tables[table] if all(row.get(column) == value for column, _, value in where)]
+    return [{column: row[column] for column in columns or row} for row in rows]
+
+
+class FakeSnapshot:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+class FakeOvsdb:
+    def __init__(self, device):
+        self.device = device
+
+    def get(self, table, select, skip_exception=False):
+        self.device.round_trip()
+        return ovsdb_select(table, [select], [])[0][select]
+
+    def get_json_table(self, table, select, where=None):
+        self.device.round_trip()
+        return ovsdb_select(table, select, [parse_where_condition(where)] if where else [])
+
+
+class FakeNode(NodeHandler):
+    def __init__(self):
+        self.name = "gw"
+        self.round_trips = 0
+        self.device_snapshot = FakeSnapshot()
+        self.ovsdb = FakeOvsdb(self)
+
+    def round_trip(self):
+        self.round_trips += 1
+        time.sleep(ROUND_TRIP_DURATION)
+
+    def execute(self, path, args="", **kwargs):
+        self.round_trip()
+        assert path == "tools/device/ovsdb_batch_select"
+        database, *operations = json.loads(args.strip("'"))
+        assert database == "Open_vSwitch"
+        results = []
+        for operation in operations:
+            if operation["table"] not in ovsdb_tables:
+                results.append({"error": "unknown table", "details": operation["table"]})
+                break
+            results.append({"rows": ovsdb_select(operation["table"], operation.get("columns"), operation["where"])})
+        return [0, json.dumps(results), ""]
+
+
+@allure.title("Validate batched OVSDB reads")
+class TestOvsdbBatch:
+    @allure.title("Validate where conditions and OVSDB values are converted")
+    def test_conversions(self):
+        assert parse_where_condition("if_name==home-ap-50") == ["if_name", "==", "home-ap-50"]
+        assert parse_where_condition("channel!=44") == ["channel", "!=", 44]
+        assert parse_where_condition("enabled==true") == ["enabled", "==", True]
+        assert parse_where_condition("ssid==a<=b") == ["ssid", "==", "a<=b"]
+        with pytest.raises(ValueError):
+            parse_where_condition("if_name")
+        assert ovsdb_value_to_python(["set", []]) == []
+        assert ovsdb_value_to_python(["map", [["key--1", "home--1"]]]) == {"key--1": "home--1"}
+        assert ovsdb_value_to_python(["uuid", "3f5b"]) == "3f5b"
+
+    @allure.title("Validate all selects are executed with a single remote invocation")
+    def test_batch_execute(self):
+        node = FakeNode()
+        batch = node.ovsdb_batch()
+        vif_index = batch.select("Wifi_VIF_State", ["ssid", "mac_list"], "if_name==bhaul-ap-50")
+        services_index = batch.select("Node_Services", ["service"], ["status==enabled"])
+        results = batch.execute()
+        assert node.round_trips == 1
+        assert results[vif_index] == [{"ssid": "fut_bhaul_ap", "mac_list": ["aa:bb:cc:dd:ee:ff"]}]
+        assert results[services_index] == [{"service": "wm"}]
+
+        batch.select("Unknown_Table")
+        batch.select("AWLAN_Node")
+        assert batch.execute(skip_exception=True)[2:] == [None, None]
+        with pytest.raises(RuntimeError, match="Unknown_Table"):
+            batch.execute()
+        assert node.ovsdb_batch().execute() == []
+
+    @allure.title("Benchmark the round trips of the startup probes")
+    def test_benchmark_startup_probes(self):
+        legacy_node = FakeNode()
+        start_time = time.perf_counter()
+        legacy_bridge_type = legacy_node.get_bridge_type()
+        legacy_node_services = legacy_node.get_node_services_and_status()
+        legacy_states = [
+            legacy_node.ovsdb.get_json_table("Wifi_VIF_State", ["ssid"], f"if_name=={if_name}")
+            for if_name in ("home-ap-50", "bhaul-ap-50")
+        ]
+        legacy_duration = time.perf_counter() - start_time
+
+        batched_node = FakeNode()
+        start_time = time.perf_counter()
+        batched_node.load_startup_ovsdb_state()
+        bridge_type = batched_node.get_bridge_type()
+        node_services = batched_node.get_node_services_and_status()
+        batch = batched_node.ovsdb_batch()
+        for if_name in ("home-ap-50", "bhaul-ap-50"):
+            batch.select("Wifi_VIF_State", ["ssid"], f"if_name=={if_name}")
+        states = batch.execute()
+        batched_duration = time.perf_counter() - start_time
+
+        log.info(
+            f"Round trips: individual reads {legacy_node.round_trips} in {legacy_duration:.3f}s, "
+            f"batched reads {batched_node.round_trips} in {batched_duration:.3f}s",
+        )
+        assert (bridge_type, node_services, states) == (legacy_bridge_type, legacy_node_services, legacy_states)
+        assert bridge_type == "ovs_bridge"
+        assert legacy_node.round_trips == 4
+        assert batched_node.round_trips == 2
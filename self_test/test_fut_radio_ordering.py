@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework.lib.fut_radio_ordering import (
+    CAC_DURATIONS,
+    get_radio_state,
+    RadioTransitionCostModel,
+    reorder_items,
+)
+from framework.lib.fut_regulatory import get_regulatory_index
+from lib_testbed.generic.util.logger import log
+
+
+class TestWm2:
+    pass
+
+
+class TestDm:
+    pass
+
+
+def create_item(cls: type, function_name: str, cfg: dict | None, index: int) -> SimpleNamespace:
+    return SimpleNamespace(cls=cls, originalname=function_name, name=f"{function_name}[cfg{index}]", cfg=cfg)
+
+
+def create_items(cls: type, function_name: str, configs: list) -> list:
+    return [create_item(cls, function_name, cfg, index) for index, cfg in enumerate(configs)]
+
+
+@pytest.fixture
+def cost_model():
+    return RadioTransitionCostModel(get_regulatory_index(), "US")
+
+
+@allure.title("Validate radio state aware test case ordering")
+class TestRadioOrdering:
+    @allure.title("Validate DFS channels are detected from the regulatory rules")
+    def test_cac_duration(self, cost_model):
+        assert cost_model.cac_duration(("5g", 36, "HT20")) == 0
+        assert cost_model.cac_duration(("5gl", 52, "HT40")) == CAC_DURATIONS["standard"]
+        assert cost_model.cac_duration(("5gu", 120, "HT80")) == CAC_DURATIONS["weather"]
+        assert cost_model.cac_duration(("24g", 6, None)) == 0
+        assert get_radio_state({"channel": 6, "radio_band": "24g", "encryption": "WPA2"}) == ("24g", 6, None)
+        assert get_radio_state({"radio_band": "24g"}) is None
+
+    @allure.title("Validate cases are grouped by the radio state and the DFS channels are visited in one block")
+    def test_reorder_items(self, cost_model):
+        # Generated inputs iterate the encryption in the outer loop, so every case changes the channel
+        configs = [
+            {"channel": channel, "ht_mode": "HT20", "radio_band": radio_band, "encryption": encryption}
+            for encryption in ["WPA2", "WPA3", "OPEN"]
+            for channel, radio_band in [(6, "24g"), (52, "5gl"), (36, "5gl"), (120, "5gu"), (157, "5gu"), (1, "24g")]
+        ]
+        items = [
+            *create_items(TestDm, "test_dm_verify_awlan_node_params", [{"awlan_field_name": "model"}]),
+            *create_items(TestWm2, "test_wm2_set_channel", configs),
+            *create_items(TestWm2, "test_wm2_set_bcn_int", [{"radio_band": "24g", "bcn_int": 200}]),
+        ]
+        reordered, original_cost, reordered_cost = reorder_items(items, lambda item: item.cfg, cost_model)
+        log.info(f"Estimated radio transition time: {original_cost}s, reordered: {reordered_cost}s")
+
+        assert sorted(item.name for item in reordered) == sorted(item.name for item in items)
+        assert reordered[0] is items[0] and reordered[-1] is items[-1]
+        wm2_states = [get_radio_state(item.cfg) for item in reordered[1:-1]]
+        # Each radio state is configured once and keeps the original order of its cases
+        assert len([state for index, state in enumerate(wm2_states) if wm2_states[index - 1] != state]) == 6
+        for state in set(wm2_states):
+            encryptions = [item.cfg["encryption"] for item in reordered[1:-1] if get_radio_state(item.cfg) == state]
+            assert encryptions == ["WPA2", "WPA3", "OPEN"]
+        # Non-DFS channels of each band before its DFS channels
+        dfs_positions = [index for index, state in enumerate(wm2_states) if cost_model.cac_duration(state)]
+        assert wm2_states[dfs_positions[0] - 1][1] in (36, 157)
+        assert original_cost == 18 * 10 + 18 * 15 + 3 * (60 + 600)
+        assert reordered_cost == 6 * 10 + 6 * 15 + 60 + 600
+
+    @allure.title("Validate functions with cases without a radio channel are not reordered")
+    def test_functions_not_reordered(self, cost_model):
+        configs = [{"channel": 44, "radio_band": "5g"}, {"channel": 6, "radio_band": "24g"}, {"radio_band": "5g"}]
+        items = create_items(TestWm2, "test_wm2_set_ht_mode", configs)
+        assert reorder_items(items, lambda item: item.cfg, cost_model) == (items, 0, 0)
+        items = create_items(TestDm, "test_dm_set_channel", configs[:2])
+        assert reorder_items(items, lambda item: item.cfg, cost_model)[0] == items
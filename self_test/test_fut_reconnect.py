@@ -0,0 +1,210 @@
+import socket
+import threading
+import time
+from pathlib import Path
+
+import allure
+import pytest
+
+from framework.device_handler import DeviceHandler
+from framework.lib.fut_reconnect import can_probe_port, is_port_open, load_reconnection_policy, ReconnectionEngine
+from lib_testbed.generic.util.logger import log
+
+# Fast policy for the simulated endpoint
+TEST_POLICY = {"initial_interval": 0.05, "max_interval": 0.2, "backoff_factor": 2, "jitter": 0.2, "probe_timeout": 0.2}
+
+
+class FlappingEndpoint:
+    """Local TCP endpoint which follows the schedule of (listening, duration) states, the last state is kept."""
+
+    def __init__(self, schedule: list[tuple[bool, float]]):
+        with socket.socket() as probe_socket:
+            probe_socket.bind(("127.0.0.1", 0))
+            self.port = probe_socket.getsockname()[1]
+        self.schedule = schedule
+        self.listening = False
+        self.stable_since: float | None = None
+        self.listener: socket.socket | None = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _set_listening(self, listening: bool):
+        if listening and self.listener is None:
+            self.listener = socket.socket()
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.listener.bind(("127.0.0.1", self.port))
+            self.listener.listen(16)
+        elif not listening and self.listener is not None:
+            self.listener.close()
+            self.listener = None
+        self.listening = listening
+
+    def _run(self):
+        for index, (listening, duration) in enumerate(self.schedule):
+            self._set_listening(listening)
+            if index == len(self.schedule) - 1:
+                self.stable_since = time.monotonic()
+                return
+            time.sleep(duration)
+
+    def is_usable(self) -> bool:
+        # The device is usable once the endpoint stopped flapping
+        return self.stable_since is not None and self.listening
+
+    def __enter__(self):
+        """Start following the schedule."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        """Wait for the end of the schedule and stop listening."""
+        self.thread.join()
+        self._set_listening(False)
+
+
+@allure.title("Validate probe-driven reconnection")
+class TestReconnection:
+    @allure.title("Validate reconnection policies are loaded per test suite")
+    def test_load_policy(self, monkeypatch):
+        monkeypatch.chdir(Path(__file__).parents[1])
+        default_policy = load_reconnection_policy()
+        um_policy = load_reconnection_policy("um")
+        assert default_policy["deadline"] == 150
+        assert load_reconnection_policy("cm2") == default_policy
+        assert um_policy == {**default_policy, "max_interval": 15, "deadline": 360}
+        ReconnectionEngine(name="gw", host="127.0.0.1", confirm=lambda: True, **um_policy)
+
+    @allure.title("Validate the probe intervals grow exponentially up to the limit")
+    def test_intervals(self):
+        engine = ReconnectionEngine(name="gw", host="127.0.0.1", confirm=lambda: True, **TEST_POLICY)
+        intervals = engine.intervals()
+        for expected in [0.05, 0.1, 0.2, 0.2, 0.2]:
+            assert expected * 0.8 <= next(intervals) <= expected * 1.2
+
+    @allure.title("Validate the device is recovered once the flapping endpoint is stable")
+    def test_recovery_flapping_endpoint(self):
+        schedule = [(False, 0.4), (True, 0.15), (False, 0.3), (True, 0.1), (False, 0.2), (True, 0)]
+        confirm_results = []
+        with FlappingEndpoint(schedule) as endpoint:
+
+            def confirm():
+                confirm_results.append(endpoint.is_usable())
+                return confirm_results[-1]
+
+            engine = ReconnectionEngine(
+                name="gw",
+                host="127.0.0.1",
+                port=endpoint.port,
+                confirm=confirm,
+                deadline=10,
+                **TEST_POLICY,
+            )
+            event = engine.wait_for_recovery()
+        log.info(f"Reconnection event: {event}, confirmation results: {confirm_results}")
+        assert event["recovered"] and not event["probe_fallback"]
+        # The device is confirmed only when the port is open, and the recovery ends at the first usable confirmation
+        assert event["confirmations"] == len(confirm_results) < event["probes"]
+        assert confirm_results[-1] and not any(confirm_results[:-1])
+
+    @allure.title("Validate the reconnection gives up at the deadline")
+    def test_deadline(self):
+        with FlappingEndpoint([(False, 0)]) as endpoint:
+            assert not is_port_open("127.0.0.1", endpoint.port, 0.2)
+            engine = ReconnectionEngine(
+                name="gw",
+                host="127.0.0.1",
+                port=endpoint.port,
+                confirm=lambda: True,
+                deadline=0.5,
+                **TEST_POLICY,
+            )
+            event = engine.wait_for_recovery()
+        assert not event["recovered"] and event["confirmations"] == 0
+        assert event["probes"] > 1 and event["time_to_recover"] >= 0.5
+
+    @allure.title("Validate the port is probed until the end of an outage longer than several probe intervals")
+    def test_recovery_default_policy(self, monkeypatch):
+        monkeypatch.chdir(Path(__file__).parents[1])
+        # The default policy probes after about 0.5, 1.5 and 3.5 seconds, all of them during the outage
+        with FlappingEndpoint([(False, 4), (True, 0)]) as endpoint:
+            engine = ReconnectionEngine(
+                name="gw",
+                host="127.0.0.1",
+                port=endpoint.port,
+                confirm=lambda: True,
+                **load_reconnection_policy(),
+            )
+            event = engine.wait_for_recovery()
+        log.info(f"Reconnection event: {event}")
+        assert event["recovered"] and not event["probe_fallback"]
+        assert event["probes"] > 3 and event["confirmations"] == 1
+
+    @allure.title("Validate the port probe is checked while the device is reachable")
+    def test_can_probe_port(self):
+        with FlappingEndpoint([(True, 0)]) as endpoint:
+            endpoint.thread.join()
+            assert can_probe_port("127.0.0.1", endpoint.port, 0.2)
+        assert not can_probe_port("127.0.0.1", endpoint.port, 0.2)
+        assert not can_probe_port("leaf1.invalid", 22, 0.2)
+
+    @allure.title("Validate the recovery is confirmed without probing if the port can not be probed")
+    def test_probe_fallback(self):
+        confirm_results = [False, False, True]
+        engine = ReconnectionEngine(
+            name="gw",
+            host="127.0.0.1",
+            confirm=lambda: confirm_results.pop(0),
+            deadline=10,
+            probe_port=False,
+            **TEST_POLICY,
+        )
+        event = engine.wait_for_recovery()
+        assert event["recovered"] and event["probe_fallback"]
+        assert event["probes"] == 0 and event["confirmations"] == 3 and not confirm_results
+
+    @allure.title("Validate the recovery is confirmed without probing if the hostname does not resolve")
+    def test_probe_fallback_unresolved_host(self):
+        engine = ReconnectionEngine(
+            name="leaf1", host="leaf1.invalid", confirm=lambda: True, deadline=10, **TEST_POLICY
+        )
+        event = engine.wait_for_recovery()
+        assert event["recovered"] and event["probe_fallback"]
+        assert event["probes"] == 1 and event["confirmations"] == 1
+
+    @allure.title("Validate the device handler reconnection procedure reports the time to recover")
+    def test_device_handler_reconnection(self):
+        schedule = [(False, 0.5), (True, 0)]
+        with FlappingEndpoint(schedule) as endpoint:
+            device_handler = DeviceHandler.__new__(DeviceHandler)
+            device_handler.name = "gw"
+            device_handler.hostname = "127.0.0.1"
+            device_handler.device_osrt_config = {"host": {"port": endpoint.port}}
+            device_handler.ssh_port_probe = True
+            device_handler.resident_shell = None
+            device_handler.ssh_pool = None
+            device_handler.reconnection_policy = {**TEST_POLICY, "deadline": 5}
+            device_handler.reconnection_events = []
+            device_handler.device_api = type(
+                "FakeDeviceApi",
+                (),
+                {"run_raw": lambda self, cmd, **kwargs: [0 if endpoint.is_usable() else 255, "", ""]},
+            )()
+            assert device_handler._start_rcn_procedure() is True
+
+        event = device_handler.reconnection_events[0]
+        log.info(f"Time to recover: {event['time_to_recover']}s, the fixed sleep waited at least 30s")
+        assert event["recovered"] and event["confirmations"] >= 1
+        assert not device_handler.rcn_active
+
+        device_handler.device_osrt_config = {"host": {"port": endpoint.port}}
+        device_handler.reconnection_policy = {**TEST_POLICY, "deadline": 0.3}
+        with pytest.raises(ConnectionError):
+            device_handler._start_rcn_procedure()
+        assert len(device_handler.reconnection_events) == 2 and not device_handler.rcn_active
+
+        # The node name resolves only on the server, the recovery is confirmed over the device API
+        device_handler.hostname = "leaf1.invalid"
+        device_handler.ssh_port_probe = can_probe_port(device_handler.hostname, 22)
+        device_handler.reconnection_policy = {**TEST_POLICY, "deadline": 5}
+        device_handler.device_api = type("FakeDeviceApi", (), {"run_raw": lambda self, cmd, **kwargs: [0, "", ""]})()
+        assert device_handler._start_rcn_procedure() is True
+        assert device_handler.reconnection_events[2]["probe_fallback"]
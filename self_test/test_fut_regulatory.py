@@ -0,0 +1,97 @@
+import time
+
+import allure
+import pytest
+
+from config.defaults import all_bandwidth_list, all_channels, all_encryption_types, radio_band_list
+from framework.lib.fut_lib import load_reg_rule, validate_channel_ht_mode_band
+from framework.lib.fut_regulatory import get_regulatory_index, RegulatoryIndex
+from lib_testbed.generic.util.logger import log
+
+reg_domains = ["US", "EU", "GB"]
+
+
+@pytest.fixture(scope="module")
+def regulatory_rule():
+    return load_reg_rule()
+
+
+@pytest.fixture(scope="module")
+def permutation_rows():
+    """Full matrix of channel x ht_mode x radio_band permutations, repeated for each encryption type."""
+    channels = sorted(set(channel for band_channels in all_channels.values() for channel in band_channels))
+    return [
+        (channel, ht_mode, radio_band)
+        for channel in channels
+        for ht_mode in all_bandwidth_list
+        for radio_band in radio_band_list
+        for _ in all_encryption_types
+    ]
+
+
+@allure.title("Validate RegulatoryIndex class")
+class TestRegulatoryIndex:
+    @allure.title("Validate index matches the regulatory rules for all combinations")
+    def test_index_matches_rules(self, regulatory_rule, permutation_rows):
+        regulatory_index = RegulatoryIndex(regulatory_rule)
+        for reg_domain in reg_domains:
+            for radio_band, band_rule in regulatory_rule[reg_domain]["band"].items():
+                for ht_mode, channels in band_rule.items():
+                    assert regulatory_index.channels(reg_domain, radio_band, ht_mode) == sorted(set(channels))
+            expected = [
+                validate_channel_ht_mode_band(*row, regulatory_rule=regulatory_rule, reg_domain=reg_domain)
+                for row in permutation_rows
+            ]
+            assert regulatory_index.compliant_rows(permutation_rows, reg_domain) == expected
+
+    @allure.title("Validate invalid parameters are not compliant")
+    def test_invalid_parameters(self, regulatory_rule):
+        regulatory_index = RegulatoryIndex(regulatory_rule)
+        assert regulatory_index.is_compliant(36, "ht40", "5G", "us")
+        assert not regulatory_index.is_compliant(36, "HT40", "9g", "US")
+        assert not regulatory_index.is_compliant(36, "HT40", "5g", "XX")
+        assert not regulatory_index.is_compliant("36", "HT40", "5g", "US")
+        assert not regulatory_index.is_compliant(-1, "HT40", "5g", "US")
+        assert ("EMPTY", "5g", "HT20") not in regulatory_index
+        assert regulatory_index.compliant_rows([(None, None, None), (6, "HT20", "24g")], "US") == [False, True]
+        assert regulatory_index.filter_rows([(13, "HT20", "24g"), (11, "HT20", "24g")], "US") == [(11, "HT20", "24g")]
+
+    @allure.title("Validate other constraints are combined with the regulatory rules")
+    def test_allowed_masks(self, regulatory_rule):
+        regulatory_index = RegulatoryIndex(regulatory_rule)
+        rows = [(36, "HT20", "5g"), (40, "HT20", "5g"), (6, "HT20", "24g")]
+        allowed_masks = {"5g": 1 << 36}
+        assert regulatory_index.compliant_rows(rows, "US", allowed_masks=allowed_masks) == [True, False, False]
+
+    @allure.title("Validate index is immutable and shared")
+    def test_shared_index(self):
+        regulatory_index = get_regulatory_index()
+        assert get_regulatory_index() is regulatory_index
+        with pytest.raises(AttributeError, match="immutable"):
+            regulatory_index.rule = {}
+        assert validate_channel_ht_mode_band(44, "HT40", "5g", reg_domain="EU")
+        assert not validate_channel_ht_mode_band(44, "HT320", "5g", reg_domain="EU")
+
+    @allure.title("Benchmark regulatory index against the regulatory rules dictionary")
+    def test_benchmark(self, regulatory_rule, permutation_rows):
+        regulatory_index = RegulatoryIndex(regulatory_rule)
+
+        start_time = time.perf_counter()
+        legacy_results = [
+            [
+                validate_channel_ht_mode_band(*row, regulatory_rule=regulatory_rule, reg_domain=reg_domain)
+                for row in permutation_rows
+            ]
+            for reg_domain in reg_domains
+        ]
+        legacy_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        index_results = [regulatory_index.compliant_rows(permutation_rows, reg_domain) for reg_domain in reg_domains]
+        index_duration = time.perf_counter() - start_time
+
+        log.info(
+            f"rows:{len(permutation_rows) * len(reg_domains)}, rules dictionary:{legacy_duration:.3f}s, "
+            f"index:{index_duration:.3f}s, speedup:{legacy_duration / index_duration:.1f}x",
+        )
+        assert index_results == legacy_results
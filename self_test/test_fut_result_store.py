@@ -0,0 +1,104 @@
+import json
+import os
+import time
+import uuid
+
+import allure
+import pytest
+
+from framework.lib.fut_allure import create_processed_results, read_data_from_results, ResultStore
+from lib_testbed.generic.util.logger import log
+
+
+def legacy_search_files(directory: str, search_strings: list[str]) -> list[str]:
+    """Search the result files by matching every search string against every file content, as the reference."""
+    matching_files = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if not file.endswith("-result.json"):
+                continue
+            file_path = os.path.join(root, file)
+            with open(file_path) as file_fd:
+                file_content = file_fd.read()
+            if any(search_string in file_content for search_string in search_strings):
+                matching_files.append(file_path)
+    return matching_files
+
+
+def create_results_dir(results_dir, num_results: int, step_size: int = 0) -> list[str]:
+    """Create synthetic pytest results with the optional padding of steps, and return the test names."""
+    results_dir.mkdir()
+    test_names = []
+    for index in range(num_results):
+        test_name = f"test_wm2_set_channel[config_{index}]"
+        test_names.append(test_name)
+        result = {
+            "name": test_name,
+            "status": "failed" if index % 3 else "passed",
+            "parameters": [{"name": "cfg", "value": {"channel": index % 165, "ht_mode": "HT20"}}],
+            "steps": [{"name": "step", "status": "passed", "description": "x" * step_size}],
+            "attachments": [{"name": "log", "source": f"{uuid.uuid4()}-attachment.txt"}],
+        }
+        results_dir.joinpath(f"{uuid.uuid4()}-result.json").write_text(json.dumps(result))
+        results_dir.joinpath(f"{uuid.uuid4()}-container.json").write_text(json.dumps({"children": []}))
+    return test_names
+
+
+@allure.title("Validate ResultStore class")
+class TestResultStore:
+    @allure.title("Validate result files are indexed by the test name")
+    def test_result_store_index(self, tmp_path):
+        results_dir = tmp_path.joinpath("allure-results")
+        test_names = create_results_dir(results_dir, 20)
+        result_store = ResultStore(results_dir.as_posix())
+        assert len(read_data_from_results(results_dir.as_posix())) == 20
+        assert result_store.get_results_data()[0]["parameterValues"][0]["ht_mode"] == "HT20"
+        # Exact names do not match the tests whose names only start with them
+        removed_names = test_names[1:3]
+        assert sorted(result_store.get_files(removed_names)) == sorted(
+            legacy_search_files(results_dir.as_posix(), [f'"{test_name}"' for test_name in removed_names]),
+        )
+        assert len(result_store.get_files(["test_wm2_set_channel[config_1"])) == 0
+
+    @allure.title("Validate processed results and the hardlinked backup")
+    def test_create_processed_results(self, tmp_path):
+        results_dir = tmp_path.joinpath("allure-results")
+        test_names = create_results_dir(results_dir, 20)
+        removed_entries = [{"name": test_name} for test_name in test_names[5:10]]
+        result_store = ResultStore(results_dir.as_posix())
+        removed_files = result_store.get_files(test_names[5:10])
+        create_processed_results(results_dir.as_posix(), removed_entries, result_store=result_store)
+        assert not any(os.path.exists(file_path) for file_path in removed_files)
+        assert len(ResultStore(results_dir.as_posix()).name_index) == 15
+        assert len(result_store.get_results_data()) == 15
+
+        backup_dir = tmp_path.joinpath("allure-results_bak")
+        assert len(ResultStore(backup_dir.as_posix()).name_index) == 20
+        kept_file = next(results_dir.glob("*-result.json"))
+        assert kept_file.stat().st_ino == backup_dir.joinpath(kept_file.name).stat().st_ino
+
+    @allure.title("Validate results are not removed if the number of files does not match")
+    def test_create_processed_results_mismatch(self, tmp_path):
+        results_dir = tmp_path.joinpath("allure-results")
+        test_names = create_results_dir(results_dir, 5)
+        removed_entries = [{"name": test_names[0]}, {"name": "test_missing"}]
+        create_processed_results(results_dir.as_posix(), removed_entries, create_backup=False)
+        assert len(ResultStore(results_dir.as_posix()).name_index) == 5
+
+    @allure.title("Validate result file search speedup")
+    @pytest.mark.parametrize("max_workers", [None, 1])
+    def test_result_store_benchmark(self, tmp_path, max_workers):
+        results_dir = tmp_path.joinpath("allure-results")
+        test_names = create_results_dir(results_dir, 1000, step_size=20000)
+        removed_names = test_names[::10]
+
+        start_time = time.perf_counter()
+        legacy_files = legacy_search_files(results_dir.as_posix(), [f'"{test_name}"' for test_name in removed_names])
+        legacy_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result_store = ResultStore(results_dir.as_posix(), max_workers=max_workers)
+        files = result_store.get_files(removed_names)
+        duration = time.perf_counter() - start_time
+        log.info(f"workers:{max_workers}, result store:{duration:.3f}s, search_files:{legacy_duration:.3f}s")
+        assert sorted(files) == sorted(legacy_files)
@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+
+import allure
+import pytest
+
+from framework.lib.fut_setup_scheduler import SetupScheduler
+from framework.tools import fut_setup
+from lib_testbed.generic.util.logger import log
+
+
+class StepRecorder:
+    """Records the start and end order and the peak concurrency of the simulated setup steps."""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.peak_concurrency = 0
+        self.lock = threading.Lock()
+
+    def step(self, name: str, duration: float, fail: bool = False):
+        def execute(*args):
+            with self.lock:
+                self.events.append(("start", name))
+                self.running += 1
+                self.peak_concurrency = max(self.peak_concurrency, self.running)
+            time.sleep(duration)
+            with self.lock:
+                self.events.append(("end", name))
+                self.running -= 1
+            if fail:
+                raise RuntimeError(f"{name} failed")
+
+        return execute
+
+    def executed(self, name: str) -> bool:
+        return ("end", name) in self.events
+
+    def ends_before_start(self, first: str, second: str) -> bool:
+        return self.events.index(("end", first)) < self.events.index(("start", second))
+
+
+step_durations = {
+    "setup_fut_configurator": 0.05,
+    "setup_server_handler": 0.1,
+    "setup_server_device": 0.8,
+    "check_ssh_availability": 0.2,
+    "setup_node_handler": 0.3,
+    "setup_node_device": 0.3,
+    "setup_client_handler": 0.1,
+    "setup_client_device": 0.2,
+}
+
+
+@allure.title("Validate SetupScheduler class")
+class TestSetupScheduler:
+    @allure.title("Validate steps start as soon as their dependencies are complete")
+    def test_dependency_order(self):
+        recorder = StepRecorder()
+        scheduler = SetupScheduler()
+        scheduler.add_step("a", recorder.step("a", 0.1))
+        scheduler.add_step("b", recorder.step("b", 0.4), depends_on=["a"])
+        scheduler.add_step("c", recorder.step("c", 0.1), depends_on=["a"])
+        scheduler.add_step("d", recorder.step("d", 0.1), depends_on=["c"])
+        scheduler.add_step("e", recorder.step("e", 0.1), depends_on=["b", "d"])
+        scheduler.run()
+        for name, setup_step in scheduler.steps.items():
+            for dependency in setup_step.depends_on:
+                assert recorder.ends_before_start(dependency, name), (dependency, name)
+        # Chain c -> d runs while b is running
+        assert recorder.ends_before_start("d", "e") and not recorder.ends_before_start("b", "c")
+        assert recorder.peak_concurrency == 2
+        report = scheduler.timing_report()
+        log.info(f"Timing report: {report}")
+        assert report["critical_path"] == ["a", "b", "e"]
+        assert all(step["status"] == "passed" for step in report["steps"].values())
+
+    @allure.title("Validate invalid dependencies are rejected")
+    def test_invalid_dependencies(self):
+        scheduler = SetupScheduler()
+        scheduler.add_step("a", lambda: None, depends_on=["missing"])
+        with pytest.raises(ValueError, match="unknown step: missing"):
+            scheduler.run()
+        scheduler = SetupScheduler()
+        scheduler.add_step("a", lambda: None, depends_on=["c"])
+        scheduler.add_step("b", lambda: None, depends_on=["a"])
+        scheduler.add_step("c", lambda: None, depends_on=["b"])
+        with pytest.raises(ValueError, match="cycle"):
+            scheduler.run()
+        with pytest.raises(ValueError, match="Duplicate"):
+            scheduler.add_step("a", lambda: None)
+
+    @allure.title("Validate dependent steps are skipped after a failure")
+    def test_failure(self):
+        recorder = StepRecorder()
+        scheduler = SetupScheduler()
+        scheduler.add_step("a", recorder.step("a", 0.1, fail=True))
+        scheduler.add_step("b", recorder.step("b", 0.3))
+        scheduler.add_step("c", recorder.step("c", 0.1), depends_on=["a"])
+        with pytest.raises(RuntimeError, match="Setup step\\(s\\) failed: a"):
+            scheduler.run()
+        statuses = {name: step["status"] for name, step in scheduler.timing_report()["steps"].items()}
+        assert statuses == {"a": "failed", "b": "passed", "c": "skipped"}
+
+
+@allure.title("Validate FUT session setup graph")
+class TestFutSetupGraph:
+    @allure.title("Validate node setup is not serialized behind the server container setup")
+    def test_pre_test_device_setup(self, monkeypatch, tmp_path):
+        recorder = StepRecorder()
+        for function_name, duration in step_durations.items():
+
+            def record(*args, function_name=function_name, duration=duration):
+                recorder.step(f"{function_name}{args}", duration)()
+
+            monkeypatch.setattr(fut_setup, function_name, record)
+        timing_file = tmp_path.joinpath("setup_timing.json")
+        monkeypatch.setattr(fut_setup, "SETUP_TIMING_FILE", timing_file.as_posix())
+
+        fut_setup.pre_test_device_setup(node_devices=("gw", "l1", "l2"), client_devices=("w1", "e1"))
+
+        assert not recorder.executed("setup_client_device('e1',)")
+        # Previously: configurator, server, SSH check, node and client handlers serially, then the device setup
+        assert not recorder.ends_before_start("setup_server_device()", "setup_node_handler('gw',)")
+        assert recorder.ends_before_start("setup_node_handler('l2',)", "setup_node_device('l2',)")
+        assert recorder.peak_concurrency > 2
+        report = json.loads(timing_file.read_text())
+        log.info(f"Setup timing: {json.dumps(report, indent=4)}")
+        assert report["critical_path"] == ["fut_configurator", "server_handler", "server_device"]
+        assert set(report["steps"]) == {
+            "fut_configurator",
+            "server_handler",
+            "server_device",
+            "ssh_check",
+            "gw_handler",
+            "gw_device",
+            "l1_handler",
+            "l1_device",
+            "l2_handler",
+            "l2_device",
+            "w1_handler",
+            "w1_device",
+            "e1_handler",
+        }
+
+    @allure.title("Validate setup failure is reported with the timing breakdown")
+    def test_pre_test_device_setup_failure(self, monkeypatch, tmp_path):
+        def fail(*args):
+            raise RuntimeError("SSH not available")
+
+        for function_name in step_durations:
+            monkeypatch.setattr(fut_setup, function_name, lambda *args: None)
+        monkeypatch.setattr(fut_setup, "check_ssh_availability", fail)
+        timing_file = tmp_path.joinpath("setup_timing.json")
+        monkeypatch.setattr(fut_setup, "SETUP_TIMING_FILE", timing_file.as_posix())
+        with pytest.raises(RuntimeError, match="SSH not available"):
+            fut_setup.pre_test_device_setup(node_devices=("gw",), client_devices=())
+        report = json.loads(timing_file.read_text())
+        assert report["steps"]["ssh_check"]["status"] == "failed"
+        assert report["steps"]["gw_handler"]["status"] == "skipped"
@@ -0,0 +1,155 @@
+import json
+import sys
+
+import allure
+import pytest
+
+from framework.lib.fut_sharding import estimate_shard_duration, load_duration_history, split_into_shards
+from framework.tools import fut_shard_runner
+from lib_testbed.generic.util.logger import log
+
+# Fake FUT test suites, executed by the fake testbeds
+fake_test_module = """
+import time
+
+import pytest
+
+
+class TestFakeWm:
+    @pytest.mark.parametrize("cfg", [{"duration": 0.01 * (index % 4)} for index in range(12)])
+    def test_wm_configure(self, cfg):
+        time.sleep(cfg["duration"])
+
+
+class TestFakeNm:
+    @pytest.mark.parametrize("cfg", [{"duration": 0.02} for index in range(5)])
+    def test_nm_configure(self, cfg):
+        time.sleep(cfg["duration"])
+"""
+
+# Stands in for the allure-pytest plugin, writes one result file per test case
+fake_allure_conftest = """
+import json
+import os
+import uuid
+from pathlib import Path
+
+
+def pytest_addoption(parser):
+    parser.addoption("--alluredir", action="store", default=None)
+
+
+def pytest_runtest_logreport(report):
+    results_dir = report_config.getoption("alluredir")
+    if report.when != "call" or not results_dir:
+        return
+    Path(results_dir).mkdir(parents=True, exist_ok=True)
+    result = {"name": report.nodeid, "status": report.outcome, "testbed": os.environ["OPENSYNC_TESTBED"]}
+    Path(results_dir).joinpath(f"{uuid.uuid4()}-result.json").write_text(json.dumps(result))
+    Path(results_dir).joinpath("environment.properties").write_text(
+        f"testbed_name={os.environ['OPENSYNC_TESTBED']}\\nfut_release_version=1.0\\n",
+    )
+
+
+def pytest_configure(config):
+    global report_config
+    report_config = config
+"""
+
+
+@pytest.fixture
+def fake_testbed(tmp_path):
+    test_dir = tmp_path.joinpath("fake_tests")
+    test_dir.mkdir()
+    test_dir.joinpath("test_fake.py").write_text(fake_test_module)
+    test_dir.joinpath("conftest.py").write_text(fake_allure_conftest)
+    pytest_command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "-p",
+        "framework.lib.fut_shard_plugin",
+        "-p",
+        "no:cacheprovider",
+        # The fake conftest stands in for allure-pytest, which registers the same options
+        "-p",
+        "no:allure_pytest",
+        "-c",
+        "/dev/null",
+        f"--rootdir={test_dir}",
+    ]
+    return test_dir, pytest_command
+
+
+@allure.title("Validate shard planning")
+class TestShardPlanning:
+    @allure.title("Validate shards are balanced by the recorded durations")
+    def test_split_into_shards(self):
+        node_ids = [f"test/WM2_test.py::TestWm2::test_wm2_configure[cfg{index}]" for index in range(20)]
+        node_ids += [f"test/NM2_test.py::TestNm2::test_nm2_configure[cfg{index}]" for index in range(4)]
+        history = {
+            "cases": {node_id: 100.0 if index < 4 else 10.0 for index, node_id in enumerate(node_ids[:20])},
+            "suites": {"TestWm2": 30.0, "TestNm2": 30.0},
+        }
+        shards = split_into_shards(node_ids, 3, history)
+        durations = [estimate_shard_duration(shard, history) for shard in shards]
+        log.info(f"Shard durations: {durations}")
+        assert sorted(node_id for shard in shards for node_id in shard) == sorted(node_ids)
+        for shard in shards:
+            assert shard == [node_id for node_id in node_ids if node_id in shard]
+        # Total 560s of test cases and 60s of suite setups on 3 testbeds
+        assert max(durations) <= 280
+        # Test cases of the new suite are estimated by the median of all recorded durations
+        assert estimate_shard_duration(node_ids[20:], history) == 30.0 + 4 * 10.0
+
+    @allure.title("Validate invalid number of shards is rejected")
+    def test_invalid_number_of_shards(self):
+        with pytest.raises(ValueError, match="positive"):
+            split_into_shards(["test_a"], 0)
+        assert split_into_shards([], 2) == [[], []]
+
+
+@allure.title("Validate shard runner with fake testbeds")
+class TestShardRunner:
+    @allure.title("Validate each test case is executed once and the results are merged")
+    def test_run_shards(self, fake_testbed, tmp_path):
+        test_dir, pytest_command = fake_testbed
+        output_dir = tmp_path.joinpath("shard-results")
+        history_file = tmp_path.joinpath("shard_durations.json")
+        exit_code = fut_shard_runner.main(
+            testbeds=["fake-tb1", "fake-tb2", "fake-tb3"],
+            output_dir=output_dir.as_posix(),
+            pytest_args=[test_dir.as_posix()],
+            history_file=history_file.as_posix(),
+            pytest_command=pytest_command,
+        )
+        assert exit_code == 0
+
+        merged_dir = output_dir.joinpath("allure-results")
+        results = [json.loads(path.read_text()) for path in merged_dir.glob("*-result.json")]
+        executed = sorted(result["name"] for result in results)
+        log.info(f"Executed test cases: {executed}")
+        assert len(executed) == 17 and len(set(executed)) == 17
+        assert {result["testbed"] for result in results} == {"fake-tb1", "fake-tb2", "fake-tb3"}
+        environment = merged_dir.joinpath("environment.properties").read_text().splitlines()
+        assert "testbed_name=fake-tb1,fake-tb2,fake-tb3" in environment
+        assert "fut_release_version=1.0" in environment
+
+        history = load_duration_history(history_file.as_posix())
+        assert len(history["cases"]) == 17
+        assert set(history["suites"]) == {"TestFakeWm", "TestFakeNm"}
+
+    @allure.title("Validate failures of the shards are reported")
+    def test_failed_shard(self, fake_testbed, tmp_path, capsys):
+        test_dir, pytest_command = fake_testbed
+        failing_test = "\n    def test_nm_fail(self):\n        assert False\n"
+        test_dir.joinpath("test_fake.py").write_text(fake_test_module + failing_test)
+        exit_code = fut_shard_runner.main(
+            testbeds=["fake-tb1", "fake-tb2"],
+            output_dir=tmp_path.joinpath("shard-results").as_posix(),
+            pytest_args=[test_dir.as_posix()],
+            history_file=tmp_path.joinpath("shard_durations.json").as_posix(),
+            pytest_command=pytest_command,
+        )
+        assert exit_code == 1
+        assert "18 test cases in 2 shards" in capsys.readouterr().out
@@ -0,0 +1,224 @@
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+import pytest
+
+from framework.device_handler import DeviceHandler
+from framework.lib.fut_latency import percentile
+from framework.lib.fut_ssh_pool import SshConnectionPool, SshPoolError
+from lib_testbed.generic.util.logger import log
+
+# Simulated duration of the TCP connection, key exchange and authentication of a new SSH connection
+HANDSHAKE_DURATION = 0.05
+
+# Stands in for the ssh client, connects to the in-process SSH server stand-in over a Unix socket
+fake_ssh_client = """
+import json
+import os
+import socket
+import sys
+
+server_path, *arguments = sys.argv[1:]
+separator = arguments.index("--")
+options, remote_command = arguments[:separator], " ".join(arguments[separator + 1:])
+settings = dict(option.split("=", 1) for option in options if "=" in option)
+control_path = settings.get("ControlPath")
+
+
+def request(message):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(server_path)
+        connection.sendall(json.dumps(message).encode() + b"\\n")
+        return json.loads(connection.makefile().readline())
+
+
+def master_alive():
+    return bool(control_path) and os.path.exists(control_path) and request({"type": "check", "path": control_path})
+
+
+if "-O" in options:
+    operation = options[options.index("-O") + 1]
+    if operation == "exit" and control_path and os.path.exists(control_path):
+        os.remove(control_path)
+    sys.exit(0 if operation == "exit" or master_alive() else 255)
+if settings.get("ControlMaster") == "yes":
+    if not request({"type": "connect", "path": control_path}):
+        sys.exit(255)
+    open(control_path, "w").close()
+    sys.exit(0)
+response = request({"type": "exec", "command": remote_command, "multiplexed": master_alive()})
+sys.stdout.write(response["stdout"])
+sys.stderr.write(response["stderr"])
+sys.exit(response["exit_code"])
+"""
+
+
+class SshServerStandIn(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        super().__init__(path, SshRequestHandler)
+        self.accept_connections = True
+        self.connections = 0
+        self.masters: set = set()
+        self.open_channels = 0
+        self.max_open_channels = 0
+        self.lock = threading.Lock()
+
+
+class SshRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        message = json.loads(self.rfile.readline())
+        if message["type"] == "check":
+            response = message["path"] in server.masters
+        elif message["type"] == "connect":
+            time.sleep(HANDSHAKE_DURATION)
+            response = server.accept_connections
+            if response:
+                with server.lock:
+                    server.connections += 1
+                    server.masters.add(message["path"])
+        else:
+            if not message["multiplexed"]:
+                time.sleep(HANDSHAKE_DURATION)
+                with server.lock:
+                    server.connections += 1
+            with server.lock:
+                server.open_channels += 1
+                server.max_open_channels = max(server.max_open_channels, server.open_channels)
+            result = subprocess.run(["sh", "-c", message["command"]], capture_output=True, text=True, check=False)
+            with server.lock:
+                server.open_channels -= 1
+            response = {"exit_code": result.returncode, "stdout": result.stdout, "stderr": result.stderr}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+@pytest.fixture
+def ssh_server(tmp_path):
+    server = SshServerStandIn(tmp_path.joinpath("sshd.sock").as_posix())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client_path = tmp_path.joinpath("fake_ssh.py")
+    client_path.write_text(fake_ssh_client)
+
+    def ssh_command(remote_command: str, ssh_options: list | None = None) -> list:
+        client = [sys.executable, client_path.as_posix(), server.server_address]
+        return [*client, *(ssh_options or []), "--", remote_command]
+
+    server.ssh_command = ssh_command
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@allure.title("Validate SSH connection pool")
+class TestSshConnectionPool:
+    @allure.title("Validate commands share a single connection")
+    def test_run(self, ssh_server):
+        ssh_pool = SshConnectionPool(name="gw", ssh_command=ssh_server.ssh_command)
+        assert ssh_pool.run("echo pooled; echo failure >&2; exit 3") == [3, "pooled", "failure"]
+        assert ssh_pool.run("ls /")[0] == 0
+        assert ssh_pool.run("sleep 2", timeout=0.5)[0] == 124
+        assert ssh_server.connections == 1
+        ssh_pool.close()
+        assert ssh_pool.control_path is None and not ssh_pool.master_started
+
+    @allure.title("Validate the number of concurrently open channels is bounded")
+    def test_bounded_concurrency(self, ssh_server):
+        ssh_pool = SshConnectionPool(name="gw", ssh_command=ssh_server.ssh_command, max_channels=2)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda _: ssh_pool.run("sleep 0.2; echo done"), range(6)))
+        assert results == [[0, "done", ""]] * 6
+        assert ssh_server.max_open_channels == 2
+        assert ssh_server.connections == 1
+        ssh_pool.close()
+
+    @allure.title("Validate a lost master connection is re-established and the pool is disabled if it fails")
+    def test_health_check(self, ssh_server):
+        ssh_pool = SshConnectionPool(
+            name="gw",
+            ssh_command=ssh_server.ssh_command,
+            health_check_interval=0,
+            max_restarts=1,
+        )
+        assert ssh_pool.run("true")[0] == 0
+        ssh_server.masters.clear()
+        assert ssh_pool.run("true")[0] == 0
+        assert ssh_server.connections == 2
+
+        ssh_server.masters.clear()
+        ssh_server.accept_connections = False
+        with pytest.raises(SshPoolError):
+            ssh_pool.run("true")
+        with pytest.raises(SshPoolError, match="disabled"):
+            ssh_pool.run("true")
+        assert ssh_pool.disabled
+
+    @allure.title("Validate the device handler falls back to the device API if the pool is not usable")
+    def test_device_handler_fallback(self, ssh_server):
+        ssh_server.accept_connections = False
+        device_handler = DeviceHandler.__new__(DeviceHandler)
+        device_handler.name = "gw"
+        device_handler.test_script_timeout = 180
+        device_handler.ssh_pool = SshConnectionPool(name="gw", ssh_command=ssh_server.ssh_command, max_restarts=0)
+        device_handler.device_api = type("FakeDeviceApi", (), {"run_raw": lambda self, cmd, **kwargs: [0, cmd, ""]})()
+        assert device_handler.run_raw("ls /", timeout=5) == [0, "ls /", ""]
+        assert device_handler.ssh_pool.disabled
+
+    @allure.title("Validate the pool is usable again after the device recovered from a connection loss")
+    def test_reset_after_reconnection(self, ssh_server):
+        # The master connection fails while the device is not accepting logins yet
+        ssh_server.accept_connections = False
+        device_handler = DeviceHandler.__new__(DeviceHandler)
+        device_handler.name = "gw"
+        device_handler.test_script_timeout = 180
+        device_handler.resident_shell = None
+        device_handler.ssh_pool = SshConnectionPool(name="gw", ssh_command=ssh_server.ssh_command, max_restarts=0)
+        device_handler.device_api = type("FakeDeviceApi", (), {"run_raw": lambda self, cmd, **kwargs: [0, "", ""]})()
+        with socket.create_server(("127.0.0.1", 0)) as ssh_port:
+            device_handler.hostname = "127.0.0.1"
+            device_handler.device_osrt_config = {"host": {"port": ssh_port.getsockname()[1]}}
+            device_handler.reconnection_policy = {"initial_interval": 0.05, "deadline": 2}
+            device_handler.reconnection_events = []
+            assert device_handler._start_rcn_procedure() is True
+        assert not device_handler.ssh_pool.disabled and device_handler.ssh_pool.restart_count == 0
+
+        ssh_server.accept_connections = True
+        assert device_handler.run_raw("echo pooled") == [0, "pooled", ""]
+        assert ssh_server.connections == 1
+        device_handler.ssh_pool.close()
+
+    @allure.title("Benchmark the command latency over new SSH sessions and over the SSH connection pool")
+    def test_benchmark(self, ssh_server):
+        iterations = 30
+        ssh_latencies = []
+        for _ in range(iterations):
+            start_time = time.perf_counter()
+            subprocess.run(ssh_server.ssh_command("ls /"), capture_output=True, check=True)
+            ssh_latencies.append(time.perf_counter() - start_time)
+
+        assert ssh_server.connections == iterations
+
+        ssh_pool = SshConnectionPool(name="gw", ssh_command=ssh_server.ssh_command)
+        ssh_pool.run("true")
+        ssh_pool.latencies.clear()
+        for _ in range(iterations):
+            assert ssh_pool.run("ls /")[0] == 0
+        pool_latencies = ssh_pool.latency_percentiles()
+        ssh_pool.close()
+        # The pooled commands do not pay for the handshake of a new connection
+        assert ssh_server.connections == iterations + 1
+
+        log.info(
+            f"New SSH session: p50 {percentile(ssh_latencies, 0.5) * 1000:.1f} ms, "
+            f"p99 {percentile(ssh_latencies, 0.99) * 1000:.1f} ms; "
+            f"SSH pool: p50 {pool_latencies['p50'] * 1000:.1f} ms, p99 {pool_latencies['p99'] * 1000:.1f} ms",
+        )
+        assert pool_latencies["samples"] == iterations
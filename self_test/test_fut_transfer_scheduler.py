@@ -0,0 +1,133 @@
+import os
+import stat
+import threading
+import time
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework.device_handler import DeviceHandler
+from framework.lib.fut_transfer_scheduler import TransferScheduler
+from lib_testbed.generic.util.logger import log
+
+transfer_duration = 0.5
+
+
+class FakeDeviceApi:
+    """Device API which simulates a slow file transfer and records when transfers are in progress."""
+
+    def __init__(self, name: str, transfer_intervals: list):
+        self.name = name
+        self.transfer_intervals = transfer_intervals
+
+    def run_raw(self, cmd, **kwargs):
+        return [0, "", ""]
+
+    def _transfer(self):
+        start_time = time.monotonic()
+        time.sleep(transfer_duration)
+        self.transfer_intervals.append((self.name, start_time, time.monotonic()))
+
+    def put_file(self, file_name, location, **kwargs):
+        self._transfer()
+
+    def put_dir(self, directory, location, **kwargs):
+        self._transfer()
+
+
+def create_device_handler(
+    name: str, fut_base_dir: str, transfer_scheduler: TransferScheduler, transfer_intervals: list
+):
+    device_handler = DeviceHandler.__new__(DeviceHandler)
+    device_handler.name = name
+    device_handler.model = "fake"
+    device_handler.fut_base_dir = fut_base_dir
+    device_handler.fut_dir = "/tmp/fut-base"
+    device_handler.fut_configurator = SimpleNamespace(transfer_scheduler=transfer_scheduler)
+    device_handler.device_api = FakeDeviceApi(name, transfer_intervals)
+    device_handler.file_transfer_stats = []
+    device_handler.resident_shell = None
+    device_handler.ssh_pool = None
+    return device_handler
+
+
+def run_transfers(device_handlers: list, **kwargs) -> None:
+    threads = [
+        threading.Thread(
+            target=device_handler.file_transfer, args=(["shell"],), kwargs={"skip_env_file": True, **kwargs}
+        )
+        for device_handler in device_handlers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def max_overlap(transfer_intervals: list) -> int:
+    events = sorted(
+        [(start, 1) for _, start, _ in transfer_intervals] + [(end, -1) for _, _, end in transfer_intervals]
+    )
+    overlap = max_overlap = 0
+    for _, change in events:
+        overlap += change
+        max_overlap = max(max_overlap, overlap)
+    return max_overlap
+
+
+@pytest.fixture
+def fut_base_dir(tmp_path):
+    tmp_path.joinpath("shell/lib").mkdir(parents=True)
+    tmp_path.joinpath("shell/lib/unit_lib.sh").write_text("unit_lib\n" * 1000)
+    return tmp_path.as_posix()
+
+
+@allure.title("Validate TransferScheduler class")
+class TestTransferScheduler:
+    @allure.title("Validate transfers to different devices overlap")
+    @pytest.mark.parametrize("full_transfer", [False, True])
+    def test_parallel_transfers(self, fut_base_dir, full_transfer):
+        transfer_intervals = []
+        transfer_scheduler = TransferScheduler(max_concurrency=5)
+        device_handlers = [
+            create_device_handler(name, fut_base_dir, transfer_scheduler, transfer_intervals)
+            for name in ["gw", "l1", "l2", "w1", "w2"]
+        ]
+        run_transfers(device_handlers, full_transfer=full_transfer)
+        log.info(f"stats:{transfer_scheduler.transfer_stats}")
+        assert len(transfer_intervals) == 5
+        # All transfers start before any of them ends
+        assert max_overlap(transfer_intervals) == 5
+        assert all(device_stats["throughput"] for device_stats in transfer_scheduler.transfer_stats.values())
+
+    @allure.title("Validate the concurrency cap and the serialization of transfers to the same device")
+    def test_bounded_transfers(self, fut_base_dir):
+        transfer_intervals = []
+        transfer_scheduler = TransferScheduler(max_concurrency=2)
+        device_handlers = [
+            create_device_handler(name, fut_base_dir, transfer_scheduler, transfer_intervals)
+            for name in ["gw", "l1", "l2", "gw"]
+        ]
+        run_transfers(device_handlers)
+        assert max_overlap(transfer_intervals) == 2
+        gw_intervals = [(start, end) for name, start, end in transfer_intervals if name == "gw"]
+        assert len(gw_intervals) == 2 and max_overlap([(None, *interval) for interval in gw_intervals]) == 1
+
+    @allure.title("Validate the bandwidth cap paces transfers")
+    def test_bandwidth_cap(self):
+        transfer_scheduler = TransferScheduler(max_bandwidth=1000)
+        assert transfer_scheduler.reserve_bandwidth(500) == 0
+        start_time = time.monotonic()
+        transfer_scheduler.reserve_bandwidth(500)
+        assert time.monotonic() - start_time >= 0.4
+
+    @allure.title("Validate the shell environment file is readable by everyone")
+    def test_fut_set_env_mode(self, fut_base_dir, monkeypatch):
+        device_handler = create_device_handler("gw", fut_base_dir, TransferScheduler(), [])
+        monkeypatch.setattr(device_handler, "_get_shell_cfg", lambda: {"FUT_TOPDIR": device_handler.fut_dir})
+        shell_fut_env_path = device_handler.create_fut_set_env()
+        file_mode = stat.S_IMODE(os.stat(shell_fut_env_path).st_mode)
+        log.info(f"{shell_fut_env_path} mode: {oct(file_mode)}")
+        assert file_mode == 0o644
+        assert 'FUT_TOPDIR="/tmp/fut-base"' in open(shell_fut_env_path).read()
@@ -0,0 +1,202 @@
+import ipaddress
+import json
+import shutil
+import socket
+import time
+from pathlib import Path
+
+import allure
+import pytest
+from docker.server.data.var.www.gatekeeper import gatekeeper
+from docker.server.data.var.www.gatekeeper.lib import gatekeeper_io, gatekeeper_pb2
+from docker.server.data.var.www.gatekeeper.lib.gatekeeper_db import GatekeeperDb, GatekeeperTable
+
+from lib_testbed.generic.util.logger import log
+
+gatekeeper_lib_dir = Path(gatekeeper.__file__).parent.joinpath("lib")
+action_map = {
+    gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_ACCEPT: "allow",
+    gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_BLOCK: "block",
+    gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_REDIRECT: "redirect",
+}
+
+
+class LegacyGatekeeperDb:
+    """DB which reads and parses the DB files on every request, as the simulator did before the DB was indexed."""
+
+    def __init__(self, lib_path: Path):
+        self.lib_path = lib_path
+
+    def get_snapshot(self):
+        content = json.loads(self.lib_path.joinpath("gatekeeper_content.json").read_text())
+        category = json.loads(self.lib_path.joinpath("gatekeeper_category.json").read_text())
+        snapshot = type("LegacySnapshot", (), {})()
+        snapshot.lookup = lambda key, attribute: content.get(key, {}).get(attribute)
+        snapshot.lookup_category = category.get
+        return snapshot
+
+
+@pytest.fixture
+def gatekeeper_lib(tmp_path):
+    lib_path = tmp_path.joinpath("lib")
+    lib_path.mkdir()
+    for file_name in ["gatekeeper_content.json", "gatekeeper_category.json"]:
+        shutil.copy(gatekeeper_lib_dir.joinpath(file_name), lib_path)
+    return lib_path
+
+
+@pytest.fixture
+def gatekeeper_client(gatekeeper_lib, monkeypatch):
+    monkeypatch.setattr(gatekeeper_io, "gatekeeper_db", GatekeeperDb(gatekeeper_lib.as_posix()))
+    return gatekeeper.app.test_client()
+
+
+def update_db(lib_path: Path, file_name: str, update: dict) -> None:
+    db_path = lib_path.joinpath(file_name)
+    db = json.loads(db_path.read_text())
+    for key, value in update.items():
+        db.setdefault(key, {}).update(value)
+    db_path.write_text(json.dumps(db))
+
+
+def request_verdict(client, request_type: str, attribute, request_id: int = 1) -> dict:
+    """Send the verdict request to the gatekeeper simulator and return the decoded reply header."""
+    request = gatekeeper_pb2.GatekeeperReq()
+    request_field = getattr(request, f"req_{request_type}")
+    request_field.header.request_id = request_id
+    request_field.header.policy_rule = "fut"
+    attribute_field = {"fqdn": "fqdn", "http_url": "http_url", "https_sni": "https_sni", "ipv4": "addr_ipv4"}
+    setattr(request_field, attribute_field[request_type], attribute)
+    response = client.post("/gatekeeper", data=request.SerializeToString())
+    assert response.status_code == 200, response.status_code
+    reply = gatekeeper_pb2.GatekeeperReply()
+    reply.ParseFromString(response.data)
+    reply_field = getattr(reply, f"reply_{request_type}")
+    verdict = {
+        "action": action_map[reply_field.header.action],
+        "category_id": reply_field.header.category_id,
+        "request_id": reply_field.header.request_id,
+    }
+    if request_type == "fqdn" and reply_field.redirect.redirect_ipv4:
+        verdict["redirect_ipv4"] = str(ipaddress.IPv4Address(socket.ntohl(reply_field.redirect.redirect_ipv4)))
+    return verdict
+
+
+def ipv4_attribute(address: str) -> int:
+    """Return the IPv4 address in the format of the request, the network byte order integer."""
+    return int.from_bytes(ipaddress.IPv4Address(address).packed, byteorder="big")
+
+
+@allure.title("Validate GatekeeperTable class")
+class TestGatekeeperTable:
+    @allure.title("Validate FQDN suffix entries")
+    def test_fqdn_suffix(self):
+        table = GatekeeperTable(
+            "fqdn",
+            {
+                "www.example.com": {"action": "allow"},
+                "*.example.com": {"action": "block"},
+                ".ads.example.com": {"action": "redirect"},
+            },
+        )
+        assert table.lookup("www.example.com")["action"] == "allow"
+        assert table.lookup("mail.example.com")["action"] == "block"
+        assert table.lookup("example.com")["action"] == "block"
+        assert table.lookup("x.ADS.example.com.")["action"] == "redirect"
+        assert table.lookup("example.org") is None
+
+    @allure.title("Validate URL prefix entries")
+    def test_url_prefix(self):
+        table = GatekeeperTable(
+            "http_url",
+            {
+                "http://fut.opensync.io/test*": {"action": "allow"},
+                "http://fut.opensync.io/test/block*": {"action": "block"},
+            },
+        )
+        assert table.lookup("http://fut.opensync.io/test/allow")["action"] == "allow"
+        assert table.lookup("http://fut.opensync.io/test/block/1")["action"] == "block"
+        assert table.lookup("http://fut.opensync.io/other") is None
+
+    @allure.title("Validate IP network entries")
+    def test_ip_networks(self):
+        table = GatekeeperTable(
+            "ipv4",
+            {"10.0.0.0/8": {"action": "allow"}, "10.1.0.0/16": {"action": "block"}, "10.1.1.1": {"action": "redirect"}},
+        )
+        assert table.lookup("10.2.3.4")["action"] == "allow"
+        assert table.lookup("10.1.3.4")["action"] == "block"
+        assert table.lookup(ipv4_attribute("10.1.1.1"))["action"] == "redirect"
+        assert table.lookup("192.168.1.1") is None
+        ipv6_table = GatekeeperTable("ipv6", {"2001:db8::/32": {"action": "block"}})
+        assert ipv6_table.lookup(ipaddress.IPv6Address("2001:db8::1").packed)["action"] == "block"
+        assert ipv6_table.lookup("2001:db9::1") is None
+
+
+@allure.title("Validate gatekeeper simulator with the indexed DB")
+class TestGatekeeperDb:
+    @allure.title("Validate verdicts of the default DB entries")
+    def test_default_db_verdicts(self, gatekeeper_client):
+        assert request_verdict(gatekeeper_client, "fqdn", "www.wikipedia.org")["action"] == "allow"
+        assert request_verdict(gatekeeper_client, "fqdn", "www.dailymirror.co.uk")["action"] == "block"
+        assert request_verdict(gatekeeper_client, "fqdn", "www.unknown.org", request_id=7) == {
+            "action": "allow",
+            "category_id": 100,
+            "request_id": 7,
+        }
+        assert request_verdict(gatekeeper_client, "fqdn", "www.googlefoo.com")["redirect_ipv4"] == "216.239.38.120"
+        assert request_verdict(gatekeeper_client, "fqdn", "localhost.lan.foobar")["category_id"] == 15
+        assert request_verdict(gatekeeper_client, "ipv4", ipv4_attribute("192.168.20.1"))["category_id"] == 15
+        assert request_verdict(gatekeeper_client, "https_sni", "www.playboy.com")["action"] == "redirect"
+        url = "http://fut.opensync.io/gatekeeper/test/http_url/block"
+        assert request_verdict(gatekeeper_client, "http_url", url)["action"] == "block"
+        request = gatekeeper_pb2.GatekeeperReq()
+        request.req_fqdn.fqdn = "www.trigger_an_error.plume"
+        assert gatekeeper_client.post("/gatekeeper", data=request.SerializeToString()).status_code == 500
+
+    @allure.title("Validate DB is reloaded when the files change")
+    def test_hot_reload(self, gatekeeper_client, gatekeeper_lib):
+        db = gatekeeper_io.gatekeeper_db
+        assert request_verdict(gatekeeper_client, "fqdn", "www.wikipedia.org")["action"] == "allow"
+        request_verdict(gatekeeper_client, "fqdn", "www.wikipedia.org")
+        assert db.reload_count == 1
+
+        update_db(gatekeeper_lib, "gatekeeper_content.json", {"fqdn": {"*.wikipedia.org": {"action": "block"}}})
+        update_db(gatekeeper_lib, "gatekeeper_category.json", {"www.wikipedia.org": {"category_id": 42}})
+        assert request_verdict(gatekeeper_client, "fqdn", "en.wikipedia.org")["action"] == "block"
+        assert request_verdict(gatekeeper_client, "fqdn", "www.wikipedia.org") == {
+            "action": "allow",
+            "category_id": 42,
+            "request_id": 1,
+        }
+        assert db.reload_count == 2
+
+        # Partially written file does not replace the loaded DB
+        gatekeeper_lib.joinpath("gatekeeper_content.json").write_text('{"fqdn": {')
+        assert request_verdict(gatekeeper_client, "fqdn", "en.wikipedia.org")["action"] == "block"
+        assert db.reload_count == 2
+
+    @allure.title("Validate request rate of the gatekeeper simulator with a large DB")
+    def test_request_rate_benchmark(self, gatekeeper_lib, monkeypatch):
+        update_db(
+            gatekeeper_lib,
+            "gatekeeper_content.json",
+            {"fqdn": {f"www.site{index}.com": {"action": "block" if index % 2 else "allow"} for index in range(20000)}},
+        )
+        update_db(
+            gatekeeper_lib,
+            "gatekeeper_category.json",
+            {f"www.site{index}.com": {"category_id": index % 100} for index in range(20000)},
+        )
+        client = gatekeeper.app.test_client()
+        num_requests = 300
+        request_rates = {}
+        for name, db in [("legacy", LegacyGatekeeperDb(gatekeeper_lib)), ("indexed", GatekeeperDb(gatekeeper_lib))]:
+            monkeypatch.setattr(gatekeeper_io, "gatekeeper_db", db)
+            start_time = time.perf_counter()
+            for index in range(num_requests):
+                verdict = request_verdict(client, "fqdn", f"www.site{index * 7}.com", request_id=index)
+                assert verdict["action"] == ("block" if index * 7 % 2 else "allow")
+                assert verdict["category_id"] == index * 7 % 100
+            request_rates[name] = num_requests / (time.perf_counter() - start_time)
+        log.info(f"Requests per second: {', '.join(f'{name}:{rate:.0f}' for name, rate in request_rates.items())}")
@@ -0,0 +1,132 @@
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import allure
+import pytest
+from docker.server.data.var.www.gatekeeper import gatekeeper
+from docker.server.data.var.www.gatekeeper.lib import gatekeeper_io, gatekeeper_pb2
+from docker.server.data.var.www.gatekeeper.lib.gatekeeper_db import GatekeeperDb
+from google.protobuf import json_format
+
+from framework.tools.gatekeeper_load_test import create_requests, measure
+from lib_testbed.generic.util.logger import log
+
+gatekeeper_lib_dir = Path(gatekeeper.__file__).parent.joinpath("lib")
+
+
+@pytest.fixture
+def gatekeeper_lib(tmp_path):
+    lib_path = tmp_path.joinpath("lib")
+    lib_path.mkdir()
+    for file_name in ["gatekeeper_content.json", "gatekeeper_category.json"]:
+        shutil.copy(gatekeeper_lib_dir.joinpath(file_name), lib_path)
+    return lib_path
+
+
+@pytest.fixture
+def gatekeeper_client(gatekeeper_lib, monkeypatch):
+    monkeypatch.setattr(gatekeeper_io, "gatekeeper_db", GatekeeperDb(gatekeeper_lib.as_posix()))
+    monkeypatch.setattr(gatekeeper_io, "verdict_cache", gatekeeper_io.VerdictCache())
+    yield gatekeeper.app.test_client()
+    gatekeeper.set_production_mode(False)
+
+
+def post_request(client, request_type: str, attribute, request_id: int) -> bytes:
+    request = gatekeeper_pb2.GatekeeperReq()
+    request_field = getattr(request, f"req_{request_type}")
+    request_field.header.request_id = request_id
+    request_field.header.policy_rule = "fut"
+    setattr(request_field, gatekeeper_io.ATTRIBUTE_FIELDS[request_type], attribute)
+    response = client.post("/gatekeeper", data=request.SerializeToString())
+    assert response.status_code == 200, response.status_code
+    return response.data
+
+
+verdict_requests = [
+    ("fqdn", "www.wikipedia.org"),
+    ("fqdn", "www.googlefoo.com"),
+    ("fqdn", "www.unknown.org"),
+    ("https_sni", "www.playboy.com"),
+    ("http_url", "http://fut.opensync.io/gatekeeper/test/http_url/block"),
+    ("ipv4", int.from_bytes(bytes([192, 168, 20, 1]), byteorder="big")),
+    ("ipv6", bytes(15) + b"\x01"),
+    ("app", "fut_app"),
+]
+
+
+@allure.title("Validate gatekeeper simulator production mode")
+class TestGatekeeperProduction:
+    @allure.title("Validate cached replies are identical to the fully constructed replies")
+    @pytest.mark.parametrize("request_id", [0, 1, 127, 128, 300, 2**32 - 1])
+    def test_cached_reply_bytes(self, gatekeeper_client, request_id):
+        for request_type, attribute in verdict_requests:
+            gatekeeper.set_production_mode(False)
+            expected = post_request(gatekeeper_client, request_type, attribute, request_id)
+            gatekeeper.set_production_mode(True)
+            post_request(gatekeeper_client, request_type, attribute, request_id + 1 if request_id < 2**32 - 1 else 5)
+            assert post_request(gatekeeper_client, request_type, attribute, request_id) == expected, request_type
+        assert gatekeeper_io.verdict_cache.hits == len(verdict_requests)
+
+    @allure.title("Validate verdict cache is emptied when the DB is reloaded")
+    def test_cache_invalidation(self, gatekeeper_client, gatekeeper_lib):
+        gatekeeper.set_production_mode(True)
+        reply = gatekeeper_pb2.GatekeeperReply()
+        reply.ParseFromString(post_request(gatekeeper_client, "fqdn", "www.wikipedia.org", 1))
+        assert reply.reply_fqdn.header.action == gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_ACCEPT
+
+        content_path = gatekeeper_lib.joinpath("gatekeeper_content.json")
+        content = json.loads(content_path.read_text())
+        content["fqdn"]["www.wikipedia.org"] = {"action": "block"}
+        content_path.write_text(json.dumps(content))
+        reply.ParseFromString(post_request(gatekeeper_client, "fqdn", "www.wikipedia.org", 2))
+        assert reply.reply_fqdn.header.action == gatekeeper_pb2.GatekeeperAction.GATEKEEPER_ACTION_BLOCK
+        assert reply.reply_fqdn.header.request_id == 2
+
+    @allure.title("Validate debug conversions are skipped and a single access line is logged in production mode")
+    def test_access_log(self, gatekeeper_client, monkeypatch, caplog):
+        conversions = []
+        message_to_dict = json_format.MessageToDict
+
+        def counting_message_to_dict(*args, **kwargs):
+            conversions.append(args[0].DESCRIPTOR.name)
+            return message_to_dict(*args, **kwargs)
+
+        monkeypatch.setattr(json_format, "MessageToDict", counting_message_to_dict)
+        gatekeeper.set_production_mode(False)
+        with caplog.at_level(logging.DEBUG, logger=gatekeeper.gatekeeper_logger.name):
+            post_request(gatekeeper_client, "fqdn", "www.dailymirror.co.uk", 3)
+        assert conversions == ["GatekeeperReq", "GatekeeperReply"]
+
+        conversions.clear()
+        caplog.clear()
+        gatekeeper.set_production_mode(True)
+        with caplog.at_level(logging.INFO, logger=gatekeeper.gatekeeper_logger.name):
+            post_request(gatekeeper_client, "fqdn", "www.dailymirror.co.uk", 4)
+            post_request(gatekeeper_client, "ipv4", int.from_bytes(bytes([192, 168, 20, 1]), byteorder="big"), 5)
+        assert conversions == []
+        messages = [record.getMessage() for record in caplog.records]
+        log.info(f"Access log: {messages}")
+        assert len(messages) == 2
+        assert messages[0].startswith("FQDN www.dailymirror.co.uk GATEKEEPER_ACTION_BLOCK id=4 cached=False ")
+        assert messages[1].startswith("IPv4 192.168.20.1 GATEKEEPER_ACTION_ACCEPT id=5 cached=False ")
+
+    @allure.title("Validate request latency measurement in the debug and the production mode")
+    def test_production_latency(self, gatekeeper_client):
+        requests = create_requests(["www.wikipedia.org", "www.dailymirror.co.uk", "www.unknown.org"], 500, 0)
+        status_codes = []
+
+        def post(request):
+            status_codes.append(gatekeeper_client.post("/gatekeeper", data=request).status_code)
+            return status_codes[-1]
+
+        latencies = {}
+        for mode, production_mode in [("debug", False), ("production", True)]:
+            gatekeeper.set_production_mode(production_mode)
+            post(requests[0])
+            latencies[mode] = sorted(measure(post, requests))
+        medians = {mode: mode_latencies[len(mode_latencies) // 2] for mode, mode_latencies in latencies.items()}
+        log.info(f"Median latency: {', '.join(f'{mode}:{median * 1000:.3f}ms' for mode, median in medians.items())}")
+        assert all(len(mode_latencies) == len(requests) for mode_latencies in latencies.values())
+        assert set(status_codes) == {200}
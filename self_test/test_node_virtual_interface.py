@@ -0,0 +1,109 @@
+import json
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from framework.node_handler import NodeHandler
+from lib_testbed.generic.util.logger import log
+
+
+class FakeOvsdb:
+    @staticmethod
+    def python_value_to_ovsdb_value(value):
+        return str(value).lower() if isinstance(value, bool) else value
+
+
+class FakeNode(NodeHandler):
+    def __init__(self):
+        self.name = "gw"
+        self.expected_shell_result = 0
+        self.applied_interface_args = {}
+        self.fut_configurator = SimpleNamespace(vif_config_reuse_enabled=True)
+        self.ovsdb = FakeOvsdb()
+        self.tables = {"Wifi_Radio_State": {}, "Wifi_VIF_State": {}}
+        self.executions = []
+
+    def execute(self, path, args="", **kwargs):
+        results = []
+        for operation in json.loads(args.strip("'"))[1:]:
+            row = self.tables[operation["table"]].get(operation["where"][0][2])
+            results.append({"rows": [{column: row.get(column) for column in operation["columns"]}] if row else []})
+        return [0, json.dumps(results), ""]
+
+    def execute_with_logging(self, path, args="", as_sudo=False, **kwargs):
+        self.executions.append((path, args))
+        parsed = dict(arg.lstrip("-").split(" ", 1) for arg in args.split(" -"))
+        if path.endswith("configure_ap_interface"):
+            radio_state = self.tables["Wifi_Radio_State"].setdefault(parsed["radio_if_name"], {})
+            vif_state = self.tables["Wifi_VIF_State"].setdefault(parsed["vif_if_name"], {})
+            radio_state.update({key: parsed[key] for key in ("channel", "ht_mode") if key in parsed})
+            vif_state.update({key: parsed[key] for key in ("ssid", "enabled", "mode") if key in parsed})
+        return [0, "", ""]
+
+    def get_command_arguments(self, *args):
+        return " ".join(*args)
+
+
+def create_interface(node: FakeNode, channel: int, ht_mode: str = "HT20", ssid: str = "fut_home_ap"):
+    interface = NodeHandler.VirtualInterface.__new__(NodeHandler.VirtualInterface)
+    interface.node = node
+    interface.if_name = "home-ap-50"
+    interface.interface_mode = "ap"
+    interface.radio_args = {"channel": channel, "channel_mode": "manual", "radio_if_name": "wifi1", "ht_mode": ht_mode}
+    interface.vif_args = {"enabled": True, "mode": "ap", "perform_cac": True, "ssid": ssid, "vif_if_name": "home-ap-50"}
+    interface.network_args = {"inet_enabled": True, "mtu": 1600, "network_if_name": "home-ap-50"}
+    interface.combined_args = {**interface.radio_args, **interface.vif_args, **interface.network_args}
+    return interface
+
+
+@pytest.fixture
+def node():
+    return FakeNode()
+
+
+@allure.title("Validate idempotent VIF interface configuration")
+class TestVirtualInterface:
+    @allure.title("Validate unchanged configuration is reused and only the changed arguments are pushed")
+    def test_configure_interface(self, node):
+        assert create_interface(node, channel=44).configure_interface() == 0
+        assert "-channel_mode manual" in node.executions[0][1]
+        assert "-perform_network_config true" in node.executions[0][1]
+
+        assert create_interface(node, channel=44).configure_interface() == 0
+        assert len(node.executions) == 1
+
+        assert create_interface(node, channel=44, ssid="fut_home_ap_2").configure_interface() == 0
+        log.info(f"Partial configuration arguments: {node.executions[1][1]}")
+        assert node.executions[1][1] == (
+            "-radio_if_name wifi1 -vif_if_name home-ap-50 -channel 44 -ssid fut_home_ap_2 -perform_network_config false"
+        )
+
+        assert create_interface(node, channel=52, ssid="fut_home_ap_2").configure_interface() == 0
+        assert "-perform_cac true" in node.executions[2][1]
+        assert "-ht_mode" not in node.executions[2][1]
+
+    @allure.title("Validate the full configuration is applied after a change of the device state or if forced")
+    def test_configure_interface_state_changed(self, node):
+        assert create_interface(node, channel=44).configure_interface() == 0
+        node.tables["Wifi_Radio_State"]["wifi1"]["channel"] = 36
+        assert create_interface(node, channel=44).configure_interface() == 0
+        assert create_interface(node, channel=44).configure_interface(force=True) == 0
+        assert len(node.executions) == 3
+        assert all("-channel_mode manual" in args for _, args in node.executions)
+
+        node.applied_interface_args.clear()
+        assert create_interface(node, channel=44).configure_interface(perform_network_config=False) == 0
+        assert create_interface(node, channel=44).configure_interface() == 0
+        assert node.executions[-1][1] == (
+            "-radio_if_name wifi1 -vif_if_name home-ap-50 -channel 44 -inet_enabled true -mtu 1600 "
+            "-network_if_name home-ap-50 -perform_network_config true"
+        )
+
+    @allure.title("Validate the full configuration is always applied if the reuse is not enabled")
+    def test_configure_interface_reuse_disabled(self, node):
+        node.fut_configurator.vif_config_reuse_enabled = False
+        for ssid in ("fut_home_ap", "fut_home_ap", "fut_home_ap_2"):
+            assert create_interface(node, channel=44, ssid=ssid).configure_interface() == 0
+        assert len(node.executions) == 3
+        assert all("-channel_mode manual" in args for _, args in node.executions)
@@ -0,0 +1,176 @@
+import subprocess
+
+import allure
+import pytest
+
+from lib_testbed.generic.util.logger import log
+
+# Wifi_Radio_State channel of wifi0 recorded during a channel change, as
+# (offset in milliseconds, value). Intermediate updates do not match the
+# expected value, only the last one does.
+channel_change_trace = [(0, "1"), (400, "1"), (1100, "0"), (2350, "44")]
+# Wifi_Radio_State channel of wifi0 during a DFS CAC, which is not updated for several seconds
+channel_cac_trace = [(0, "1"), (4200, "44")]
+# Wifi_Radio_State channel of wifi0 with an update every 100 milliseconds before the expected value
+channel_busy_trace = [(offset_ms, "1") for offset_ms in range(0, 3000, 100)] + [(3000, "44")]
+# Wifi_Radio_State channel of wifi0 with an update every 100 milliseconds that never matches the expected value
+channel_stuck_trace = [(offset_ms, "1") for offset_ms in range(0, 6000, 100)]
+# Wifi_VIF_Config row of the removed interface, as (offset in milliseconds, value)
+vif_remove_trace = [(0, "wifi0.1"), (1350, "")]
+# Wifi_Radio_State channel of wifi0 before and after the radio is configured
+radio_config_trace = [(0, ""), (1200, "44")]
+
+fake_ovsh_content = """#!/bin/bash
+echo >> "${FAKE_OVSDB_DIR}/ovsh_calls"
+sleep "${FAKE_OVSH_DELAY:-0}"
+elapsed_ms=$(( ($(date +%s%N) - $(cat "${FAKE_OVSDB_DIR}/start_ns")) / 1000000 ))
+value=""
+while read -r offset_ms trace_value; do
+    [ "${elapsed_ms}" -ge "${offset_ms}" ] && value=${trace_value}
+done < "${FAKE_OVSDB_DIR}/trace"
+echo -n "${value}"
+"""
+
+fake_ovsdb_client_content = """#!/bin/bash
+start_ns=$(cat "${FAKE_OVSDB_DIR}/start_ns")
+while read -r offset_ms trace_value; do
+    sleep_ms=$(( offset_ms - ($(date +%s%N) - start_ns) / 1000000 ))
+    [ "${sleep_ms}" -gt 0 ] && sleep "$(( sleep_ms / 1000 )).$(printf '%03d' $(( sleep_ms % 1000 )))"
+    echo "{\\"${4}\\":{\\"value\\":\\"${trace_value}\\"}}"
+done < "${FAKE_OVSDB_DIR}/trace"
+exec sleep 3600
+"""
+
+wait_script_content = """#!/bin/bash
+source "${FUT_TOPDIR}/shell/config/default_shell.sh" > /dev/null
+source "${FUT_TOPDIR}/shell/lib/unit_lib.sh" > /dev/null
+date +%s%N > "${FAKE_OVSDB_DIR}/start_ns"
+eval "$@" > /dev/null
+ec=$?
+echo "$(date +%s%N) ${ec}"
+"""
+
+
+@pytest.fixture
+def fake_ovsdb(tmp_path):
+    fake_ovsdb_dir = tmp_path.joinpath("fake_ovsdb")
+    bin_dir = fake_ovsdb_dir.joinpath("bin")
+    bin_dir.mkdir(parents=True)
+    for name, content in [("ovsh", fake_ovsh_content), ("ovsdb-client", fake_ovsdb_client_content)]:
+        bin_dir.joinpath(name).write_text(content)
+        bin_dir.joinpath(name).chmod(0o755)
+    fake_ovsdb_dir.joinpath("wait.sh").write_text(wait_script_content)
+    return fake_ovsdb_dir
+
+
+def replay_trace(fake_ovsdb_dir, trace: list, wait_command: str, monitor: bool, ovsh_delay: float = 0) -> dict:
+    """Execute the wait command against the replayed trace and return the wait statistics."""
+    fake_ovsdb_dir.joinpath("trace").write_text("".join(f"{offset_ms} {value}\n" for offset_ms, value in trace))
+    fake_ovsdb_dir.joinpath("ovsh_calls").write_text("")
+    env = {
+        "FUT_TOPDIR": pytest.fut_configurator.fut_base_dir,
+        "FAKE_OVSDB_DIR": fake_ovsdb_dir.as_posix(),
+        "OVSH": fake_ovsdb_dir.joinpath("bin/ovsh").as_posix(),
+        "OVSDB_WAIT_MONITOR": str(monitor).lower(),
+        "DEFAULT_WAIT_TIME": "10",
+        "FAKE_OVSH_DELAY": str(ovsh_delay),
+        "PATH": f"{fake_ovsdb_dir.joinpath('bin').as_posix()}:/usr/bin:/bin",
+    }
+    result = subprocess.run(
+        ["bash", fake_ovsdb_dir.joinpath("wait.sh").as_posix(), wait_command],
+        env=env,
+        stdout=subprocess.PIPE,
+        check=True,
+        timeout=30,
+    )
+    end_ns, exit_code = result.stdout.decode("utf-8").split()[-2:]
+    start_ns = fake_ovsdb_dir.joinpath("start_ns").read_text().strip()
+    duration_ms = (int(end_ns) - int(start_ns)) / 1e6
+    return {
+        "exit_code": int(exit_code),
+        "duration_ms": round(duration_ms),
+        "latency_ms": round(duration_ms - trace[-1][0]),
+        "ovsh_calls": len(fake_ovsdb_dir.joinpath("ovsh_calls").read_text()),
+    }
+
+
+@allure.title("Validate event driven OVSDB waits")
+class TestOvsdbMonitorWait:
+    @allure.title("Validate wait latency and number of checks with OVSDB monitor and with polling on recorded traces")
+    @pytest.mark.parametrize(
+        "wait_command, trace",
+        [
+            (
+                "wait_for_function_output 44 'get_ovsdb_entry_value Wifi_Radio_State channel -w if_name wifi0' 10 1",
+                channel_change_trace,
+            ),
+            (
+                "wait_for_function_response 'notempty' 'get_ovsdb_entry_value Wifi_Radio_State channel -r' 10",
+                [(offset_ms, "" if value != "44" else value) for offset_ms, value in channel_change_trace],
+            ),
+            (
+                "wait_for_function_output 44 'get_ovsdb_entry_value Wifi_Radio_State channel -w if_name wifi0' 10 1",
+                channel_busy_trace,
+            ),
+        ],
+    )
+    def test_wait_latency(self, fake_ovsdb, wait_command, trace):
+        polling_stats = replay_trace(fake_ovsdb, trace, wait_command, monitor=False)
+        monitor_stats = replay_trace(fake_ovsdb, trace, wait_command, monitor=True)
+        log.info(f"polling:{polling_stats}, monitor:{monitor_stats}")
+        assert polling_stats["exit_code"] == monitor_stats["exit_code"] == 0
+        # Each check after the first one is woken by a table update, and the checks are at least the retry sleep apart
+        assert monitor_stats["ovsh_calls"] <= len(trace) + 1
+        assert monitor_stats["ovsh_calls"] <= polling_stats["ovsh_calls"]
+
+    @allure.title("Validate a table without updates is checked less often with OVSDB monitor")
+    def test_wait_quiet_table(self, fake_ovsdb):
+        wait_command = "wait_for_function_output 44 'get_ovsdb_entry_value Wifi_Radio_State channel' 10 1"
+        polling_stats = replay_trace(fake_ovsdb, channel_cac_trace, wait_command, monitor=False)
+        monitor_stats = replay_trace(fake_ovsdb, channel_cac_trace, wait_command, monitor=True)
+        log.info(f"polling:{polling_stats}, monitor:{monitor_stats}")
+        assert monitor_stats["exit_code"] == 0
+        assert monitor_stats["ovsh_calls"] < polling_stats["ovsh_calls"]
+
+    @allure.title("Validate entry removal is detected by the OVSDB monitor")
+    def test_wait_ovsdb_entry_remove(self, fake_ovsdb):
+        wait_command = "wait_ovsdb_entry_remove Wifi_VIF_Config -w if_name wifi0.1"
+        monitor_stats = replay_trace(fake_ovsdb, vif_remove_trace, wait_command, monitor=True)
+        log.info(f"monitor:{monitor_stats}")
+        assert monitor_stats["exit_code"] == 0
+        assert monitor_stats["ovsh_calls"] <= len(vif_remove_trace) + 1
+
+    @allure.title("Validate wait falls back to polling when the OVSDB monitor exits")
+    def test_monitor_exit_fallback(self, fake_ovsdb):
+        fake_ovsdb.joinpath("bin/ovsdb-client").write_text("#!/bin/bash\nexit 1\n")
+        wait_command = "wait_for_function_output 44 'get_ovsdb_entry_value Wifi_Radio_State channel' 10 1"
+        monitor_stats = replay_trace(fake_ovsdb, channel_change_trace, wait_command, monitor=True)
+        log.info(f"monitor:{monitor_stats}")
+        assert monitor_stats["exit_code"] == 0
+        assert monitor_stats["ovsh_calls"] <= 5
+
+    @allure.title("Validate OVSDB monitor wait does not time out before the polling budget")
+    def test_wait_budget(self, fake_ovsdb):
+        retry_count, retry_sleep, ovsh_delay = 3, 1, 0.5
+        check_command = "get_ovsdb_entry_value Wifi_Radio_State channel"
+        wait_command = f"(wait_for_function_output 44 '{check_command}' {retry_count} {retry_sleep})"
+        monitor_stats = replay_trace(fake_ovsdb, channel_stuck_trace, wait_command, monitor=True, ovsh_delay=ovsh_delay)
+        log.info(f"monitor:{monitor_stats}")
+        assert monitor_stats["exit_code"] != 0
+        assert monitor_stats["ovsh_calls"] >= retry_count + 1
+        # Time spent in the checks does not count towards the wait budget, as with polling
+        budget_ms = retry_count * retry_sleep * 1000 + monitor_stats["ovsh_calls"] * ovsh_delay * 1000
+        assert monitor_stats["duration_ms"] >= budget_ms
+
+    @allure.title("Validate nested waits leave the outer OVSDB monitor running")
+    def test_nested_wait(self, fake_ovsdb):
+        nested_wait = "wait_for_function_response notempty 'get_ovsdb_entry_value Wifi_Radio_State channel -r' 5"
+        wait_command = (
+            "ovsdb_monitor_start Wifi_Radio_State channel"
+            f' && : "$({nested_wait})"'
+            f" && {nested_wait}"
+            " && ovsdb_monitor_is_running; ec=$?; ovsdb_monitor_stop; (exit $ec)"
+        )
+        monitor_stats = replay_trace(fake_ovsdb, radio_config_trace, wait_command, monitor=True)
+        log.info(f"monitor:{monitor_stats}")
+        assert monitor_stats["exit_code"] == 0
@@ -0,0 +1,48 @@
+import allure
+
+from framework.lib.fut_lib import compare_process_fingerprints, parse_process_fingerprints
+from framework.node_handler import NodeHandler
+from lib_testbed.generic.util.logger import log
+
+fingerprint_output = "/usr/opensync/bin/dm:1200:5321\n/usr/opensync/bin/wm:1300:5400\n/usr/opensync/bin/sm::\n"
+
+
+@allure.title("Validate OpenSync process fingerprints")
+class TestProcessFingerprint:
+    @allure.title("Validate fingerprint script output is parsed")
+    def test_parse_process_fingerprints(self):
+        assert parse_process_fingerprints(fingerprint_output) == {
+            "/usr/opensync/bin/dm": "1200:5321",
+            "/usr/opensync/bin/wm": "1300:5400",
+            "/usr/opensync/bin/sm": ":",
+        }
+        assert parse_process_fingerprints("") == {}
+
+    @allure.title("Validate restarted processes are detected even if the PID is reused")
+    def test_compare_process_fingerprints(self):
+        baseline = {"/usr/opensync/bin/dm": "1200:5321", "/usr/opensync/bin/wm": "1300:5400"}
+        assert compare_process_fingerprints(baseline, dict(baseline)) == ({}, {}, {})
+        current = {"/usr/opensync/bin/dm": "1200:9800", "/usr/opensync/bin/sm": "1400:9900"}
+        missing, mismatching, new = compare_process_fingerprints(baseline, current)
+        log.info(f"Missing: {missing}, mismatching: {mismatching}, new: {new}")
+        assert missing == {"/usr/opensync/bin/wm": "1300:5400"}
+        assert mismatching == {"/usr/opensync/bin/dm": "1200:9800"}
+        assert new == {"/usr/opensync/bin/sm": "1400:9900"}
+
+    @allure.title("Validate fingerprints are retrieved with a single script execution")
+    def test_opensync_pid_retrieval(self):
+        executions = []
+        node_handler = NodeHandler.__new__(NodeHandler)
+
+        def fake_execute(path, args="", **kwargs):
+            executions.append((path, args))
+            return [0, fingerprint_output, ""]
+
+        node_handler.execute = fake_execute
+        fingerprints = node_handler.opensync_pid_retrieval(tracked_node_services=["wm", "dm", "sm"])
+        assert fingerprints["/usr/opensync/bin/wm"] == "1300:5400"
+        node_handler.opensync_pid_retrieval()
+        assert executions == [
+            ("tools/device/get_process_fingerprint", " dm sm wm"),
+            ("tools/device/get_process_fingerprint", ""),
+        ]
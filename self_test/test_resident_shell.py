@@ -0,0 +1,84 @@
+import os
+import signal
+
+import allure
+import pytest
+
+from framework.lib.fut_resident_shell import RESIDENT_SHELL_SCRIPT, ResidentShell, ResidentShellError
+from lib_testbed.generic.util.logger import log
+
+test_script_content = """#!/bin/sh
+source /tmp/fut-base/shell/config/default_shell.sh
+[ -e "/tmp/fut-base/fut_set_env.sh" ] && source /tmp/fut-base/fut_set_env.sh
+source "${FUT_TOPDIR}/shell/lib/unit_lib.sh"
+echo "name=$(basename "$0") args=$# first=${1}"
+fut_info_dump_line
+echo "to stderr" >&2
+[ "${2}" = "sleep" ] && sleep 5
+exit "${3:-0}"
+"""
+
+script_name_content = """#!/bin/sh
+# The script name is expanded in all forms, but not in single quotes
+echo "quoted=$(basename "$0") unquoted=$(basename $0) braces=$(basename ${0})"
+echo "$(echo awk | awk '{print toupper($0)}')" '$0'
+"""
+
+
+@pytest.fixture
+def resident_shell(tmp_path, monkeypatch):
+    fut_base_dir = pytest.fut_configurator.fut_base_dir
+    monkeypatch.setenv("FUT_TOPDIR", fut_base_dir)
+    shell = ResidentShell(name="self_test", spawn_cmd=["bash", f"{fut_base_dir}/{RESIDENT_SHELL_SCRIPT}"])
+    script = tmp_path.joinpath("resident_test.sh")
+    script.write_text(test_script_content)
+    yield shell, script.as_posix()
+    shell.close()
+
+
+@allure.title("Validate ResidentShell class")
+class TestResidentShell:
+    @allure.title("Validate script output and exit code")
+    def test_run(self, resident_shell):
+        shell, script = resident_shell
+        actual = shell.run(script, "'f oo' bar 3")
+        log.info(f"actual:{actual}")
+        dump_line = "************* FUT-INFO-DUMP: resident_test.sh *************"
+        assert actual == (3, f"name=resident_test.sh args=3 first=f oo\n{dump_line}", "to stderr")
+
+    @allure.title("Validate missing script exit code")
+    def test_run_missing_script(self, resident_shell):
+        shell, script = resident_shell
+        exit_code, _, std_err = shell.run(f"{script}.missing")
+        assert exit_code == 127 and "not found" in std_err
+
+    @allure.title("Validate script timeout")
+    def test_run_timeout(self, resident_shell):
+        shell, script = resident_shell
+        assert shell.run(script, "foo sleep", timeout=1)[0] == 124
+        # The shell is still usable after the timeout
+        assert shell.run(script, "foo")[0] == 0
+
+    @allure.title("Validate restart after the resident shell is killed")
+    def test_restart_after_crash(self, resident_shell):
+        shell, script = resident_shell
+        assert shell.run(script)[0] == 0
+        os.kill(shell.process.pid, signal.SIGKILL)
+        shell.process.wait()
+        assert shell.run(script)[0] == 0
+        assert shell.restart_count == 1
+
+    @allure.title("Validate multi-line commands are rejected")
+    def test_run_multi_line(self, resident_shell):
+        shell, script = resident_shell
+        with pytest.raises(ResidentShellError):
+            shell.run(script, "foo\nbar")
+
+    @allure.title("Validate the script name is expanded to the script path")
+    def test_run_script_name(self, resident_shell, tmp_path):
+        shell, _ = resident_shell
+        script = tmp_path.joinpath("script_name.sh")
+        script.write_text(script_name_content)
+        actual = shell.run(script.as_posix())
+        log.info(f"actual:{actual}")
+        assert actual == (0, "quoted=script_name.sh unquoted=script_name.sh braces=script_name.sh\nAWK $0", "")
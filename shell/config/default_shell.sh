@@ -22,6 +22,8 @@ export FUT_PM_LIB_SRC=false
 [ -z "$LOGREAD" ] && export LOGREAD="cat /var/log/messages"
 [ -z "$DEFAULT_WAIT_TIME" ] && export DEFAULT_WAIT_TIME=30
 [ -z "$OVSH" ] && export OVSH="${OPENSYNC_ROOTDIR}/tools/ovsh --quiet --timeout=180000"
+[ -z "$OVSDB_WAIT_MONITOR" ] && export OVSDB_WAIT_MONITOR=true
+[ -z "$OVSDB_WAIT_POLL_INTERVAL" ] && export OVSDB_WAIT_POLL_INTERVAL=5
 [ -z "$CAC_TIMEOUT" ] && export CAC_TIMEOUT=60
 [ -z "$PLATFORM_OVERRIDE_FILE" ] && export PLATFORM_OVERRIDE_FILE=
 [ -z "$MODEL_OVERRIDE_FILE" ] && export MODEL_OVERRIDE_FILE=
@@ -35,7 +35,8 @@ raise()
 {
     exception_type="BROKEN"
     exception_name="FutShellException"
-    exception_location=$(basename "$0")
+    # Libraries are not rewritten by the resident shell, where $0 is the shell itself
+    exception_location=$(basename "${rsh_script:-$0}")
     exception_msg=${1:-"Unknown error"}
     shift 1
     exit_code=1
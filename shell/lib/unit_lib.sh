@@ -2635,7 +2635,8 @@ force_delete_ip_port_forward_raise()
 ###############################################################################
 fut_info_dump_line()
 {
-    echo "************* FUT-INFO-DUMP: $(basename $0) *************"
+    # Libraries are not rewritten by the resident shell, where $0 is the shell itself
+    echo "************* FUT-INFO-DUMP: $(basename "${rsh_script:-$0}") *************"
 }
 
 ###############################################################################
@@ -5908,25 +5909,253 @@ wait_for_function_exit_code()
     local fn_exec_cnt=1
 
     log -deb "unit_lib:wait_for_function_exit_code - Executing $function_to_wait_for, waiting for exit code ${exp_ec}"
+    ovsdb_monitor_start_for_function "$function_to_wait_for"
     $function_to_wait_for
     local act_ec=$?
     while [ ${act_ec} -ne "${exp_ec}" ]; do
         log -deb "unit_lib:wait_for_function_exit_code - Retry ${fn_exec_cnt}, exit code: ${act_ec}, expecting: ${exp_ec}"
         if [ ${fn_exec_cnt} -ge "${retry_count}" ]; then
+            ovsdb_monitor_stop
             log -err "unit_lib:wait_for_function_exit_code: Function ${function_to_wait_for} timed out"
             return $?
         fi
-        sleep "${retry_sleep}"
+        ovsdb_monitor_wait "${retry_sleep}" $(( retry_count * retry_sleep - $(ovsdb_monitor_waited) ))
         $function_to_wait_for
         act_ec=$?
-        fn_exec_cnt=$(( $fn_exec_cnt + 1 ))
+        if ovsdb_monitor_is_running; then
+            fn_exec_cnt=$(( $(ovsdb_monitor_waited) / retry_sleep + 1 ))
+        else
+            fn_exec_cnt=$(( $fn_exec_cnt + 1 ))
+        fi
     done
+    ovsdb_monitor_stop
 
     log -deb "unit_lib:wait_for_function_exit_code - Exit code: ${act_ec} equal to expected: ${exp_ec}"
 
     return 0
 }
 
+###############################################################################
+# DESCRIPTION:
+#   Function starts the OVSDB monitor of the provided table in the background.
+#   While the monitor is running, ovsdb_monitor_wait returns as soon as the
+#   table is updated, instead of sleeping for the fixed time between checks.
+#   The monitor is not started if disabled with OVSDB_WAIT_MONITOR, if the
+#   ovsdb-client tool is not available, or if the shell does not support read
+#   with timeout. In that case ovsdb_monitor_wait falls back to polling.
+#   Only one monitor is active at a time, it is read on file descriptor 8.
+#   If a monitor was already started by an outer wait, for example when the
+#   checked function waits itself or runs in a command substitution, it is
+#   left running for the outer wait and the nested wait falls back to polling.
+#   Each call must be paired with ovsdb_monitor_stop.
+#   Function also resets the time waited for the table updates.
+#   If the table is not provided, only the wait for polling is set up.
+# INPUT PARAMETER(S):
+#   $1  ovsdb table (string, optional)
+#   $2  ovsdb field in ovsdb table (string, optional)
+# RETURNS:
+#   0   Monitor started.
+#   1   Monitor is not available.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_start Wifi_Radio_State channel
+###############################################################################
+ovsdb_monitor_start()
+{
+    local NARGS_MIN=0
+    local NARGS_MAX=2
+    local ovsdb_monitor_fifo
+    [ $# -ge ${NARGS_MIN} ] && [ $# -le ${NARGS_MAX} ] ||
+        raise "unit_lib:ovsdb_monitor_start requires ${NARGS_MIN}-${NARGS_MAX} input arguments, $# given" -arg
+
+    OVSDB_MONITOR_DEPTH=$(( ${OVSDB_MONITOR_DEPTH:-0} + 1 ))
+    if [ -n "${OVSDB_MONITOR_PID}" ]; then
+        log -deb "unit_lib:ovsdb_monitor_start - OVSDB monitor is used by an outer wait, falling back to polling"
+        return 1
+    fi
+    OVSDB_MONITOR_WAITED_CS=0
+    [ -z "$1" ] && return 1
+    [ "${OVSDB_WAIT_MONITOR}" = "false" ] && return 1
+    command -v ovsdb-client > /dev/null 2>&1 || return 1
+    (echo | read -t 1 -r ovsdb_monitor_update) 2> /dev/null || return 1
+
+    ovsdb_monitor_fifo=$(mktemp -u /tmp/fut_ovsdb_monitor.XXXXXX) || return 1
+    mkfifo "${ovsdb_monitor_fifo}" || return 1
+    # shellcheck disable=SC2086
+    ovsdb-client --format=json monitor Open_vSwitch "$1" $2 < /dev/null > "${ovsdb_monitor_fifo}" 2> /dev/null &
+    OVSDB_MONITOR_PID=$!
+    OVSDB_MONITOR_OWNER_DEPTH=${OVSDB_MONITOR_DEPTH}
+    exec 8< "${ovsdb_monitor_fifo}"
+    rm -f "${ovsdb_monitor_fifo}"
+    log -deb "unit_lib:ovsdb_monitor_start - Monitoring table $1 $2"
+    return 0
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function starts the OVSDB monitor of the table that the provided function
+#   call reads. Supported function calls are get_ovsdb_entry_value and
+#   check_ovsdb_entry. For any other function call the monitor is not started.
+#   Each call must be paired with ovsdb_monitor_stop.
+# INPUT PARAMETER(S):
+#   $1  function call (string, required)
+# RETURNS:
+#   0   Monitor started.
+#   1   Monitor is not available.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_start_for_function "get_ovsdb_entry_value Manager is_connected"
+###############################################################################
+ovsdb_monitor_start_for_function()
+{
+    local NARGS=1
+    [ $# -ne ${NARGS} ] &&
+        raise "unit_lib:ovsdb_monitor_start_for_function requires ${NARGS} input argument(s), $# given" -arg
+
+    # shellcheck disable=SC2086
+    set -- $1
+    case "$1" in
+        get_ovsdb_entry_value)
+            [ $# -ge 3 ] && { ovsdb_monitor_start "$2" "$3"; return; }
+            ;;
+        check_ovsdb_entry)
+            [ $# -ge 2 ] && { ovsdb_monitor_start "$2"; return; }
+            ;;
+    esac
+    ovsdb_monitor_start
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function checks if the OVSDB monitor started with ovsdb_monitor_start is
+#   running. A monitor started by an outer wait is not reported as running.
+# INPUT PARAMETER(S):
+#   None.
+# RETURNS:
+#   0   Monitor is running.
+#   1   Monitor is not running.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_is_running
+###############################################################################
+ovsdb_monitor_is_running()
+{
+    [ -n "${OVSDB_MONITOR_PID}" ] && [ "${OVSDB_MONITOR_OWNER_DEPTH}" = "${OVSDB_MONITOR_DEPTH}" ] &&
+        [ -e "/proc/${OVSDB_MONITOR_PID}/status" ] &&
+        ! grep -q "^State:.*[ZX]" "/proc/${OVSDB_MONITOR_PID}/status"
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function echoes the number of seconds waited in ovsdb_monitor_wait since
+#   the OVSDB monitor was started. Time spent in the checks of the table is
+#   not included, so the wait budget is the same as with polling.
+# INPUT PARAMETER(S):
+#   None.
+# RETURNS:
+#   Echoes waited time in seconds.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_waited
+###############################################################################
+ovsdb_monitor_waited()
+{
+    echo $(( ${OVSDB_MONITOR_WAITED_CS:-0} / 100 ))
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function echoes the system uptime in centiseconds, which is used to keep
+#   the checks of the OVSDB table apart at sub-second resolution. If uptime is
+#   not available, the current time in whole seconds is used instead.
+# INPUT PARAMETER(S):
+#   None.
+# RETURNS:
+#   Echoes time in centiseconds.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_time_cs
+###############################################################################
+ovsdb_monitor_time_cs()
+{
+    local uptime
+    if read -r uptime _ < /proc/uptime 2> /dev/null && [ "${uptime#*.}" != "${uptime}" ]; then
+        # Leading digit keeps fractions like 08 from being parsed as octal
+        echo $(( ${uptime%.*} * 100 + 1${uptime#*.} - 100 ))
+    else
+        echo $(( $(date +%s) * 100 ))
+    fi
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function waits before the next check of the OVSDB table.
+#   If the OVSDB monitor is running, function returns as soon as the monitored
+#   table is updated, or at the latest after OVSDB_WAIT_POLL_INTERVAL seconds,
+#   so that changes are never missed. Function waits at least the provided
+#   time, measured at sub-second resolution, so a frequently updated table is
+#   not checked more often than with polling. If the monitor is not running,
+#   or it exits during the wait, function sleeps for the provided time.
+#   The time waited is added to the total reported by ovsdb_monitor_waited.
+# INPUT PARAMETER(S):
+#   $1  minimum time in seconds to wait, slept if monitor is not running (int, optional, default=1)
+#   $2  maximum time in seconds to wait for the table update (int, optional)
+# RETURNS:
+#   0   Always.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_wait 1 10
+###############################################################################
+ovsdb_monitor_wait()
+{
+    local retry_sleep=${1:-1}
+    local monitor_wait=${OVSDB_WAIT_POLL_INTERVAL:-5}
+    local ovsdb_monitor_update
+    local throttle_cs
+    local wait_start_cs
+    [ -n "$2" ] && [ "$2" -lt "${monitor_wait}" ] && monitor_wait=$2
+    [ "${monitor_wait}" -lt 1 ] && monitor_wait=1
+
+    if ! ovsdb_monitor_is_running; then
+        sleep "${retry_sleep}"
+        return 0
+    fi
+    wait_start_cs=$(ovsdb_monitor_time_cs)
+    if read -t "${monitor_wait}" -r ovsdb_monitor_update <&8; then
+        throttle_cs=$(( retry_sleep * 100 - $(ovsdb_monitor_time_cs) + wait_start_cs ))
+        if [ "${throttle_cs}" -gt 0 ]; then
+            # Fractional sleep is not supported by all shells, round up to whole seconds in that case
+            sleep "$(( throttle_cs / 100 )).$(( throttle_cs % 100 / 10 ))$(( throttle_cs % 10 ))" 2> /dev/null ||
+                sleep $(( (throttle_cs + 99) / 100 ))
+        fi
+    elif ! ovsdb_monitor_is_running; then
+        log -deb "unit_lib:ovsdb_monitor_wait - OVSDB monitor exited, falling back to polling"
+        wait "${OVSDB_MONITOR_PID}" 2> /dev/null
+        exec 8<&-
+        OVSDB_MONITOR_PID=""
+        sleep "${retry_sleep}"
+    fi
+    OVSDB_MONITOR_WAITED_CS=$(( ${OVSDB_MONITOR_WAITED_CS:-0} + $(ovsdb_monitor_time_cs) - wait_start_cs ))
+    return 0
+}
+
+###############################################################################
+# DESCRIPTION:
+#   Function stops the OVSDB monitor started with ovsdb_monitor_start.
+#   A monitor started by an outer wait is left running.
+# INPUT PARAMETER(S):
+#   None.
+# RETURNS:
+#   0   Always.
+# USAGE EXAMPLE(S):
+#   ovsdb_monitor_stop
+###############################################################################
+ovsdb_monitor_stop()
+{
+    if [ -n "${OVSDB_MONITOR_PID}" ] && [ "${OVSDB_MONITOR_OWNER_DEPTH}" = "${OVSDB_MONITOR_DEPTH}" ]; then
+        kill "${OVSDB_MONITOR_PID}" 2> /dev/null
+        wait "${OVSDB_MONITOR_PID}" 2> /dev/null
+        exec 8<&-
+        OVSDB_MONITOR_PID=""
+    fi
+    [ "${OVSDB_MONITOR_DEPTH:-0}" -gt 0 ] && OVSDB_MONITOR_DEPTH=$(( OVSDB_MONITOR_DEPTH - 1 ))
+    return 0
+}
+
 ###############################################################################
 # DESCRIPTION:
 #   Function waits for expected output from provided function call,
@@ -5973,20 +6202,21 @@ wait_for_function_output()
         is_get_ovsdb_entry_value=1
 
     log -deb "unit_lib:wait_for_function_output - Executing $function_to_wait_for, waiting for $wait_for_value response"
+    ovsdb_monitor_start_for_function "$function_to_wait_for"
     while [ $fn_exec_cnt -le $retry_count ]; do
         fn_exec_cnt=$(( $fn_exec_cnt + 1 ))
 
         res=$($function_to_wait_for)
         if [ "$wait_for_value" = 'notempty' ]; then
             if [ $is_get_ovsdb_entry_value ]; then
-                [ -n "$res" ] && [ "$res" != '["set",[]]' ] && [ "$res" != '["map",[]]' ] && return 0
+                [ -n "$res" ] && [ "$res" != '["set",[]]' ] && [ "$res" != '["map",[]]' ] && ovsdb_monitor_stop && return 0
             else
                 [ -n "$res" ] &&
                     break
             fi
         elif [ "$wait_for_value" = 'empty' ]; then
             if [ $is_get_ovsdb_entry_value ]; then
-                [ -z "$res" ] || [ "$res" = '["set",[]]' ] || [ "$res" = '["map",[]]' ] && return 0
+                [ -z "$res" ] || [ "$res" = '["set",[]]' ] || [ "$res" = '["map",[]]' ] && ovsdb_monitor_stop && return 0
             else
                 [ -z "$res" ] &&
                     break
@@ -5994,15 +6224,18 @@ wait_for_function_output()
         else
             if [ "${one_of_values}" == "true" ]; then
                 for wait_value in ${wait_for_value}; do
-                    [ "$res" == "$wait_value" ] && return 0
+                    [ "$res" == "$wait_value" ] && ovsdb_monitor_stop && return 0
                 done
             else
-                [ "$res" == "$wait_for_value" ] && return 0
+                [ "$res" == "$wait_for_value" ] && ovsdb_monitor_stop && return 0
             fi
         fi
         log -deb "unit_lib:wait_for_function_output - Function retry ${fn_exec_cnt} output: ${res}"
-        sleep "${retry_sleep}"
+        ovsdb_monitor_wait "${retry_sleep}" $(( retry_count * retry_sleep - $(ovsdb_monitor_waited) ))
+        ovsdb_monitor_is_running &&
+            fn_exec_cnt=$(( $(ovsdb_monitor_waited) / retry_sleep ))
     done
+    ovsdb_monitor_stop
 
     if [ $fn_exec_cnt -gt "$retry_count" ]; then
         raise "Function $function_to_wait_for timed out" -l "unit_lib:wait_for_function_output"
@@ -6062,6 +6295,7 @@ wait_for_function_response()
         log -deb "unit_lib:wait_for_function_response - Waiting for function $function_to_wait_for exit code $wait_for_value"
     fi
 
+    ovsdb_monitor_start_for_function "$function_to_wait_for"
     while [ $func_exec_time -le $wait_time ]; do
         log -deb "unit_lib:wait_for_function_response - Executing: $function_to_wait_for"
         func_exec_time=$((func_exec_time+1))
@@ -6092,8 +6326,11 @@ wait_for_function_response()
             break
         fi
 
-        sleep 1
+        ovsdb_monitor_wait 1 $(( wait_time - $(ovsdb_monitor_waited) + 1 ))
+        ovsdb_monitor_is_running &&
+            func_exec_time=$(ovsdb_monitor_waited)
     done
+    ovsdb_monitor_stop
 
     if [ $retval = 1 ]; then
         log -deb "unit_lib:wait_for_function_response - Function $function_to_wait_for timed out"
@@ -6288,6 +6525,7 @@ wait_ovsdb_entry_remove()
     log "$info_string"
     select_entry_command="$ovsdb_table $conditions_string"
     wait_time=0
+    ovsdb_monitor_start "$ovsdb_table" _uuid
     while [ $wait_time -le $DEFAULT_WAIT_TIME ]; do
         wait_time=$((wait_time+1))
 
@@ -6297,8 +6535,11 @@ wait_ovsdb_entry_remove()
             break
         fi
 
-        sleep 1
+        ovsdb_monitor_wait 1 $(( DEFAULT_WAIT_TIME - $(ovsdb_monitor_waited) + 1 ))
+        ovsdb_monitor_is_running &&
+            wait_time=$(ovsdb_monitor_waited)
     done
+    ovsdb_monitor_stop
 
     if [ $wait_time -gt "$DEFAULT_WAIT_TIME" ]; then
         raise "Could not remove entry from $ovsdb_table" -l "unit_lib:wait_ovsdb_entry_remove" -fc
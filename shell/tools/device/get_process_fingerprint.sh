@@ -0,0 +1,71 @@
+#!/bin/sh
+
+# The script does not source unit_lib.sh, so it can be executed after every test case at a minimal cost
+# shellcheck disable=SC1091
+source /tmp/fut-base/shell/config/default_shell.sh > /dev/null
+[ -e "/tmp/fut-base/fut_set_env.sh" ] && source /tmp/fut-base/fut_set_env.sh > /dev/null
+
+usage()
+{
+cat << usage_string
+tools/device/get_process_fingerprint.sh [-h] arguments
+Description:
+    Echoes the PID and the start time of the OpenSync manager processes.
+    Start time is the process start time since boot in clock ticks, so a
+    restarted process is detected even if its PID was reused.
+    Without arguments, all managers enabled in the Node_Services table and
+    the DM are reported. With arguments, the requested managers which are
+    enabled in the Node_Services table are reported. DM is not present in
+    the Node_Services table and is always reported if requested.
+    Output line format is <process_path>:<pid>:<start_time>. The PID and the
+    start time are empty if the process is not running.
+Arguments:
+    -h  show this help message
+    \$@ (node_services) : Node services to report : (string)(optional)
+Script usage example:
+    ./tools/device/get_process_fingerprint.sh
+    ./tools/device/get_process_fingerprint.sh dm wm sm
+usage_string
+}
+
+case "${1}" in
+    -h | --help)  usage ; exit 0 ;;
+esac
+
+get_enabled_node_services()
+{
+    ${OVSH} s Node_Services service -w status==enabled -r 2> /dev/null
+}
+
+if [ $# -eq 0 ]; then
+    node_services="$(get_enabled_node_services) dm"
+else
+    node_services=""
+    enabled_node_services=""
+    for node_service in "$@"; do
+        if [ "${node_service}" = "dm" ]; then
+            node_services="${node_services} dm"
+            continue
+        fi
+        # Query the table only once and only if needed
+        [ -z "${enabled_node_services}" ] && enabled_node_services=" $(echo $(get_enabled_node_services)) "
+        case "${enabled_node_services}" in
+            *" ${node_service} "*) node_services="${node_services} ${node_service}" ;;
+        esac
+    done
+fi
+
+for node_service in ${node_services}; do
+    process_path="${OPENSYNC_ROOTDIR}/bin/${node_service}"
+    pid=""
+    wait_time=0
+    # The process may be restarting, wait for it the same as get_process_id.sh does
+    while [ -z "${pid}" ] && [ ${wait_time} -lt ${DEFAULT_WAIT_TIME} ]; do
+        pid=$(pgrep -o "${process_path}")
+        [ -z "${pid}" ] && sleep 1 && wait_time=$((wait_time + 1))
+    done
+    start_time=""
+    # Start time is the 22nd field of the stat file, field 20 after the process name enclosed in parentheses
+    [ -n "${pid}" ] && start_time=$(sed 's/.*) //' "/proc/${pid}/stat" 2> /dev/null | cut -d ' ' -f 20)
+    echo "${process_path}:${pid}:${start_time}"
+done
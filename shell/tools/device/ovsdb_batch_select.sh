@@ -0,0 +1,31 @@
+#!/bin/sh
+
+# The script does not source unit_lib.sh, so several OVSDB reads cost a single lightweight execution
+# shellcheck disable=SC1091
+source /tmp/fut-base/shell/config/default_shell.sh > /dev/null
+[ -e "/tmp/fut-base/fut_set_env.sh" ] && source /tmp/fut-base/fut_set_env.sh > /dev/null
+
+usage()
+{
+cat << usage_string
+tools/device/ovsdb_batch_select.sh [-h] arguments
+Description:
+    Executes an OVSDB transaction with one or more select operations and
+    echoes the JSON result, one result object per operation. The whole
+    transaction is performed by a single ovsdb-client invocation.
+Arguments:
+    -h  show this help message
+    \$1 (transaction) : OVSDB transaction in JSON format : (string)(required)
+Script usage example:
+    ./tools/device/ovsdb_batch_select.sh '["Open_vSwitch",{"op":"select","table":"AWLAN_Node","where":[],"columns":["ovs_version"]},{"op":"select","table":"Node_Services","where":[],"columns":["service","status"]}]'
+usage_string
+}
+
+case "${1}" in
+    -h | --help)  usage ; exit 0 ;;
+esac
+
+NARGS=1
+[ $# -ne ${NARGS} ] && usage && echo "Requires exactly ${NARGS} input argument" && exit 1
+
+ovsdb-client transact "${1}"
@@ -0,0 +1,126 @@
+#!/bin/sh
+
+# FUT environment loading
+# The environment is loaded once and shared by all scripts executed through this shell.
+fut_topdir="${FUT_TOPDIR:-/tmp/fut-base}"
+# shellcheck disable=SC1091
+source "${fut_topdir}/shell/config/default_shell.sh" > /dev/null
+[ -e "${fut_topdir}/fut_set_env.sh" ] && source "${fut_topdir}/fut_set_env.sh" > /dev/null
+source "${FUT_TOPDIR}/shell/lib/unit_lib.sh" > /dev/null
+
+usage()
+{
+cat << usage_string
+tools/device/resident_shell.sh [-h]
+Description:
+    - Long-lived shell with the FUT environment and unit_lib.sh already loaded.
+    - Reads framed requests from standard input and executes each FUT script in a subshell,
+      skipping the script lines that source the already loaded environment.
+    - Platform and model override files are still sourced by each script.
+    - Request frame, three lines:
+        FUT_RSH_CMD <request_id> <timeout_seconds>
+        <absolute script path>
+        <script arguments>
+    - Response frame, header line followed by the raw standard output and standard error:
+        FUT_RSH_RESULT <request_id> <exit_code> <stdout_bytes> <stderr_bytes>
+    - Exit code 124 is reported if the script exceeds the timeout, 127 if the script is missing.
+Arguments:
+    -h  show this help message
+Script usage example:
+    ./tools/device/resident_shell.sh
+usage_string
+}
+
+case "${1}" in
+    -h | --help)  usage ; exit 0 ;;
+esac
+
+rsh_dir=$(mktemp -d /tmp/fut_resident_shell.XXXXXX) || exit 1
+
+trap 'rm -rf "${rsh_dir}"' EXIT
+trap 'exit 0' INT TERM HUP
+
+# Script lines sourcing the environment, which is already loaded in this shell
+rsh_strip='/^source .*\/shell\/config\/default_shell\.sh/d;/^\[ -e .*\/fut_set_env\.sh" \] && source/d;/^source .*\/shell\/lib\/unit_lib\.sh/d'
+# The scripts are evaluated in this shell, so their $0, ${0} and "$0" are replaced with the script path variable.
+# Single quoted strings, e.g. awk programs, and comments are kept as they are. Double quotes are tracked separately
+# inside each command substitution.
+rsh_rewrite='
+BEGIN { special = "[\\\\\"\047$#()]" }
+{
+    line = $0
+    out = ""
+    while (line != "") {
+        if (sq) {
+            quote = index(line, "\047")
+            if (!quote) { out = out line; break }
+            out = out substr(line, 1, quote); line = substr(line, quote + 1); sq = 0
+            continue
+        }
+        if (!match(line, special)) { out = out line; break }
+        out = out substr(line, 1, RSTART - 1)
+        line = substr(line, RSTART)
+        c = substr(line, 1, 1)
+        step = 1
+        if (c == "\\") step = 2
+        else if (c == "#" && !dq && (out == "" || substr(out, length(out), 1) ~ /[ \t;]/)) { out = out line; break }
+        else if (substr(line, 1, 4) == "${0}") { out = out "${rsh_script}"; line = substr(line, 5); continue }
+        else if (substr(line, 1, 2) == "$0") { out = out "${rsh_script}"; line = substr(line, 3); continue }
+        else if (substr(line, 1, 2) == "$(") { subst++; subst_dq[subst] = dq; subst_paren[subst] = 0; dq = 0; step = 2 }
+        else if (c == "\"") dq = !dq
+        else if (c == "\047" && !dq) sq = 1
+        else if (c == "(" && !dq && subst) subst_paren[subst]++
+        else if (c == ")" && !dq && subst) {
+            if (subst_paren[subst]) subst_paren[subst]--
+            else { dq = subst_dq[subst]; subst-- }
+        }
+        out = out substr(line, 1, step)
+        line = substr(line, step + 1)
+    }
+    print out
+}'
+
+echo "FUT_RSH_READY $$"
+
+while IFS= read -r rsh_header; do
+    # shellcheck disable=SC2086
+    set -- ${rsh_header}
+    [ "${1}" = "FUT_RSH_CMD" ] || continue
+    rsh_id="${2}"
+    rsh_timeout="${3}"
+    IFS= read -r rsh_script || break
+    IFS= read -r rsh_args || break
+    rm -f "${rsh_dir}/timeout"
+
+    (
+        if [ ! -f "${rsh_script}" ]; then
+            echo "${rsh_script}: not found" >&2
+            exit 127
+        fi
+        eval "set -- ${rsh_args}"
+        eval "$(sed -e "${rsh_strip}" "${rsh_script}" | awk "${rsh_rewrite}")"
+    ) < /dev/null > "${rsh_dir}/stdout" 2> "${rsh_dir}/stderr" &
+    rsh_pid=$!
+
+    (
+        trap 'kill "${rsh_sleep_pid}" 2> /dev/null; exit 0' TERM
+        sleep "${rsh_timeout}" &
+        rsh_sleep_pid=$!
+        wait "${rsh_sleep_pid}"
+        touch "${rsh_dir}/timeout"
+        kill -TERM "${rsh_pid}"
+    ) < /dev/null > /dev/null 2>&1 &
+    rsh_watchdog_pid=$!
+
+    wait "${rsh_pid}"
+    rsh_ec=$?
+    kill -TERM "${rsh_watchdog_pid}" 2> /dev/null
+    wait "${rsh_watchdog_pid}" 2> /dev/null
+    [ -e "${rsh_dir}/timeout" ] && rsh_ec=124
+
+    # shellcheck disable=SC2046
+    echo "FUT_RSH_RESULT ${rsh_id} ${rsh_ec}" $(wc -c < "${rsh_dir}/stdout") $(wc -c < "${rsh_dir}/stderr")
+    cat "${rsh_dir}/stdout" "${rsh_dir}/stderr"
+done
+
+exit 0